@@ -0,0 +1,125 @@
+"""
+Benchmark: finding extraction with the compiled keyword matcher and BM25.
+
+Replays captured session content through the old per-keyword substring loop
+and through ParagraphScorer. Saved results only keep matching snippets, so
+pages of PAGE_TEXT_MAX_CHARS are rebuilt from the snippets of all sessions in
+``data/results/*.json`` (most paragraphs of a real page do not match the
+query either); page texts in the page cache are used as they are. Keywords
+come from each session's query the way TaskParser extracts them. The crawl
+is repeated to reach larger sizes.
+
+Usage:
+    python benchmarks/bench_keyword_matcher.py [--pages 50] [--repeats 1,5,20] [--extra-keywords 20]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from src.keyword_matcher import ParagraphScorer  # noqa: E402
+from src.orchestrator import PAGE_TEXT_MAX_CHARS  # noqa: E402
+from src.task_parser import TaskParser  # noqa: E402
+
+
+def legacy_extract(content: str, keywords: list[str]) -> list[dict]:
+    """The previous Orchestrator._extract_findings."""
+    findings = []
+    if not content:
+        return findings
+    for para in content.split('\n\n'):
+        para = para.strip()
+        if len(para) < 50:
+            continue
+        para_lower = para.lower()
+        matching_keywords = [k for k in keywords if k.lower() in para_lower]
+        if matching_keywords:
+            findings.append({
+                "text": para[:500],
+                "keywords": matching_keywords,
+                "relevance": len(matching_keywords) / len(keywords) if keywords else 0
+            })
+    findings.sort(key=lambda x: x.get("relevance", 0), reverse=True)
+    return findings[:10]
+
+
+def load_sessions(results_dir: Path, cache_dir: Path, pages_per_session: int) -> list[tuple[list[str], list[str]]]:
+    """Captured (keywords, page texts) per session."""
+    parser = TaskParser()
+    keyword_sets: list[list[str]] = []
+    snippets: list[str] = []
+    for path in sorted(results_dir.glob("*.json")):
+        data = json.loads(path.read_text(encoding="utf-8"))
+        findings = data.get("findings", [])
+        if not findings:
+            continue
+        keyword_sets.append(parser._extract_keywords(data.get("query", "")))
+        snippets.extend(f.get("summary", "") for f in findings)
+
+    pages = [p.read_text(encoding="utf-8") for p in sorted(cache_dir.glob("objects/*/*.txt"))]
+    position = 0
+    while snippets and len(pages) < pages_per_session:
+        paragraphs: list[str] = []
+        size = 0
+        while size < PAGE_TEXT_MAX_CHARS:
+            snippet = snippets[position % len(snippets)]
+            # Stride through the pool so each page mixes sessions
+            position += 7
+            paragraphs.append(snippet)
+            size += len(snippet) + 2
+        pages.append("\n\n".join(paragraphs)[:PAGE_TEXT_MAX_CHARS])
+    return [(keywords, pages) for keywords in keyword_sets]
+
+
+def run(extract, sessions, repeats: int, extra_keywords: list[str], new_scorer) -> tuple[float, int]:
+    start = time.perf_counter()
+    found = 0
+    for keywords, pages in sessions:
+        keywords = keywords + extra_keywords
+        state = new_scorer()
+        for _ in range(repeats):
+            for page in pages:
+                found += len(extract(state, page, keywords))
+    return time.perf_counter() - start, found
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--results-dir", type=Path, default=ROOT / "data" / "results")
+    parser.add_argument("--cache-dir", type=Path, default=ROOT / "data" / "cache" / "pages")
+    parser.add_argument("--pages", type=int, default=50, help="Pages crawled per session")
+    parser.add_argument("--repeats", default="1,5,20")
+    parser.add_argument("--extra-keywords", type=int, default=0,
+                        help="Synthetic keywords added per session (LLM parsers produce more)")
+    args = parser.parse_args()
+
+    sessions = load_sessions(args.results_dir, args.cache_dir, args.pages)
+    if not sessions:
+        sys.exit(f"No captured session content under {args.results_dir}")
+    pages = sum(len(p) for _, p in sessions)
+    chars = sum(len(page) for page in sessions[0][1])
+    extra = [f"keyword{i}" for i in range(args.extra_keywords)]
+    print(f"{len(sessions)} sessions, {pages} pages, {chars / 1000:.0f}k chars per session, "
+          f"+{len(extra)} synthetic keywords")
+
+    print(f"{'repeats':>7} | {'pages':>7} | {'legacy':>9} | {'bm25':>9} | {'speedup':>7} | "
+          f"{'legacy hits':>11} | {'bm25 hits':>9}")
+    print("-" * 78)
+    for repeats in (int(r) for r in args.repeats.split(",")):
+        legacy_s, legacy_hits = run(
+            lambda _, page, kws: legacy_extract(page, kws), sessions, repeats, extra, lambda: None
+        )
+        bm25_s, bm25_hits = run(
+            lambda scorer, page, kws: scorer.extract(page, kws), sessions, repeats, extra, ParagraphScorer
+        )
+        print(f"{repeats:>7} | {pages * repeats:>7} | {legacy_s * 1000:>7.1f}ms | {bm25_s * 1000:>7.1f}ms | "
+              f"{legacy_s / bm25_s:>6.1f}x | {legacy_hits:>11} | {bm25_hits:>9}")
+
+
+if __name__ == "__main__":
+    main()
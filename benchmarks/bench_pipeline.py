@@ -0,0 +1,294 @@
+"""
+Benchmark: end-to-end research and sales-list pipelines against a fake browser-api.
+
+Starts benchmarks/fake_browser_api.py on free local ports (one port per
+simulated browser container) with a synthetic corpus and a latency/error/
+timeout profile, then drives the real code paths against it:
+
+- orchestrator:  Orchestrator.run (search + crawl tasks, HTTP tier off)
+- company_info:  collect_company_info of the sales-automation scripts
+- contact_forms: collect_contact_forms of the sales-automation scripts
+
+Each scenario reports tasks/sec, p50/p95 task latency and memory (process
+RSS high-water mark; with --tracemalloc also the Python heap peak of the
+scenario). Results can be written with --json and compared with a previous
+run via --baseline: the exit status is 1 when a scenario's throughput drops
+or its p95 latency grows by more than --tolerance, so CI can catch
+regressions. No Docker or network access is needed.
+
+Usage:
+    python benchmarks/bench_pipeline.py [--browsers 4] [--sites 40] [--queries 3]
+        [--only orchestrator,company_info,contact_forms] [--latency-ms 200]
+        [--error-rate 0.02] [--timeout-rate 0.01] [--json out.json]
+        [--baseline baseline.json --tolerance 0.25] [--tracemalloc]
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import resource
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+import urllib.request
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+SALES_SCRIPTS = ROOT / "projects" / "sales-automation" / "scripts"
+sys.path.insert(0, str(ROOT))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_browser_api import add_profile_arguments, synthetic_corpus  # noqa: E402
+from src.browser_pool import BrowserInstance, BrowserPool  # noqa: E402
+from src.orchestrator import Orchestrator  # noqa: E402
+
+SCENARIOS = ("orchestrator", "company_info", "contact_forms")
+
+QUERIES = [
+    "AI企業 2026 比較",
+    "生成AI スタートアップ 資金調達",
+    "LLM enterprise platform benchmark",
+    "製造業 DX 導入事例",
+    "SaaS 業務効率化 東京",
+]
+
+
+def free_ports(count: int) -> list[int]:
+    sockets = []
+    for _ in range(count):
+        sock = socket.socket()
+        sock.bind(("127.0.0.1", 0))
+        sockets.append(sock)
+    ports = [sock.getsockname()[1] for sock in sockets]
+    for sock in sockets:
+        sock.close()
+    return ports
+
+
+def start_server(ports: list[int], corpus_path: Path, args: argparse.Namespace) -> subprocess.Popen:
+    """Start the fake browser-api and wait until every port answers /health."""
+    command = [
+        sys.executable, str(Path(__file__).resolve().parent / "fake_browser_api.py"),
+        "--ports", ",".join(map(str, ports)),
+        "--corpus", str(corpus_path),
+        "--latency-ms", str(args.latency_ms),
+        "--latency-sigma", str(args.latency_sigma),
+        "--action-ms", str(args.action_ms),
+        "--error-rate", str(args.error_rate),
+        "--timeout-rate", str(args.timeout_rate),
+        "--timeout-ms", str(args.timeout_ms),
+        "--screenshot-kb", str(args.screenshot_kb),
+        "--seed", str(args.seed),
+    ]
+    server = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.DEVNULL, text=True)
+    deadline = time.monotonic() + 15
+    pending = list(ports)
+    while pending:
+        if server.poll() is not None or time.monotonic() > deadline:
+            server.kill()
+            raise RuntimeError("fake browser-api did not start")
+        try:
+            with urllib.request.urlopen(f"http://localhost:{pending[0]}/health", timeout=1):
+                pending.pop(0)
+        except OSError:
+            time.sleep(0.1)
+    return server
+
+
+def percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    if len(values) == 1:
+        return values[0]
+    return statistics.quantiles(values, n=100, method="inclusive")[round(q * 100) - 1]
+
+
+def rss_peak_mb() -> float:
+    """Process RSS high-water mark (ru_maxrss is KiB on Linux, bytes on macOS)."""
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def report(name: str, elapsed: float, latencies: list[float], failed: int, trace_memory: bool) -> dict:
+    result = {
+        "scenario": name,
+        "tasks": len(latencies),
+        "failed": failed,
+        "elapsed_s": round(elapsed, 3),
+        "tasks_per_sec": round(len(latencies) / elapsed, 2) if elapsed else 0.0,
+        "p50_ms": round(percentile(latencies, 0.50) * 1000, 1),
+        "p95_ms": round(percentile(latencies, 0.95) * 1000, 1),
+        "rss_peak_mb": round(rss_peak_mb(), 1),
+    }
+    if trace_memory:
+        result["py_peak_mb"] = round(tracemalloc.get_traced_memory()[1] / (1024 * 1024), 1)
+    return result
+
+
+async def bench_orchestrator(ports: list[int], args: argparse.Namespace, output_dir: Path) -> tuple[float, list[float], int]:
+    pool = BrowserPool()
+    instances = [
+        BrowserInstance(
+            id=f"fake-{port}", container_id=f"fake-{port}", container_name=f"fake-browser-{port}",
+            session="bench", api_port=port, vnc_port=0, novnc_port=0, status="ready",
+        )
+        for port in ports
+    ]
+    latencies: list[float] = []
+    failed = 0
+    started = time.perf_counter()
+    try:
+        for i in range(args.queries):
+            orchestrator = Orchestrator(
+                parallel=len(ports),
+                output_dir=output_dir / f"run-{i}",
+                timeout=30,
+                follow_links=args.follow_links,
+                http_tier=False,
+                pool=pool,
+                instances=instances,
+                trace=False,
+            )
+            await orchestrator.run(QUERIES[i % len(QUERIES)])
+            for result in orchestrator.session.results:
+                if result.status != "success":
+                    failed += 1
+                if result.started_at and result.completed_at:
+                    latencies.append((result.completed_at - result.started_at).total_seconds())
+    finally:
+        await pool.close()
+    return time.perf_counter() - started, latencies, failed
+
+
+def _load_sales_list():
+    if str(SALES_SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(SALES_SCRIPTS))
+    import create_sales_list
+    return create_sales_list
+
+
+def _timed(func, latencies: list[float], failures: list[int]):
+    """Wrap a per-site worker to record its latency (called from worker threads)."""
+    def wrapper(*args, **kwargs):
+        started = time.perf_counter()
+        try:
+            result = func(*args, **kwargs)
+        finally:
+            latencies.append(time.perf_counter() - started)
+        if not result:
+            failures.append(1)
+        return result
+    return wrapper
+
+
+def bench_sales(name: str, ports: list[int], sites: list[str]) -> tuple[float, list[float], int]:
+    create_sales_list = _load_sales_list()
+    latencies: list[float] = []
+    failures: list[int] = []
+    worker = "extract_company_info" if name == "company_info" else "find_contact_form_url"
+    original = getattr(create_sales_list, worker)
+    setattr(create_sales_list, worker, _timed(original, latencies, failures))
+    started = time.perf_counter()
+    try:
+        # The scripts print progress and debug lines per site
+        with contextlib.redirect_stdout(io.StringIO()):
+            if name == "company_info":
+                search_results = [{"url": url, "title": url} for url in sites]
+                create_sales_list.collect_company_info(ports, search_results, "IT", max_companies=len(sites))
+            else:
+                companies = [{"company_name": url, "company_url": url} for url in sites]
+                create_sales_list.collect_contact_forms(ports, companies)
+    finally:
+        setattr(create_sales_list, worker, original)
+    return time.perf_counter() - started, latencies, len(failures)
+
+
+def compare(results: list[dict], baseline_path: Path, tolerance: float) -> list[str]:
+    """Scenarios that regressed against a baseline result file."""
+    baseline = {r["scenario"]: r for r in json.loads(baseline_path.read_text())["results"]}
+    regressions = []
+    for result in results:
+        base = baseline.get(result["scenario"])
+        if not base:
+            continue
+        if result["tasks_per_sec"] < base["tasks_per_sec"] * (1 - tolerance):
+            regressions.append(f"{result['scenario']}: tasks/sec {base['tasks_per_sec']} -> {result['tasks_per_sec']}")
+        if result["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+            regressions.append(f"{result['scenario']}: p95 {base['p95_ms']}ms -> {result['p95_ms']}ms")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Pipeline benchmark against a fake browser-api")
+    parser.add_argument("--browsers", type=int, default=4, help="Simulated browser containers")
+    parser.add_argument("--sites", type=int, default=40, help="Company sites in the synthetic corpus")
+    parser.add_argument("--queries", type=int, default=3, help="Orchestrator runs")
+    parser.add_argument("--follow-links", type=int, default=5, help="Result links crawled per search task")
+    parser.add_argument("--only", default=",".join(SCENARIOS), help="Comma-separated scenarios")
+    parser.add_argument("--json", type=Path, default=None, help="Write results to this file")
+    parser.add_argument("--baseline", type=Path, default=None, help="Fail on regression against this file")
+    parser.add_argument("--tolerance", type=float, default=0.25, help="Allowed relative regression")
+    parser.add_argument("--tracemalloc", action="store_true", help="Also measure the Python heap peak")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+
+    scenarios = [s for s in args.only.split(",") if s]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    corpus = synthetic_corpus(args.sites, seed=args.seed)
+    sites = [url for url in corpus.pages if url.endswith(".co.jp/")]
+    ports = free_ports(args.browsers)
+
+    print(f"browsers={args.browsers} sites={len(sites)} latency={args.latency_ms:.0f}ms "
+          f"errors={args.error_rate:.0%} timeouts={args.timeout_rate:.0%}")
+    print(f"{'scenario':<15}{'tasks':>7}{'failed':>8}{'tasks/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'rss MB':>9}")
+
+    results = []
+    with tempfile.TemporaryDirectory() as tmp:
+        corpus_path = Path(tmp) / "corpus.json"
+        corpus.save(corpus_path)
+        server = start_server(ports, corpus_path, args)
+        try:
+            for name in scenarios:
+                if args.tracemalloc:
+                    tracemalloc.start()
+                if name == "orchestrator":
+                    elapsed, latencies, failed = asyncio.run(bench_orchestrator(ports, args, Path(tmp) / "orchestrator"))
+                else:
+                    elapsed, latencies, failed = bench_sales(name, ports, sites)
+                result = report(name, elapsed, latencies, failed, args.tracemalloc)
+                if args.tracemalloc:
+                    tracemalloc.stop()
+                results.append(result)
+                print(f"{name:<15}{result['tasks']:>7}{result['failed']:>8}{result['tasks_per_sec']:>9.2f}"
+                      f"{result['p50_ms']:>9.1f}{result['p95_ms']:>9.1f}{result['rss_peak_mb']:>9.1f}")
+        finally:
+            server.terminate()
+            server.wait()
+
+    if args.json:
+        profile = {k: getattr(args, k) for k in ("latency_ms", "latency_sigma", "action_ms", "error_rate",
+                                                  "timeout_rate", "timeout_ms", "seed")}
+        args.json.write_text(json.dumps({
+            "browsers": args.browsers, "sites": len(sites), "profile": profile, "results": results,
+        }, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, args.baseline, args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}")
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,122 @@
+"""
+Benchmark: SemanticFilter scoring and embedding cache.
+
+Compares the old per-finding cosine loop against the vectorized matrix
+product + argpartition ranking, and measures a cold vs. warm embedding cache.
+A deterministic fake encoder stands in for sentence-transformers so the
+benchmark runs without downloading a model (encode cost is simulated).
+
+Usage:
+    python benchmarks/bench_semantic_filter.py [--sizes 100,1000,10000,100000]
+"""
+
+import argparse
+import hashlib
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.semantic_filter import SemanticFilter, top_k_indices  # noqa: E402
+
+DIM = 384  # all-MiniLM-L6-v2
+
+
+class FakeEncoder:
+    """Deterministic pseudo-embeddings; sleeps per text to mimic model cost."""
+
+    def __init__(self, seconds_per_text: float = 0.0002):
+        self.seconds_per_text = seconds_per_text
+        self.encoded = 0
+
+    def encode(self, texts, convert_to_numpy=True):
+        if isinstance(texts, str):
+            texts = [texts]
+        self.encoded += len(texts)
+        time.sleep(self.seconds_per_text * len(texts))
+        out = np.empty((len(texts), DIM), dtype=np.float32)
+        for i, text in enumerate(texts):
+            seed = int.from_bytes(hashlib.blake2b(text.encode(), digest_size=8).digest(), "little")
+            out[i] = np.random.default_rng(seed).standard_normal(DIM)
+        return out
+
+
+def make_findings(n: int) -> list[dict]:
+    rng = np.random.default_rng(0)
+    return [
+        {"title": f"Finding {i}", "summary": f"summary text {i}", "relevance": float(rng.random())}
+        for i in range(n)
+    ]
+
+
+def legacy_rank(query_emb: np.ndarray, embs: np.ndarray, keyword: np.ndarray, top_k: int) -> list[int]:
+    """The previous implementation: Python loop of cosine similarities, full sort."""
+    scores = []
+    for i in range(len(embs)):
+        dot = np.dot(query_emb, embs[i])
+        denom = np.linalg.norm(query_emb) * np.linalg.norm(embs[i])
+        sim = float(dot / denom) if denom else 0.0
+        scores.append((0.3 * keyword[i] + 0.7 * (sim + 1) / 2, i))
+    scores.sort(reverse=True)
+    return [i for _, i in scores[:top_k]]
+
+
+def vectorized_rank(query_emb: np.ndarray, embs: np.ndarray, keyword: np.ndarray, top_k: int) -> list[int]:
+    norms = np.linalg.norm(embs, axis=1)
+    norms[norms == 0] = 1.0
+    sims = (embs @ query_emb) / (norms * np.linalg.norm(query_emb))
+    combined = 0.3 * keyword + 0.7 * (sims + 1) / 2
+    return top_k_indices(combined, top_k).tolist()
+
+
+def timed(fn, *args) -> tuple[float, object]:
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sizes", default="100,1000,10000,100000")
+    parser.add_argument("--top-k", type=int, default=20)
+    args = parser.parse_args()
+    sizes = [int(s) for s in args.sizes.split(",")]
+
+    print(f"{'findings':>9} | {'legacy rank':>11} | {'vector rank':>11} | {'speedup':>7} | "
+          f"{'cold embed':>10} | {'warm embed':>10}")
+    print("-" * 75)
+
+    rng = np.random.default_rng(1)
+    for n in sizes:
+        embs = rng.standard_normal((n, DIM)).astype(np.float32)
+        query_emb = rng.standard_normal(DIM).astype(np.float32)
+        keyword = rng.random(n).astype(np.float32)
+
+        legacy_s, legacy = timed(legacy_rank, query_emb, embs, keyword, args.top_k)
+        vector_s, vector = timed(vectorized_rank, query_emb, embs, keyword, args.top_k)
+        assert legacy == vector, "rankings differ"
+
+        findings = make_findings(n)
+        with tempfile.TemporaryDirectory() as cache_dir:
+            semantic_filter = SemanticFilter(cache_dir=Path(cache_dir), relevance_threshold=0.0)
+            semantic_filter._available = True
+            semantic_filter._model = FakeEncoder()
+            cold_s, _ = timed(semantic_filter._compute_scores_sync, "query", findings, args.top_k)
+
+            # New filter instance re-opens the mmapped cache like a later session
+            semantic_filter = SemanticFilter(cache_dir=Path(cache_dir), relevance_threshold=0.0)
+            semantic_filter._available = True
+            semantic_filter._model = encoder = FakeEncoder()
+            warm_s, _ = timed(semantic_filter._compute_scores_sync, "query", findings, args.top_k)
+            assert encoder.encoded == 1, "warm run re-embedded findings"
+
+        print(f"{n:>9} | {legacy_s * 1000:>9.1f}ms | {vector_s * 1000:>9.1f}ms | "
+              f"{legacy_s / vector_s:>6.0f}x | {cold_s * 1000:>8.0f}ms | {warm_s * 1000:>8.0f}ms")
+
+
+if __name__ == "__main__":
+    main()
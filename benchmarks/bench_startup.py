@@ -0,0 +1,103 @@
+"""
+Benchmark: CLI startup time and import budget.
+
+Runs lightweight subcommands (``--help``, ``list``, ``agent list``) in fresh
+interpreters and checks that
+
+- none of the heavy modules (aiohttp, numpy, LiteLLM, sentence-transformers,
+  torch, the orchestrator and browser pool) is imported, and
+- the median startup time over a bare ``python -c pass`` stays within the
+  budget (interpreter startup itself varies too much between machines to be
+  part of it).
+
+Exits with status 1 when a check fails, so it can run in CI. Commands run in
+a temporary directory so ``list`` does not touch ./data.
+
+Usage:
+    python benchmarks/bench_startup.py [--runs 7] [--budget-ms 200]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+COMMANDS = [["--help"], ["list"], ["agent", "list"]]
+
+# Modules lightweight commands must not load
+HEAVY_MODULES = [
+    "aiohttp",
+    "numpy",
+    "litellm",
+    "sentence_transformers",
+    "torch",
+    "src.orchestrator",
+    "src.browser_pool",
+    "src.semantic_filter",
+    "src.llm_client",
+]
+
+
+def run(args: list[str], cwd: str, env: dict) -> tuple[float, str]:
+    """Wall time of one interpreter run and its stderr."""
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args], cwd=cwd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True
+    )
+    return time.perf_counter() - started, result.stderr
+
+
+def imported_modules(importtime_output: str) -> set[str]:
+    """Module names from ``-X importtime`` output."""
+    modules = set()
+    for line in importtime_output.splitlines():
+        if line.startswith("import time:") and "|" in line:
+            name = line.rsplit("|", 1)[1].strip()
+            if name != "imported package":
+                modules.add(name)
+    return modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="CLI startup benchmark")
+    parser.add_argument("--runs", type=int, default=7, help="Runs per command (median is reported)")
+    parser.add_argument("--budget-ms", type=float, default=200, help="Allowed startup time over a bare interpreter")
+    args = parser.parse_args()
+
+    env = {**os.environ, "PYTHONPATH": str(ROOT), "PYTHONDONTWRITEBYTECODE": "1"}
+    failures = []
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Warm the OS file cache and bytecode caches first
+        run(["-m", "src", "--help"], tmp, {**env, "PYTHONDONTWRITEBYTECODE": ""})
+        bare = statistics.median(run(["-c", "pass"], tmp, env)[0] for _ in range(args.runs))
+        print(f"bare interpreter: {bare * 1000:.0f}ms (budget {args.budget_ms:.0f}ms on top)")
+        print(f"{'command':<14}{'total ms':>10}{'startup ms':>12}  heavy modules")
+
+        for command in COMMANDS:
+            total = statistics.median(run(["-m", "src", *command], tmp, env)[0] for _ in range(args.runs))
+            _, importtime = run(["-X", "importtime", "-m", "src", *command], tmp, env)
+            loaded = imported_modules(importtime)
+            heavy = [m for m in HEAVY_MODULES if m in loaded]
+            startup_ms = (total - bare) * 1000
+            name = " ".join(command)
+            print(f"{name:<14}{total * 1000:>10.0f}{startup_ms:>12.0f}  {', '.join(heavy) or '-'}")
+
+            if heavy:
+                failures.append(f"{name}: imports {', '.join(heavy)}")
+            if startup_ms > args.budget_ms:
+                failures.append(f"{name}: startup {startup_ms:.0f}ms > {args.budget_ms:.0f}ms")
+
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,574 @@
+"""
+Fake browser-api: a local stand-in for the Playwright container API.
+
+Serves pages from a corpus on one or more ports, each port acting as one
+browser container, with configurable latency, error and timeout
+distributions. Implements the endpoints the Orchestrator and the
+sales-automation scripts use, with the response shapes of docker/browser-api:
+/health, /browser/navigate, /browser/content, /browser/evaluate,
+/browser/screenshot (and /raw), /browser/wait, /browser/batch, /pool/lease
+and /pool/release.
+
+JavaScript is not executed. ``evaluate`` scripts are matched to a family by a
+marker substring (SCRIPT_FAMILIES) and answered with the current page's
+recorded result for that family, or null.
+
+Corpus format (JSON)::
+
+    {
+      "version": 1,
+      "pages": {"<url>": {"url": ..., "title": ..., "text": ..., "html": ...,
+                          "evaluate": {"<family>": <result>}}},
+      "hosts": {"<host>": "<url of the page served for any URL on it>"}
+    }
+
+A URL is looked up exactly, then without its trailing slash, then through
+``hosts``. Unknown paths on a known host get a 404 page; unknown hosts get a
+synthesized page (or a DNS error with --unknown-host error).
+
+Usage:
+    python benchmarks/fake_browser_api.py --ports 3101-3104 [--corpus corpus.json]
+        [--latency-ms 200] [--latency-sigma 0.5] [--error-rate 0.02]
+        [--timeout-rate 0.01] [--timeout-ms 3000] [--seed 0]
+"""
+
+import argparse
+import asyncio
+import base64
+import hashlib
+import json
+import math
+import random
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from aiohttp import web
+
+# evaluate() script family -> marker substring of the script
+SCRIPT_FAMILIES = {
+    "company_info": "company_name:",
+    "contact_check": "hasFormStructure",
+    "contact_footer": "querySelector('footer",
+    "contact_link": "contactPatterns",
+    "result_links": "engines = /(duckduckgo",
+}
+
+PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+
+class FakeError(Exception):
+    """An action failure, answered like browser-api does (500 + error)."""
+
+
+@dataclass
+class FaultProfile:
+    """Latency, error and timeout distribution of simulated browsers."""
+    latency_ms: float = 200.0  # median navigation latency (log-normal)
+    latency_sigma: float = 0.5
+    action_ms: float = 15.0  # median latency of content/evaluate/screenshot
+    error_rate: float = 0.0  # navigations failing with a network error
+    timeout_rate: float = 0.0  # navigations hanging until timeout_ms
+    timeout_ms: float = 3000.0
+    fault_actions: tuple = ("navigate",)
+    screenshot_kb: int = 200
+    seed: int = 0
+
+    def delay(self, rng: random.Random, median_ms: float) -> float:
+        """Seconds to spend on an action."""
+        if median_ms <= 0:
+            return 0.0
+        return median_ms * math.exp(rng.gauss(0, self.latency_sigma)) / 1000
+
+    def fault(self, rng: random.Random, action: str) -> Optional[str]:
+        """None, "error" or "timeout" for one action."""
+        if action not in self.fault_actions:
+            return None
+        roll = rng.random()
+        if roll < self.timeout_rate:
+            return "timeout"
+        if roll < self.timeout_rate + self.error_rate:
+            return "error"
+        return None
+
+
+@dataclass
+class Corpus:
+    """Pages served by the fake browsers."""
+    pages: dict[str, dict] = field(default_factory=dict)
+    hosts: dict[str, str] = field(default_factory=dict)
+    synthesize_unknown: bool = True
+    _hosts: Optional[set] = field(default=None, init=False, repr=False)
+
+    @classmethod
+    def load(cls, path: Path) -> "Corpus":
+        data = json.loads(path.read_text(encoding="utf-8"))
+        return cls(pages=data.get("pages", {}), hosts=data.get("hosts", {}))
+
+    def save(self, path: Path) -> None:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": 1, "pages": self.pages, "hosts": self.hosts}
+        path.write_text(json.dumps(data, ensure_ascii=False), encoding="utf-8")
+
+    def _known_hosts(self) -> set[str]:
+        if self._hosts is None:
+            self._hosts = {urlparse(url).hostname for url in self.pages}
+        return self._hosts
+
+    def page(self, url: str) -> Optional[dict]:
+        """Page for a URL, or None if its host is unknown (DNS failure)."""
+        page = self.pages.get(url) or self.pages.get(url.rstrip("/")) or self.pages.get(url.rstrip("/") + "/")
+        if page is not None:
+            return {"url": url, **page}
+        host = urlparse(url).hostname or ""
+        template = self.hosts.get(host)
+        if template and template in self.pages:
+            return _rotate_results({**self.pages[template], "url": url})
+        if host in self._known_hosts():
+            return {"url": url, "title": "404 Not Found", "text": "ページが見つかりません", "html": "", "evaluate": {}}
+        if not self.synthesize_unknown:
+            return None
+        return synthesize_page(url)
+
+
+def _rotate_results(page: dict) -> dict:
+    """Give each search URL served from a host template its own result order."""
+    links = page.get("evaluate", {}).get("result_links")
+    if not links:
+        return page
+    shift = int(hashlib.sha256(page["url"].encode()).hexdigest(), 16) % len(links)
+    return {**page, "evaluate": {**page["evaluate"], "result_links": links[shift:] + links[:shift]}}
+
+
+def synthesize_page(url: str) -> dict:
+    """Deterministic filler page for a URL outside the corpus."""
+    digest = hashlib.sha256(url.encode()).hexdigest()
+    host = urlparse(url).hostname or "unknown"
+    paragraphs = [
+        f"{host} page {digest[i:i + 8]}: " + " ".join(digest[j:j + 6] for j in range(0, 60, 6))
+        for i in range(0, 40, 8)
+    ]
+    return {"url": url, "title": host, "text": "\n\n".join(paragraphs), "html": "", "evaluate": {}}
+
+
+# Vocabulary of synthetic page text (matches typical research queries)
+_WORDS = [
+    "AI", "企業", "2026", "生成AI", "LLM", "スタートアップ", "資金調達", "市場", "比較", "導入事例",
+    "クラウド", "SaaS", "DX", "エンジニア", "開発", "サービス", "東京", "大阪", "製造業", "業務効率化",
+    "agent", "model", "platform", "enterprise", "research", "startup", "funding", "benchmark",
+]
+
+
+def _paragraphs(rng: random.Random, count: int, words: int = 40) -> str:
+    return "\n\n".join(" ".join(rng.choice(_WORDS) for _ in range(words)) for _ in range(count))
+
+
+def synthetic_corpus(sites: int = 40, seed: int = 0) -> Corpus:
+    """
+    Corpus of company sites plus search engine result pages.
+
+    Every site has a top and a company page; about 60% have a contact form
+    at /contact and another 20% one that is only linked from the top page.
+    Any URL on duckduckgo.com, www.google.com or www.bing.com is a result
+    page listing all sites (in a per-URL order).
+    """
+    rng = random.Random(seed)
+    corpus = Corpus()
+    tops = []
+    for i in range(sites):
+        base = f"https://www.example-{i:03d}.co.jp"
+        name = f"株式会社サンプル{i:03d}"
+        kind = rng.random()
+        if kind < 0.6:
+            contact = f"{base}/contact"
+        elif kind < 0.8:
+            contact = f"{base}/company/inquiry-form"
+        else:
+            contact = ""
+        info = json.dumps({
+            "company_name": name,
+            "company_url": f"{base}/",
+            "location": rng.choice(["東京都千代田区", "東京都渋谷区", "大阪府大阪市", "福岡県福岡市"]),
+            "business": rng.choice(["AIソリューションの開発", "SaaSの提供", "受託開発", "DX支援"]),
+            "custom_field_1": "", "custom_field_2": "", "custom_field_3": "",
+        }, ensure_ascii=False)
+        corpus.pages[f"{base}/"] = {
+            "title": f"{name} | トップ",
+            "text": _paragraphs(rng, 12),
+            "html": "",
+            "evaluate": {"company_info": info, "contact_link": contact, "contact_footer": contact},
+        }
+        corpus.pages[f"{base}/company"] = {
+            "title": f"会社概要 | {name}",
+            "text": _paragraphs(rng, 8),
+            "html": "",
+            "evaluate": {"company_info": info},
+        }
+        if contact:
+            corpus.pages[contact] = {
+                "title": f"お問い合わせ | {name}",
+                "text": "お問い合わせフォーム\n\n" + _paragraphs(rng, 2),
+                "html": "",
+                "evaluate": {"contact_check": True},
+            }
+        tops.append(f"{base}/")
+
+    search = "https://duckduckgo.com/?q=results"
+    corpus.pages[search] = {
+        "title": "results at DuckDuckGo",
+        "text": _paragraphs(rng, 30, words=25),
+        "html": "",
+        "evaluate": {"result_links": tops},
+    }
+    for host in ("duckduckgo.com", "html.duckduckgo.com", "www.google.com", "www.bing.com"):
+        corpus.hosts[host] = search
+    return corpus
+
+
+def script_family(script: str) -> Optional[str]:
+    for family, marker in SCRIPT_FAMILIES.items():
+        if marker in script:
+            return family
+    return None
+
+
+class FakeBrowser:
+    """State of one simulated container (current page, lease)."""
+
+    def __init__(self, port: int, corpus: Corpus, profile: FaultProfile):
+        self.port = port
+        self.corpus = corpus
+        self.profile = profile
+        self.rng = random.Random(profile.seed * 100003 + port)
+        self.page: Optional[dict] = None
+        self.lease: Optional[dict] = None
+        self.requests = 0
+
+    async def _fault(self, action: str) -> None:
+        fault = self.profile.fault(self.rng, action)
+        if fault == "timeout":
+            await asyncio.sleep(self.profile.timeout_ms / 1000)
+            raise FakeError(f"{action}: Timeout {self.profile.timeout_ms:.0f}ms exceeded.")
+        if fault == "error":
+            await asyncio.sleep(self.profile.delay(self.rng, self.profile.action_ms))
+            raise FakeError(f"{action}: net::ERR_CONNECTION_RESET")
+
+    async def navigate(self, params: dict) -> dict:
+        url = params.get("url")
+        if not url:
+            raise FakeError("URL is required")
+        await self._fault("navigate")
+        load = self.profile.delay(self.rng, self.profile.latency_ms)
+        await asyncio.sleep(load)
+        page = self.corpus.page(url)
+        if page is None:
+            raise FakeError(f"page.goto: net::ERR_NAME_NOT_RESOLVED at {url}")
+        self.page = page
+
+        body: dict[str, Any] = {
+            "url": page["url"],
+            "title": page.get("title", ""),
+            "blocking": {
+                "profile": params.get("profile") or "full",
+                "loadMs": round(load * 1000),
+                "blocked": 0,
+                "bytesSaved": 0,
+                "byType": {},
+            },
+        }
+        readiness = params.get("readiness")
+        if readiness:
+            body["readiness"] = await self._ready(readiness)
+        return body
+
+    async def _ready(self, readiness: dict) -> dict:
+        waited = min(readiness.get("quietMs", 500), readiness.get("timeout", 2000))
+        await asyncio.sleep(waited / 1000)
+        return {"strategy": readiness.get("strategy", "domquiet"), "waitedMs": waited, "timedOut": False}
+
+    def _current(self) -> dict:
+        if self.page is None:
+            raise FakeError("No page loaded")
+        return self.page
+
+    async def content(self, params: dict) -> dict:
+        await self._fault("content")
+        await asyncio.sleep(self.profile.delay(self.rng, self.profile.action_ms))
+        page = self._current()
+        fields = params.get("fields") or ["html", "text", "url", "title"]
+        max_chars = params.get("maxChars")
+        body: dict[str, Any] = {}
+        for name in fields:
+            value = page.get(name, "")
+            if max_chars and name in ("html", "text") and len(value) > max_chars:
+                value = value[:max_chars]
+                body["truncated"] = True
+            body[name] = value
+        return body
+
+    async def evaluate(self, params: dict) -> dict:
+        script = params.get("script")
+        if not script:
+            raise FakeError("Script is required")
+        await self._fault("evaluate")
+        await asyncio.sleep(self.profile.delay(self.rng, self.profile.action_ms))
+        family = script_family(script)
+        result = self._current().get("evaluate", {}).get(family) if family else None
+        return {"result": result}
+
+    async def wait(self, params: dict) -> dict:
+        readiness = params.get("readiness")
+        if readiness:
+            return {"message": "Wait completed", "readiness": await self._ready(readiness)}
+        await asyncio.sleep(self.profile.delay(self.rng, self.profile.action_ms))
+        return {"message": "Wait completed"}
+
+    async def screenshot_bytes(self) -> bytes:
+        await self._fault("screenshot")
+        await asyncio.sleep(self.profile.delay(self.rng, self.profile.action_ms * 4))
+        seed = hashlib.sha256(self._current()["url"].encode()).digest()
+        size = max(0, self.profile.screenshot_kb * 1024 - len(PNG_SIGNATURE))
+        return PNG_SIGNATURE + (seed * (size // len(seed) + 1))[:size]
+
+    async def screenshot(self, params: dict) -> dict:
+        return {"screenshot": base64.b64encode(await self.screenshot_bytes()).decode()}
+
+    async def run_batch(self, steps: list[dict], default_timeout: float) -> dict:
+        """Same semantics as BrowserManager.runBatch."""
+        started = time.monotonic()
+        results: list[dict] = []
+        stopped_at = None
+        stop_reason = None
+        skip_next = False
+
+        for index, step in enumerate(steps):
+            action = step.get("action")
+            step_started = time.monotonic()
+            if skip_next:
+                skip_next = False
+                results.append({"index": index, "action": action, "success": False, "skipped": True, "elapsedMs": 0})
+                continue
+
+            timeout_ms = step.get("timeout") or default_timeout
+            try:
+                handler = self.actions.get(action)
+                if handler is None:
+                    raise FakeError(f"Unsupported batch action: {action}")
+                body = await asyncio.wait_for(handler(self, step.get("params") or {}), timeout_ms / 1000)
+                result = {"index": index, "action": action, "success": True, **body}
+            except asyncio.TimeoutError:
+                result = {"index": index, "action": action, "success": False,
+                          "error": f"Error: {action} timed out after {timeout_ms}ms"}
+            except FakeError as e:
+                result = {"index": index, "action": action, "success": False, "error": f"Error: {e}"}
+            result["elapsedMs"] = round((time.monotonic() - step_started) * 1000)
+            results.append(result)
+
+            if not result["success"]:
+                on_error = step.get("onError", "abort")
+                if on_error == "abort":
+                    stopped_at, stop_reason = index, "error"
+                    break
+                skip_next = on_error == "skipNext"
+                continue
+
+            condition = step.get("stopIf")
+            if condition:
+                if condition == "success":
+                    matched = True
+                else:
+                    value = result.get("result", result["success"])
+                    truthy = bool(value) and value != "false"
+                    matched = truthy if condition == "truthy" else not truthy
+                if matched:
+                    stopped_at, stop_reason = index, "condition"
+                    break
+
+        return {
+            "steps": results,
+            "completed": sum(1 for r in results if not r.get("skipped")),
+            "stoppedAt": stopped_at,
+            "stopReason": stop_reason,
+            "elapsedMs": round((time.monotonic() - started) * 1000),
+        }
+
+    actions = {
+        "navigate": navigate,
+        "content": content,
+        "evaluate": evaluate,
+        "wait": wait,
+        "screenshot": screenshot,
+    }
+
+
+def create_app(browser: FakeBrowser) -> web.Application:
+    """aiohttp application of one fake container."""
+
+    def action_route(handler):
+        async def route(request: web.Request) -> web.Response:
+            browser.requests += 1
+            params = await request.json() if request.can_read_body else {}
+            try:
+                body = await handler(browser, params)
+            except FakeError as e:
+                return web.json_response({"success": False, "error": f"Error: {e}"}, status=500)
+            return web.json_response({"success": True, **body})
+        return route
+
+    async def health(_request: web.Request) -> web.Response:
+        return web.json_response({
+            "status": "healthy",
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "browser": "ready",
+            "lease": browser.lease,
+            "memory": None,
+        })
+
+    async def screenshot_raw(request: web.Request) -> web.Response:
+        browser.requests += 1
+        try:
+            image = await browser.screenshot_bytes()
+        except FakeError as e:
+            return web.json_response({"success": False, "error": f"Error: {e}"}, status=500)
+        return web.Response(body=image, content_type="image/png")
+
+    async def batch(request: web.Request) -> web.Response:
+        browser.requests += 1
+        body = await request.json()
+        steps = body.get("steps")
+        if not isinstance(steps, list) or not steps:
+            return web.json_response({"success": False, "error": "steps must be a non-empty array"}, status=400)
+        result = await browser.run_batch(steps, body.get("timeout", 30000))
+        return web.json_response({"success": result["stopReason"] != "error", **result})
+
+    async def lease(request: web.Request) -> web.Response:
+        body = await request.json()
+        owner = body.get("owner")
+        if not owner:
+            return web.json_response({"success": False, "error": "owner is required"}, status=400)
+        if browser.lease and browser.lease["owner"] != owner:
+            return web.json_response({"success": False, "error": "Already leased", "lease": browser.lease}, status=409)
+        browser.lease = {"owner": owner, "expiresAt": time.time() + body.get("ttlMs", 7200000) / 1000}
+        return web.json_response({"success": True, "lease": browser.lease})
+
+    async def release(request: web.Request) -> web.Response:
+        body = await request.json()
+        if browser.lease and body.get("owner") and browser.lease["owner"] != body["owner"]:
+            return web.json_response({"success": False, "error": "Lease held by another owner"}, status=409)
+        browser.lease = None
+        browser.page = None
+        return web.json_response({"success": True})
+
+    app = web.Application(client_max_size=16 * 1024 * 1024)
+    app.router.add_get("/health", health)
+    app.router.add_post("/browser/navigate", action_route(FakeBrowser.navigate))
+    app.router.add_post("/browser/content", action_route(FakeBrowser.content))
+    app.router.add_post("/browser/evaluate", action_route(FakeBrowser.evaluate))
+    app.router.add_post("/browser/wait", action_route(FakeBrowser.wait))
+    app.router.add_post("/browser/screenshot", action_route(FakeBrowser.screenshot))
+    app.router.add_post("/browser/screenshot/raw", screenshot_raw)
+    app.router.add_post("/browser/batch", batch)
+    app.router.add_post("/pool/lease", lease)
+    app.router.add_post("/pool/release", release)
+    return app
+
+
+class FakeBrowserApi:
+    """Fake containers on a set of ports, served from one event loop."""
+
+    def __init__(self, ports: list[int], corpus: Corpus, profile: FaultProfile, host: str = "127.0.0.1"):
+        self.host = host
+        self.browsers = [FakeBrowser(port, corpus, profile) for port in ports]
+        self._runners: list[web.AppRunner] = []
+
+    async def start(self) -> None:
+        for browser in self.browsers:
+            runner = web.AppRunner(create_app(browser), access_log=None)
+            await runner.setup()
+            await web.TCPSite(runner, self.host, browser.port).start()
+            self._runners.append(runner)
+
+    async def stop(self) -> None:
+        for runner in self._runners:
+            await runner.cleanup()
+        self._runners = []
+
+
+def parse_ports(spec: str) -> list[int]:
+    """"3101-3104,3110" -> [3101, 3102, 3103, 3104, 3110]"""
+    ports = []
+    for part in spec.split(","):
+        if "-" in part:
+            first, last = part.split("-")
+            ports.extend(range(int(first), int(last) + 1))
+        elif part:
+            ports.append(int(part))
+    return ports
+
+
+def add_profile_arguments(parser: argparse.ArgumentParser) -> None:
+    """Fault profile options (shared with the benchmark suite)."""
+    defaults = FaultProfile()
+    parser.add_argument("--latency-ms", type=float, default=defaults.latency_ms,
+                        help="Median navigation latency")
+    parser.add_argument("--latency-sigma", type=float, default=defaults.latency_sigma,
+                        help="Log-normal spread of latencies")
+    parser.add_argument("--action-ms", type=float, default=defaults.action_ms,
+                        help="Median latency of content/evaluate")
+    parser.add_argument("--error-rate", type=float, default=defaults.error_rate)
+    parser.add_argument("--timeout-rate", type=float, default=defaults.timeout_rate)
+    parser.add_argument("--timeout-ms", type=float, default=defaults.timeout_ms,
+                        help="How long a timed-out navigation hangs before failing")
+    parser.add_argument("--screenshot-kb", type=int, default=defaults.screenshot_kb)
+    parser.add_argument("--seed", type=int, default=defaults.seed)
+
+
+def profile_from_args(args: argparse.Namespace) -> FaultProfile:
+    return FaultProfile(
+        latency_ms=args.latency_ms,
+        latency_sigma=args.latency_sigma,
+        action_ms=args.action_ms,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_ms=args.timeout_ms,
+        screenshot_kb=args.screenshot_kb,
+        seed=args.seed,
+    )
+
+
+async def serve(args: argparse.Namespace) -> None:
+    if args.corpus:
+        corpus = Corpus.load(args.corpus)
+    else:
+        corpus = synthetic_corpus(args.sites, seed=args.seed)
+    corpus.synthesize_unknown = args.unknown_host == "synthesize"
+    profile = profile_from_args(args)
+    api = FakeBrowserApi(parse_ports(args.ports), corpus, profile, host=args.host)
+    await api.start()
+    print(json.dumps({"ready": True, "ports": parse_ports(args.ports), "pages": len(corpus.pages),
+                      "profile": asdict(profile)}), flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await api.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--ports", default="3101-3104", help="Ports to serve, e.g. 3101-3108")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--corpus", type=Path, default=None, help="Corpus JSON (default: synthetic)")
+    parser.add_argument("--sites", type=int, default=40, help="Sites of the synthetic corpus")
+    parser.add_argument("--unknown-host", choices=["synthesize", "error"], default="synthesize")
+    add_profile_arguments(parser)
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,114 @@
-import { chromium, Browser, BrowserContext, Page } from 'playwright';
+import { chromium, Browser, BrowserContext, Page, Request as PwRequest, Response as PwResponse, Route } from 'playwright';
 import { v4 as uuidv4 } from 'uuid';
 import * as fs from 'fs';
+import * as os from 'os';
 import * as path from 'path';
 
+/**
+ * リソースブロックのプロファイル
+ * - full: 何もブロックしない（フォーム送信・スクリーンショット用）
+ * - no-media: 画像・動画・フォントと広告/解析ドメインをブロック
+ * - text-only: さらに CSS とサードパーティのスクリプト/XHR もブロック（テキスト抽出用）
+ */
+type BlockProfile = 'full' | 'no-media' | 'text-only';
+
+interface BlockRules {
+  denyTypes: string[];            // 常にブロックするリソース種別
+  thirdPartyDenyTypes: string[];  // サードパーティからの場合のみブロックする種別
+  denyDomains: string[];          // 常にブロックするドメイン（広告・解析）
+  allowDomains: string[];         // 上記より優先して許可するドメイン
+}
+
+// 広告・解析・トラッキング
+const TRACKER_DOMAINS = [
+  'doubleclick.net', 'googlesyndication.com', 'googleadservices.com', 'google-analytics.com',
+  'googletagmanager.com', 'googletagservices.com', 'adservice.google.com', 'facebook.net',
+  'hotjar.com', 'clarity.ms', 'scorecardresearch.com', 'criteo.com', 'criteo.net', 'taboola.com',
+  'outbrain.com', 'amazon-adsystem.com', 'adnxs.com', 'rubiconproject.com', 'pubmatic.com',
+  'yads.yahoo.co.jp', 'microad.jp', 'i-mobile.co.jp', 'ad-stir.com', 'logly.co.jp',
+  'nr-data.net', 'segment.io', 'mixpanel.com', 'optimizely.com'
+];
+
+// SPA の描画に必要なことが多い公開CDN（text-only でもスクリプトを許可）
+const CDN_DOMAINS = [
+  'cdnjs.cloudflare.com', 'cdn.jsdelivr.net', 'unpkg.com', 'ajax.googleapis.com', 'code.jquery.com'
+];
+
+const BLOCK_PROFILES: Record<BlockProfile, BlockRules> = {
+  'full': { denyTypes: [], thirdPartyDenyTypes: [], denyDomains: [], allowDomains: [] },
+  'no-media': {
+    denyTypes: ['image', 'media', 'font'],
+    thirdPartyDenyTypes: [],
+    denyDomains: TRACKER_DOMAINS,
+    allowDomains: []
+  },
+  'text-only': {
+    denyTypes: ['image', 'media', 'font', 'stylesheet', 'texttrack', 'manifest', 'eventsource', 'websocket'],
+    thirdPartyDenyTypes: ['script', 'xhr', 'fetch', 'other'],
+    denyDomains: TRACKER_DOMAINS,
+    allowDomains: CDN_DOMAINS
+  }
+};
+
+// 学習前に使うリソース種別ごとの平均サイズ（バイト、削減量の推定用）
+const DEFAULT_RESOURCE_BYTES: Record<string, number> = {
+  image: 40_000, media: 500_000, font: 40_000, stylesheet: 25_000, script: 30_000,
+  xhr: 5_000, fetch: 5_000, other: 5_000
+};
+
+interface BlockCounters {
+  blocked: number;
+  bytesSaved: number;
+  byType: Record<string, number>;
+}
+
+interface ProfileTotals {
+  pages: number;
+  loadMs: number;
+  blocked: number;
+  bytesSaved: number;
+}
+
 interface Tab {
   id: string;
   page: Page;
   url: string;
   title: string;
+  profile?: BlockProfile;
+  routeHandler?: (route: Route) => Promise<void>;
+  blocking?: BlockCounters;
+}
+
+function isBlockProfile(value: unknown): value is BlockProfile {
+  return typeof value === 'string' && value in BLOCK_PROFILES;
+}
+
+// ホスト名の登録ドメイン部分（example.co.jp / example.com）を簡易的に求める
+function siteOf(hostname: string): string {
+  const labels = hostname.split('.');
+  if (labels.length <= 2) return hostname;
+  const tld = labels[labels.length - 1];
+  const second = labels[labels.length - 2];
+  const take = tld.length === 2 && second.length <= 3 ? 3 : 2;
+  return labels.slice(-take).join('.');
+}
+
+const envBlockProfile = process.env.BLOCK_PROFILE;
+const DEFAULT_BLOCK_PROFILE: BlockProfile = isBlockProfile(envBlockProfile) ? envBlockProfile : 'full';
+
+function matchesDomain(hostname: string, domains: string[]): boolean {
+  return domains.some(d => hostname === d || hostname.endsWith(`.${d}`));
 }
 
 interface ClickOptions {
+  tabId?: string;
   selector?: string;
   text?: string;
   ref?: string;
 }
 
 interface TypeOptions {
+  tabId?: string;
   selector?: string;
   text: string;
   submit?: boolean;
@@ -24,14 +116,110 @@ interface TypeOptions {
 }
 
 interface WaitOptions {
+  tabId?: string;
   selector?: string;
   text?: string;
   timeout?: number;
+  readiness?: ReadinessOptions;
+}
+
+type ReadinessStrategy = 'domquiet' | 'networkidle' | 'selector' | 'none';
+
+interface ReadinessOptions {
+  strategy?: ReadinessStrategy;
+  quietMs?: number;     // domquiet: DOM変更が止まってからの待機時間
+  timeout?: number;     // 全戦略共通の上限（ms）
+  selector?: string;    // selector: 出現を待つセレクタ
+}
+
+interface ReadinessResult {
+  strategy: ReadinessStrategy;
+  waitedMs: number;
+  timedOut: boolean;
+}
+
+type BatchAction = 'navigate' | 'content' | 'evaluate' | 'click' | 'type' | 'wait' | 'screenshot' | 'snapshot';
+
+interface BatchStep {
+  action: BatchAction;
+  params?: Record<string, any>;
+  timeout?: number;                                // ステップ単位のタイムアウト（ms）
+  onError?: 'abort' | 'continue' | 'skipNext';     // 失敗時の扱い（既定: abort）
+  stopIf?: 'success' | 'truthy' | 'falsy';         // 条件を満たしたらバッチを早期終了
+}
+
+interface BatchStepResult {
+  index: number;
+  action: string;
+  success: boolean;
+  elapsedMs: number;
+  skipped?: boolean;
+  error?: string;
+  [key: string]: unknown;
+}
+
+interface BatchResult {
+  steps: BatchStepResult[];
+  completed: number;
+  stoppedAt: number | null;
+  stopReason: 'condition' | 'error' | null;
+  elapsedMs: number;
+}
+
+type ContentField = 'html' | 'text' | 'url' | 'title';
+
+const CONTENT_FIELDS: ContentField[] = ['html', 'text', 'url', 'title'];
+
+interface ContentOptions {
+  tabId?: string;
+  fields?: ContentField[];  // 返すフィールド（既定: 全て）
+  maxChars?: number;        // html / text をこの文字数で切り詰める
+  mainContent?: boolean;    // 本文のみ抽出（ナビ・ヘッダー・フッター等を除去）
+}
+
+interface PageContent {
+  html?: string;
+  text?: string;
+  url?: string;
+  title?: string;
+  truncated?: boolean;
+}
+
+type ImageFormat = 'png' | 'jpeg' | 'webp';
+
+interface ClipRect {
+  x: number;
+  y: number;
+  width: number;
+  height: number;
 }
 
 interface ScreenshotOptions {
+  tabId?: string;
   fullPage?: boolean;
   path?: string;
+  format?: ImageFormat;
+  quality?: number;   // jpeg/webp のみ (0-100)
+  clip?: ClipRect;    // 指定時は fullPage より優先
+  maxHeight?: number; // fullPage の高さ上限 (px)
+}
+
+interface ScreenshotImage {
+  buffer: Buffer;
+  contentType: string;
+  format: ImageFormat;
+}
+
+interface MemoryInfo {
+  usedBytes: number;
+  limitBytes: number;
+  tabs: number;
+}
+
+interface LeaseInfo {
+  owner: string;
+  acquiredAt: string;
+  expiresAt: string;
 }
 
 interface SessionInfo {
@@ -51,6 +239,10 @@ export class BrowserManager {
   private startTime: Date;
   private history: string[] = [];
   private ready: boolean = false;
+  private lease: LeaseInfo | null = null;
+  private defaultProfile: BlockProfile = DEFAULT_BLOCK_PROFILE;
+  private profileTotals: Map<BlockProfile, ProfileTotals> = new Map();
+  private resourceBytes: Map<string, { count: number; total: number }> = new Map();
 
   constructor() {
     this.sessionId = uuidv4();
@@ -106,6 +298,8 @@ export class BrowserManager {
     }
 
     this.context = await this.browser.newContext(contextOptions);
+    // 実際に受信したサイズを種別ごとに学習し、ブロックによる削減量の推定に使う
+    this.context.on('response', (response: PwResponse) => this.learnResourceSize(response));
 
     // 初期タブを作成
     const page = await this.context.newPage();
@@ -126,11 +320,25 @@ export class BrowserManager {
     return this.ready;
   }
 
-  private getCurrentPage(): Page {
+  /**
+   * tabId 指定時はそのタブ、未指定時は現在のタブを対象にする
+   * （タブごとに並行して操作できるようにするため）
+   */
+  private resolveTabId(tabId?: string): string {
+    if (tabId) {
+      if (!this.tabs.has(tabId)) {
+        throw new Error(`Tab ${tabId} not found`);
+      }
+      return tabId;
+    }
     if (!this.currentTabId || !this.tabs.has(this.currentTabId)) {
       throw new Error('No active tab');
     }
-    return this.tabs.get(this.currentTabId)!.page;
+    return this.currentTabId;
+  }
+
+  private getPage(tabId?: string): Page {
+    return this.tabs.get(this.resolveTabId(tabId))!.page;
   }
 
   private async updateTabInfo(tabId: string): Promise<void> {
@@ -141,39 +349,293 @@ export class BrowserManager {
     }
   }
 
-  async navigate(url: string, waitUntil: 'load' | 'domcontentloaded' | 'networkidle' = 'domcontentloaded'): Promise<{ url: string; title: string }> {
+  async navigate(
+    url: string,
+    waitUntil: 'load' | 'domcontentloaded' | 'networkidle' = 'domcontentloaded',
+    readiness?: ReadinessOptions,
+    tabId?: string,
+    profile?: BlockProfile
+  ): Promise<{ url: string; title: string; readiness?: ReadinessResult; blocking: object }> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const targetTabId = this.resolveTabId(tabId);
+    const page = this.getPage(targetTabId);
+    const tab = this.tabs.get(targetTabId)!;
 
+    if (profile !== undefined && !isBlockProfile(profile)) {
+      throw new Error(`Unknown block profile: ${profile}`);
+    }
+    // 指定がなければタブの現在のプロファイル（初回は既定値）を使う
+    await this.applyProfile(tab, profile || tab.profile || this.defaultProfile);
+    tab.blocking = { blocked: 0, bytesSaved: 0, byType: {} };
+
+    const loadStarted = Date.now();
     await page.goto(url, { waitUntil });
+    const loadMs = Date.now() - loadStarted;
+
+    let readinessResult: ReadinessResult | undefined;
+    if (readiness && readiness.strategy && readiness.strategy !== 'none') {
+      readinessResult = await this.waitForReady(page, readiness);
+    }
 
     const title = await page.title();
     const currentUrl = page.url();
 
     this.history.push(currentUrl);
-    await this.updateTabInfo(this.currentTabId!);
+    await this.updateTabInfo(targetTabId);
+
+    const blocking = { profile: tab.profile!, loadMs, ...tab.blocking };
+    this.recordProfileTotals(blocking.profile, loadMs, blocking.blocked, blocking.bytesSaved);
+
+    return { url: currentUrl, title, readiness: readinessResult, blocking };
+  }
+
+  /**
+   * タブにブロックプロファイルを適用する
+   * full ではルーティングを外す（ルーティング中は HTTP キャッシュが無効になるため）
+   */
+  private async applyProfile(tab: Tab, profile: BlockProfile): Promise<void> {
+    tab.profile = profile;
+    if (profile === 'full') {
+      if (tab.routeHandler) {
+        await tab.page.unroute('**/*', tab.routeHandler);
+        tab.routeHandler = undefined;
+      }
+      return;
+    }
+    if (!tab.routeHandler) {
+      tab.routeHandler = (route: Route) => this.handleRoute(tab, route);
+      await tab.page.route('**/*', tab.routeHandler);
+    }
+  }
+
+  private async handleRoute(tab: Tab, route: Route): Promise<void> {
+    const request = route.request();
+    if (!this.shouldBlock(tab, request)) {
+      await route.continue().catch(() => undefined);
+      return;
+    }
 
-    return { url: currentUrl, title };
+    const type = request.resourceType();
+    if (tab.blocking) {
+      tab.blocking.blocked += 1;
+      tab.blocking.bytesSaved += this.estimateResourceBytes(type);
+      tab.blocking.byType[type] = (tab.blocking.byType[type] || 0) + 1;
+    }
+    await route.abort('blockedbyclient').catch(() => undefined);
+  }
+
+  private shouldBlock(tab: Tab, request: PwRequest): boolean {
+    const rules = BLOCK_PROFILES[tab.profile || 'full'];
+    // メインフレームのページ遷移そのものは決してブロックしない
+    try {
+      if (request.isNavigationRequest() && request.frame() === tab.page.mainFrame()) {
+        return false;
+      }
+    } catch {
+      // Service Worker のリクエストはフレームを持たない
+    }
+
+    let hostname: string;
+    try {
+      hostname = new URL(request.url()).hostname;
+    } catch {
+      return false;
+    }
+    if (!hostname) return false;  // data: / blob: など
+    if (matchesDomain(hostname, rules.allowDomains)) return false;
+    if (matchesDomain(hostname, rules.denyDomains)) return true;
+
+    const type = request.resourceType();
+    if (rules.denyTypes.includes(type)) return true;
+    if (rules.thirdPartyDenyTypes.includes(type)) {
+      let pageHost = '';
+      try {
+        pageHost = new URL(tab.page.url()).hostname;
+      } catch {
+        return false;
+      }
+      return Boolean(pageHost) && siteOf(hostname) !== siteOf(pageHost);
+    }
+    return false;
+  }
+
+  private learnResourceSize(response: PwResponse): void {
+    const length = parseInt(response.headers()['content-length'] || '', 10);
+    if (!Number.isFinite(length) || length <= 0) return;
+    const type = response.request().resourceType();
+    const entry = this.resourceBytes.get(type) || { count: 0, total: 0 };
+    entry.count += 1;
+    entry.total += length;
+    this.resourceBytes.set(type, entry);
+  }
+
+  private estimateResourceBytes(type: string): number {
+    const learned = this.resourceBytes.get(type);
+    if (learned && learned.count >= 5) {
+      return Math.round(learned.total / learned.count);
+    }
+    return DEFAULT_RESOURCE_BYTES[type] ?? DEFAULT_RESOURCE_BYTES.other;
+  }
+
+  private recordProfileTotals(profile: BlockProfile, loadMs: number, blocked: number, bytesSaved: number): void {
+    const totals = this.profileTotals.get(profile) || { pages: 0, loadMs: 0, blocked: 0, bytesSaved: 0 };
+    totals.pages += 1;
+    totals.loadMs += loadMs;
+    totals.blocked += blocked;
+    totals.bytesSaved += bytesSaved;
+    this.profileTotals.set(profile, totals);
+  }
+
+  /**
+   * プロファイルごとのブロック件数・推定削減バイト数・平均ロード時間
+   * （loadMsDeltaVsFull は full プロファイルとの平均ロード時間の差。負なら高速化）
+   */
+  getBlockingStats(): object {
+    const full = this.profileTotals.get('full');
+    const fullAvg = full && full.pages > 0 ? full.loadMs / full.pages : null;
+    const profiles: Record<string, object> = {};
+    for (const [profile, totals] of this.profileTotals) {
+      const avgLoadMs = totals.pages > 0 ? totals.loadMs / totals.pages : 0;
+      profiles[profile] = {
+        ...totals,
+        avgLoadMs: Math.round(avgLoadMs),
+        loadMsDeltaVsFull: fullAvg === null || profile === 'full' ? null : Math.round(avgLoadMs - fullAvg)
+      };
+    }
+    return { defaultProfile: this.defaultProfile, profiles };
+  }
+
+  /**
+   * 固定スリープの代わりにページの準備完了をイベントで待つ
+   * - domquiet: DOM変更が quietMs 間止まるまで
+   * - networkidle: ネットワークが落ち着くまで（timeout で打ち切り）
+   * - selector: 指定要素が出現するまで
+   * いずれも timeout を超えたら打ち切って続行する（エラーにはしない）
+   */
+  async waitForReady(page: Page, options: ReadinessOptions): Promise<ReadinessResult> {
+    const strategy = options.strategy || 'domquiet';
+    const timeout = options.timeout ?? 3000;
+    const started = Date.now();
+    let timedOut = false;
+
+    try {
+      if (strategy === 'domquiet') {
+        const quietMs = options.quietMs ?? 500;
+        timedOut = await page.evaluate(
+          ({ quietMs, timeout }) => new Promise<boolean>((resolve) => {
+            let quietTimer: ReturnType<typeof setTimeout>;
+            const finish = (result: boolean) => {
+              observer.disconnect();
+              clearTimeout(quietTimer);
+              clearTimeout(capTimer);
+              resolve(result);
+            };
+            const observer = new MutationObserver(() => {
+              clearTimeout(quietTimer);
+              quietTimer = setTimeout(() => finish(false), quietMs);
+            });
+            observer.observe(document, { childList: true, subtree: true, attributes: true, characterData: true });
+            quietTimer = setTimeout(() => finish(false), quietMs);
+            const capTimer = setTimeout(() => finish(true), timeout);
+          }),
+          { quietMs, timeout }
+        );
+      } else if (strategy === 'networkidle') {
+        await page.waitForLoadState('networkidle', { timeout });
+      } else if (strategy === 'selector') {
+        if (!options.selector) {
+          throw new Error('selector is required for the selector strategy');
+        }
+        await page.waitForSelector(options.selector, { timeout });
+      }
+    } catch (error) {
+      if (error instanceof Error && error.name === 'TimeoutError') {
+        timedOut = true;
+      } else {
+        throw error;
+      }
+    }
+
+    return { strategy, waitedMs: Date.now() - started, timedOut };
   }
 
   async screenshot(options: ScreenshotOptions = {}): Promise<string> {
+    const image = await this.captureScreenshot(options);
+    if (options.path) {
+      fs.writeFileSync(options.path, image.buffer);
+    }
+
+    // Base64エンコードして返す（JSON API 互換）
+    return image.buffer.toString('base64');
+  }
+
+  /**
+   * スクリーンショットをメモリ上のバッファとして取得（一時ファイルを経由しない）
+   *
+   * - format: png（既定）/ jpeg / webp。webp は Playwright 未対応のため CDP で取得
+   * - clip: 指定領域のみ。未指定なら fullPage またはビューポート
+   * - maxHeight: fullPage 時にページ上端からこの高さで切り詰める
+   */
+  async captureScreenshot(options: ScreenshotOptions = {}): Promise<ScreenshotImage> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(options.tabId);
 
-    const screenshotPath = options.path || `/tmp/screenshot-${Date.now()}.png`;
-    await page.screenshot({
-      path: screenshotPath,
-      fullPage: options.fullPage || false
-    });
+    const format: ImageFormat = options.format || 'png';
+    if (!['png', 'jpeg', 'webp'].includes(format)) {
+      throw new Error(`Unsupported screenshot format: ${format}`);
+    }
+    const quality = format === 'png' || options.quality === undefined
+      ? undefined
+      : Math.min(100, Math.max(0, Math.round(options.quality)));
+
+    let clip = options.clip;
+    let fullPage = !clip && (options.fullPage || false);
+    if (fullPage && options.maxHeight && options.maxHeight > 0) {
+      const size = await page.evaluate(() => ({
+        width: document.documentElement.scrollWidth,
+        height: document.documentElement.scrollHeight
+      }));
+      if (size.height > options.maxHeight) {
+        clip = { x: 0, y: 0, width: size.width, height: options.maxHeight };
+      }
+    }
+
+    let buffer: Buffer;
+    if (format === 'webp') {
+      const cdp = await page.context().newCDPSession(page);
+      try {
+        if (!clip && fullPage) {
+          const size = await page.evaluate(() => ({
+            width: document.documentElement.scrollWidth,
+            height: document.documentElement.scrollHeight
+          }));
+          clip = { x: 0, y: 0, width: size.width, height: size.height };
+        }
+        const { data } = await cdp.send('Page.captureScreenshot', {
+          format: 'webp',
+          quality,
+          clip: clip ? { ...clip, scale: 1 } : undefined,
+          captureBeyondViewport: Boolean(clip)
+        });
+        buffer = Buffer.from(data, 'base64');
+      } finally {
+        await cdp.detach().catch(() => undefined);
+      }
+    } else {
+      buffer = await page.screenshot({
+        type: format,
+        quality,
+        clip,
+        fullPage: clip ? true : fullPage
+      });
+    }
 
-    // Base64エンコードして返す
-    const buffer = fs.readFileSync(screenshotPath);
-    return buffer.toString('base64');
+    return { buffer, contentType: `image/${format}`, format };
   }
 
-  async getSnapshot(): Promise<object> {
+  async getSnapshot(tabId?: string): Promise<object> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(tabId);
 
     // ページの構造情報を取得
     const elements = await page.evaluate(() => {
@@ -205,7 +667,7 @@ export class BrowserManager {
 
   async click(options: ClickOptions): Promise<void> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(options.tabId);
 
     if (options.selector) {
       await page.click(options.selector);
@@ -221,7 +683,7 @@ export class BrowserManager {
 
   async type(options: TypeOptions): Promise<void> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(options.tabId);
 
     let element;
     if (options.selector) {
@@ -240,32 +702,58 @@ export class BrowserManager {
     }
   }
 
-  async getContent(): Promise<{ html: string; text: string; url: string; title: string }> {
+  async getContent(options: ContentOptions = {}): Promise<PageContent> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(options.tabId);
+
+    const fields = new Set<ContentField>(
+      (options.fields && options.fields.length > 0 ? options.fields : CONTENT_FIELDS)
+        .filter(f => CONTENT_FIELDS.includes(f))
+    );
+    const maxChars = options.maxChars && options.maxChars > 0 ? options.maxChars : undefined;
+    const result: PageContent = {};
+    let truncated = false;
+
+    const clip = (value: string): string => {
+      if (maxChars && value.length > maxChars) {
+        truncated = true;
+        return value.slice(0, maxChars);
+      }
+      return value;
+    };
 
-    const html = await page.content();
-    const text = await page.evaluate(() => document.body.innerText);
+    if (fields.has('html') || fields.has('text')) {
+      // 必要なものだけをページ内で組み立て、切り詰めてから転送する
+      const extracted = await page.evaluate(extractPageContent, {
+        wantHtml: fields.has('html'),
+        wantText: fields.has('text'),
+        mainContent: options.mainContent || false
+      });
+      if (extracted.html !== undefined) result.html = clip(extracted.html);
+      if (extracted.text !== undefined) result.text = clip(extracted.text);
+    }
+    if (fields.has('url')) result.url = page.url();
+    if (fields.has('title')) result.title = await page.title();
+    if (truncated) result.truncated = true;
 
-    return {
-      html,
-      text,
-      url: page.url(),
-      title: await page.title()
-    };
+    return result;
   }
 
-  async evaluate(script: string): Promise<unknown> {
+  async evaluate(script: string, tabId?: string): Promise<unknown> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(tabId);
 
     // スクリプトを関数として評価
     return await page.evaluate(script);
   }
 
-  async wait(options: WaitOptions): Promise<void> {
+  async wait(options: WaitOptions): Promise<ReadinessResult | void> {
     await this.ensureInitialized();
-    const page = this.getCurrentPage();
+    const page = this.getPage(options.tabId);
+
+    if (options.readiness) {
+      return await this.waitForReady(page, options.readiness);
+    }
 
     if (options.selector) {
       await page.waitForSelector(options.selector, { timeout: options.timeout });
@@ -293,7 +781,7 @@ export class BrowserManager {
     return tabList;
   }
 
-  async newTab(url?: string): Promise<string> {
+  async newTab(url?: string, activate: boolean = true): Promise<string> {
     await this.ensureInitialized();
 
     if (!this.context) {
@@ -315,7 +803,10 @@ export class BrowserManager {
       await this.updateTabInfo(tabId);
     }
 
-    this.currentTabId = tabId;
+    // activate=false ならバックグラウンドのタブとして作成（並行処理用スロット）
+    if (activate || !this.currentTabId) {
+      this.currentTabId = tabId;
+    }
     return tabId;
   }
 
@@ -352,6 +843,235 @@ export class BrowserManager {
     await tab.page.bringToFront();
   }
 
+  /**
+   * ウォームプール用: 先頭タブだけ残して about:blank に戻す
+   * （ブラウザ・コンテキストは維持するので再起動コストがかからない）
+   */
+  async resetTabs(): Promise<void> {
+    await this.ensureInitialized();
+
+    if (!this.context) {
+      throw new Error('Browser context not initialized');
+    }
+
+    const tabIds = Array.from(this.tabs.keys());
+    const keepId = tabIds.length > 0 ? tabIds[0] : null;
+
+    for (const tabId of tabIds) {
+      if (tabId === keepId) continue;
+      const tab = this.tabs.get(tabId)!;
+      await tab.page.close().catch(() => undefined);
+      this.tabs.delete(tabId);
+    }
+
+    if (keepId) {
+      const tab = this.tabs.get(keepId)!;
+      await tab.page.goto('about:blank');
+      await this.updateTabInfo(keepId);
+      this.currentTabId = keepId;
+    } else {
+      const page = await this.context.newPage();
+      const tabId = uuidv4();
+      this.tabs.set(tabId, { id: tabId, page, url: 'about:blank', title: 'New Tab' });
+      this.currentTabId = tabId;
+    }
+
+    this.history = [];
+  }
+
+  /**
+   * 複数アクションを1リクエストで順番に実行する（HTTP往復の削減）
+   * 各ステップの結果は個別エンドポイントのレスポンスと同じ形で返す
+   */
+  async runBatch(steps: BatchStep[], defaultTimeout: number = 30000, tabId?: string): Promise<BatchResult> {
+    await this.ensureInitialized();
+
+    const started = Date.now();
+    const results: BatchStepResult[] = [];
+    let stoppedAt: number | null = null;
+    let stopReason: BatchResult['stopReason'] = null;
+    let skipNext = false;
+
+    for (let index = 0; index < steps.length; index++) {
+      const step = steps[index];
+      const stepStarted = Date.now();
+
+      if (skipNext) {
+        skipNext = false;
+        results.push({ index, action: step.action, success: false, skipped: true, elapsedMs: 0 });
+        continue;
+      }
+
+      let stepResult: BatchStepResult;
+      try {
+        const body = await this.withTimeout(
+          this.runAction(step.action, { tabId, ...(step.params || {}) }),
+          step.timeout ?? defaultTimeout,
+          step.action
+        );
+        stepResult = { index, action: step.action, success: true, elapsedMs: Date.now() - stepStarted, ...body };
+      } catch (error) {
+        stepResult = {
+          index,
+          action: step.action,
+          success: false,
+          elapsedMs: Date.now() - stepStarted,
+          error: String(error)
+        };
+      }
+      results.push(stepResult);
+
+      if (!stepResult.success) {
+        const onError = step.onError || 'abort';
+        if (onError === 'abort') {
+          stoppedAt = index;
+          stopReason = 'error';
+          break;
+        }
+        if (onError === 'skipNext') {
+          skipNext = true;
+        }
+        continue;
+      }
+
+      if (step.stopIf && this.matchesStopCondition(step.stopIf, stepResult)) {
+        stoppedAt = index;
+        stopReason = 'condition';
+        break;
+      }
+    }
+
+    return {
+      steps: results,
+      completed: results.filter(r => !r.skipped).length,
+      stoppedAt,
+      stopReason,
+      elapsedMs: Date.now() - started
+    };
+  }
+
+  private async runAction(action: BatchAction, params: Record<string, any>): Promise<Record<string, unknown>> {
+    switch (action) {
+      case 'navigate':
+        if (!params.url) {
+          throw new Error('URL is required');
+        }
+        return { ...await this.navigate(params.url, params.waitUntil || 'domcontentloaded', params.readiness, params.tabId, params.profile) };
+      case 'content':
+        return { ...await this.getContent(params) };
+      case 'evaluate':
+        if (!params.script) {
+          throw new Error('Script is required');
+        }
+        return { result: await this.evaluate(params.script, params.tabId) };
+      case 'click':
+        await this.click(params);
+        return { message: 'Click performed' };
+      case 'type':
+        await this.type({ tabId: params.tabId, selector: params.selector, text: params.text, submit: params.submit, ref: params.ref });
+        return { message: 'Text typed' };
+      case 'wait': {
+        const readiness = await this.wait({ timeout: 30000, ...params });
+        return { message: 'Wait completed', readiness: readiness || undefined };
+      }
+      case 'screenshot':
+        return {
+          screenshot: await this.screenshot({
+            tabId: params.tabId,
+            fullPage: params.fullPage || false,
+            path: params.path,
+            format: params.format,
+            quality: params.quality,
+            clip: params.clip,
+            maxHeight: params.maxHeight
+          })
+        };
+      case 'snapshot':
+        return { snapshot: await this.getSnapshot(params.tabId) };
+      default:
+        throw new Error(`Unsupported batch action: ${action}`);
+    }
+  }
+
+  private matchesStopCondition(condition: NonNullable<BatchStep['stopIf']>, stepResult: BatchStepResult): boolean {
+    if (condition === 'success') {
+      return stepResult.success;
+    }
+    // evaluate の戻り値（それ以外のアクションは success）で判定
+    const value = 'result' in stepResult ? stepResult.result : stepResult.success;
+    const truthy = Boolean(value) && value !== 'false';
+    return condition === 'truthy' ? truthy : !truthy;
+  }
+
+  private withTimeout<T>(promise: Promise<T>, timeoutMs: number, label: string): Promise<T> {
+    // タイムアウト後も元の操作は続くため、未処理の reject にならないよう握りつぶす
+    promise.catch(() => undefined);
+    let timer: ReturnType<typeof setTimeout>;
+    const timeout = new Promise<never>((_, reject) => {
+      timer = setTimeout(() => reject(new Error(`${label} timed out after ${timeoutMs}ms`)), timeoutMs);
+    });
+    return Promise.race([promise, timeout]).finally(() => clearTimeout(timer));
+  }
+
+  /**
+   * コンテナのメモリ使用量（cgroup）を返す。クライアント側でタブの同時実行数を決めるのに使う
+   * cgroup の上限が無い場合はホストの総メモリを上限とみなす
+   */
+  getMemoryInfo(): MemoryInfo {
+    const readNumber = (file: string): number | null => {
+      try {
+        const value = fs.readFileSync(file, 'utf-8').trim();
+        const parsed = Number(value);
+        return Number.isFinite(parsed) ? parsed : null;
+      } catch {
+        return null;
+      }
+    };
+
+    const used = readNumber('/sys/fs/cgroup/memory.current')          // cgroup v2
+      ?? readNumber('/sys/fs/cgroup/memory/memory.usage_in_bytes')    // cgroup v1
+      ?? os.totalmem() - os.freemem();
+    let limit = readNumber('/sys/fs/cgroup/memory.max')
+      ?? readNumber('/sys/fs/cgroup/memory/memory.limit_in_bytes')
+      ?? os.totalmem();
+    // v1 の無制限は巨大な値になる
+    limit = Math.min(limit, os.totalmem());
+
+    return { usedBytes: used, limitBytes: limit, tabs: this.tabs.size };
+  }
+
+  getLease(): LeaseInfo | null {
+    if (this.lease && new Date(this.lease.expiresAt).getTime() < Date.now()) {
+      // 期限切れのリースは解放済みとみなす（クライアントが落ちた場合の保険）
+      this.lease = null;
+    }
+    return this.lease;
+  }
+
+  acquireLease(owner: string, ttlMs: number): LeaseInfo | null {
+    const current = this.getLease();
+    if (current && current.owner !== owner) {
+      return null;
+    }
+
+    const now = new Date();
+    this.lease = {
+      owner,
+      acquiredAt: current ? current.acquiredAt : now.toISOString(),
+      expiresAt: new Date(now.getTime() + ttlMs).toISOString()
+    };
+    return this.lease;
+  }
+
+  releaseLease(owner?: string): boolean {
+    const current = this.getLease();
+    if (current && owner && current.owner !== owner) {
+      return false;
+    }
+    this.lease = null;
+    return true;
+  }
+
   async getSessionInfo(): Promise<SessionInfo> {
     await this.ensureInitialized();
 
@@ -415,3 +1135,71 @@ export class BrowserManager {
     }
   }
 }
+
+/**
+ * ページ内で実行されるコンテンツ抽出関数（page.evaluate に渡す）
+ *
+ * mainContent 時は main / article / [role=main] のうち最もテキスト量の多い要素を
+ * 本文とみなし（なければ body）、そのクローンからナビ・ヘッダー・フッター・
+ * 広告などの定型要素を取り除いてテキスト化する。
+ */
+function extractPageContent(args: { wantHtml: boolean; wantText: boolean; mainContent: boolean }): { html?: string; text?: string } {
+  const out: { html?: string; text?: string } = {};
+
+  if (!args.mainContent) {
+    if (args.wantHtml) out.html = document.documentElement.outerHTML;
+    if (args.wantText) out.text = document.body ? document.body.innerText : '';
+    return out;
+  }
+
+  const candidates = Array.from(document.querySelectorAll<HTMLElement>('main, article, [role="main"]'));
+  let root: HTMLElement = document.body;
+  let best = 0;
+  for (const el of candidates) {
+    const length = (el.innerText || '').length;
+    if (length > best) {
+      best = length;
+      root = el;
+    }
+  }
+  if (!root) return out;
+
+  const clone = root.cloneNode(true) as HTMLElement;
+  const boilerplate = [
+    'script', 'style', 'noscript', 'template', 'svg', 'iframe', 'nav', 'header', 'footer', 'aside', 'form',
+    '[role="navigation"]', '[role="banner"]', '[role="contentinfo"]', '[role="complementary"]',
+    '[aria-hidden="true"]', '[hidden]',
+    '.nav', '.navbar', '.menu', '.breadcrumb', '.sidebar', '.footer', '.header', '.cookie', '.ads', '.advertisement'
+  ].join(',');
+  clone.querySelectorAll(boilerplate).forEach(el => el.remove());
+
+  if (args.wantHtml) out.html = clone.outerHTML;
+  if (args.wantText) {
+    // クローンはレイアウトを持たず innerText が使えないため、ブロック要素ごとに段落を区切る
+    const blocks = new Set(['P', 'DIV', 'SECTION', 'ARTICLE', 'MAIN', 'LI', 'UL', 'OL', 'TABLE', 'TR',
+      'H1', 'H2', 'H3', 'H4', 'H5', 'H6', 'BLOCKQUOTE', 'PRE', 'DL', 'DT', 'DD', 'FIGURE', 'FIGCAPTION']);
+    const parts: string[] = [];
+    const walk = (node: Node): void => {
+      if (node.nodeType === Node.TEXT_NODE) {
+        parts.push((node.textContent || '').replace(/\s+/g, ' '));
+        return;
+      }
+      if (node.nodeType !== Node.ELEMENT_NODE) return;
+      const tag = (node as Element).tagName;
+      if (tag === 'BR') {
+        parts.push('\n');
+        return;
+      }
+      const block = blocks.has(tag);
+      if (block) parts.push('\n\n');
+      node.childNodes.forEach(walk);
+      if (block) parts.push('\n\n');
+    };
+    walk(clone);
+    out.text = parts.join('')
+      .replace(/[ \t]*\n[ \t]*/g, '\n')
+      .replace(/\n{3,}/g, '\n\n')
+      .trim();
+  }
+  return out;
+}
@@ -1,7 +1,36 @@
 import express, { Request, Response, NextFunction } from 'express';
+import * as zlib from 'zlib';
 import { BrowserManager } from './browserManager';
 import { v4 as uuidv4 } from 'uuid';
 
+function gzip(data: Buffer): Promise<Buffer> {
+  return new Promise((resolve, reject) => {
+    zlib.gzip(data, { level: 6 }, (error, output) => (error ? reject(error) : resolve(output)));
+  });
+}
+
+// この大きさ未満のレスポンスは圧縮しない（CPU の無駄）
+const GZIP_MIN_BYTES = 1024;
+
+/**
+ * JSON を返す。クライアントが gzip を受け付ける場合は圧縮する
+ * （ページ本文を返す content / batch 用）
+ */
+async function sendJson(req: Request, res: Response, body: unknown): Promise<void> {
+  const payload = Buffer.from(JSON.stringify(body));
+  res.set('Content-Type', 'application/json; charset=utf-8');
+  res.set('Vary', 'Accept-Encoding');
+  if (payload.length >= GZIP_MIN_BYTES && /\bgzip\b/.test(req.headers['accept-encoding'] || '')) {
+    const compressed = await gzip(payload);
+    res.set('Content-Encoding', 'gzip');
+    res.set('Content-Length', String(compressed.length));
+    res.end(compressed);
+    return;
+  }
+  res.set('Content-Length', String(payload.length));
+  res.end(payload);
+}
+
 const app = express();
 app.use(express.json());
 
@@ -19,7 +48,9 @@ app.get('/health', (_req: Request, res: Response) => {
   res.json({
     status: 'healthy',
     timestamp: new Date().toISOString(),
-    browser: browserManager.isReady() ? 'ready' : 'initializing'
+    browser: browserManager.isReady() ? 'ready' : 'initializing',
+    lease: browserManager.getLease(),
+    memory: browserManager.getMemoryInfo()
   });
 });
 
@@ -36,11 +67,11 @@ app.post('/browser/init', async (_req: Request, res: Response) => {
 // ページナビゲーション
 app.post('/browser/navigate', async (req: Request, res: Response) => {
   try {
-    const { url, waitUntil = 'domcontentloaded' } = req.body;
+    const { url, waitUntil = 'domcontentloaded', readiness, tabId, profile } = req.body;
     if (!url) {
       return res.status(400).json({ success: false, error: 'URL is required' });
     }
-    const result = await browserManager.navigate(url, waitUntil);
+    const result = await browserManager.navigate(url, waitUntil, readiness, tabId, profile);
     res.json({ success: true, ...result });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
@@ -50,18 +81,31 @@ app.post('/browser/navigate', async (req: Request, res: Response) => {
 // スクリーンショット取得
 app.post('/browser/screenshot', async (req: Request, res: Response) => {
   try {
-    const { fullPage = false, path } = req.body;
-    const screenshot = await browserManager.screenshot({ fullPage, path });
+    const { fullPage = false, path, format, quality, clip, maxHeight, tabId } = req.body;
+    const screenshot = await browserManager.screenshot({ fullPage, path, format, quality, clip, maxHeight, tabId });
     res.json({ success: true, screenshot });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
   }
 });
 
+// スクリーンショット取得（バイナリ）: 画像バイトをそのまま返す
+app.post('/browser/screenshot/raw', async (req: Request, res: Response) => {
+  try {
+    const { fullPage = false, format = 'png', quality, clip, maxHeight, tabId } = req.body;
+    const image = await browserManager.captureScreenshot({ fullPage, format, quality, clip, maxHeight, tabId });
+    res.set('Content-Type', image.contentType);
+    res.set('Content-Length', String(image.buffer.length));
+    res.end(image.buffer);
+  } catch (error) {
+    res.status(500).json({ success: false, error: String(error) });
+  }
+});
+
 // ページスナップショット（アクセシビリティツリー）
-app.post('/browser/snapshot', async (_req: Request, res: Response) => {
+app.post('/browser/snapshot', async (req: Request, res: Response) => {
   try {
-    const snapshot = await browserManager.getSnapshot();
+    const snapshot = await browserManager.getSnapshot(req.body.tabId);
     res.json({ success: true, snapshot });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
@@ -71,8 +115,8 @@ app.post('/browser/snapshot', async (_req: Request, res: Response) => {
 // 要素クリック
 app.post('/browser/click', async (req: Request, res: Response) => {
   try {
-    const { selector, text, ref } = req.body;
-    await browserManager.click({ selector, text, ref });
+    const { selector, text, ref, tabId } = req.body;
+    await browserManager.click({ selector, text, ref, tabId });
     res.json({ success: true, message: 'Click performed' });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
@@ -82,8 +126,8 @@ app.post('/browser/click', async (req: Request, res: Response) => {
 // テキスト入力
 app.post('/browser/type', async (req: Request, res: Response) => {
   try {
-    const { selector, text, submit = false, ref } = req.body;
-    await browserManager.type({ selector, text, submit, ref });
+    const { selector, text, submit = false, ref, tabId } = req.body;
+    await browserManager.type({ selector, text, submit, ref, tabId });
     res.json({ success: true, message: 'Text typed' });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
@@ -91,10 +135,11 @@ app.post('/browser/type', async (req: Request, res: Response) => {
 });
 
 // ページコンテンツ取得
-app.post('/browser/content', async (_req: Request, res: Response) => {
+app.post('/browser/content', async (req: Request, res: Response) => {
   try {
-    const content = await browserManager.getContent();
-    res.json({ success: true, ...content });
+    const { tabId, fields, maxChars, mainContent } = req.body;
+    const content = await browserManager.getContent({ tabId, fields, maxChars, mainContent });
+    await sendJson(req, res, { success: true, ...content });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
   }
@@ -103,11 +148,11 @@ app.post('/browser/content', async (_req: Request, res: Response) => {
 // JavaScript実行
 app.post('/browser/evaluate', async (req: Request, res: Response) => {
   try {
-    const { script } = req.body;
+    const { script, tabId } = req.body;
     if (!script) {
       return res.status(400).json({ success: false, error: 'Script is required' });
     }
-    const result = await browserManager.evaluate(script);
+    const result = await browserManager.evaluate(script, tabId);
     res.json({ success: true, result });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
@@ -117,14 +162,33 @@ app.post('/browser/evaluate', async (req: Request, res: Response) => {
 // ページ待機
 app.post('/browser/wait', async (req: Request, res: Response) => {
   try {
-    const { selector, text, timeout = 30000 } = req.body;
-    await browserManager.wait({ selector, text, timeout });
-    res.json({ success: true, message: 'Wait completed' });
+    const { selector, text, timeout = 30000, readiness, tabId } = req.body;
+    const result = await browserManager.wait({ selector, text, timeout, readiness, tabId });
+    res.json({ success: true, message: 'Wait completed', readiness: result || undefined });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
   }
 });
 
+// 複数アクションを1リクエストで実行（パイプライン）
+app.post('/browser/batch', async (req: Request, res: Response) => {
+  try {
+    const { steps, timeout = 30000, tabId } = req.body;
+    if (!Array.isArray(steps) || steps.length === 0) {
+      return res.status(400).json({ success: false, error: 'steps must be a non-empty array' });
+    }
+    const result = await browserManager.runBatch(steps, timeout, tabId);
+    await sendJson(req, res, { success: result.stopReason !== 'error', ...result });
+  } catch (error) {
+    res.status(500).json({ success: false, error: String(error) });
+  }
+});
+
+// リソースブロックの集計（プロファイル別の削減量・ロード時間）
+app.get('/browser/blocking', (_req: Request, res: Response) => {
+  res.json({ success: true, ...browserManager.getBlockingStats() });
+});
+
 // タブ一覧取得
 app.get('/browser/tabs', async (_req: Request, res: Response) => {
   try {
@@ -138,8 +202,8 @@ app.get('/browser/tabs', async (_req: Request, res: Response) => {
 // 新しいタブを開く
 app.post('/browser/tabs/new', async (req: Request, res: Response) => {
   try {
-    const { url } = req.body;
-    const tabId = await browserManager.newTab(url);
+    const { url, activate = true } = req.body;
+    const tabId = await browserManager.newTab(url, activate);
     res.json({ success: true, tabId });
   } catch (error) {
     res.status(500).json({ success: false, error: String(error) });
@@ -168,6 +232,40 @@ app.post('/browser/tabs/select', async (req: Request, res: Response) => {
   }
 });
 
+// ウォームプール: インスタンスをリース
+app.post('/pool/lease', (req: Request, res: Response) => {
+  const { owner, ttlMs = 2 * 60 * 60 * 1000 } = req.body;
+  if (!owner) {
+    return res.status(400).json({ success: false, error: 'owner is required' });
+  }
+  const lease = browserManager.acquireLease(owner, ttlMs);
+  if (!lease) {
+    return res.status(409).json({ success: false, error: 'Instance already leased', lease: browserManager.getLease() });
+  }
+  res.json({ success: true, lease });
+});
+
+// ウォームプール: タブをリセットしてリースを返却
+app.post('/pool/release', async (req: Request, res: Response) => {
+  try {
+    const { owner, reset = true } = req.body;
+    // 所有者が違う場合は、現在のリース保持者のタブをリセットする前に拒否する
+    const current = browserManager.getLease();
+    if (current && owner && current.owner !== owner) {
+      return res.status(409).json({ success: false, error: 'Lease held by another owner' });
+    }
+    if (reset) {
+      await browserManager.resetTabs();
+    }
+    if (!browserManager.releaseLease(owner)) {
+      return res.status(409).json({ success: false, error: 'Lease held by another owner' });
+    }
+    res.json({ success: true, message: 'Lease released' });
+  } catch (error) {
+    res.status(500).json({ success: false, error: String(error) });
+  }
+});
+
 // ブラウザ終了
 app.post('/browser/close', async (_req: Request, res: Response) => {
   try {
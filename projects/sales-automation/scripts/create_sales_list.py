@@ -12,7 +12,7 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 
 # ライブラリのインポート
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from lib.browser import get_container_ports, browser_navigate, browser_evaluate
+from lib.browser import get_container_ports, browser_navigate, browser_evaluate, start_recording, start_replay, stop_traffic
 from lib.search import search_duckduckgo, determine_search_context, generate_query_variations
 from lib.extractor import extract_company_info
 from lib.contact_finder import find_contact_form_url
@@ -165,6 +165,10 @@ def main():
     parser.add_argument('query', help='検索クエリ（例: "東京 IT企業"）')
     parser.add_argument('--max-companies', type=int, default=100, help='最大収集企業数（デフォルト: 100）')
     parser.add_argument('--skip-contact-forms', action='store_true', help='問い合わせフォーム検出をスキップ')
+    parser.add_argument('--record', help='browser-api の通信をこのアーカイブ（.jsonl.gz）に記録')
+    parser.add_argument('--replay', help='記録済みアーカイブから通信を再生（コンテナ不要）')
+    parser.add_argument('--replay-speed', type=float, default=1.0, help='再生速度の倍率（0 で待機なし、デフォルト: 1）')
+    parser.add_argument('--replay-mode', choices=['key', 'order'], default='key', help='再生時の照合方法（デフォルト: key）')
     args = parser.parse_args()
 
     print("=" * 60)
@@ -174,8 +178,13 @@ def main():
     print(f"目標企業数: {args.max_companies}社")
     print()
 
-    # コンテナポート取得
-    ports = get_container_ports()
+    # コンテナポート取得（再生時は記録時のポート）
+    if args.replay:
+        ports = start_replay(args.replay, speed=args.replay_speed, mode=args.replay_mode)
+    else:
+        ports = get_container_ports()
+        if args.record:
+            start_recording(args.record)
     if not ports:
         print("エラー: Dockerコンテナが起動していません")
         print("docker compose up -d で起動してください")
@@ -241,6 +250,10 @@ def main():
     print(f"  - Markdown: {md_path}")
     print(f"  - 収集企業数: {len(companies)}社")
 
+    traffic = stop_traffic()
+    if traffic:
+        print(f"  - browser-api 通信: {traffic}")
+
 
 if __name__ == "__main__":
     main()
@@ -2,15 +2,20 @@
 ブラウザ操作関数
 funding_collector から流用
 """
+import gzip
 import json
 import subprocess
 import re
 import os
+import threading
+import time
 from pathlib import Path
 from typing import Optional, List
 from urllib.request import Request, urlopen
 from urllib.error import URLError
 
+from .traffic import TrafficRecorder, TrafficReplayer
+
 
 def get_container_ports() -> List[int]:
     """起動中のコンテナのAPIポートを取得"""
@@ -36,16 +41,129 @@ def get_container_ports() -> List[int]:
     return sorted(ports)
 
 
-def browser_navigate(port: int, url: str, timeout: int = 30) -> bool:
-    """ブラウザをURLにナビゲート"""
-    try:
-        api_url = f"http://localhost:{port}/browser/navigate"
-        data = json.dumps({"url": url}).encode('utf-8')
-        req = Request(api_url, data=data, headers={'Content-Type': 'application/json'})
+# リソースブロックのプロファイル（browser-api の browserManager.ts と対応）
+BLOCK_FULL = "full"            # ブロックなし（フォーム送信用）
+BLOCK_NO_MEDIA = "no-media"    # 画像・動画・フォント・広告/解析ドメインをブロック
+BLOCK_TEXT_ONLY = "text-only"  # さらに CSS とサードパーティのスクリプト/XHR もブロック
+
+# プロファイル別のブロック件数・推定削減バイト数・ロード時間の集計（スレッドセーフ）
+_blocking_lock = threading.Lock()
+_blocking_stats: dict = {}
+
+
+def _record_blocking(blocking: dict) -> None:
+    profile = blocking.get("profile", BLOCK_FULL)
+    with _blocking_lock:
+        totals = _blocking_stats.setdefault(
+            profile, {"pages": 0, "blocked": 0, "bytes_saved": 0, "load_ms": 0}
+        )
+        totals["pages"] += 1
+        totals["blocked"] += blocking.get("blocked", 0)
+        totals["bytes_saved"] += blocking.get("bytesSaved", 0)
+        totals["load_ms"] += blocking.get("loadMs", 0)
+
+
+def get_blocking_stats() -> dict:
+    """
+    プロファイル別の集計を取得
+
+    avg_load_ms_delta_vs_full は full プロファイルとの平均ロード時間の差（負なら高速化）
+    """
+    with _blocking_lock:
+        stats = {profile: dict(totals) for profile, totals in _blocking_stats.items()}
+    full = stats.get(BLOCK_FULL)
+    full_avg = full["load_ms"] / full["pages"] if full and full["pages"] else None
+    for profile, totals in stats.items():
+        avg = totals["load_ms"] / totals["pages"] if totals["pages"] else 0.0
+        totals["avg_load_ms"] = round(avg)
+        totals["avg_load_ms_delta_vs_full"] = (
+            None if full_avg is None or profile == BLOCK_FULL else round(avg - full_avg)
+        )
+    return stats
+
+
+# 通信の記録・再生（start_recording / start_replay で有効化）
+_recorder: Optional[TrafficRecorder] = None
+_replayer: Optional[TrafficReplayer] = None
+
+
+def start_recording(path: str) -> None:
+    """以降の browser-api 通信をアーカイブ（.jsonl.gz）に記録する"""
+    global _recorder
+    _recorder = TrafficRecorder(path)
+
 
+def start_replay(path: str, speed: float = 1.0, mode: str = "key") -> List[int]:
+    """
+    以降の browser-api 通信を記録済みアーカイブから返す（コンテナ不要）
+
+    Returns:
+        記録時のポートリスト（get_container_ports の代わりに使う）
+    """
+    global _replayer
+    _replayer = TrafficReplayer(path, speed=speed, mode=mode)
+    return [int(stream) for stream in _replayer.streams if stream.isdigit()]
+
+
+def stop_traffic() -> dict:
+    """記録・再生を終了し、件数を返す（記録はここでアーカイブが確定する）"""
+    global _recorder, _replayer
+    stats = {}
+    if _recorder:
+        _recorder.close()
+        stats["recorded"] = _recorder.recorded
+    if _replayer:
+        stats.update(replayed=_replayer.replayed, misses=_replayer.misses)
+    _recorder = _replayer = None
+    return stats
+
+
+def _post(port: int, action: str, params: dict, timeout: float, accept_gzip: bool = False) -> dict:
+    """
+    browser-api に POST してレスポンスの JSON を返す（記録・再生に対応）
+
+    通信エラーは例外のまま呼び出し元へ。記録時は失敗レスポンスとして残し、
+    再生時はそれを返す（呼び出し元ではどちらも失敗扱いになる）
+    """
+    if _replayer:
+        return _replayer.replay(str(port), action, params)
+
+    headers = {'Content-Type': 'application/json'}
+    if accept_gzip:
+        headers['Accept-Encoding'] = 'gzip'
+    req = Request(f"http://localhost:{port}/browser/{action}", data=json.dumps(params).encode('utf-8'), headers=headers)
+
+    started = time.monotonic()
+    try:
         with urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            return result.get("success", False)
+            body = response.read()
+            if response.headers.get('Content-Encoding') == 'gzip':
+                body = gzip.decompress(body)
+        result = json.loads(body.decode('utf-8'))
+    except Exception as e:
+        if _recorder:
+            _recorder.record(str(port), action, params, {"success": False, "error": str(e)}, time.monotonic() - started)
+        raise
+    if _recorder:
+        _recorder.record(str(port), action, params, result, time.monotonic() - started)
+    return result
+
+
+def browser_navigate(port: int, url: str, timeout: int = 30, profile: Optional[str] = None) -> bool:
+    """
+    ブラウザをURLにナビゲート
+
+    profile: リソースブロックのプロファイル（BLOCK_TEXT_ONLY など）。
+    省略時はタブの現在のプロファイルのまま
+    """
+    try:
+        params = {"url": url}
+        if profile:
+            params["profile"] = profile
+        result = _post(port, "navigate", params, timeout)
+        if result.get("blocking"):
+            _record_blocking(result["blocking"])
+        return result.get("success", False)
     except (URLError, json.JSONDecodeError, Exception):
         return False
 
@@ -53,29 +171,120 @@ def browser_navigate(port: int, url: str, timeout: int = 30) -> bool:
 def browser_evaluate(port: int, script: str, timeout: int = 60) -> Optional[str]:
     """ブラウザでJavaScriptを実行"""
     try:
-        api_url = f"http://localhost:{port}/browser/evaluate"
-        data = json.dumps({"script": script}).encode('utf-8')
-        req = Request(api_url, data=data, headers={'Content-Type': 'application/json'})
-
-        with urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            if result.get("success"):
-                return result.get("result")
-            return None
+        result = _post(port, "evaluate", {"script": script}, timeout)
+        if result.get("success"):
+            return result.get("result")
+        return None
     except (URLError, json.JSONDecodeError, Exception):
         return None
 
 
-def browser_get_content(port: int, timeout: int = 30) -> Optional[dict]:
-    """ページコンテンツを取得"""
+def browser_get_content(port: int, timeout: int = 30, fields: Optional[List[str]] = None,
+                        max_chars: Optional[int] = None, main_content: bool = False) -> Optional[dict]:
+    """
+    ページコンテンツを取得
+
+    Args:
+        port: APIポート
+        timeout: タイムアウト（秒）
+        fields: 必要なフィールド（"html", "text", "url", "title"。省略時は全て）
+        max_chars: html / text をこの文字数で切り詰める
+        main_content: 本文のみ抽出（ナビ・ヘッダー・フッター等を除去）
+
+    Returns:
+        コンテンツ（失敗時は None）。レスポンスは gzip 圧縮で受け取る
+    """
     try:
-        api_url = f"http://localhost:{port}/browser/content"
-        req = Request(api_url, data=b'', headers={'Content-Type': 'application/json'})
+        params = {}
+        if fields:
+            params["fields"] = fields
+        if max_chars:
+            params["maxChars"] = max_chars
+        if main_content:
+            params["mainContent"] = True
+        result = _post(port, "content", params, timeout, accept_gzip=True)
+        if result.get("success"):
+            return result
+        return None
+    except (URLError, json.JSONDecodeError, Exception):
+        return None
 
-        with urlopen(req, timeout=timeout) as response:
-            result = json.loads(response.read().decode('utf-8'))
-            if result.get("success"):
-                return result
-            return None
+
+def browser_batch(port: int, steps: List[dict], step_timeout: int = 30000,
+                  timeout: Optional[float] = None) -> Optional[dict]:
+    """
+    複数アクションを1リクエストで順番に実行（/browser/batch）
+
+    steps の各要素: {"action": "navigate"|"content"|"evaluate"|..., "params": {...},
+                     "timeout": ms, "onError": "abort"|"continue"|"skipNext",
+                     "stopIf": "success"|"truthy"|"falsy"}
+    戻り値の steps[i] は個別エンドポイントのレスポンスと同じ形。
+    通信失敗・バッチ未対応（旧イメージ）の場合は None を返す。
+    """
+    if timeout is None:
+        timeout = sum(step.get("timeout", step_timeout) for step in steps) / 1000 + 5
+    try:
+        result = _post(port, "batch", {"steps": steps, "timeout": step_timeout}, timeout)
+        if "steps" in result:
+            for step in result["steps"]:
+                if step.get("action") == "navigate" and step.get("blocking"):
+                    _record_blocking(step["blocking"])
+            return result
+        return None
     except (URLError, json.JSONDecodeError, Exception):
         return None
+
+
+# 固定sleepの代わりに使った待機時間の集計（スレッドセーフ）
+_readiness_lock = threading.Lock()
+_readiness_stats = {"pages": 0, "waited_s": 0.0, "saved_s": 0.0, "fallbacks": 0}
+
+
+def _record_readiness(waited: float, baseline: float, fallback: bool = False) -> None:
+    with _readiness_lock:
+        _readiness_stats["pages"] += 1
+        _readiness_stats["waited_s"] += waited
+        _readiness_stats["saved_s"] += baseline - waited
+        if fallback:
+            _readiness_stats["fallbacks"] += 1
+
+
+def get_readiness_stats() -> dict:
+    """待機時間の集計を取得（saved_s は固定sleepと比べて短縮できた秒数）"""
+    with _readiness_lock:
+        return {k: round(v, 3) if isinstance(v, float) else v for k, v in _readiness_stats.items()}
+
+
+def browser_wait_ready(
+    port: int,
+    fallback_sleep: float,
+    strategy: str = "domquiet",
+    selector: Optional[str] = None,
+    quiet_ms: int = 500,
+    timeout_ms: Optional[int] = None,
+) -> bool:
+    """
+    ページの準備完了をイベントで待機（固定sleepの置き換え）
+
+    strategy: "domquiet"（DOM変更が quiet_ms 止まるまで）/ "networkidle" / "selector"
+    timeout_ms を省略すると fallback_sleep を上限とするため、従来より遅くならない。
+    APIが readiness に未対応・失敗した場合は fallback_sleep だけ sleep する。
+    """
+    if timeout_ms is None:
+        timeout_ms = int(fallback_sleep * 1000)
+    readiness = {"strategy": strategy, "quietMs": quiet_ms, "timeout": timeout_ms}
+    if selector:
+        readiness["selector"] = selector
+
+    try:
+        result = _post(port, "wait", {"readiness": readiness}, timeout_ms / 1000 + 10)
+        info = result.get("readiness")
+        if result.get("success") and info:
+            _record_readiness(info.get("waitedMs", 0) / 1000, fallback_sleep)
+            return not info.get("timedOut", False)
+    except (URLError, json.JSONDecodeError, Exception):
+        pass
+
+    time.sleep(fallback_sleep)
+    _record_readiness(fallback_sleep, fallback_sleep, fallback=True)
+    return False
@@ -3,10 +3,9 @@
 """
 import json
 import re
-import time
 from urllib.parse import urljoin, urlparse
 from typing import Optional
-from .browser import browser_navigate, browser_evaluate
+from .browser import browser_navigate, browser_evaluate, browser_wait_ready, browser_batch, BLOCK_NO_MEDIA
 
 
 def normalize_base_url(url: str) -> str:
@@ -85,6 +84,65 @@ COMMON_CONTACT_PATHS = [
 ]
 
 
+# キーワード検証とHTML構造検証を同時に実行（効率化）
+CONTACT_PAGE_CHECK_SCRIPT = """(function() {
+    const title = document.title.toLowerCase();
+    const body = document.body.innerText.toLowerCase();
+
+    // キーワード検証
+    const hasContactKeyword = title.includes('contact') || title.includes('問い合わせ') ||
+                             title.includes('お問い合わせ') || title.includes('inquiry') ||
+                             body.includes('お問い合わせ') || body.includes('contact') ||
+                             body.includes('問い合わせ') || body.includes('form') ||
+                             body.includes('ご相談') || body.includes('資料請求');
+
+    // HTML構造検証
+    const hasForm = !!document.querySelector('form');
+    const hasEmailInput = !!document.querySelector('input[type="email"]');
+    const hasSubmitButton = !!document.querySelector('button[type="submit"], input[type="submit"]');
+    const hasTextarea = !!document.querySelector('textarea');
+    const hasFormStructure = (hasForm && hasSubmitButton) || (hasEmailInput && hasTextarea && hasSubmitButton);
+
+    // いずれかがtrueなら問い合わせフォームと判定
+    return hasContactKeyword || hasFormStructure;
+})()"""
+
+
+def _probe_contact_paths(port: int, candidates: list[str]) -> Optional[str]:
+    """
+    候補URLを1回のバッチリクエストで順に確認し、最初に問い合わせページと判定されたURLを返す
+
+    Returns:
+        見つかったURL / 見つからなければ空文字列 / バッチ未対応なら None
+    """
+    if not candidates:
+        return ''
+
+    steps = []
+    for url in candidates:
+        # 遷移に失敗したら直後の判定ステップを飛ばす
+        steps.append({
+            "action": "navigate",
+            "params": {"url": url, "profile": BLOCK_NO_MEDIA, "readiness": {"strategy": "domquiet", "quietMs": 300, "timeout": 1000}},
+            "timeout": 4000,
+            "onError": "skipNext",
+        })
+        steps.append({
+            "action": "evaluate",
+            "params": {"script": CONTACT_PAGE_CHECK_SCRIPT},
+            "timeout": 3000,
+            "onError": "continue",
+            "stopIf": "truthy",
+        })
+
+    result = browser_batch(port, steps)
+    if result is None:
+        return None
+    if result.get("stopReason") == "condition":
+        return candidates[result["stoppedAt"] // 2]
+    return ''
+
+
 def find_contact_form_url(port: int, base_url: str) -> str:
     """
     問い合わせフォームURLを4段階で検出
@@ -101,45 +159,31 @@ def find_contact_form_url(port: int, base_url: str) -> str:
     base_url = normalize_base_url(base_url)
     
     # === 方法1: よくあるパスを直接試す（キーワード + HTML構造を同時チェック）===
-    for path in COMMON_CONTACT_PATHS:
-        candidate_url = urljoin(base_url, path)
-        # 英語ページはスキップ
-        if is_english_page(candidate_url):
-            continue
-        if browser_navigate(port, candidate_url, timeout=3):
-            time.sleep(1)  # JavaScript読み込み待機
-            # キーワード検証とHTML構造検証を同時に実行（効率化）
-            combined_script = """(function() {
-                const title = document.title.toLowerCase();
-                const body = document.body.innerText.toLowerCase();
-
-                // キーワード検証
-                const hasContactKeyword = title.includes('contact') || title.includes('問い合わせ') ||
-                                         title.includes('お問い合わせ') || title.includes('inquiry') ||
-                                         body.includes('お問い合わせ') || body.includes('contact') ||
-                                         body.includes('問い合わせ') || body.includes('form') ||
-                                         body.includes('ご相談') || body.includes('資料請求');
-
-                // HTML構造検証
-                const hasForm = !!document.querySelector('form');
-                const hasEmailInput = !!document.querySelector('input[type="email"]');
-                const hasSubmitButton = !!document.querySelector('button[type="submit"], input[type="submit"]');
-                const hasTextarea = !!document.querySelector('textarea');
-                const hasFormStructure = (hasForm && hasSubmitButton) || (hasEmailInput && hasTextarea && hasSubmitButton);
-
-                // いずれかがtrueなら問い合わせフォームと判定
-                return hasContactKeyword || hasFormStructure;
-            })()"""
-            result = browser_evaluate(port, combined_script, timeout=3)
-            if result == 'true':
-                print(f"  [DEBUG] Method 1 (common paths): {candidate_url}")
-                return candidate_url
+    # 英語ページはスキップ
+    candidates = [
+        urljoin(base_url, path) for path in COMMON_CONTACT_PATHS
+        if not is_english_page(urljoin(base_url, path))
+    ]
+    found = _probe_contact_paths(port, candidates)
+    if found is None:
+        # バッチ未対応（旧イメージ）: 1パスずつ navigate + evaluate
+        found = ''
+        for candidate_url in candidates:
+            if browser_navigate(port, candidate_url, timeout=3, profile=BLOCK_NO_MEDIA):
+                browser_wait_ready(port, 1)  # JavaScript読み込み待機（DOMが落ち着いたら即続行）
+                result = browser_evaluate(port, CONTACT_PAGE_CHECK_SCRIPT, timeout=3)
+                if str(result).lower() == 'true':
+                    found = candidate_url
+                    break
+    if found:
+        print(f"  [DEBUG] Method 1 (common paths): {found}")
+        return found
 
     # === 方法2: トップページからリンクを探す ===
-    if not browser_navigate(port, base_url):
+    if not browser_navigate(port, base_url, profile=BLOCK_NO_MEDIA):
         return ''
 
-    time.sleep(2)  # JavaScript動的生成リンク対応のため待機
+    browser_wait_ready(port, 2)  # JavaScript動的生成リンク対応のため待機
 
     # 問い合わせリンクを検出するスクリプト
     script = """(function() {
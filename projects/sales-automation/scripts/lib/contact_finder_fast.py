@@ -8,10 +8,9 @@
 - iframe対応追加
 """
 import json
-import time
 from urllib.parse import urljoin, urlparse
 from typing import Optional, Tuple
-from .browser import browser_navigate, browser_evaluate
+from .browser import browser_navigate, browser_evaluate, browser_wait_ready, BLOCK_NO_MEDIA
 
 
 # よくある問い合わせフォームパス（削減版: 10パス）
@@ -46,10 +45,10 @@ def find_contact_form_url_fast(port: int, base_url: str, debug: bool = False) ->
             print(f"  [DEBUG] {msg}")
 
     # === 方法1: トップページからリンクを探す（最速）===
-    if not browser_navigate(port, base_url, timeout=15):
+    if not browser_navigate(port, base_url, timeout=15, profile=BLOCK_NO_MEDIA):
         return '', 'navigation_failed'
 
-    time.sleep(1)  # 短縮
+    browser_wait_ready(port, 1)  # DOMが落ち着いたら即続行（最大1秒）
 
     # 問い合わせリンク + フォーム検出を一括実行
     combined_script = """(function() {
@@ -135,8 +134,8 @@ def find_contact_form_url_fast(port: int, base_url: str, debug: bool = False) ->
             contact_link = data.get('contact_link', '')
             if contact_link:
                 # contactページに遷移してフォーム確認
-                if browser_navigate(port, contact_link, timeout=10):
-                    time.sleep(1)
+                if browser_navigate(port, contact_link, timeout=10, profile=BLOCK_NO_MEDIA):
+                    browser_wait_ready(port, 1)
                     
                     form_check = """(function() {
                         const form = document.querySelector('form');
@@ -179,8 +178,8 @@ def find_contact_form_url_fast(port: int, base_url: str, debug: bool = False) ->
                             iframe_src = form_data.get('iframe_src', '')
                             if iframe_src:
                                 # iframeを確認
-                                if browser_navigate(port, iframe_src, timeout=10):
-                                    time.sleep(1)
+                                if browser_navigate(port, iframe_src, timeout=10, profile=BLOCK_NO_MEDIA):
+                                    browser_wait_ready(port, 1)
                                     iframe_form_check = browser_evaluate(port, 
                                         "!!document.querySelector('form, input[type=email], textarea')", timeout=5)
                                     # True/true両方対応
@@ -200,8 +199,8 @@ def find_contact_form_url_fast(port: int, base_url: str, debug: bool = False) ->
                             })()"""
                             any_iframe = browser_evaluate(port, all_iframe_script, timeout=5)
                             if any_iframe and any_iframe.startswith('http'):
-                                if browser_navigate(port, any_iframe, timeout=10):
-                                    time.sleep(1)
+                                if browser_navigate(port, any_iframe, timeout=10, profile=BLOCK_NO_MEDIA):
+                                    browser_wait_ready(port, 1)
                                     iframe_form_check = browser_evaluate(port, 
                                         "!!document.querySelector('form, input[type=email], textarea')", timeout=5)
                                     if iframe_form_check and str(iframe_form_check).lower() == 'true':
@@ -216,8 +215,8 @@ def find_contact_form_url_fast(port: int, base_url: str, debug: bool = False) ->
     # === 方法2: よくあるパスを試す（削減版）===
     for path in COMMON_CONTACT_PATHS:
         candidate_url = urljoin(base_url, path)
-        if browser_navigate(port, candidate_url, timeout=8):
-            time.sleep(1)
+        if browser_navigate(port, candidate_url, timeout=8, profile=BLOCK_NO_MEDIA):
+            browser_wait_ready(port, 1)
             
             check_script = """(function() {
                 const form = document.querySelector('form');
@@ -244,7 +243,7 @@ def find_contact_form_url_fast(port: int, base_url: str, debug: bool = False) ->
                 return candidate_url, 'common_path_form'
 
     # === 方法3: 外部フォームサービス ===
-    if browser_navigate(port, base_url, timeout=10):
+    if browser_navigate(port, base_url, timeout=10, profile=BLOCK_NO_MEDIA):
         external_script = """(function() {
             const services = ['forms.gle', 'typeform.com', 'formrun.com', 'tayori.com', 'form.run'];
             
@@ -278,10 +277,10 @@ def has_form_on_page(port: int, url: str) -> bool:
     """
     指定URLにフォームがあるか確認（送信前チェック用）
     """
-    if not browser_navigate(port, url, timeout=10):
+    if not browser_navigate(port, url, timeout=10, profile=BLOCK_NO_MEDIA):
         return False
     
-    time.sleep(1)
+    browser_wait_ready(port, 1)
     
     check_script = """(function() {
         const form = document.querySelector('form');
@@ -2,9 +2,8 @@
 企業情報抽出機能（v2 - 会社名抽出強化版）
 """
 import re
-import time
 from typing import Optional, Dict, Any
-from .browser import browser_navigate, browser_evaluate
+from .browser import browser_navigate, browser_evaluate, browser_wait_ready, BLOCK_NO_MEDIA
 
 # 企業名として不適切なパターン（スキップ対象）
 NG_TITLE_PATTERNS = {
@@ -88,11 +87,11 @@ def extract_company_info(port: int, url: str, search_context: str = 'General') -
             custom_field_3: str,
         }
     """
-    if not browser_navigate(port, url):
+    if not browser_navigate(port, url, profile=BLOCK_NO_MEDIA):
         return None
 
-    # ページロード待機
-    time.sleep(2)
+    # ページロード待機（DOMが落ち着いたら即続行、最大2秒）
+    browser_wait_ready(port, 2)
 
     # 基本情報抽出スクリプト（v2: 会社名抽出を大幅強化）
     script = f"""(function() {{
@@ -0,0 +1,244 @@
+"""
+営業文の一括生成（送信前ステージ）
+
+送信ループ内で1社ずつ同期的にLLMを呼ぶ代わりに、送信前に全社分を
+asyncio で並列生成する。
+
+- 同時実行数の上限（concurrency）
+- レート制限（429）を受けたら同時実行数を半減し、指数バックオフで再試行。
+  成功が続けば徐々に上限まで戻す（AIMD）
+- 生成結果は営業リストと同じ場所に JSONL で1件ずつ追記するため、
+  途中で止まっても再実行時は生成済みの企業をスキップして再開できる
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import random
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 5
+
+
+def messages_path_for(list_file: str) -> str:
+    """営業リストに対応する生成済みメッセージファイルのパス"""
+    base, _ = os.path.splitext(list_file)
+    return f"{base}_messages.jsonl"
+
+
+def company_key(company: Dict[str, Any]) -> str:
+    """企業の識別キー（URL優先、なければ会社名）"""
+    return company.get('url') or company.get('company_url') or company.get('company_name', '')
+
+
+def config_fingerprint(sender_info: Dict[str, str], config: Dict[str, Any]) -> str:
+    """プロンプトに影響する設定のハッシュ（変わったら再生成する）"""
+    payload = json.dumps({
+        'sender_info': sender_info,
+        'model': config.get('model', 'gpt-4o-mini'),
+        'system_prompt': config.get('system_prompt'),
+        'company_intro': config.get('company_intro'),
+    }, ensure_ascii=False, sort_keys=True)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def load_messages(path: str, fingerprint: Optional[str] = None) -> Dict[str, str]:
+    """
+    生成済みメッセージを読み込む
+
+    Args:
+        path: JSONLファイル
+        fingerprint: 指定時は同じ設定で生成されたものだけ返す
+
+    Returns:
+        {企業キー: 営業文}
+    """
+    messages: Dict[str, str] = {}
+    if not os.path.exists(path):
+        return messages
+
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = json.loads(line)
+            except json.JSONDecodeError:
+                # 書き込み途中で止まった最終行は無視
+                continue
+            if fingerprint and entry.get('fingerprint') != fingerprint:
+                continue
+            if entry.get('message'):
+                messages[entry['key']] = entry['message']
+    return messages
+
+
+def _is_rate_limit(error: Exception) -> bool:
+    return (
+        type(error).__name__ == 'RateLimitError'
+        or getattr(error, 'status_code', None) == 429
+    )
+
+
+def _retry_after(error: Exception) -> Optional[float]:
+    """レスポンスの Retry-After ヘッダ（秒）"""
+    response = getattr(error, 'response', None)
+    headers = getattr(response, 'headers', None) or {}
+    try:
+        return float(headers.get('retry-after'))
+    except (TypeError, ValueError):
+        return None
+
+
+class AdaptiveLimiter:
+    """
+    レート制限に応じて同時実行数を増減させるセマフォ
+
+    429 を受けたら上限を半減、成功が limit 回続いたら1つ増やす
+    """
+
+    def __init__(self, max_concurrency: int):
+        self.max_concurrency = max(1, max_concurrency)
+        self.limit = self.max_concurrency
+        self.active = 0
+        self.rate_limited = 0
+        self._successes = 0
+        self._cond = asyncio.Condition()
+
+    async def __aenter__(self):
+        async with self._cond:
+            while self.active >= self.limit:
+                await self._cond.wait()
+            self.active += 1
+        return self
+
+    async def __aexit__(self, *exc):
+        async with self._cond:
+            self.active -= 1
+            self._cond.notify_all()
+
+    def on_success(self) -> None:
+        self._successes += 1
+        if self.limit < self.max_concurrency and self._successes >= self.limit:
+            self.limit += 1
+            self._successes = 0
+
+    def on_rate_limit(self) -> None:
+        self.rate_limited += 1
+        self._successes = 0
+        self.limit = max(1, self.limit // 2)
+
+
+async def generate_messages_batch(
+    companies: List[Dict[str, Any]],
+    sender_info: Dict[str, str],
+    config: Dict[str, Any],
+    output_path: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    generate_fn: Optional[Callable[..., Awaitable[str]]] = None,
+) -> Dict[str, Any]:
+    """
+    全企業の営業文を並列生成して output_path に追記する
+
+    Args:
+        companies: 企業リスト
+        sender_info: 送信者情報
+        config: message_generation 設定（model, system_prompt, company_intro）
+        output_path: 生成結果のJSONL（既存分はスキップ）
+        concurrency: 同時リクエスト数の上限
+        max_retries: 1社あたりの最大リトライ回数
+        generate_fn: 生成関数（省略時は generate_sales_message_llm_async）
+
+    Returns:
+        {"generated", "skipped", "failed", "rate_limited", "elapsed_s"}
+    """
+    if generate_fn is None:
+        from .message_generator_llm import generate_sales_message_llm_async
+        generate_fn = generate_sales_message_llm_async
+
+    fingerprint = config_fingerprint(sender_info, config)
+    done = load_messages(output_path, fingerprint)
+
+    pending = []
+    seen = set(done)
+    for company in companies:
+        key = company_key(company)
+        if key and key not in seen:
+            seen.add(key)
+            pending.append(company)
+
+    limiter = AdaptiveLimiter(concurrency)
+    stats = {'generated': 0, 'skipped': len(companies) - len(pending), 'failed': 0}
+    started = time.monotonic()
+
+    os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+    out = open(output_path, 'a', encoding='utf-8')
+
+    async def generate_one(company: Dict[str, Any]) -> None:
+        key = company_key(company)
+        for attempt in range(max_retries + 1):
+            try:
+                async with limiter:
+                    message = await generate_fn(
+                        company_info=company,
+                        sender_info=sender_info,
+                        system_prompt=config.get('system_prompt'),
+                        company_intro=config.get('company_intro'),
+                        model=config.get('model', 'gpt-4o-mini'),
+                    )
+            except Exception as e:
+                if attempt >= max_retries:
+                    stats['failed'] += 1
+                    logger.error(f"営業文生成に失敗: {company.get('company_name', key)}: {e}")
+                    return
+                if _is_rate_limit(e):
+                    limiter.on_rate_limit()
+                delay = _retry_after(e) or min(60.0, 2 ** attempt + random.random())
+                await asyncio.sleep(delay)
+                continue
+
+            limiter.on_success()
+            # イベントループ上で逐次書き込むのでロック不要。1件ごとにflushして再開可能にする
+            out.write(json.dumps({
+                'key': key,
+                'company_name': company.get('company_name', ''),
+                'message': message,
+                'fingerprint': fingerprint,
+                'generated_at': datetime.now().isoformat(),
+            }, ensure_ascii=False) + '\n')
+            out.flush()
+            stats['generated'] += 1
+            return
+
+    try:
+        await asyncio.gather(*[generate_one(c) for c in pending])
+    finally:
+        out.close()
+
+    stats['rate_limited'] = limiter.rate_limited
+    stats['elapsed_s'] = round(time.monotonic() - started, 2)
+    return stats
+
+
+def run_message_batch(
+    companies: List[Dict[str, Any]],
+    sender_info: Dict[str, str],
+    config: Dict[str, Any],
+    output_path: str,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    generate_fn: Optional[Callable[..., Awaitable[str]]] = None,
+) -> Dict[str, Any]:
+    """generate_messages_batch の同期ラッパー（スクリプトから呼ぶ用）"""
+    return asyncio.run(generate_messages_batch(
+        companies, sender_info, config, output_path,
+        concurrency=concurrency, max_retries=max_retries, generate_fn=generate_fn,
+    ))
@@ -5,14 +5,15 @@ LLMを使った営業文生成
 """
 import os
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Tuple
 
-from openai import OpenAI, APIError, RateLimitError, APIConnectionError
+from openai import OpenAI, AsyncOpenAI, APIError, RateLimitError, APIConnectionError
 
 logger = logging.getLogger(__name__)
 
 # OpenAIは遅延インポート（インストールされていない環境対応）
 _openai_client = None
+_async_openai_client = None
 
 
 class OpenAIKeyNotFoundError(Exception):
@@ -33,6 +34,20 @@ def _get_openai_client():
     return _openai_client
 
 
+def _get_async_openai_client():
+    """一括生成（asyncio）用のクライアント"""
+    global _async_openai_client
+    if _async_openai_client is None:
+        api_key = os.environ.get("OPENAI_API_KEY")
+        if not api_key:
+            raise OpenAIKeyNotFoundError(
+                "OPENAI_API_KEY 環境変数が設定されていません。\n"
+                "export OPENAI_API_KEY='sk-...' を実行してください。"
+            )
+        _async_openai_client = AsyncOpenAI(api_key=api_key)
+    return _async_openai_client
+
+
 # デフォルトのシステムプロンプト
 DEFAULT_SYSTEM_PROMPT = """あなたは営業メール文を作成するアシスタントです。
 以下の提案内容と文体で、300-400文字程度のDMを作成してください。
@@ -62,31 +77,17 @@ DEFAULT_COMPANY_INTRO = """ゼネフィ合同会社はシステム開発会社
 高額還元パートナー制度（500万円の案件なら150万円還元）と役員PMによる品質保証が強みです。"""
 
 
-def generate_sales_message_llm(
+def build_prompts(
     company_info: Dict[str, Any],
     sender_info: Dict[str, str],
     system_prompt: Optional[str] = None,
-    company_intro: Optional[str] = None,
-    model: str = "gpt-4o-mini"
-) -> str:
+    company_intro: Optional[str] = None
+) -> Tuple[str, str]:
     """
-    LLMで営業文を生成（200-300文字）
-    
-    Args:
-        company_info: 企業情報（company_name, business, custom_field_1-3など）
-        sender_info: 送信者情報（company_name, contact_name, email, phone）
-        system_prompt: システムプロンプト（なければデフォルト使用）
-        company_intro: 自社紹介文（なければデフォルト使用）
-        model: 使用するモデル（デフォルト: gpt-4o-mini）
-    
-    Returns:
-        生成された営業文
-    
-    Raises:
-        OpenAIKeyNotFoundError: APIキーが設定されていない場合
+    営業文生成用の (システムプロンプト, ユーザープロンプト) を組み立てる
+
+    同期版・非同期版で共通
     """
-    client = _get_openai_client()
-    
     # 企業情報を整理
     company_name = company_info.get('company_name', '御社')
     business = company_info.get('business', '')
@@ -127,6 +128,35 @@ def generate_sales_message_llm(
 営業文を作成してください（本文のみ、件名は不要）：
 """
 
+    return sys_prompt, user_prompt
+
+
+def generate_sales_message_llm(
+    company_info: Dict[str, Any],
+    sender_info: Dict[str, str],
+    system_prompt: Optional[str] = None,
+    company_intro: Optional[str] = None,
+    model: str = "gpt-4o-mini"
+) -> str:
+    """
+    LLMで営業文を生成（200-300文字）
+    
+    Args:
+        company_info: 企業情報（company_name, business, custom_field_1-3など）
+        sender_info: 送信者情報（company_name, contact_name, email, phone）
+        system_prompt: システムプロンプト（なければデフォルト使用）
+        company_intro: 自社紹介文（なければデフォルト使用）
+        model: 使用するモデル（デフォルト: gpt-4o-mini）
+    
+    Returns:
+        生成された営業文
+    
+    Raises:
+        OpenAIKeyNotFoundError: APIキーが設定されていない場合
+    """
+    client = _get_openai_client()
+    sys_prompt, user_prompt = build_prompts(company_info, sender_info, system_prompt, company_intro)
+
     try:
         response = client.chat.completions.create(
             model=model,
@@ -149,6 +179,33 @@ def generate_sales_message_llm(
         raise
 
 
+async def generate_sales_message_llm_async(
+    company_info: Dict[str, Any],
+    sender_info: Dict[str, str],
+    system_prompt: Optional[str] = None,
+    company_intro: Optional[str] = None,
+    model: str = "gpt-4o-mini"
+) -> str:
+    """
+    generate_sales_message_llm の非同期版（一括生成用）
+
+    レート制限などのエラーはそのまま送出する（リトライは呼び出し側で行う）
+    """
+    client = _get_async_openai_client()
+    sys_prompt, user_prompt = build_prompts(company_info, sender_info, system_prompt, company_intro)
+
+    response = await client.chat.completions.create(
+        model=model,
+        messages=[
+            {"role": "system", "content": sys_prompt},
+            {"role": "user", "content": user_prompt}
+        ],
+        max_tokens=500,
+        temperature=0.7
+    )
+    return response.choices[0].message.content.strip()
+
+
 def estimate_cost(num_companies: int) -> dict:
     """
     コスト見積もり
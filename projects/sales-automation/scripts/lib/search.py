@@ -2,10 +2,9 @@
 DuckDuckGo検索機能
 """
 import re
-import time
 from urllib.parse import quote, urlparse
 from typing import List, Dict, Optional
-from .browser import browser_navigate, browser_evaluate
+from .browser import browser_navigate, browser_evaluate, browser_wait_ready, BLOCK_TEXT_ONLY
 
 
 # 除外ドメイン（検索結果から除外するサイト）- setでO(1)検索
@@ -150,11 +149,14 @@ def search_duckduckgo(port: int, query: str, max_results: int = 10, scroll_pages
     encoded_query = quote(query)
     url = f"https://duckduckgo.com/?q={encoded_query}"
 
-    if not browser_navigate(port, url):
+    if not browser_navigate(port, url, profile=BLOCK_TEXT_ONLY):
         return []
 
-    # ページロード待機
-    time.sleep(3)
+    # 検索結果が描画されるまで待機（最大3秒）
+    browser_wait_ready(
+        port, 3, strategy="selector",
+        selector='article[data-testid="result"], div[data-testid="result"]'
+    )
 
     all_results = []
     seen_urls = set()
@@ -236,7 +238,7 @@ def search_duckduckgo(port: int, query: str, max_results: int = 10, scroll_pages
         # 次のページをロード（最後のページ以外）
         if page < scroll_pages:
             browser_evaluate(port, scroll_script)
-            time.sleep(2)  # 読み込み待機
+            browser_wait_ready(port, 2)  # 追加結果の読み込み待機
 
     # 除外ドメイン・URLパターン・タイトルキーワードのフィルタリング
     filtered_results = []
@@ -0,0 +1,182 @@
+"""
+browser-api 通信の記録・再生
+
+記録モードでは browser.py 経由の全リクエスト（アクション・パラメータ・
+レスポンス・所要時間）を gzip 圧縮の JSON Lines アーカイブに書き出す。
+再生モードではアーカイブのレスポンスを返すため、Docker もネットワークも
+使わずに抽出・正規化・出力など Python 側の処理を実トラフィックで
+繰り返しプロファイルできる。
+
+アーカイブ形式はリサーチエージェント本体（src/traffic.py）と同じ:
+1行目がヘッダ {"version": 1, ...}、以降 1行 1リクエスト
+{"t", "stream", "action", "key", "elapsed", "response", "params"(キー初出時のみ)}。
+stream はポート番号、key はアクション + パラメータ（tabId を除く）+
+直前に開いていたページ URL（ナビゲーションで始まるリクエストは除く）のハッシュ。
+
+再生モード:
+    key:   同じキーの記録を記録順に返す（使い切ったら最後のものを返し続ける）
+    order: ポートごとに記録順で返す。次の記録とキーが違えば key と同じ扱い
+"""
+import gzip
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Optional, Tuple
+
+ARCHIVE_VERSION = 1
+REPLAY_KEY = "key"
+REPLAY_ORDER = "order"
+REPLAY_MODES = (REPLAY_KEY, REPLAY_ORDER)
+
+# 実行ごとに変わるがレスポンスには影響しないパラメータ
+VOLATILE_PARAMS = ("tabId",)
+
+
+def request_key(action: str, params: dict, page: str = "") -> str:
+    """リクエストのキー（アクション・パラメータ・現在ページ）"""
+    stable = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+    steps = params.get("steps") or [{}] if action == "batch" else None
+    navigates = action == "navigate" or (steps is not None and steps[0].get("action") == "navigate")
+    context = "" if navigates else page
+    payload = json.dumps([action, stable, context], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def page_after(action: str, params: dict, page: str) -> str:
+    """リクエスト後にタブが開いているページ（バッチは最後の navigate）"""
+    if action == "navigate":
+        return params.get("url", page)
+    if action == "batch":
+        for step in params.get("steps", []):
+            if step.get("action") == "navigate":
+                page = (step.get("params") or {}).get("url", page)
+    return page
+
+
+class _PageTracker:
+    """タブごとの現在ページ（ページ依存のリクエストのキー用）"""
+
+    def __init__(self):
+        self._pages = {}
+
+    def key(self, stream: str, action: str, params: dict) -> str:
+        tab = (stream, params.get("tabId"))
+        page = self._pages.get(tab, "")
+        self._pages[tab] = page_after(action, params, page)
+        return request_key(action, params, page)
+
+
+class TrafficRecorder:
+    """リクエストとレスポンスをアーカイブに追記（スレッドセーフ）。close() で確定"""
+
+    def __init__(self, path: str):
+        self.path = path
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._tmp_path = os.path.join(os.path.dirname(os.path.abspath(path)), f".{os.path.basename(path)}.tmp")
+        self._file = gzip.open(self._tmp_path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({"version": ARCHIVE_VERSION, "created_at": datetime.now().isoformat()}) + "\n")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._keys = set()
+        self._pages = _PageTracker()
+        self.recorded = 0
+
+    def record(self, stream: str, action: str, params: dict, response: dict, elapsed: float) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            key = self._pages.key(stream, action, params)
+            entry = {
+                "t": round(time.monotonic() - self._start - elapsed, 4),
+                "stream": stream,
+                "action": action,
+                "key": key,
+                "elapsed": round(elapsed, 4),
+                "response": response,
+            }
+            if key not in self._keys:
+                self._keys.add(key)
+                entry["params"] = params
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.recorded += 1
+
+    def close(self) -> None:
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.path)
+
+
+class TrafficReplayer:
+    """アーカイブのレスポンスを返す（記録時の所要時間 / speed だけ待つ。speed=0 で待たない）"""
+
+    def __init__(self, path: str, speed: float = 1.0, mode: str = REPLAY_KEY):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.speed = speed
+        self.mode = mode
+        self.replayed = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        # レスポンスはシリアライズしたまま保持し、実通信と同じく毎回パースする
+        self._by_key = {}
+        self._by_stream = {}
+        self._last = {}
+        self._stream_map = {}
+        self._pages = _PageTracker()
+
+        with gzip.open(path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported traffic archive version: {header.get('version')}")
+            for line in f:
+                entry = json.loads(line)
+                body, elapsed = json.dumps(entry["response"]), entry.get("elapsed", 0.0)
+                self._by_key.setdefault(entry["key"], deque()).append((body, elapsed))
+                self._by_stream.setdefault(entry["stream"], deque()).append((entry["key"], body, elapsed))
+
+    @property
+    def streams(self) -> list:
+        """記録されたストリーム（ポート）を初出順に"""
+        return list(self._by_stream)
+
+    def _next(self, stream: str, action: str, params: dict) -> Optional[Tuple[str, float]]:
+        with self._lock:
+            key = self._pages.key(stream, action, params)
+            if self.mode == REPLAY_ORDER:
+                recorded = self._stream_map.get(stream)
+                if recorded is None:
+                    used = set(self._stream_map.values())
+                    candidates = [stream] if stream in self._by_stream and stream not in used else self._by_stream
+                    recorded = next((s for s in candidates if s not in used), "")
+                    self._stream_map[stream] = recorded
+                queue = self._by_stream.get(recorded)
+                if queue and queue[0][0] == key:
+                    _, body, elapsed = queue.popleft()
+                    return body, elapsed
+
+            queue = self._by_key.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+                return self._last[key]
+            return self._last.get(key)
+
+    def replay(self, stream: str, action: str, params: dict) -> dict:
+        """記録されたレスポンス（未記録なら失敗レスポンス）"""
+        found = self._next(stream, action, params)
+        if found is None:
+            with self._lock:
+                self.misses += 1
+            return {"success": False, "error": f"Not in traffic archive: {action}"}
+        body, elapsed = found
+        with self._lock:
+            self.replayed += 1
+        if self.speed > 0 and elapsed:
+            time.sleep(elapsed / self.speed)
+        return json.loads(body)
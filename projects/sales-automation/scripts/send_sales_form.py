@@ -16,9 +16,12 @@ from pathlib import Path
 
 # ライブラリのインポート
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
-from lib.browser import get_container_ports, browser_navigate
+from lib.browser import get_container_ports, browser_navigate, browser_wait_ready, BLOCK_FULL
 from lib.form_handler import detect_form_fields, detect_captcha, fill_and_submit_form
 from lib.message_generator import generate_sales_message
+from lib.message_batch import (
+    messages_path_for, company_key, config_fingerprint, load_messages, run_message_batch
+)
 from lib.rate_limiter import RateLimiter
 from lib.duplicate_checker import mark_as_sent, filter_unsent_companies
 
@@ -108,7 +111,8 @@ def load_config(config_path: str) -> dict:
     return config
 
 
-def send_to_company(port: int, company: dict, sender_info: dict, rate_limiter: RateLimiter, message_config: dict = None) -> dict:
+def send_to_company(port: int, company: dict, sender_info: dict, rate_limiter: RateLimiter,
+                    message_config: dict = None, messages: dict = None) -> dict:
     """
     1企業へのフォーム送信
 
@@ -119,6 +123,8 @@ def send_to_company(port: int, company: dict, sender_info: dict, rate_limiter: R
         company: 企業情報
         sender_info: 送信者情報
         rate_limiter: レートリミッター
+        message_config: message_generation設定
+        messages: 一括生成済みの営業文（{企業キー: 営業文}）
 
     Returns:
         送信結果
@@ -138,7 +144,8 @@ def send_to_company(port: int, company: dict, sender_info: dict, rate_limiter: R
         log_and_return(rate_limiter, company, form_url, result, '')
         return result
 
-    if not browser_navigate(port, form_url):
+    # 連絡先探索で設定したブロックプロファイルはタブに残るため、reCAPTCHAや埋め込みフォーム用に明示的に解除する
+    if not browser_navigate(port, form_url, profile=BLOCK_FULL):
         result = {
             'status': 'failed',
             'error': 'Navigation failed',
@@ -148,8 +155,7 @@ def send_to_company(port: int, company: dict, sender_info: dict, rate_limiter: R
         return result
 
     # b2. 動的フォーム読み込み待機（LeadGrid等のJS生成フォーム対応）
-    import time
-    time.sleep(3)
+    browser_wait_ready(port, 3, strategy="selector", selector="form, iframe")
 
     # c. CAPTCHA検出（reCAPTCHA v3/invisibleは送信可能なのでスキップしない）
     # 現在はCAPTCHAがあっても送信を試みて、失敗したらログに記録
@@ -175,8 +181,8 @@ def send_to_company(port: int, company: dict, sender_info: dict, rate_limiter: R
         log_and_return(rate_limiter, company, form_url, result, '')
         return result
 
-    # e. 営業文生成
-    message = generate_sales_message(company, sender_info, message_config)
+    # e. 営業文生成（一括生成済みがあればそれを使う）
+    message = (messages or {}).get(company_key(company)) or generate_sales_message(company, sender_info, message_config)
 
     # f. フォーム入力・送信
     # 電話番号: ハイフンありとなしの両方を用意
@@ -356,6 +362,8 @@ def main():
     parser.add_argument('list_file', help='営業リスト（JSON/CSV）')
     parser.add_argument('--max-sends', type=int, default=100, help='最大送信件数（デフォルト: 100）')
     parser.add_argument('--config', default='config/sales_automation.json', help='設定ファイルパス')
+    parser.add_argument('--concurrency', type=int, default=8, help='LLM営業文の同時生成数（デフォルト: 8）')
+    parser.add_argument('--generate-only', action='store_true', help='営業文の一括生成だけ行い送信しない')
     args = parser.parse_args()
 
     print("=" * 60)
@@ -385,6 +393,24 @@ def main():
     print(f"送信者情報: {sender_info['company_name']} / {sender_info['contact_name']}")
     print()
 
+    # 2b. LLM営業文の一括生成（送信ループで1社ずつ待たないよう事前に並列生成）
+    messages = {}
+    if message_config.get('use_llm'):
+        targets = companies[:args.max_sends]
+        messages_path = messages_path_for(args.list_file)
+        print(f"営業文を一括生成中... (同時{args.concurrency}件)")
+        stats = run_message_batch(targets, sender_info, message_config, messages_path,
+                                  concurrency=args.concurrency)
+        messages = load_messages(messages_path, config_fingerprint(sender_info, message_config))
+        print(f"  生成: {stats['generated']}件 / 生成済み: {stats['skipped']}件 / 失敗: {stats['failed']}件 "
+              f"({stats['elapsed_s']}秒, レート制限: {stats['rate_limited']}回)")
+        print(f"  保存先: {messages_path}")
+        print()
+    if args.generate_only:
+        if not message_config.get('use_llm'):
+            print("use_llm が無効のため一括生成は不要です")
+        return
+
     # 3. レートリミッター初期化
     output_dir = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'output')
     os.makedirs(output_dir, exist_ok=True)
@@ -426,7 +452,7 @@ def main():
 
             port = ports[i % len(ports)]
             futures[executor.submit(send_to_company, port, company,
-                                   sender_info, rate_limiter, message_config)] = company
+                                   sender_info, rate_limiter, message_config, messages)] = company
             sent_count += 1
 
         # 結果収集（create_sales_list.py 行91-102と同じパターン）
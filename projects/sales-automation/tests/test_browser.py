@@ -6,6 +6,7 @@ import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
 from lib.browser import get_container_ports, browser_navigate, browser_evaluate, browser_get_content
+from lib.browser import browser_wait_ready, get_readiness_stats
 import time
 
 
@@ -109,6 +110,98 @@ def test_browser_get_content():
     print("✅ PASSED: Successfully retrieved page content")
 
 
+def test_browser_wait_ready_falls_back_to_sleep():
+    """Test that an unreachable API falls back to the fixed sleep"""
+    print("\n=== Test: browser_wait_ready (fallback) ===")
+    before = get_readiness_stats()
+
+    start = time.monotonic()
+    ready = browser_wait_ready(1, 0.2)
+    elapsed = time.monotonic() - start
+
+    after = get_readiness_stats()
+    assert ready is False, "Unreachable API should not report ready"
+    assert elapsed >= 0.2, f"Fallback sleep too short: {elapsed:.2f}s"
+    assert after["fallbacks"] == before["fallbacks"] + 1
+    assert after["pages"] == before["pages"] + 1
+    print("✅ PASSED: browser_wait_ready fell back to fixed sleep")
+
+
+def test_browser_get_content_requests_fields_and_gzip(monkeypatch):
+    """Test that content options are sent and a gzip response is decoded"""
+    print("\n=== Test: browser_get_content (options + gzip) ===")
+    import gzip
+    import json
+    import lib.browser as browser
+
+    sent = {}
+
+    class FakeResponse:
+        headers = {'Content-Encoding': 'gzip'}
+
+        def read(self):
+            return gzip.compress(json.dumps({"success": True, "text": "本文"}).encode('utf-8'))
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def fake_urlopen(req, timeout=None):
+        sent['body'] = json.loads(req.data.decode('utf-8'))
+        sent['encoding'] = req.get_header('Accept-encoding')
+        return FakeResponse()
+
+    monkeypatch.setattr(browser, 'urlopen', fake_urlopen)
+    result = browser_get_content(3000, fields=["text"], max_chars=5000, main_content=True)
+
+    assert result == {"success": True, "text": "本文"}
+    assert sent['body'] == {"fields": ["text"], "maxChars": 5000, "mainContent": True}
+    assert sent['encoding'] == 'gzip'
+    print("✅ PASSED: browser_get_content sent options and decoded gzip")
+
+
+def test_browser_navigate_sends_profile_and_records_blocking(monkeypatch):
+    """Test that the blocking profile is sent and its stats are aggregated"""
+    print("\n=== Test: browser_navigate (blocking profile) ===")
+    import json
+    import lib.browser as browser
+
+    sent = {}
+    blocking = {"profile": "text-only", "loadMs": 400, "blocked": 12, "bytesSaved": 250000}
+
+    class FakeResponse:
+        headers = {}
+
+        def read(self):
+            return json.dumps({"success": True, "blocking": blocking}).encode('utf-8')
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            return False
+
+    def fake_urlopen(req, timeout=None):
+        sent['body'] = json.loads(req.data.decode('utf-8'))
+        return FakeResponse()
+
+    monkeypatch.setattr(browser, 'urlopen', fake_urlopen)
+    monkeypatch.setattr(browser, '_blocking_stats', {})
+    assert browser_navigate(3000, "https://example.com", profile=browser.BLOCK_TEXT_ONLY)
+    assert browser_navigate(3000, "https://example.com", profile=browser.BLOCK_TEXT_ONLY)
+
+    assert sent['body'] == {"url": "https://example.com", "profile": "text-only"}
+    stats = browser.get_blocking_stats()["text-only"]
+    assert stats["pages"] == 2
+    assert stats["blocked"] == 24
+    assert stats["bytes_saved"] == 500000
+    assert stats["avg_load_ms"] == 400
+    assert stats["avg_load_ms_delta_vs_full"] is None
+    print("✅ PASSED: browser_navigate sent profile and recorded blocking stats")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("BROWSER.PY TEST SUITE")
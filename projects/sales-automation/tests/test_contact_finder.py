@@ -5,6 +5,7 @@ import sys
 import os
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'scripts'))
 
+from lib import contact_finder
 from lib.contact_finder import find_contact_form_url, is_valid_contact_url
 from lib.browser import get_container_ports, browser_navigate
 import time
@@ -107,6 +108,35 @@ def test_find_contact_form_url_with_common_path():
     print("✅ PASSED: Common path detection working")
 
 
+def test_probe_contact_paths_batch(monkeypatch):
+    """Test that common paths are probed in one batch and the stopping step is mapped back"""
+    print("\n=== Test: _probe_contact_paths ===")
+    candidates = ["https://example.com/contact", "https://example.com/inquiry", "https://example.com/form"]
+    calls = []
+
+    def fake_batch(port, steps):
+        calls.append(steps)
+        # 2件目の判定ステップ（index 3）で条件成立
+        return {"success": True, "steps": [], "stoppedAt": 3, "stopReason": "condition"}
+
+    monkeypatch.setattr(contact_finder, "browser_batch", fake_batch)
+    assert contact_finder._probe_contact_paths(3000, candidates) == "https://example.com/inquiry"
+    assert len(calls) == 1 and len(calls[0]) == 2 * len(candidates)
+    assert [s["action"] for s in calls[0][:2]] == ["navigate", "evaluate"]
+
+    # バッチ未対応なら None（呼び出し側で1件ずつにフォールバック）
+    monkeypatch.setattr(contact_finder, "browser_batch", lambda port, steps: None)
+    assert contact_finder._probe_contact_paths(3000, candidates) is None
+
+    # 最後まで条件が成立しなければ空文字列
+    monkeypatch.setattr(
+        contact_finder, "browser_batch",
+        lambda port, steps: {"success": True, "steps": [], "stoppedAt": None, "stopReason": None}
+    )
+    assert contact_finder._probe_contact_paths(3000, candidates) == ""
+    print("✅ PASSED: Batch probing maps results to candidate URLs")
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("CONTACT_FINDER.PY TEST SUITE")
@@ -0,0 +1,102 @@
+"""
+message_batch.py のテスト
+"""
+import asyncio
+import json
+
+from scripts.lib.message_batch import (
+    AdaptiveLimiter, config_fingerprint, load_messages, messages_path_for, run_message_batch
+)
+
+
+class FakeRateLimitError(Exception):
+    status_code = 429
+
+
+COMPANIES = [
+    {'company_name': f'テスト企業{i}', 'url': f'https://example{i}.co.jp'}
+    for i in range(6)
+]
+SENDER = {'company_name': '送信元', 'contact_name': '山田'}
+CONFIG = {'model': 'gpt-4o-mini'}
+
+
+def test_messages_path_for():
+    """営業リストと同じ場所にJSONLを置く"""
+    assert messages_path_for('output/sales_list_20260101.json') == 'output/sales_list_20260101_messages.jsonl'
+
+
+def test_batch_generates_concurrently_within_limit(tmp_path):
+    """同時実行数の上限を守って全社分を生成する"""
+    state = {'active': 0, 'peak': 0}
+
+    async def fake_generate(company_info, **kwargs):
+        state['active'] += 1
+        state['peak'] = max(state['peak'], state['active'])
+        await asyncio.sleep(0.01)
+        state['active'] -= 1
+        return f"{company_info['company_name']}様へ"
+
+    path = str(tmp_path / 'list_messages.jsonl')
+    stats = run_message_batch(COMPANIES, SENDER, CONFIG, path, concurrency=3, generate_fn=fake_generate)
+
+    assert stats['generated'] == len(COMPANIES)
+    assert stats['failed'] == 0
+    assert 1 < state['peak'] <= 3
+    messages = load_messages(path, config_fingerprint(SENDER, CONFIG))
+    assert messages['https://example0.co.jp'] == 'テスト企業0様へ'
+
+
+def test_batch_resumes_and_skips_generated(tmp_path):
+    """再実行時は生成済みの企業をスキップする"""
+    calls = []
+
+    async def fake_generate(company_info, **kwargs):
+        calls.append(company_info['company_name'])
+        return 'msg'
+
+    path = str(tmp_path / 'list_messages.jsonl')
+    run_message_batch(COMPANIES[:2], SENDER, CONFIG, path, generate_fn=fake_generate)
+    stats = run_message_batch(COMPANIES, SENDER, CONFIG, path, generate_fn=fake_generate)
+
+    assert stats['skipped'] == 2
+    assert stats['generated'] == 4
+    assert len(calls) == 6
+
+    # 設定が変わったら別物として扱う
+    other = {'model': 'gpt-4o'}
+    assert load_messages(path, config_fingerprint(SENDER, other)) == {}
+    with open(path, encoding='utf-8') as f:
+        assert len([json.loads(line) for line in f]) == 6
+
+
+def test_batch_backs_off_on_rate_limit(tmp_path, monkeypatch):
+    """429 を受けたらリトライし、同時実行数を下げる"""
+    attempts = {}
+
+    async def no_sleep(delay):
+        return None
+
+    async def flaky_generate(company_info, **kwargs):
+        name = company_info['company_name']
+        attempts[name] = attempts.get(name, 0) + 1
+        if attempts[name] == 1:
+            raise FakeRateLimitError('rate limited')
+        return 'ok'
+
+    monkeypatch.setattr('scripts.lib.message_batch.asyncio.sleep', no_sleep)
+    path = str(tmp_path / 'list_messages.jsonl')
+    stats = run_message_batch(COMPANIES, SENDER, CONFIG, path, concurrency=4, generate_fn=flaky_generate)
+
+    assert stats['generated'] == len(COMPANIES)
+    assert stats['rate_limited'] == len(COMPANIES)
+
+
+def test_adaptive_limiter_halves_and_recovers():
+    """AIMD: 429で半減、成功が続くと1ずつ回復"""
+    limiter = AdaptiveLimiter(8)
+    limiter.on_rate_limit()
+    assert limiter.limit == 4
+    for _ in range(4):
+        limiter.on_success()
+    assert limiter.limit == 5
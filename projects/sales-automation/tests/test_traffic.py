@@ -0,0 +1,91 @@
+"""
+traffic.py（browser-api 通信の記録・再生）のテスト
+"""
+import gzip
+import json
+
+from scripts.lib import browser
+from scripts.lib.traffic import TrafficRecorder, TrafficReplayer
+
+PAGE_A = 'https://a.example.co.jp/'
+PAGE_B = 'https://b.example.co.jp/'
+SCRIPT = '(() => document.title)()'
+
+
+def record_session(path):
+    """A を開いて評価、B を開いて評価、B で再評価（結果が変わる）"""
+    recorder = TrafficRecorder(str(path))
+    recorder.record('3001', 'navigate', {'url': PAGE_A}, {'success': True, 'url': PAGE_A}, 0.2)
+    recorder.record('3001', 'evaluate', {'script': SCRIPT}, {'success': True, 'result': 'A'}, 0.01)
+    recorder.record('3001', 'navigate', {'url': PAGE_B}, {'success': True, 'url': PAGE_B}, 0.2)
+    recorder.record('3001', 'evaluate', {'script': SCRIPT}, {'success': True, 'result': 'B1'}, 0.01)
+    recorder.record('3001', 'evaluate', {'script': SCRIPT}, {'success': True, 'result': 'B2'}, 0.01)
+    recorder.close()
+    return recorder
+
+
+def test_archive_stores_params_once(tmp_path):
+    """同じリクエストのパラメータは初出時だけ保存する"""
+    path = tmp_path / 'traffic.jsonl.gz'
+    recorder = record_session(path)
+
+    with gzip.open(path, 'rt', encoding='utf-8') as f:
+        lines = [json.loads(line) for line in f]
+    assert lines[0]['version'] == 1
+    assert recorder.recorded == len(lines) - 1 == 5
+    evaluates = [e for e in lines[1:] if e['action'] == 'evaluate']
+    # A と B では同じスクリプトでも別キー。B の2回目は params を持たない
+    assert len({e['key'] for e in evaluates}) == 2
+    assert ['params' in e for e in evaluates] == [True, True, False]
+
+
+def test_replay_by_key_follows_current_page(tmp_path):
+    """評価結果は直前に開いたページの記録から返し、使い切ったら最後の記録を返す"""
+    path = tmp_path / 'traffic.jsonl.gz'
+    record_session(path)
+    replayer = TrafficReplayer(str(path), speed=0)
+
+    # 記録とは逆順に開いても、ページごとの結果が返る
+    assert replayer.replay('9000', 'navigate', {'url': PAGE_B})['success']
+    assert replayer.replay('9000', 'evaluate', {'script': SCRIPT})['result'] == 'B1'
+    assert replayer.replay('9000', 'evaluate', {'script': SCRIPT})['result'] == 'B2'
+    assert replayer.replay('9000', 'evaluate', {'script': SCRIPT})['result'] == 'B2'
+    replayer.replay('9000', 'navigate', {'url': PAGE_A})
+    assert replayer.replay('9000', 'evaluate', {'script': SCRIPT})['result'] == 'A'
+
+    missing = replayer.replay('9000', 'navigate', {'url': 'https://unknown.example.com/'})
+    assert not missing['success']
+    assert (replayer.replayed, replayer.misses) == (6, 1)
+
+
+def test_browser_functions_replay_without_containers(tmp_path):
+    """start_replay 後は browser.py の関数が記録から応答する"""
+    path = tmp_path / 'traffic.jsonl.gz'
+    record_session(path)
+
+    ports = browser.start_replay(str(path), speed=0, mode='order')
+    try:
+        assert ports == [3001]
+        assert browser.browser_navigate(3001, PAGE_A)
+        assert browser.browser_evaluate(3001, SCRIPT) == 'A'
+        assert browser.browser_navigate(3001, PAGE_B)
+        assert browser.browser_evaluate(3001, SCRIPT) == 'B1'
+        assert browser.browser_evaluate(3001, SCRIPT) == 'B2'
+        assert browser.browser_get_content(3001) is None  # 未記録
+    finally:
+        stats = browser.stop_traffic()
+    assert stats == {'replayed': 5, 'misses': 1}
+
+
+def test_recorded_failures_replay_as_failures(tmp_path):
+    """記録時の通信エラーは再生でも失敗になる"""
+    path = tmp_path / 'traffic.jsonl.gz'
+    recorder = TrafficRecorder(str(path))
+    recorder.record('3001', 'navigate', {'url': PAGE_A}, {'success': False, 'error': 'HTTP Error 500'}, 3.0)
+    recorder.close()
+
+    browser.start_replay(str(path), speed=0)
+    try:
+        assert browser.browser_navigate(3001, PAGE_A) is False
+    finally:
+        browser.stop_traffic()
@@ -14,35 +14,51 @@ Features:
 __version__ = "0.2.0"
 __author__ = "zeneffi"
 
-from .cli import main
-from .orchestrator import Orchestrator
-from .browser_pool import BrowserPool
-from .snapshot import SnapshotManager
-from .task_parser import TaskParser, LLMTaskParser, create_parser
-from .llm_client import LLMClient
-from .semantic_filter import SemanticFilter
-from .retry import retry_with_backoff, RetryConfig, FallbackChain
-
-# MCP server (optional import)
-try:
-    from .mcp_server import ResearchAgentMCPServer
-    _MCP_AVAILABLE = True
-except ImportError:
-    _MCP_AVAILABLE = False
-    ResearchAgentMCPServer = None
-
-__all__ = [
-    "main",
-    "Orchestrator",
-    "BrowserPool",
-    "SnapshotManager",
-    "TaskParser",
-    "LLMTaskParser",
-    "create_parser",
-    "LLMClient",
-    "SemanticFilter",
-    "retry_with_backoff",
-    "RetryConfig",
-    "FallbackChain",
-    "ResearchAgentMCPServer",
-]
+import importlib
+
+# Public names -> defining module. Resolved on first access (PEP 562) so that
+# importing the package, e.g. for ``python -m src list``, does not load aiohttp,
+# numpy, LiteLLM or sentence-transformers.
+_EXPORTS = {
+    "main": ".cli",
+    "Orchestrator": ".orchestrator",
+    "ResearchEvent": ".events",
+    "BrowserPool": ".browser_pool",
+    "SnapshotManager": ".snapshot",
+    "PageCache": ".page_cache",
+    "TrafficRecorder": ".traffic",
+    "TrafficReplayer": ".traffic",
+    "JobScheduler": ".job_scheduler",
+    "JobQueueFull": ".job_scheduler",
+    "TaskParser": ".task_parser",
+    "LLMTaskParser": ".task_parser",
+    "create_parser": ".task_parser",
+    "LLMClient": ".llm_client",
+    "SemanticFilter": ".semantic_filter",
+    "MapReduceSummarizer": ".summarizer",
+    "retry_with_backoff": ".retry",
+    "RetryConfig": ".retry",
+    "FallbackChain": ".retry",
+    "ResearchAgentMCPServer": ".mcp_server",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    try:
+        value = getattr(importlib.import_module(module_name, __name__), name)
+    except ImportError:
+        # MCP server is optional
+        if name != "ResearchAgentMCPServer":
+            raise
+        value = None
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_EXPORTS))
@@ -2,18 +2,61 @@
 Browser Pool - Docker container lifecycle management for browser instances.
 
 Manages a pool of Docker containers running Playwright browsers.
+
+Two modes are supported:
+- Cold mode (``start``/``stop``): containers are recreated for every session.
+  ``start_each`` yields every container as soon as it is ready instead of
+  waiting for all of them.
+- Warm mode (``lease``/``release``): long-lived containers are kept running
+  between sessions and leased to a session, then handed back with their tabs
+  reset. Leases are held by the browser-api inside each container, so several
+  processes (CLI, MCP server) can share the same warm pool safely.
+
+All Docker calls go through ``asyncio.create_subprocess_exec`` so the event
+loop is never blocked, and containers are (re)created concurrently with a
+bounded number of in-flight Docker commands.
+
+Each container can also be split into several tab-addressed slots
+(``open_slots``/``close_slots``) so I/O-bound pages run concurrently inside
+one browser. The number of slots per container is chosen from its memory
+headroom reported by the browser-api.
+
+With a TrafficRecorder every browser-api call is captured to a traffic
+archive; with a TrafficReplayer calls are answered from one instead, and
+start()/lease() hand out stand-in instances without any containers.
 """
 
 import asyncio
+import hashlib
 import json
+import logging
+import os
 import subprocess
+import time
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Optional
+from typing import AsyncIterator, Optional, Union
 from uuid import uuid4
 
 import aiohttp
 
+from . import tracing
+from .traffic import TrafficRecorder, TrafficReplayer
+
+logger = logging.getLogger(__name__)
+
+# Container labels used to tell warm-pool containers from per-session ones
+POOL_LABEL = "daytona.pool"
+WARM_POOL = "warm"
+COLD_POOL = "cold"
+WARM_CONTAINER_PREFIX = "docker-browser-warm"
+DEFAULT_LEASE_TTL = 2 * 60 * 60  # seconds
+DEFAULT_DOCKER_CONCURRENCY = 4
+# Admission control for tab slots: expected memory per extra tab and the share
+# of the container's memory limit we are willing to fill
+DEFAULT_TAB_MEMORY_MB = 350
+MEMORY_HEADROOM = 0.8
+
 
 @dataclass
 class BrowserInstance:
@@ -28,6 +71,137 @@ class BrowserInstance:
     status: str = "starting"
     current_url: str = ""
     error: Optional[str] = None
+    warm: bool = False
+    leased: bool = False
+
+
+@dataclass
+class BrowserSlot:
+    """
+    One concurrently usable tab of a browser instance.
+
+    Quacks like a BrowserInstance (``id``/``status``/``api_port``) so it can be
+    handed to the scheduler and to every BrowserPool action method.
+    """
+    instance: BrowserInstance
+    index: int
+    tab_id: Optional[str] = None  # None = the instance's current tab
+
+    @property
+    def id(self) -> str:
+        return f"{self.instance.id}#{self.index}"
+
+    @property
+    def status(self) -> str:
+        return self.instance.status
+
+    @property
+    def api_port(self) -> int:
+        return self.instance.api_port
+
+
+# Anything BrowserPool actions can run on
+BrowserTarget = Union[BrowserInstance, BrowserSlot]
+
+
+@dataclass
+class StartupTiming:
+    """Per-container startup timings (seconds, measured from start of recreate)."""
+    container_name: str
+    started_at: float
+    removed: Optional[float] = None
+    created: Optional[float] = None
+    ready: Optional[float] = None
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-friendly dictionary."""
+        return {
+            "container": self.container_name,
+            "remove_s": self.removed,
+            "run_s": self.created,
+            "ready_s": self.ready,
+            "error": self.error,
+        }
+
+
+@dataclass
+class ReadinessStats:
+    """Time spent waiting for page readiness vs. the fixed sleeps it replaces."""
+    pages: int = 0
+    waited: float = 0.0
+    saved: float = 0.0
+    timeouts: int = 0
+
+    def record(self, readiness: dict, baseline_sleep: float) -> None:
+        """Record one readiness result (waitedMs from browser-api)."""
+        waited = readiness.get("waitedMs", 0) / 1000
+        self.pages += 1
+        self.waited += waited
+        self.saved += baseline_sleep - waited
+        if readiness.get("timedOut"):
+            self.timeouts += 1
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-friendly dictionary."""
+        return {
+            "pages": self.pages,
+            "waited_s": round(self.waited, 3),
+            "saved_s": round(self.saved, 3),
+            "timeouts": self.timeouts,
+        }
+
+
+# Request-blocking profiles of the browser-api (see browserManager.ts)
+BLOCK_FULL = "full"            # block nothing (forms, screenshots)
+BLOCK_NO_MEDIA = "no-media"    # images, video, fonts, ad/analytics domains
+BLOCK_TEXT_ONLY = "text-only"  # additionally CSS and third-party scripts/XHR
+BLOCK_PROFILES = (BLOCK_FULL, BLOCK_NO_MEDIA, BLOCK_TEXT_ONLY)
+
+
+@dataclass
+class BlockingStats:
+    """Requests blocked, estimated bytes saved and page load time per blocking profile."""
+    profiles: dict = field(default_factory=dict)
+
+    def record(self, blocking: dict) -> None:
+        """Record the "blocking" part of one navigate result."""
+        profile = blocking.get("profile", BLOCK_FULL)
+        totals = self.profiles.setdefault(
+            profile, {"pages": 0, "load_ms": 0, "blocked": 0, "bytes_saved": 0}
+        )
+        totals["pages"] += 1
+        totals["load_ms"] += blocking.get("loadMs", 0)
+        totals["blocked"] += blocking.get("blocked", 0)
+        totals["bytes_saved"] += blocking.get("bytesSaved", 0)
+
+    def to_dict(self) -> dict:
+        """
+        Convert to a JSON-friendly dictionary.
+
+        load_ms_delta_vs_full compares average load times with pages loaded
+        under the full profile in the same run (None without such pages).
+        """
+        full = self.profiles.get(BLOCK_FULL)
+        full_avg = full["load_ms"] / full["pages"] if full and full["pages"] else None
+        result = {}
+        for profile, totals in self.profiles.items():
+            avg = totals["load_ms"] / totals["pages"] if totals["pages"] else 0.0
+            result[profile] = {
+                "pages": totals["pages"],
+                "blocked": totals["blocked"],
+                "bytes_saved": totals["bytes_saved"],
+                "avg_load_ms": round(avg),
+                "load_ms_delta_vs_full": (
+                    None if full_avg is None or profile == BLOCK_FULL else round(avg - full_avg)
+                ),
+            }
+        return result
+
+
+# Default readiness: wait until the DOM has been quiet for 500ms, capped at 2s
+# (the fixed sleep it replaces), so it is never slower than the old behaviour.
+DEFAULT_READINESS = {"strategy": "domquiet", "quietMs": 500, "timeout": 2000}
 
 
 @dataclass
@@ -37,6 +211,7 @@ class PoolStatus:
     running: int = 0
     starting: int = 0
     error: int = 0
+    leased: int = 0
     containers: list = field(default_factory=list)
 
 
@@ -46,18 +221,26 @@ class BrowserPool:
 
     Provides methods to:
     - Start/stop containers
+    - Lease/release instances from a long-lived warm pool
     - Check health status
     - Execute browser commands
     - Manage sessions
     """
 
+    # Upper bound for the warm pool (same as the CLI's MAX_PARALLEL)
+    MAX_WARM_SIZE = 15
+
     def __init__(
         self,
         docker_compose_path: Optional[Path] = None,
         base_api_port: int = 3000,
         base_vnc_port: int = 5900,
         base_novnc_port: int = 6080,
-        proxy_config_path: Optional[Path] = None
+        proxy_config_path: Optional[Path] = None,
+        docker_concurrency: int = DEFAULT_DOCKER_CONCURRENCY,
+        pool_id: Optional[str] = None,
+        recorder: Optional[TrafficRecorder] = None,
+        replayer: Optional[TrafficReplayer] = None
     ):
         self.docker_compose_path = docker_compose_path or Path(__file__).parent.parent / "docker"
         self.base_api_port = base_api_port
@@ -65,7 +248,20 @@ class BrowserPool:
         self.base_novnc_port = base_novnc_port
         self.instances: dict[str, BrowserInstance] = {}
         self._http_session: Optional[aiohttp.ClientSession] = None
+        # Part of every lease owner; pass a persisted id to take over the
+        # leases of a previous process
+        self._pool_id = pool_id or uuid4().hex[:8]
+        # Bounds concurrent docker run/rm calls (dockerd serializes heavily beyond this)
+        self._docker_semaphore = asyncio.Semaphore(max(1, docker_concurrency))
+        self.startup_timings: dict[str, StartupTiming] = {}
+        self.readiness_stats = ReadinessStats()
+        self.blocking_stats = BlockingStats()
+        self._batch_unsupported: set[str] = set()
+        self._raw_screenshot_unsupported: set[str] = set()
         self.proxies: list[dict] = []
+        # Capture browser-api traffic, or serve it from an archive
+        self.recorder = recorder
+        self.replayer = replayer
 
         # プロキシ設定を読み込む
         proxy_path = proxy_config_path or Path(__file__).parent.parent / "config" / "proxies.json"
@@ -74,6 +270,11 @@ class BrowserPool:
                 config = json.load(f)
                 self.proxies = config.get("proxies", [])
 
+    @property
+    def pool_id(self) -> str:
+        """Id that makes lease owners of this pool object unique."""
+        return self._pool_id
+
     async def _get_http_session(self) -> aiohttp.ClientSession:
         """Get or create HTTP session."""
         if self._http_session is None or self._http_session.closed:
@@ -105,25 +306,65 @@ class BrowserPool:
             return int(match.group(1))
         return container_port  # Fallback to container port
 
-    def _run_docker_command(self, *args: str, capture_output: bool = True) -> subprocess.CompletedProcess:
-        """Run a docker command."""
-        cmd = ["docker"] + list(args)
-        return subprocess.run(
+    async def _run_command(self, cmd: list[str]) -> subprocess.CompletedProcess:
+        """Run a command without blocking the event loop."""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                cwd=self.docker_compose_path
+            )
+        except FileNotFoundError as e:
+            return subprocess.CompletedProcess(cmd, 127, "", str(e))
+
+        stdout, stderr = await proc.communicate()
+        return subprocess.CompletedProcess(
             cmd,
-            capture_output=capture_output,
-            text=True,
-            cwd=self.docker_compose_path
+            proc.returncode,
+            stdout.decode("utf-8", errors="replace"),
+            stderr.decode("utf-8", errors="replace")
         )
 
-    def _run_compose_command(self, *args: str, capture_output: bool = True) -> subprocess.CompletedProcess:
+    async def _run_docker_command(self, *args: str) -> subprocess.CompletedProcess:
+        """Run a docker command."""
+        return await self._run_command(["docker"] + list(args))
+
+    async def _run_compose_command(self, *args: str) -> subprocess.CompletedProcess:
         """Run a docker-compose command."""
-        cmd = ["docker", "compose"] + list(args)
-        return subprocess.run(
-            cmd,
-            capture_output=capture_output,
-            text=True,
-            cwd=self.docker_compose_path
-        )
+        return await self._run_command(["docker", "compose"] + list(args))
+
+    async def _recreate_container(
+        self,
+        container_name: str,
+        index: int,
+        pool: str,
+        profile_dir: Optional[Path] = None
+    ) -> None:
+        """Remove any existing container with this name and run a fresh one."""
+        timing = StartupTiming(container_name=container_name, started_at=time.monotonic())
+        self.startup_timings[container_name] = timing
+
+        async with self._docker_semaphore:
+            try:
+                # 既存コンテナを削除（rm -f は稼働中でも強制停止する）
+                await self._run_docker_command("rm", "-f", container_name)
+                timing.removed = round(time.monotonic() - timing.started_at, 3)
+
+                await self._run_container(container_name, index, pool, profile_dir)
+                timing.created = round(time.monotonic() - timing.started_at, 3)
+            except Exception as e:
+                timing.error = str(e)
+                raise
+
+    def get_startup_timings(self) -> list[dict]:
+        """
+        Get startup timings of containers started by this pool.
+
+        Returns:
+            List of per-container timing dictionaries
+        """
+        return [t.to_dict() for t in self.startup_timings.values()]
 
     async def start(
         self,
@@ -144,103 +385,215 @@ class BrowserPool:
         Returns:
             List of started browser instances
         """
+        if self.replayer:
+            return self._replay_instances(count, session)
+
         # Build image if requested
         if build:
-            result = self._run_compose_command("build")
+            result = await self._run_compose_command("build")
             if result.returncode != 0:
                 raise RuntimeError(f"Failed to build image: {result.stderr}")
 
-        # 個別にコンテナを起動（プロキシ割り当て）
-        for i in range(count):
-            container_name = f"docker-browser-{i + 1}"
-
-            # 既存コンテナを停止・削除
-            self._run_docker_command("stop", container_name)
-            self._run_docker_command("rm", "-f", container_name)
-
-            # プロキシ設定
-            env_args = [
-                "-e", "DISPLAY=:99",
-                "-e", "API_PORT=3000",
-                "-e", "VNC_PORT=5900",
-                "-e", "NOVNC_PORT=6080",
-            ]
-
-            if self.proxies and i < len(self.proxies):
-                proxy = self.proxies[i]
-                proxy_url = f"http://{proxy['host']}:{proxy['port']}"
-                env_args.extend([
-                    "-e", f"PROXY_SERVER={proxy_url}",
-                    "-e", f"PROXY_USERNAME={proxy['username']}",
-                    "-e", f"PROXY_PASSWORD={proxy['password']}",
-                ])
-
-            # ボリュームマウント設定
-            volume_args = []
-            if profile_dir:
-                # プロファイルディレクトリをコンテナにマウント
-                host_profile = Path(profile_dir).absolute()
-                host_profile.mkdir(parents=True, exist_ok=True)
-                volume_args = ["-v", f"{host_profile}:/app/profile"]
-                env_args.extend(["-e", "BROWSER_PROFILE_DIR=/app/profile"])
-
-            # コンテナを起動
-            result = self._run_docker_command(
-                "run", "-d",
-                "--name", container_name,
-                "--shm-size=2g",
-                "-p", "3000",
-                "-p", "5900",
-                "-p", "6080",
-                *env_args,
-                *volume_args,
-                "docker-browser"
-            )
-            if result.returncode != 0:
-                raise RuntimeError(f"Failed to start container {container_name}: {result.stderr}")
-
-        # Wait for containers to be ready
-        await asyncio.sleep(2)
+        # 個別にコンテナを起動（プロキシ割り当て、並列数は semaphore で制限）
+        with tracing.span("pool.start_containers", count=count):
+            await asyncio.gather(*[
+                self._recreate_container(f"docker-browser-{i + 1}", i, COLD_POOL, profile_dir)
+                for i in range(count)
+            ])
 
         # Get container info
-        containers = await self._get_containers(session)
+        containers = await self._get_containers(pool=COLD_POOL)
 
         # Initialize browser instances
         instances = []
-        for i, container in enumerate(containers):
-            # Parse port mappings from container info
-            ports_str = container.get("ports", "")
-            api_port = self._parse_port(ports_str, 3000)
-            vnc_port = self._parse_port(ports_str, 5900)
-            novnc_port = self._parse_port(ports_str, 6080)
+        for container in containers:
+            instance = self._instance_from_container(container, session)
+            self.instances[instance.id] = instance
+            instances.append(instance)
+
+        # Wait for APIs to be ready
+        with tracing.span("pool.wait_ready", count=len(instances)):
+            await self._wait_for_ready(instances)
 
+        return instances
+
+    async def start_each(
+        self,
+        count: int,
+        session: str,
+        build: bool = False,
+        profile_dir: Optional[Path] = None,
+        timeout: int = 60
+    ) -> AsyncIterator[BrowserInstance]:
+        """
+        Start browser containers and yield each one as soon as it is ready.
+
+        Unlike start(), which returns once every container answered /health,
+        callers can put the first browser to work while the others boot.
+        Containers that fail to start or time out are not yielded (their
+        error is kept in the startup timings).
+
+        Args:
+            count: Number of containers to start
+            session: Session name for labeling
+            build: Whether to rebuild the image
+            profile_dir: Browser profile directory to mount (for persistent login)
+            timeout: Seconds to wait for each container to become ready
+
+        Yields:
+            Ready browser instances, in the order they became ready
+        """
+        if self.replayer:
+            for instance in self._replay_instances(count, session):
+                yield instance
+            return
+
+        if build:
+            result = await self._run_compose_command("build")
+            if result.returncode != 0:
+                raise RuntimeError(f"Failed to build image: {result.stderr}")
+
+        ready: asyncio.Queue[Optional[BrowserInstance]] = asyncio.Queue()
+
+        async def start_one(index: int) -> None:
+            container_name = f"docker-browser-{index + 1}"
+            instance = None
+            try:
+                await self._recreate_container(container_name, index, COLD_POOL, profile_dir)
+                containers = await self._get_containers(pool=COLD_POOL)
+                container = next((c for c in containers if c["name"] == container_name), None)
+                if container is None:
+                    raise RuntimeError(f"Container {container_name} is not running")
+                instance = self._instance_from_container(container, session)
+                self.instances[instance.id] = instance
+                await self._wait_for_ready([instance], timeout=timeout)
+            except Exception as e:
+                logger.warning(f"Browser {container_name} failed to start: {e}")
+            finally:
+                await ready.put(instance if instance and instance.status == "ready" else None)
+
+        with tracing.span("pool.start_each", count=count):
+            jobs = [asyncio.create_task(start_one(i)) for i in range(count)]
+            try:
+                for _ in range(count):
+                    instance = await ready.get()
+                    if instance is not None:
+                        yield instance
+            finally:
+                for job in jobs:
+                    job.cancel()
+                await asyncio.gather(*jobs, return_exceptions=True)
+
+    def _replay_instances(self, count: int, session: str) -> list[BrowserInstance]:
+        """Stand-in instances for a replayed session, named after the recorded streams."""
+        names = self.replayer.streams[:count]
+        names += [f"replay-{i + 1}" for i in range(len(names), count)]
+        instances = []
+        for name in names:
             instance = BrowserInstance(
-                id=str(uuid4()),
-                container_id=container["id"],
-                container_name=container["name"],
+                id=name,
+                container_id=name,
+                container_name=f"replay-{name}",
                 session=session,
-                api_port=api_port,
-                vnc_port=vnc_port,
-                novnc_port=novnc_port
+                api_port=0,
+                vnc_port=0,
+                novnc_port=0,
+                status="ready"
             )
             self.instances[instance.id] = instance
             instances.append(instance)
+        return instances
 
-        # Wait for APIs to be ready
-        await self._wait_for_ready(instances)
+    async def _run_container(
+        self,
+        container_name: str,
+        index: int,
+        pool: str,
+        profile_dir: Optional[Path] = None
+    ) -> None:
+        """
+        Run a single browser container.
 
-        return instances
+        Args:
+            container_name: Docker container name
+            index: Slot index (used for proxy assignment)
+            pool: Pool label value (warm or cold)
+            profile_dir: Browser profile directory to mount
+        """
+        # プロキシ設定
+        env_args = [
+            "-e", "DISPLAY=:99",
+            "-e", "API_PORT=3000",
+            "-e", "VNC_PORT=5900",
+            "-e", "NOVNC_PORT=6080",
+        ]
+
+        if self.proxies and index < len(self.proxies):
+            proxy = self.proxies[index]
+            proxy_url = f"http://{proxy['host']}:{proxy['port']}"
+            env_args.extend([
+                "-e", f"PROXY_SERVER={proxy_url}",
+                "-e", f"PROXY_USERNAME={proxy['username']}",
+                "-e", f"PROXY_PASSWORD={proxy['password']}",
+            ])
+
+        # ボリュームマウント設定
+        volume_args = []
+        if profile_dir:
+            # プロファイルディレクトリをコンテナにマウント
+            host_profile = Path(profile_dir).absolute()
+            host_profile.mkdir(parents=True, exist_ok=True)
+            volume_args = ["-v", f"{host_profile}:/app/profile"]
+            env_args.extend(["-e", "BROWSER_PROFILE_DIR=/app/profile"])
+
+        # コンテナを起動
+        result = await self._run_docker_command(
+            "run", "-d",
+            "--name", container_name,
+            "--label", f"{POOL_LABEL}={pool}",
+            "--shm-size=2g",
+            "-p", "3000",
+            "-p", "5900",
+            "-p", "6080",
+            *env_args,
+            *volume_args,
+            "docker-browser"
+        )
+        if result.returncode != 0:
+            raise RuntimeError(f"Failed to start container {container_name}: {result.stderr}")
+
+    async def _remove_container(self, container: str) -> None:
+        """Force-remove a container (bounded by the docker semaphore)."""
+        async with self._docker_semaphore:
+            await self._run_docker_command("rm", "-f", container)
+
+    def _instance_from_container(self, container: dict, session: str) -> BrowserInstance:
+        """Build a BrowserInstance from docker ps info."""
+        ports_str = container.get("ports", "")
+        return BrowserInstance(
+            id=str(uuid4()),
+            container_id=container["id"],
+            container_name=container["name"],
+            session=session,
+            api_port=self._parse_port(ports_str, 3000),
+            vnc_port=self._parse_port(ports_str, 5900),
+            novnc_port=self._parse_port(ports_str, 6080)
+        )
 
-    async def _get_containers(self, session: Optional[str] = None) -> list[dict]:
+    async def _get_containers(self, pool: Optional[str] = None) -> list[dict]:
         """Get running container info."""
-        result = self._run_docker_command(
+        filter_args = ["--filter", "ancestor=docker-browser"]
+        if pool:
+            filter_args = ["--filter", f"label={POOL_LABEL}={pool}"]
+
+        result = await self._run_docker_command(
             "ps", "--format", "json",
-            "--filter", "ancestor=docker-browser"
+            *filter_args
         )
 
         if result.returncode != 0:
             # Try alternative filter
-            result = self._run_compose_command("ps", "--format", "json")
+            result = await self._run_compose_command("ps", "--format", "json")
 
         containers = []
         if result.stdout:
@@ -252,7 +605,8 @@ class BrowserPool:
                             "id": container.get("ID", container.get("id", "")),
                             "name": container.get("Names", container.get("name", "")),
                             "status": container.get("Status", container.get("status", "")),
-                            "ports": container.get("Ports", container.get("ports", ""))
+                            "ports": container.get("Ports", container.get("ports", "")),
+                            "labels": container.get("Labels", container.get("labels", ""))
                         })
                     except json.JSONDecodeError:
                         continue
@@ -276,6 +630,9 @@ class BrowserPool:
                         data = await response.json()
                         if data.get("browser") == "ready":
                             instance.status = "ready"
+                            timing = self.startup_timings.get(instance.container_name)
+                            if timing and timing.ready is None:
+                                timing.ready = round(time.monotonic() - timing.started_at, 3)
                             return True
                 return False
             except Exception:
@@ -289,11 +646,15 @@ class BrowserPool:
                     if instance.status != "ready":
                         instance.status = "error"
                         instance.error = "Timeout waiting for ready"
+                        timing = self.startup_timings.get(instance.container_name)
+                        if timing and timing.ready is None:
+                            timing.error = instance.error
                 break
 
             # Check all instances
+            pending = [i for i in instances if i.status != "ready"]
             results = await asyncio.gather(
-                *[check_instance(i) for i in instances],
+                *[check_instance(i) for i in pending],
                 return_exceptions=True
             )
 
@@ -309,18 +670,270 @@ class BrowserPool:
         Args:
             session: Session name to stop. If None, stops all containers.
         """
+        if self.replayer:
+            for instance_id, instance in list(self.instances.items()):
+                if session is None or instance.session == session:
+                    del self.instances[instance_id]
+            return
+
         if session:
-            # Stop specific session containers
+            # Stop specific session containers (warm containers are released, not stopped)
+            to_remove = []
             for instance_id, instance in list(self.instances.items()):
+                if instance.warm:
+                    if instance.session == session and instance.leased:
+                        await self.release([instance])
+                    continue
                 if instance.session == session:
-                    self._run_docker_command("stop", instance.container_id)
-                    self._run_docker_command("rm", "-f", instance.container_id)
+                    to_remove.append(instance)
                     del self.instances[instance_id]
+            await asyncio.gather(*[self._remove_container(i.container_id) for i in to_remove])
         else:
             # Stop all containers
-            self._run_compose_command("down")
+            await self._run_compose_command("down")
             self.instances.clear()
 
+    def _lease_owner(self, session: str) -> str:
+        """Lease owner id (session name + pool object id to avoid collisions)."""
+        return f"{session}#{self._pool_id}"
+
+    @staticmethod
+    def _warm_index(container_name: str) -> int:
+        """Slot index of a warm container (docker-browser-warm-3 -> 3)."""
+        try:
+            return int(container_name.rsplit("-", 1)[-1])
+        except ValueError:
+            return 0
+
+    async def _fetch_health(self, api_port: int) -> Optional[dict]:
+        """Fetch /health of a browser-api, or None if unreachable."""
+        try:
+            session = await self._get_http_session()
+            url = f"http://localhost:{api_port}/health"
+            async with session.get(url) as response:
+                if response.status == 200:
+                    return await response.json()
+        except Exception:
+            pass
+        return None
+
+    async def _post_pool_api(self, instance: BrowserInstance, path: str, payload: dict) -> dict:
+        """POST to a /pool/* endpoint of the instance's browser-api."""
+        session = await self._get_http_session()
+        url = f"http://localhost:{instance.api_port}/pool/{path}"
+        try:
+            async with session.post(url, json=payload) as response:
+                return await response.json()
+        except (aiohttp.ClientError, json.JSONDecodeError) as e:
+            return {"success": False, "error": str(e)}
+
+    async def attach(self, timeout: int = 10) -> list[BrowserInstance]:
+        """
+        Attach to the running warm pool without restarting any container.
+
+        Args:
+            timeout: Seconds to wait for containers that are not ready yet
+
+        Returns:
+            List of warm browser instances (leased or not)
+        """
+        containers = await self._get_containers(pool=WARM_POOL)
+        known = {i.container_id: i for i in self.instances.values() if i.warm}
+
+        attached = []
+        for container in sorted(containers, key=lambda c: self._warm_index(c["name"])):
+            instance = known.get(container["id"])
+            if instance is None:
+                instance = self._instance_from_container(container, session="")
+                instance.warm = True
+                self.instances[instance.id] = instance
+            attached.append(instance)
+
+        # Forget containers that disappeared since the last attach
+        live_ids = {c["id"] for c in containers}
+        for instance_id, instance in list(self.instances.items()):
+            if instance.warm and instance.container_id not in live_ids:
+                del self.instances[instance_id]
+
+        pending = [i for i in attached if i.status != "ready"]
+        if pending:
+            with tracing.span("pool.wait_ready", count=len(pending)):
+                await self._wait_for_ready(pending, timeout=timeout)
+
+        return attached
+
+    async def scale(self, size: int) -> list[BrowserInstance]:
+        """
+        Grow or shrink the warm pool to a target size.
+
+        New containers are started for missing slots. Surplus containers are
+        removed from the highest slot down; leased containers are never removed.
+
+        Args:
+            size: Target number of warm containers
+
+        Returns:
+            List of warm browser instances after scaling
+        """
+        size = max(0, min(size, self.MAX_WARM_SIZE))
+        containers = await self._get_containers(pool=WARM_POOL)
+        running = {c["name"] for c in containers}
+
+        # Grow (停止済みの残骸があれば削除してから起動)
+        missing = [
+            i for i in range(size)
+            if f"{WARM_CONTAINER_PREFIX}-{i + 1}" not in running
+        ]
+        await asyncio.gather(*[
+            self._recreate_container(f"{WARM_CONTAINER_PREFIX}-{i + 1}", i, WARM_POOL)
+            for i in missing
+        ])
+        started = bool(missing)
+
+        # Shrink
+        surplus = sorted(
+            (c for c in containers if self._warm_index(c["name"]) > size),
+            key=lambda c: self._warm_index(c["name"]),
+            reverse=True
+        )
+        removable = []
+        for container in surplus:
+            health = await self._fetch_health(self._parse_port(container.get("ports", ""), 3000))
+            if health and health.get("lease"):
+                continue
+            removable.append(container["id"])
+        await asyncio.gather(*[self._remove_container(c) for c in removable])
+
+        return await self.attach(timeout=60 if started else 10)
+
+    async def lease(
+        self,
+        count: int,
+        session: str,
+        ttl: int = DEFAULT_LEASE_TTL,
+        grow: bool = True
+    ) -> list[BrowserInstance]:
+        """
+        Lease ready instances from the warm pool.
+
+        Args:
+            count: Number of instances wanted
+            session: Session name of the leaseholder
+            ttl: Lease time-to-live in seconds (guards against crashed clients)
+            grow: Whether to start more warm containers if not enough are free
+
+        Returns:
+            List of leased instances (may be fewer than requested)
+        """
+        if self.replayer:
+            return self._replay_instances(count, session)
+
+        owner = self._lease_owner(session)
+        leased: list[BrowserInstance] = []
+
+        async def try_lease(candidates: list[BrowserInstance]) -> None:
+            for instance in candidates:
+                if len(leased) >= count:
+                    return
+                # Leased instances may belong to this very session
+                if instance in leased or instance.leased or instance.status != "ready":
+                    continue
+                result = await self._post_pool_api(
+                    instance, "lease", {"owner": owner, "ttlMs": ttl * 1000}
+                )
+                if result.get("success"):
+                    instance.session = session
+                    instance.leased = True
+                    leased.append(instance)
+
+        instances = await self.attach()
+        await try_lease(instances)
+
+        if len(leased) < count and grow:
+            await try_lease(await self.scale(len(instances) + count - len(leased)))
+
+        return leased
+
+    async def release(self, instances: list[BrowserInstance], reset: bool = True) -> None:
+        """
+        Hand leased instances back to the warm pool.
+
+        Args:
+            instances: Instances obtained from lease()
+            reset: Whether to close extra tabs and navigate to about:blank
+        """
+        async def release_one(instance: BrowserInstance) -> None:
+            if not instance.leased:
+                return
+            await self._post_pool_api(
+                instance, "release",
+                {"owner": self._lease_owner(instance.session), "reset": reset}
+            )
+            instance.leased = False
+            instance.session = ""
+
+        await asyncio.gather(*[release_one(i) for i in instances])
+
+    def _slot_count(self, health: Optional[dict], max_tabs: int, tab_memory_mb: int) -> int:
+        """Number of tab slots an instance can take given its memory headroom."""
+        memory = (health or {}).get("memory")
+        if not memory or not memory.get("limitBytes"):
+            # Older browser-api without memory info: stay at one tab
+            return 1
+        free = memory["limitBytes"] * MEMORY_HEADROOM - memory.get("usedBytes", 0)
+        extra = int(free // (tab_memory_mb * 1024 * 1024))
+        return max(1, min(max_tabs, 1 + extra))
+
+    async def open_slots(
+        self,
+        instances: list[BrowserInstance],
+        max_tabs: int,
+        tab_memory_mb: int = DEFAULT_TAB_MEMORY_MB
+    ) -> list[BrowserSlot]:
+        """
+        Split instances into tab slots that can run concurrently.
+
+        Slot 0 of each instance uses its current tab; the others get their own
+        background tab. The number of slots per instance (at most max_tabs) is
+        limited by the container's free memory.
+
+        Args:
+            instances: Ready browser instances
+            max_tabs: Upper bound of slots per instance
+            tab_memory_mb: Expected memory use of one extra tab
+
+        Returns:
+            Slots, interleaved across instances so work spreads evenly
+        """
+        async def open_for(instance: BrowserInstance) -> list[BrowserSlot]:
+            slots = [BrowserSlot(instance=instance, index=0)]
+            if max_tabs <= 1 or instance.status != "ready":
+                return slots
+            health = await self._fetch_health(instance.api_port)
+            count = self._slot_count(health, max_tabs, tab_memory_mb)
+            for index in range(1, count):
+                result = await self.execute(instance, "tabs/new", activate=False)
+                if not result.get("success"):
+                    logger.warning(f"Could not open tab on {instance.id}: {result.get('error')}")
+                    break
+                slots.append(BrowserSlot(instance=instance, index=index, tab_id=result["tabId"]))
+            return slots
+
+        per_instance = await asyncio.gather(*[open_for(i) for i in instances])
+
+        # Interleave: i0#0, i1#0, ..., i0#1, i1#1, ...
+        slots: list[BrowserSlot] = []
+        for depth in range(max((len(s) for s in per_instance), default=0)):
+            slots.extend(s[depth] for s in per_instance if depth < len(s))
+        return slots
+
+    async def close_slots(self, slots: list[BrowserSlot]) -> None:
+        """Close the background tabs opened by open_slots()."""
+        await asyncio.gather(*[
+            self.execute(slot.instance, "tabs/close", tabId=slot.tab_id)
+            for slot in slots if slot.tab_id
+        ])
+
     async def status(self, session: Optional[str] = None) -> dict:
         """
         Get status of browser containers.
@@ -331,7 +944,7 @@ class BrowserPool:
         Returns:
             Status dictionary with container information
         """
-        containers = await self._get_containers(session)
+        containers = await self._get_containers()
 
         pool_status = PoolStatus()
         pool_status.total = len(containers)
@@ -345,11 +958,20 @@ class BrowserPool:
             else:
                 pool_status.error += 1
 
+            pool_name = WARM_POOL if f"{POOL_LABEL}={WARM_POOL}" in container.get("labels", "") else COLD_POOL
+            lease = None
+            if pool_name == WARM_POOL:
+                health = await self._fetch_health(self._parse_port(container.get("ports", ""), 3000))
+                lease = (health or {}).get("lease")
+                if lease:
+                    pool_status.leased += 1
+
             pool_status.containers.append({
                 "name": container.get("name", ""),
                 "status": status_str,
                 "ports": container.get("ports", ""),
-                "session": session or ""
+                "pool": pool_name,
+                "session": (lease or {}).get("owner", "").split("#")[0] if lease else (session or "")
             })
 
         return {
@@ -357,12 +979,13 @@ class BrowserPool:
             "running": pool_status.running,
             "starting": pool_status.starting,
             "error": pool_status.error,
+            "leased": pool_status.leased,
             "containers": pool_status.containers
         }
 
     async def execute(
         self,
-        instance: BrowserInstance,
+        instance: BrowserTarget,
         action: str,
         **kwargs
     ) -> dict:
@@ -370,45 +993,296 @@ class BrowserPool:
         Execute a browser action on an instance.
 
         Args:
-            instance: Target browser instance
+            instance: Target browser instance, or a slot to address one of its tabs
             action: Action to execute (navigate, click, type, screenshot, etc.)
             **kwargs: Action-specific parameters
 
         Returns:
             Action result dictionary
         """
+        if isinstance(instance, BrowserSlot) and instance.tab_id:
+            kwargs.setdefault("tabId", instance.tab_id)
+
         if instance.status != "ready":
             return {"success": False, "error": f"Instance not ready: {instance.status}"}
 
+        stream = instance.instance.id if isinstance(instance, BrowserSlot) else instance.id
+        if self.replayer:
+            return await self.replayer.replay(stream, action, kwargs)
+
         session = await self._get_http_session()
         url = f"http://localhost:{instance.api_port}/browser/{action}"
 
+        started = time.monotonic()
         try:
             async with session.post(url, json=kwargs) as response:
                 result = await response.json()
-                return result
         except aiohttp.ClientError as e:
-            return {"success": False, "error": str(e)}
+            result = {"success": False, "error": str(e)}
+        if self.recorder:
+            self.recorder.record(stream, action, kwargs, result, time.monotonic() - started)
+        return result
 
-    async def navigate(self, instance: BrowserInstance, url: str) -> dict:
-        """Navigate to URL."""
-        return await self.execute(instance, "navigate", url=url)
+    async def navigate(
+        self,
+        instance: BrowserTarget,
+        url: str,
+        readiness: Optional[dict] = None,
+        baseline_sleep: float = 0.0,
+        profile: Optional[str] = None
+    ) -> dict:
+        """
+        Navigate to URL.
+
+        Args:
+            instance: Target browser instance
+            url: URL to open
+            readiness: Readiness options for browser-api, e.g.
+                {"strategy": "domquiet"|"networkidle"|"selector",
+                 "quietMs": 500, "timeout": 2000, "selector": "form"}
+            baseline_sleep: Fixed sleep (seconds) this readiness wait replaces,
+                used to record time saved
+            profile: Request-blocking profile (one of BLOCK_PROFILES); None
+                keeps the tab's current profile
+
+        Returns:
+            Navigation result (includes "readiness" and "blocking" when supported)
+        """
+        params: dict = {"url": url}
+        if readiness is not None:
+            params["readiness"] = readiness
+        if profile is not None:
+            params["profile"] = profile
+
+        result = await self.execute(instance, "navigate", **params)
+        if result.get("readiness"):
+            self.readiness_stats.record(result["readiness"], baseline_sleep)
+        if result.get("blocking"):
+            self.blocking_stats.record(result["blocking"])
+        return result
+
+    async def wait_ready(
+        self,
+        instance: BrowserTarget,
+        strategy: str = "domquiet",
+        timeout: int = 3000,
+        quiet_ms: int = 500,
+        selector: Optional[str] = None,
+        baseline_sleep: float = 0.0
+    ) -> dict:
+        """Wait for the current page to become ready (see navigate())."""
+        readiness = {"strategy": strategy, "timeout": timeout, "quietMs": quiet_ms}
+        if selector:
+            readiness["selector"] = selector
+        result = await self.execute(instance, "wait", readiness=readiness)
+        if result.get("readiness"):
+            self.readiness_stats.record(result["readiness"], baseline_sleep)
+        return result
+
+    async def execute_batch(
+        self,
+        instance: BrowserTarget,
+        steps: list[dict],
+        step_timeout: int = 30000,
+        timeout: Optional[float] = None
+    ) -> dict:
+        """
+        Execute several browser actions in one round-trip (/browser/batch).
+
+        Args:
+            instance: Target browser instance
+            steps: Ordered steps, each {"action": ..., "params": {...}} with optional
+                "timeout" (ms), "onError" ("abort"|"continue"|"skipNext") and
+                "stopIf" ("success"|"truthy"|"falsy")
+            step_timeout: Default per-step timeout in milliseconds
+            timeout: Overall HTTP timeout in seconds (default: sum of step timeouts)
+
+        Returns:
+            Batch result with per-step results shaped like the single-action
+            responses. {"success": False, "unsupported": True} when the
+            instance runs an older browser-api image without the endpoint.
+        """
+        if instance.status != "ready":
+            return {"success": False, "error": f"Instance not ready: {instance.status}"}
+        container_id = instance.instance.id if isinstance(instance, BrowserSlot) else instance.id
+        if container_id in self._batch_unsupported:
+            return {"success": False, "unsupported": True, "error": "Batch endpoint not available"}
+
+        payload = {"steps": steps, "timeout": step_timeout}
+        if isinstance(instance, BrowserSlot) and instance.tab_id:
+            payload["tabId"] = instance.tab_id
+
+        if timeout is None:
+            timeout = sum(step.get("timeout", step_timeout) for step in steps) / 1000 + 5
+
+        if self.replayer:
+            return await self.replayer.replay(container_id, "batch", payload)
+
+        session = await self._get_http_session()
+        url = f"http://localhost:{instance.api_port}/browser/batch"
+
+        started = time.monotonic()
+        try:
+            async with session.post(
+                url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 404:
+                    self._batch_unsupported.add(container_id)
+                    result = {"success": False, "unsupported": True, "error": "Batch endpoint not available"}
+                else:
+                    result = await response.json()
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            result = {"success": False, "error": str(e) or type(e).__name__}
+        if self.recorder:
+            self.recorder.record(container_id, "batch", payload, result, time.monotonic() - started)
+        return result
 
     async def screenshot(
         self,
-        instance: BrowserInstance,
+        instance: BrowserTarget,
         full_page: bool = False
     ) -> dict:
         """Take a screenshot."""
         return await self.execute(instance, "screenshot", fullPage=full_page)
 
-    async def snapshot(self, instance: BrowserInstance) -> dict:
+    async def screenshot_to_file(
+        self,
+        instance: BrowserTarget,
+        path: Path,
+        full_page: bool = False,
+        image_format: str = "png",
+        quality: Optional[int] = None,
+        clip: Optional[dict] = None,
+        max_height: Optional[int] = None,
+        timeout: float = 60
+    ) -> dict:
+        """
+        Stream a screenshot from /browser/screenshot/raw straight to a file.
+
+        The image is never base64-encoded or held in memory as a whole; chunks
+        are hashed as they arrive and written from a worker thread.
+
+        Args:
+            instance: Target browser instance
+            path: Destination file (written via a temporary file)
+            full_page: Capture the whole page instead of the viewport
+            image_format: "png", "jpeg" or "webp"
+            quality: JPEG/WebP quality (0-100)
+            clip: Region {"x", "y", "width", "height"} to capture
+            max_height: Cap on the full-page height in pixels
+            timeout: HTTP timeout in seconds
+
+        Returns:
+            {"success", "path", "sha256", "bytes", "content_type"}, or
+            {"success": False, "unsupported": True} on older browser-api images
+        """
+        if instance.status != "ready":
+            return {"success": False, "error": f"Instance not ready: {instance.status}"}
+        container_id = instance.instance.id if isinstance(instance, BrowserSlot) else instance.id
+        if container_id in self._raw_screenshot_unsupported:
+            return {"success": False, "unsupported": True, "error": "Raw screenshot endpoint not available"}
+
+        payload: dict = {"fullPage": full_page, "format": image_format}
+        if quality is not None:
+            payload["quality"] = quality
+        if clip:
+            payload["clip"] = clip
+        if max_height:
+            payload["maxHeight"] = max_height
+        if isinstance(instance, BrowserSlot) and instance.tab_id:
+            payload["tabId"] = instance.tab_id
+
+        if self.replayer:
+            return await self._replay_screenshot(container_id, payload, path)
+
+        started = time.monotonic()
+        result = await self._download_screenshot(instance, container_id, payload, path, timeout)
+        if self.recorder:
+            # Only the size is kept: replays write a placeholder of the same length
+            recorded = {k: v for k, v in result.items() if k not in ("path", "sha256")}
+            self.recorder.record(container_id, "screenshot/raw", payload, recorded, time.monotonic() - started)
+        return result
+
+    async def _download_screenshot(
+        self,
+        instance: BrowserTarget,
+        container_id: str,
+        payload: dict,
+        path: Path,
+        timeout: float
+    ) -> dict:
+        """POST /browser/screenshot/raw and stream the image to path (see screenshot_to_file())."""
+        session = await self._get_http_session()
+        url = f"http://localhost:{instance.api_port}/browser/screenshot/raw"
+        tmp_path = path.with_name(f".{path.name}.{uuid4().hex[:8]}.tmp")
+
+        try:
+            async with session.post(
+                url,
+                json=payload,
+                timeout=aiohttp.ClientTimeout(total=timeout)
+            ) as response:
+                if response.status == 404:
+                    self._raw_screenshot_unsupported.add(container_id)
+                    return {"success": False, "unsupported": True, "error": "Raw screenshot endpoint not available"}
+                if response.status != 200:
+                    # Error bodies are not always JSON (e.g. an HTML page from a proxy)
+                    try:
+                        error = await response.json(content_type=None)
+                    except ValueError:
+                        error = None
+                    message = error.get("error") if isinstance(error, dict) else None
+                    return {"success": False, "error": message or f"HTTP {response.status}"}
+
+                await asyncio.to_thread(path.parent.mkdir, parents=True, exist_ok=True)
+                digest = hashlib.sha256()
+                size = 0
+                f = await asyncio.to_thread(open, tmp_path, "wb")
+                try:
+                    async for chunk in response.content.iter_chunked(256 * 1024):
+                        digest.update(chunk)
+                        size += len(chunk)
+                        await asyncio.to_thread(f.write, chunk)
+                finally:
+                    await asyncio.to_thread(f.close)
+                await asyncio.to_thread(os.replace, tmp_path, path)
+
+                return {
+                    "success": True,
+                    "path": str(path),
+                    "sha256": digest.hexdigest(),
+                    "bytes": size,
+                    "content_type": response.headers.get("Content-Type", f"image/{payload['format']}"),
+                }
+        except (aiohttp.ClientError, asyncio.TimeoutError, OSError) as e:
+            tmp_path.unlink(missing_ok=True)
+            return {"success": False, "error": str(e) or type(e).__name__}
+
+    async def _replay_screenshot(self, container_id: str, payload: dict, path: Path) -> dict:
+        """Write a placeholder image of the recorded size."""
+        result = await self.replayer.replay(container_id, "screenshot/raw", payload)
+        if not result.get("success"):
+            return result
+        data = bytes(result.get("bytes", 0))
+
+        def write() -> None:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = path.with_name(f".{path.name}.{uuid4().hex[:8]}.tmp")
+            tmp_path.write_bytes(data)
+            os.replace(tmp_path, path)
+
+        await asyncio.to_thread(write)
+        return {**result, "path": str(path), "sha256": hashlib.sha256(data).hexdigest()}
+
+    async def snapshot(self, instance: BrowserTarget) -> dict:
         """Get page accessibility snapshot."""
         return await self.execute(instance, "snapshot")
 
     async def click(
         self,
-        instance: BrowserInstance,
+        instance: BrowserTarget,
         selector: Optional[str] = None,
         text: Optional[str] = None
     ) -> dict:
@@ -417,7 +1291,7 @@ class BrowserPool:
 
     async def type_text(
         self,
-        instance: BrowserInstance,
+        instance: BrowserTarget,
         text: str,
         selector: Optional[str] = None,
         submit: bool = False
@@ -428,13 +1302,53 @@ class BrowserPool:
             text=text, selector=selector, submit=submit
         )
 
-    async def get_content(self, instance: BrowserInstance) -> dict:
-        """Get page content."""
-        return await self.execute(instance, "content")
+    async def get_content(
+        self,
+        instance: BrowserTarget,
+        fields: Optional[list[str]] = None,
+        max_chars: Optional[int] = None,
+        main_content: bool = False
+    ) -> dict:
+        """
+        Get page content.
+
+        Only the requested fields are built and sent by the browser-api (the
+        response is gzip-compressed in transit). Older images ignore the
+        options and return everything.
+
+        Args:
+            instance: Target browser instance
+            fields: Subset of "html", "text", "url", "title" (default: all)
+            max_chars: Truncate html/text to this many characters
+            main_content: Extract the main content only, without navigation,
+                header, footer and other boilerplate
+
+        Returns:
+            Content result ("truncated" is set when max_chars cut the page)
+        """
+        return await self.execute(
+            instance, "content", **self.content_params(fields, max_chars, main_content)
+        )
+
+    @staticmethod
+    def content_params(
+        fields: Optional[list[str]] = None,
+        max_chars: Optional[int] = None,
+        main_content: bool = False
+    ) -> dict:
+        """browser-api parameters of a content request (also usable as a batch step's params)."""
+        params: dict = {}
+        if fields:
+            params["fields"] = fields
+        if max_chars:
+            params["maxChars"] = max_chars
+        if main_content:
+            params["mainContent"] = True
+        return params
 
     async def wait(
         self,
-        instance: BrowserInstance,
+        instance: BrowserTarget,
         selector: Optional[str] = None,
         text: Optional[str] = None,
         timeout: int = 30000
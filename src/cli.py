@@ -5,24 +5,26 @@ Usage:
     python -m daytona_agent research "query" --parallel 5 --screenshot
     python -m daytona_agent status
     python -m daytona_agent stop
+
+Only lightweight modules are imported at startup; the orchestrator, browser
+pool (aiohttp) and optional LLM/embedding stacks are loaded by the commands
+that use them, so ``list``, ``agent`` and ``--help`` start quickly.
 """
 
 import argparse
 import asyncio
 import sys
+from contextlib import aclosing
 from pathlib import Path
 from typing import Optional
 
 from rich.console import Console
 from rich.panel import Panel
-from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
 from rich.table import Table
-from rich.live import Live
+from rich.markup import escape
 
-from .orchestrator import Orchestrator
-from .browser_pool import BrowserPool
 from .snapshot import SnapshotManager
-from .task_parser import TaskParser
+from .traffic import REPLAY_MODES, TrafficRecorder, TrafficReplayer
 from .agent_registry import AgentRegistry
 
 console = Console()
@@ -45,6 +47,8 @@ Examples:
     python -m daytona_agent research "クラウドサービス比較" --screenshot
     python -m daytona_agent status
     python -m daytona_agent stop
+    python -m daytona_agent pool up --size 5
+    python -m daytona_agent research "LLM評価手法" --warm
         """
     )
 
@@ -74,6 +78,36 @@ Examples:
         action="store_true",
         help="Save screenshots at each step"
     )
+    research_parser.add_argument(
+        "--screenshot-format",
+        type=str,
+        choices=["png", "jpeg", "webp"],
+        default="png",
+        help="Screenshot image format (default: png)"
+    )
+    research_parser.add_argument(
+        "--block",
+        type=str,
+        choices=["auto", "text-only", "no-media", "full"],
+        default="auto",
+        help="Block page resources: auto picks per task type (default: auto)"
+    )
+    research_parser.add_argument(
+        "--no-http",
+        action="store_true",
+        help="Load every page in a browser (skip the plain HTTP fetch of static pages)"
+    )
+    research_parser.add_argument(
+        "--no-trace",
+        action="store_true",
+        help="Do not write the JSONL trace of the session (<output>/traces)"
+    )
+    research_parser.add_argument(
+        "--screenshot-quality",
+        type=int,
+        default=None,
+        help="JPEG/WebP screenshot quality 0-100"
+    )
     research_parser.add_argument(
         "--session",
         type=str,
@@ -97,6 +131,59 @@ Examples:
         default=None,
         help="Use a registered agent profile"
     )
+    research_parser.add_argument(
+        "--max-concurrency",
+        type=int,
+        default=None,
+        help="Global cap on concurrently running tasks (default: one per browser)"
+    )
+    research_parser.add_argument(
+        "--follow-links",
+        type=int,
+        default=0,
+        help="Crawl up to N result links per search task as follow-up tasks (default: 0)"
+    )
+    research_parser.add_argument(
+        "--tabs",
+        type=int,
+        default=1,
+        help="Concurrent tabs per browser, reduced automatically if memory is short (default: 1)"
+    )
+    research_parser.add_argument(
+        "--cache-mode",
+        choices=["off", "read-write", "read-only", "refresh"],
+        default="off",
+        help="Page cache: reuse pages fetched by earlier sessions (default: off)"
+    )
+    research_parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Lease browsers from the warm pool instead of cold-starting containers"
+    )
+    research_parser.add_argument(
+        "--record",
+        type=Path,
+        default=None,
+        help="Record all browser-api traffic to this archive (.jsonl.gz); disables the HTTP tier"
+    )
+    research_parser.add_argument(
+        "--replay",
+        type=Path,
+        default=None,
+        help="Answer browser-api calls from a recorded archive instead of starting browsers"
+    )
+    research_parser.add_argument(
+        "--replay-speed",
+        type=float,
+        default=1.0,
+        help="Replay at N times the recorded speed, 0 = no delays (default: 1)"
+    )
+    research_parser.add_argument(
+        "--replay-mode",
+        choices=REPLAY_MODES,
+        default="key",
+        help="Match recorded responses by request (key) or per browser in order (order)"
+    )
 
     # status command
     status_parser = subparsers.add_parser("status", help="Show current status")
@@ -128,6 +215,18 @@ Examples:
         action="store_true",
         help="Show all sessions including completed"
     )
+    list_parser.add_argument(
+        "--status",
+        type=str,
+        choices=["running", "paused", "completed", "failed"],
+        help="Only show sessions with this status"
+    )
+    list_parser.add_argument(
+        "--limit", "-n",
+        type=int,
+        default=None,
+        help="Show at most this many sessions (newest first)"
+    )
 
     # resume command
     resume_parser = subparsers.add_parser("resume", help="Resume a session")
@@ -136,6 +235,27 @@ Examples:
         type=str,
         help="Session name to resume"
     )
+    resume_parser.add_argument(
+        "--warm",
+        action="store_true",
+        help="Lease browsers from the warm pool instead of cold-starting containers"
+    )
+
+    # pool command
+    pool_parser = subparsers.add_parser("pool", help="Manage the warm browser pool")
+    pool_subparsers = pool_parser.add_subparsers(dest="pool_command", help="Pool commands")
+
+    # pool up
+    pool_up = pool_subparsers.add_parser("up", help="Start or resize the warm pool")
+    pool_up.add_argument(
+        "--size", "-n",
+        type=int,
+        default=DEFAULT_PARALLEL,
+        help=f"Target number of warm browsers (default: {DEFAULT_PARALLEL}, max: {MAX_PARALLEL})"
+    )
+
+    # pool down
+    pool_subparsers.add_parser("down", help="Remove all warm pool containers")
 
     # agent command
     agent_parser = subparsers.add_parser("agent", help="Manage agents")
@@ -163,6 +283,12 @@ Examples:
 
 async def cmd_research(args: argparse.Namespace) -> int:
     """Execute research command."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+    from . import events
+    from .browser_pool import BrowserPool
+    from .orchestrator import Orchestrator
+
     # 並列数の検証
     parallel = min(max(1, args.parallel), MAX_PARALLEL)
     if parallel != args.parallel:
@@ -171,6 +297,10 @@ async def cmd_research(args: argparse.Namespace) -> int:
     output_dir = Path(args.output)
     output_dir.mkdir(parents=True, exist_ok=True)
 
+    if args.record and args.replay:
+        console.print("[red]--record and --replay cannot be combined[/red]")
+        return 1
+
     # エージェントプロファイルを取得
     profile_dir = None
     if args.agent:
@@ -189,10 +319,16 @@ async def cmd_research(args: argparse.Namespace) -> int:
         f"Parallel browsers: {parallel}\n"
         f"Output: {output_dir}\n"
         f"Screenshots: {'Enabled' if args.screenshot else 'Disabled'}\n"
+        f"Warm pool: {'Enabled' if args.warm else 'Disabled'}\n"
         f"Agent: {args.agent or 'None'}",
         title="Daytona Agent"
     ))
 
+    # 通信の記録・再生（HTTP ティアはブラウザを通らないため無効化）
+    recorder = TrafficRecorder(args.record) if args.record else None
+    replayer = TrafficReplayer(args.replay, speed=args.replay_speed, mode=args.replay_mode) if args.replay else None
+    pool = BrowserPool(recorder=recorder, replayer=replayer) if recorder or replayer else None
+
     # オーケストレーター初期化
     orchestrator = Orchestrator(
         parallel=parallel,
@@ -200,7 +336,18 @@ async def cmd_research(args: argparse.Namespace) -> int:
         screenshot=args.screenshot,
         session_name=args.session,
         timeout=args.timeout,
-        profile_dir=profile_dir
+        profile_dir=profile_dir,
+        warm_pool=args.warm,
+        max_concurrency=args.max_concurrency,
+        follow_links=args.follow_links,
+        tabs_per_instance=args.tabs,
+        cache_mode=args.cache_mode,
+        screenshot_format=args.screenshot_format,
+        screenshot_quality=args.screenshot_quality,
+        block_profile=None if args.block == "auto" else args.block,
+        http_tier=not (args.no_http or pool),
+        pool=pool,
+        trace=not args.no_trace
     )
 
     try:
@@ -212,13 +359,46 @@ async def cmd_research(args: argparse.Namespace) -> int:
             TaskProgressColumn(),
             console=console
         ) as progress:
-            result = await orchestrator.run(args.query, progress)
+            # 完了したタスクの発見事項を逐次表示
+            result = {}
+            async with aclosing(orchestrator.stream(args.query, progress)) as stream:
+                async for event in stream:
+                    if event.type == events.FINDINGS_ADDED:
+                        top = event.data["findings"][0]
+                        progress.console.print(
+                            f"[green]✓[/green] {escape(top.get('title') or top.get('source', ''))} "
+                            f"[dim]({len(event.data['findings'])} findings) "
+                            f"{escape(top.get('summary', '')[:80])}[/dim]"
+                        )
+                    elif event.type == events.COMPLETED:
+                        result = event.data["result"]
+                    elif event.type == events.FAILED:
+                        raise RuntimeError(event.data["error"])
 
         # 結果表示
+        cache_stats = result.get('cache', {})
+        cache_line = ""
+        if cache_stats.get('mode', 'off') != 'off':
+            cache_line = f"Page cache: {cache_stats.get('hits', 0)} hits, {cache_stats.get('misses', 0)} misses\n"
+        blocked = sum(p.get('blocked', 0) for p in result.get('blocking', {}).values())
+        if blocked:
+            saved_mb = sum(p.get('bytes_saved', 0) for p in result['blocking'].values()) / 1024 / 1024
+            cache_line += f"Blocked requests: {blocked} (~{saved_mb:.1f} MB saved)\n"
+        http_stats = result.get('http_tier') or {}
+        if http_stats.get('served') or http_stats.get('escalated'):
+            cache_line += (
+                f"HTTP fetch: {http_stats['served']} pages (avg {http_stats['avg_served_ms']}ms), "
+                f"{http_stats['escalated']} sent to a browser\n"
+            )
+        timings = result.get('timings') or {}
+        if timings.get('phases_s'):
+            phases = ", ".join(f"{name} {seconds:.1f}s" for name, seconds in timings['phases_s'].items())
+            cache_line += f"Time: {timings['total_s']:.1f}s ({phases})\n"
         console.print("\n")
         console.print(Panel(
             f"[bold green]Research Complete[/bold green]\n\n"
             f"Tasks completed: {result.get('completed', 0)}/{result.get('total', 0)}\n"
+            f"{cache_line}"
             f"Results saved to: {result.get('output_path', output_dir)}",
             title="Results"
         ))
@@ -247,10 +427,23 @@ async def cmd_research(args: argparse.Namespace) -> int:
         console.print(f"[red]Error: {e}[/red]")
         await orchestrator.stop()
         return 1
+    finally:
+        if pool:
+            await pool.close()
+        if recorder:
+            recorder.close()
+            console.print(f"Recorded {recorder.stats.recorded} browser-api requests to {args.record}")
+        if replayer:
+            console.print(
+                f"Replayed {replayer.stats.replayed} browser-api requests "
+                f"({replayer.stats.misses} not in the archive)"
+            )
 
 
 async def cmd_status(args: argparse.Namespace) -> int:
     """Show status of running containers."""
+    from .browser_pool import BrowserPool
+
     pool = BrowserPool()
 
     try:
@@ -264,6 +457,7 @@ async def cmd_status(args: argparse.Namespace) -> int:
         table.add_column("Container", style="cyan")
         table.add_column("Status", style="green")
         table.add_column("Ports", style="yellow")
+        table.add_column("Pool", style="magenta")
         table.add_column("Session", style="blue")
 
         for container in status.get('containers', []):
@@ -271,6 +465,7 @@ async def cmd_status(args: argparse.Namespace) -> int:
                 container.get('name', 'Unknown'),
                 container.get('status', 'Unknown'),
                 container.get('ports', ''),
+                container.get('pool', ''),
                 container.get('session', '')
             )
 
@@ -284,6 +479,8 @@ async def cmd_status(args: argparse.Namespace) -> int:
 
 async def cmd_stop(args: argparse.Namespace) -> int:
     """Stop running containers."""
+    from .browser_pool import BrowserPool
+
     pool = BrowserPool()
 
     if not args.force:
@@ -310,7 +507,11 @@ async def cmd_list(args: argparse.Namespace) -> int:
     snapshot_manager = SnapshotManager()
 
     try:
-        sessions = await snapshot_manager.list_sessions(include_completed=args.all)
+        sessions = await snapshot_manager.list_sessions(
+            include_completed=args.all,
+            status=args.status,
+            limit=args.limit
+        )
 
         if not sessions:
             console.print("[yellow]No sessions found[/yellow]")
@@ -340,6 +541,10 @@ async def cmd_list(args: argparse.Namespace) -> int:
 
 async def cmd_resume(args: argparse.Namespace) -> int:
     """Resume a session."""
+    from rich.progress import Progress, SpinnerColumn, TextColumn, BarColumn, TaskProgressColumn
+
+    from .orchestrator import Orchestrator
+
     snapshot_manager = SnapshotManager()
 
     try:
@@ -355,7 +560,8 @@ async def cmd_resume(args: argparse.Namespace) -> int:
             output_dir=Path(session.get('output_dir', DEFAULT_OUTPUT_DIR)),
             screenshot=session.get('screenshot', False),
             session_name=args.session,
-            timeout=session.get('timeout', 300)
+            timeout=session.get('timeout', 300),
+            warm_pool=args.warm
         )
 
         with Progress(
@@ -439,6 +645,54 @@ async def cmd_agent(args: argparse.Namespace) -> int:
     return 0
 
 
+async def cmd_pool(args: argparse.Namespace) -> int:
+    """Manage the warm browser pool."""
+    from .browser_pool import BrowserPool
+
+    pool = BrowserPool()
+
+    try:
+        if args.pool_command == "up":
+            size = min(max(1, args.size), MAX_PARALLEL)
+            with console.status(f"Scaling warm pool to {size} browsers..."):
+                instances = await pool.scale(size)
+            ready = len([i for i in instances if i.status == "ready"])
+            console.print(f"[green]Warm pool ready: {ready}/{len(instances)} browsers[/green]")
+
+            timings = pool.get_startup_timings()
+            if timings:
+                table = Table(title="Startup Timings (s)")
+                table.add_column("Container", style="cyan")
+                table.add_column("rm", style="yellow")
+                table.add_column("run", style="yellow")
+                table.add_column("ready", style="green")
+                table.add_column("Error", style="red")
+                for t in timings:
+                    table.add_row(
+                        t["container"],
+                        str(t["remove_s"] or "-"),
+                        str(t["run_s"] or "-"),
+                        str(t["ready_s"] or "-"),
+                        t["error"] or ""
+                    )
+                console.print(table)
+            return 0
+
+        elif args.pool_command == "down":
+            await pool.scale(0)
+            console.print("[green]Warm pool stopped[/green]")
+            return 0
+
+        console.print("[yellow]Specify a pool command: up, down[/yellow]")
+        return 0
+
+    except Exception as e:
+        console.print(f"[red]Error: {e}[/red]")
+        return 1
+    finally:
+        await pool.close()
+
+
 async def async_main(args: argparse.Namespace) -> int:
     """Async main entry point."""
     if args.command == "research":
@@ -453,6 +707,8 @@ async def async_main(args: argparse.Namespace) -> int:
         return await cmd_resume(args)
     elif args.command == "agent":
         return await cmd_agent(args)
+    elif args.command == "pool":
+        return await cmd_pool(args)
     else:
         parser = create_parser()
         parser.print_help()
@@ -0,0 +1,43 @@
+"""
+Research Events - Progress events emitted while a session runs.
+
+Orchestrator.stream() yields these as they happen, so callers (CLI, MCP
+server) can show findings long before the whole session has finished.
+"""
+
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+# Event types
+SESSION_STARTED = "session_started"    # data: session_id, query, total
+TASK_STARTED = "task_started"          # data: task_id, url, task_type
+TASK_FINISHED = "task_finished"        # data: task_id, status, url, title, findings, cached, error
+FINDINGS_ADDED = "findings_added"      # data: task_id, findings (aggregated finding dicts)
+RANKING = "ranking"                    # data: findings (current top findings), final
+SUMMARY_CHUNK = "summary_chunk"        # data: text
+SUMMARY_RESET = "summary_reset"        # data: error (drop the chunks streamed so far)
+COMPLETED = "completed"                # data: result (the dict run() returns)
+FAILED = "failed"                      # data: error
+
+EVENT_TYPES = (
+    SESSION_STARTED, TASK_STARTED, TASK_FINISHED, FINDINGS_ADDED,
+    RANKING, SUMMARY_CHUNK, SUMMARY_RESET, COMPLETED, FAILED,
+)
+
+
+@dataclass
+class ResearchEvent:
+    """A single progress event of a research session."""
+    type: str
+    data: dict = field(default_factory=dict)
+    session_id: str = ""
+    timestamp: float = field(default_factory=time.time)
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "type": self.type,
+            "session_id": self.session_id,
+            "timestamp": self.timestamp,
+            **self.data,
+        }
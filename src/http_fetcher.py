@@ -0,0 +1,440 @@
+"""
+HTTP Fetcher - Lightweight fetch tier in front of the browser pool.
+
+Static articles do not need a Chromium navigation: a pooled aiohttp request
+plus HTML parsing returns them in a fraction of the time and keeps browser
+slots free for pages that really need JavaScript. A page is escalated to the
+browser when its extracted text is (nearly) empty, when it asks for
+JavaScript in a ``<noscript>`` block, or when it is an SPA shell (an empty
+``#root``/``#app``/``#__next`` mount point).
+
+Escalation decisions are remembered per domain in ``DomainTiers`` so a site
+that needed the browser once goes straight to it next time.
+
+With proxies configured (``config/proxies.json``, as injected into the
+browser containers) requests rotate through them, so the HTTP tier does not
+reach sites from the host's own address.
+
+Text extraction mirrors the browser-api main-content mode: the longest
+``main``/``article`` region wins, boilerplate elements are dropped and block
+elements become paragraphs separated by blank lines.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from html.parser import HTMLParser
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlparse
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Fetch tiers
+TIER_HTTP = "http"
+TIER_BROWSER = "browser"
+
+# Extracted text shorter than this means the page renders client-side
+STATIC_MIN_TEXT_CHARS = 200
+# With a JavaScript <noscript> notice or an SPA mount point, more text is required
+JS_HINT_MIN_TEXT_CHARS = 1000
+
+DEFAULT_MAX_BYTES = 3 * 1024 * 1024
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+)
+
+# A domain that needed the browser is retried over HTTP after this long (seconds)
+BROWSER_DECISION_TTL = 7 * 24 * 60 * 60
+
+_SKIP_TAGS = frozenset({
+    "script", "style", "noscript", "template", "svg", "iframe", "nav", "header",
+    "footer", "aside", "form", "head",
+})
+_SKIP_ROLES = frozenset({"navigation", "banner", "contentinfo", "complementary"})
+_SKIP_CLASSES = frozenset({
+    "nav", "navbar", "menu", "breadcrumb", "sidebar", "footer", "header", "cookie",
+    "ads", "advertisement",
+})
+_MAIN_TAGS = frozenset({"main", "article"})
+_BLOCK_TAGS = frozenset({
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "table", "tr",
+    "h1", "h2", "h3", "h4", "h5", "h6", "blockquote", "pre", "dl", "dt", "dd",
+    "figure", "figcaption",
+})
+_VOID_TAGS = frozenset({
+    "area", "base", "br", "col", "embed", "hr", "img", "input", "link", "meta",
+    "param", "source", "track", "wbr",
+})
+# Mount points of client-side rendered apps
+_SPA_ROOT_IDS = frozenset({"root", "app", "__next", "__nuxt", "___gatsby", "svelte"})
+
+_META_CHARSET = re.compile(rb"""<meta[^>]+charset\s*=\s*["']?([\w-]+)""", re.IGNORECASE)
+_JAVASCRIPT_NOTICE = re.compile(r"javascript|ｊａｖａｓｃｒｉｐｔ", re.IGNORECASE)
+_SPACES = re.compile(r"\s+")
+_LINE_PADDING = re.compile(r"[ \t]*\n[ \t]*")
+_BLANK_LINES = re.compile(r"\n{3,}")
+
+
+@dataclass
+class FetchResult:
+    """Outcome of one HTTP fetch."""
+    url: str
+    success: bool = False
+    final_url: str = ""
+    status: int = 0
+    title: str = ""
+    text: str = ""
+    needs_browser: bool = False
+    reason: str = ""
+    elapsed_ms: int = 0
+    bytes: int = 0  # Response body bytes read
+
+
+class _ContentExtractor(HTMLParser):
+    """Collects title, main-content text and JavaScript hints from HTML."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = ""
+        self.noscript_js = False
+        self.spa_root = False
+        # Open elements: (tag, skipped, main region index or None)
+        self._stack: list[tuple[str, bool, Optional[int]]] = []
+        self._skip_depth = 0
+        self._in_title = False
+        self._in_noscript = 0
+        self._body: list[str] = []
+        self._regions: list[list[str]] = []
+        self._open_regions: list[int] = []
+
+    def _emit(self, part: str) -> None:
+        self._body.append(part)
+        for region in self._open_regions:
+            self._regions[region].append(part)
+
+    def handle_starttag(self, tag: str, attrs: list) -> None:
+        if tag in _VOID_TAGS:
+            if tag == "br" and not self._skip_depth:
+                self._emit("\n")
+            return
+        attributes = dict(attrs)
+        if tag == "title":
+            self._in_title = True
+        if tag == "noscript":
+            self._in_noscript += 1
+        if tag == "div" and attributes.get("id") in _SPA_ROOT_IDS:
+            self.spa_root = True
+
+        classes = set((attributes.get("class") or "").split())
+        skipped = (
+            tag in _SKIP_TAGS
+            or attributes.get("role") in _SKIP_ROLES
+            or attributes.get("aria-hidden") == "true"
+            or "hidden" in attributes
+            or not classes.isdisjoint(_SKIP_CLASSES)
+        )
+        region = None
+        if not skipped and not self._skip_depth and (tag in _MAIN_TAGS or attributes.get("role") == "main"):
+            region = len(self._regions)
+            self._regions.append([])
+            self._open_regions.append(region)
+        self._stack.append((tag, skipped, region))
+        if skipped:
+            self._skip_depth += 1
+        elif not self._skip_depth and tag in _BLOCK_TAGS:
+            self._emit("\n\n")
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag == "title":
+            self._in_title = False
+        if tag == "noscript" and self._in_noscript:
+            self._in_noscript -= 1
+        # Tolerate unclosed elements: pop up to the matching start tag
+        if not any(open_tag == tag for open_tag, _, _ in self._stack):
+            return
+        while self._stack:
+            open_tag, skipped, region = self._stack.pop()
+            if skipped:
+                self._skip_depth -= 1
+            elif not self._skip_depth and open_tag in _BLOCK_TAGS:
+                self._emit("\n\n")
+            if region is not None:
+                self._open_regions.remove(region)
+            if open_tag == tag:
+                break
+
+    def handle_data(self, data: str) -> None:
+        if self._in_title:
+            self.title += data
+        if self._in_noscript and _JAVASCRIPT_NOTICE.search(data):
+            self.noscript_js = True
+        if not self._skip_depth:
+            self._emit(_SPACES.sub(" ", data))
+
+    def text(self) -> str:
+        """Text of the longest main/article region (or the whole body)."""
+        parts = self._body
+        best = 0
+        for region in self._regions:
+            length = sum(len(part) for part in region)
+            if length > best:
+                best, parts = length, region
+        text = _LINE_PADDING.sub("\n", "".join(parts))
+        return _BLANK_LINES.sub("\n\n", text).strip()
+
+
+def _decode(body: bytes, charset: Optional[str]) -> str:
+    """Decode HTML using the header charset, the <meta> charset or UTF-8."""
+    if not charset:
+        match = _META_CHARSET.search(body[:4096])
+        charset = match.group(1).decode("ascii") if match else "utf-8"
+    try:
+        return body.decode(charset, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def extract_page(html: str, max_chars: Optional[int] = None) -> tuple[str, str, str]:
+    """
+    Extract title and main-content text from HTML.
+
+    Returns:
+        (title, text, reason the page needs a browser or "")
+    """
+    parser = _ContentExtractor()
+    parser.feed(html)
+    parser.close()
+    text = parser.text()
+    if max_chars is not None:
+        text = text[:max_chars]
+
+    reason = ""
+    if len(text) < STATIC_MIN_TEXT_CHARS:
+        reason = "empty text"
+    elif parser.noscript_js and len(text) < JS_HINT_MIN_TEXT_CHARS:
+        reason = "noscript notice"
+    elif parser.spa_root and len(text) < JS_HINT_MIN_TEXT_CHARS:
+        reason = "spa shell"
+    return _SPACES.sub(" ", parser.title).strip(), text, reason
+
+
+def domain_of(url: str) -> str:
+    """Host name of a URL without a leading www."""
+    host = (urlparse(url).hostname or "").lower()
+    return host[4:] if host.startswith("www.") else host
+
+
+class DomainTiers:
+    """
+    Remembered fetch tier per domain, persisted as JSON.
+
+    A domain is sent straight to the browser after an escalation. The decision
+    expires after ``browser_ttl`` seconds so sites that became static are
+    tried over HTTP again.
+    """
+
+    def __init__(self, path: Optional[Path] = None, browser_ttl: int = BROWSER_DECISION_TTL):
+        self.path = path
+        self.browser_ttl = browser_ttl
+        self._domains: dict[str, dict] = {}
+        self._dirty = False
+        if path is not None and path.exists():
+            try:
+                self._domains = json.loads(path.read_text(encoding="utf-8")).get("domains", {})
+            except (OSError, json.JSONDecodeError) as e:
+                logger.warning(f"Ignoring unreadable fetch tier file {path}: {e}")
+
+    def tier(self, url: str) -> str:
+        """Tier to try first for a URL."""
+        entry = self._domains.get(domain_of(url))
+        if entry and entry["tier"] == TIER_BROWSER:
+            if time.time() - entry["updated_at"] < self.browser_ttl:
+                return TIER_BROWSER
+        return TIER_HTTP
+
+    def record(self, url: str, tier: str, reason: str = "") -> None:
+        """Remember which tier served a URL's domain."""
+        domain = domain_of(url)
+        if not domain:
+            return
+        entry = self._domains.get(domain)
+        if entry and entry["tier"] == tier and tier == TIER_HTTP:
+            return
+        self._domains[domain] = {"tier": tier, "reason": reason, "updated_at": time.time()}
+        self._dirty = True
+
+    def flush(self) -> None:
+        """Write decisions back to disk if they changed."""
+        if self.path is None or not self._dirty:
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 1, "domains": self._domains}, ensure_ascii=False))
+        os.replace(tmp, self.path)
+        self._dirty = False
+
+
+@dataclass
+class FetchStats:
+    """Counters of the HTTP tier."""
+    served: int = 0
+    escalated: int = 0
+    skipped: int = 0  # sent straight to a browser by a remembered domain decision
+    served_ms: int = 0
+    reasons: dict = field(default_factory=dict)
+
+    def record(self, result: FetchResult) -> None:
+        if result.success:
+            self.served += 1
+            self.served_ms += result.elapsed_ms
+        else:
+            self.escalated += 1
+            self.reasons[result.reason] = self.reasons.get(result.reason, 0) + 1
+
+    def to_dict(self) -> dict:
+        return {
+            "served": self.served,
+            "escalated": self.escalated,
+            "skipped": self.skipped,
+            "avg_served_ms": round(self.served_ms / self.served) if self.served else 0,
+            "escalation_reasons": dict(self.reasons),
+        }
+
+
+class HttpFetcher:
+    """
+    Pooled async HTTP client that fetches and extracts static pages.
+
+    A page the HTTP tier cannot serve comes back with ``needs_browser`` set
+    and a reason; callers then fall back to ``BrowserPool.navigate``.
+    """
+
+    def __init__(
+        self,
+        tiers: Optional[DomainTiers] = None,
+        max_connections: int = 32,
+        max_per_host: int = 4,
+        timeout: float = 10.0,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        user_agent: str = DEFAULT_USER_AGENT,
+        proxies: Optional[list[dict]] = None,
+    ):
+        """
+        Initialize fetcher.
+
+        Args:
+            tiers: Per-domain tier memory (in-memory only if None)
+            max_connections: Connection pool size
+            max_per_host: Concurrent connections per host
+            timeout: Total timeout per request (seconds)
+            max_bytes: Larger responses are escalated to the browser
+            user_agent: User-Agent header sent with every request
+            proxies: HTTP proxies (host, port, username, password) that requests
+                rotate through; None or empty = direct
+        """
+        self.tiers = tiers or DomainTiers()
+        self.max_connections = max_connections
+        self.max_per_host = max_per_host
+        self.timeout = timeout
+        self.max_bytes = max_bytes
+        self.user_agent = user_agent
+        self.stats = FetchStats()
+        self.proxies = list(proxies or [])
+        self._proxy_cycle = itertools.cycle(self.proxies) if self.proxies else None
+        self._session: Optional[aiohttp.ClientSession] = None
+
+    def _get_session(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            self._session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=self.max_connections, limit_per_host=self.max_per_host, ttl_dns_cache=300
+                ),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+                headers={
+                    "User-Agent": self.user_agent,
+                    "Accept": "text/html,application/xhtml+xml;q=0.9,*/*;q=0.5",
+                    "Accept-Language": "ja,en;q=0.8",
+                },
+            )
+        return self._session
+
+    def _proxy_args(self) -> dict:
+        """Request arguments routing the next request through a proxy."""
+        if self._proxy_cycle is None:
+            return {}
+        proxy = next(self._proxy_cycle)
+        args = {"proxy": f"http://{proxy['host']}:{proxy['port']}"}
+        if proxy.get("username"):
+            args["proxy_auth"] = aiohttp.BasicAuth(proxy["username"], proxy.get("password", ""))
+        return args
+
+    def should_try(self, url: str) -> bool:
+        """Whether the URL's domain is not known to need the browser."""
+        if self.tiers.tier(url) == TIER_HTTP:
+            return True
+        self.stats.skipped += 1
+        return False
+
+    async def fetch(self, url: str, max_chars: Optional[int] = None) -> FetchResult:
+        """
+        Fetch a page over HTTP and extract its main content.
+
+        Args:
+            url: Page URL
+            max_chars: Truncate extracted text to this length
+
+        Returns:
+            FetchResult; on failure ``needs_browser`` is set with a reason
+        """
+        started = time.monotonic()
+        result = FetchResult(url=url)
+        try:
+            async with self._get_session().get(url, allow_redirects=True, **self._proxy_args()) as response:
+                result.status = response.status
+                result.final_url = str(response.url)
+                content_type = response.headers.get("Content-Type", "")
+                if response.status >= 400:
+                    result.reason = f"http {response.status}"
+                elif "html" not in content_type.lower():
+                    result.reason = f"content type {content_type.split(';')[0] or 'unknown'}"
+                elif response.content_length and response.content_length > self.max_bytes:
+                    result.reason = "too large"
+                else:
+                    body = await response.content.read(self.max_bytes + 1)
+                    result.bytes = len(body)
+                    if len(body) > self.max_bytes:
+                        result.reason = "too large"
+                    else:
+                        html = _decode(body, response.charset)
+                        # Parsing a large page would stall the event loop
+                        result.title, result.text, result.reason = await asyncio.to_thread(
+                            extract_page, html, max_chars
+                        )
+        except (aiohttp.ClientError, asyncio.TimeoutError, UnicodeError, ValueError) as e:
+            result.reason = f"request failed: {type(e).__name__}"
+
+        result.elapsed_ms = round((time.monotonic() - started) * 1000)
+        result.success = not result.reason
+        result.needs_browser = not result.success
+        self.stats.record(result)
+        # Only page-level signals are remembered; transient errors are not
+        if result.success:
+            self.tiers.record(url, TIER_HTTP)
+        elif result.reason in ("empty text", "noscript notice", "spa shell") or result.status in (401, 403):
+            self.tiers.record(url, TIER_BROWSER, result.reason)
+        return result
+
+    async def close(self) -> None:
+        """Close the connection pool."""
+        if self._session and not self._session.closed:
+            await self._session.close()
+        self._session = None
@@ -0,0 +1,559 @@
+"""
+Job Scheduler - Research jobs sharing one browser pool.
+
+Used by the MCP server. Each job used to build its own Orchestrator and
+BrowserPool: cold-started jobs all named their containers docker-browser-1..N,
+so concurrent jobs replaced each other's containers, and nothing bounded how
+many jobs ran at once.
+
+The scheduler sizes one warm pool to ``capacity`` browsers and leases them to
+jobs:
+
+- Admission: jobs wait in a bounded queue (JobQueueFull beyond ``max_queued``)
+  and start highest priority first, FIFO within a priority, while a browser
+  is free.
+- Fair share: a job gets browsers in proportion to its weight (1 + priority)
+  among the running jobs, up to its own ``parallel``. While a job waits and
+  every browser is busy, jobs above their share give browsers back after
+  their current task; browsers freed by finished jobs go to running jobs
+  below their ``parallel``.
+- Persistence: jobs are saved to ``<output_dir>/jobs/jobs.json``. After a
+  restart, jobs that were running resume their session from its snapshot
+  and journal; pending jobs are queued again.
+"""
+
+import asyncio
+import json
+import logging
+import os
+from contextlib import aclosing
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Optional
+from uuid import uuid4
+
+from .browser_pool import BrowserPool, BrowserInstance
+from .http_fetcher import DomainTiers
+from .orchestrator import Orchestrator
+from .page_cache import PageCache, CACHE_OFF
+from .snapshot import SnapshotManager
+from . import events
+from .summarizer import DEFAULT_TOKEN_BUDGET
+
+logger = logging.getLogger(__name__)
+
+JOB_PENDING = "pending"
+JOB_RUNNING = "running"
+JOB_COMPLETED = "completed"
+JOB_FAILED = "failed"
+JOB_STATUSES = (JOB_PENDING, JOB_RUNNING, JOB_COMPLETED, JOB_FAILED)
+
+DEFAULT_CAPACITY = 6
+DEFAULT_MAX_QUEUED = 20
+MAX_PRIORITY = 10
+
+# Finished jobs kept for status/results queries
+MAX_FINISHED_JOBS = 100
+JOB_RETENTION_HOURS = 24
+
+
+class JobQueueFull(RuntimeError):
+    """Raised when no more jobs can be queued."""
+
+
+@dataclass
+class ResearchJob:
+    """Represents an ongoing research job."""
+    id: str
+    query: str
+    status: str  # pending, running, completed, failed
+    created_at: datetime
+    completed_at: Optional[datetime] = None
+    result: Optional[dict] = None
+    error: Optional[str] = None
+    # Scheduling
+    priority: int = 0
+    parallel: int = 3
+    screenshot: bool = False
+    started_at: Optional[datetime] = None
+    session_id: str = ""  # Orchestrator session, resumed after a restart
+    browsers: int = 0  # Browsers currently leased
+    # Streamed while running
+    tasks_done: int = 0
+    tasks_total: int = 0
+    partial_findings: list = field(default_factory=list)
+    partial_summary: str = ""
+
+    @property
+    def weight(self) -> int:
+        return 1 + self.priority
+
+    @property
+    def finished(self) -> bool:
+        return self.status in (JOB_COMPLETED, JOB_FAILED)
+
+    def apply_event(self, event: events.ResearchEvent) -> None:
+        """Update the job's partial state from a streamed event."""
+        if event.session_id and not self.session_id:
+            self.session_id = event.session_id
+        if event.type == events.SESSION_STARTED:
+            self.tasks_total = event.data.get("total", 0)
+        elif event.type == events.TASK_STARTED:
+            self.tasks_total = max(self.tasks_total, self.tasks_done + 1)
+        elif event.type == events.TASK_FINISHED:
+            self.tasks_done += 1
+        elif event.type == events.RANKING:
+            self.partial_findings = event.data.get("findings", [])
+        elif event.type == events.SUMMARY_CHUNK:
+            self.partial_summary += event.data.get("text", "")
+        elif event.type == events.SUMMARY_RESET:
+            self.partial_summary = ""
+
+    def to_dict(self) -> dict:
+        """Persisted fields (streamed partial state is not kept)."""
+        return {
+            "id": self.id,
+            "query": self.query,
+            "status": self.status,
+            "created_at": self.created_at.isoformat(),
+            "completed_at": self.completed_at.isoformat() if self.completed_at else None,
+            "started_at": self.started_at.isoformat() if self.started_at else None,
+            "result": self.result,
+            "error": self.error,
+            "priority": self.priority,
+            "parallel": self.parallel,
+            "screenshot": self.screenshot,
+            "session_id": self.session_id,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ResearchJob":
+        def parse(value: Optional[str]) -> Optional[datetime]:
+            return datetime.fromisoformat(value) if value else None
+
+        return cls(
+            id=data["id"],
+            query=data["query"],
+            status=data["status"],
+            created_at=parse(data["created_at"]),
+            completed_at=parse(data.get("completed_at")),
+            started_at=parse(data.get("started_at")),
+            result=data.get("result"),
+            error=data.get("error"),
+            priority=data.get("priority", 0),
+            parallel=data.get("parallel", 3),
+            screenshot=data.get("screenshot", False),
+            session_id=data.get("session_id", ""),
+        )
+
+
+class JobScheduler:
+    """
+    Runs research jobs on browsers leased from one shared warm pool.
+
+    Scheduling happens in _dispatch(), which runs whenever a job is submitted
+    or finishes, a browser is given back, or a task of a job finishes while
+    others are waiting.
+    """
+
+    def __init__(
+        self,
+        output_dir: Path = Path("data"),
+        capacity: int = DEFAULT_CAPACITY,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        use_llm: bool = True,
+        warm_pool: bool = False,
+        pool: Optional[BrowserPool] = None,
+        summary_token_budget: int = DEFAULT_TOKEN_BUDGET,
+    ):
+        """
+        Initialize the job scheduler.
+
+        Args:
+            output_dir: Directory for research output and job state
+            capacity: Browsers shared by all jobs
+            max_queued: Maximum number of jobs waiting to start
+            use_llm: Whether jobs use LLM features
+            warm_pool: Attach to a warm pool started with ``pool up`` instead
+                of sizing it to ``capacity``
+            pool: Browser pool to use (default: a new one)
+            summary_token_budget: Estimated input tokens per summarization call
+        """
+        self.output_dir = output_dir
+        self.capacity = max(1, capacity)
+        self.max_queued = max(0, max_queued)
+        self.use_llm = use_llm
+        self.summary_token_budget = summary_token_budget
+        self.manage_pool = not warm_pool
+        self.state_path = output_dir / "jobs" / "jobs.json"
+
+        self.jobs: dict[str, ResearchJob] = {}
+        pool_id = self._load()
+        # The pool id is persisted so a restarted server owns the leases of
+        # the jobs it resumes
+        self.pool = pool or BrowserPool(pool_id=pool_id)
+
+        # Caches on output_dir are opened once and shared by all jobs, so
+        # concurrent sessions do not overwrite each other's flushes
+        self.page_cache = PageCache(output_dir / "cache" / "pages", mode=CACHE_OFF)
+        self.domain_tiers = DomainTiers(output_dir / "cache" / "fetch_tiers.json")
+        # One catalog connection for all jobs of the server
+        self.snapshot_manager = SnapshotManager(output_dir)
+        self.llm_client = None
+        self.semantic_filter = None
+        if use_llm:
+            from .llm_client import LLMClient
+            from .semantic_filter import SemanticFilter
+            try:
+                self.llm_client = LLMClient(cache_dir=output_dir / "cache" / "llm")
+            except ImportError as e:
+                logger.warning(f"LLM client unavailable: {e}")
+            self.semantic_filter = SemanticFilter(cache_dir=output_dir / "cache" / "embeddings")
+
+        self._leases: dict[str, list[BrowserInstance]] = {}
+        self._orchestrators: dict[str, Orchestrator] = {}
+        self._runners: dict[str, asyncio.Task] = {}
+        # Browsers a job has been asked to give back and not yet returned
+        self._retiring: dict[str, int] = {}
+        self._background: set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self._started = False
+
+    def _load(self) -> Optional[str]:
+        """Load jobs saved by a previous process; returns its pool id."""
+        if not self.state_path.exists():
+            return None
+        try:
+            state = json.loads(self.state_path.read_text(encoding="utf-8"))
+            for data in state.get("jobs", []):
+                job = ResearchJob.from_dict(data)
+                self.jobs[job.id] = job
+            return state.get("pool_id")
+        except (OSError, json.JSONDecodeError, KeyError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable job state {self.state_path}: {e}")
+            return None
+
+    def _save(self) -> None:
+        """Write job state atomically."""
+        self.state_path.parent.mkdir(parents=True, exist_ok=True)
+        state = {
+            "version": 1,
+            "pool_id": self.pool.pool_id,
+            "jobs": [job.to_dict() for job in self.jobs.values()],
+        }
+        tmp = self.state_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(state, ensure_ascii=False, default=str), encoding="utf-8")
+        os.replace(tmp, self.state_path)
+
+    @staticmethod
+    def _session(job: ResearchJob) -> str:
+        """Lease session name of a job."""
+        return f"mcp-job-{job.id}"
+
+    async def start(self) -> None:
+        """Bring up the shared pool and pick up jobs of a previous process."""
+        async with self._lock:
+            await self._start_pool()
+        await self._dispatch()
+
+    async def _start_pool(self) -> None:
+        if self._started:
+            return
+        self._started = True
+
+        instances = await (self.pool.scale(self.capacity) if self.manage_pool else self.pool.attach())
+        if instances and len(instances) < self.capacity:
+            logger.warning(f"Warm pool has {len(instances)} browsers, capacity lowered from {self.capacity}")
+            self.capacity = len(instances)
+
+        # Jobs that were running when the previous process exited: drop the
+        # leases they still hold (same owner), then queue them to resume
+        interrupted = [job for job in self.jobs.values() if job.status == JOB_RUNNING]
+        for job in interrupted:
+            stale = await self.pool.lease(self.capacity, session=self._session(job), grow=False)
+            await self.pool.release(stale)
+            job.status = JOB_PENDING
+        if interrupted:
+            logger.info(f"Resuming {len(interrupted)} interrupted jobs")
+            self._save()
+
+    async def submit(
+        self,
+        query: str,
+        parallel: int = 3,
+        screenshot: bool = False,
+        priority: int = 0,
+    ) -> ResearchJob:
+        """
+        Queue a research job.
+
+        Args:
+            query: Research query to investigate
+            parallel: Maximum browsers for this job (capped at capacity)
+            screenshot: Take screenshots of pages
+            priority: 0 (default) to MAX_PRIORITY; higher starts first and
+                gets a larger share of the browsers
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFull: If max_queued jobs are already waiting
+        """
+        self.cleanup()
+        queued = len(self._queue())
+        if queued >= self.max_queued:
+            raise JobQueueFull(f"Job queue is full ({queued} jobs waiting), try again later")
+
+        job = ResearchJob(
+            id=str(uuid4())[:8],
+            query=query,
+            status=JOB_PENDING,
+            created_at=datetime.now(timezone.utc),
+            priority=max(0, min(priority, MAX_PRIORITY)),
+            parallel=max(1, min(parallel, self.capacity)),
+            screenshot=screenshot,
+        )
+        self.jobs[job.id] = job
+        self._save()
+        self.schedule()
+        return job
+
+    def _queue(self) -> list[ResearchJob]:
+        """Pending jobs in start order."""
+        pending = [job for job in self.jobs.values() if job.status == JOB_PENDING]
+        return sorted(pending, key=lambda job: (-job.priority, job.created_at))
+
+    def _running(self) -> list[ResearchJob]:
+        return [self.jobs[job_id] for job_id in self._leases if job_id in self.jobs]
+
+    def _free(self) -> int:
+        return self.capacity - sum(len(instances) for instances in self._leases.values())
+
+    def _share(self, job: ResearchJob, total_weight: int) -> int:
+        """Fair number of browsers for a job, at least one."""
+        return max(1, self.capacity * job.weight // total_weight)
+
+    def queue_position(self, job: ResearchJob) -> Optional[int]:
+        """1-based position of a pending job in the queue."""
+        for position, queued in enumerate(self._queue(), start=1):
+            if queued.id == job.id:
+                return position
+        return None
+
+    def schedule(self) -> None:
+        """Run scheduling in the background (also resumes jobs after a restart)."""
+        task = asyncio.create_task(self._dispatch())
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _dispatch(self) -> None:
+        """Start queued jobs on free browsers, reclaim or hand out browsers."""
+        async with self._lock:
+            await self._start_pool()
+
+            for job in self._queue():
+                free = self._free()
+                if free <= 0:
+                    await self._reclaim(job)
+                    break
+                running = self._running()
+                total_weight = sum(j.weight for j in running) + job.weight
+                count = min(job.parallel, self._share(job, total_weight), free)
+                instances = await self.pool.lease(count, session=self._session(job), grow=False)
+                if not instances:
+                    if running:
+                        break
+                    self._finish(job, error="No warm browser instances available")
+                    continue
+                self._launch(job, instances)
+            else:
+                await self._grow()
+
+    async def _reclaim(self, waiting: ResearchJob) -> None:
+        """Ask jobs above their fair share to give browsers back to a waiting job."""
+        running = self._running()
+        if len(running) >= self.capacity:
+            # Every browser already serves a different job
+            return
+        total_weight = sum(j.weight for j in running) + waiting.weight
+        needed = self._share(waiting, total_weight) - sum(self._retiring.values())
+
+        def surplus(job: ResearchJob) -> int:
+            held = len(self._leases[job.id]) - self._retiring.get(job.id, 0)
+            return held - self._share(job, total_weight)
+
+        for job in sorted(running, key=surplus, reverse=True):
+            if needed <= 0 or surplus(job) <= 0:
+                break
+            orchestrator = self._orchestrators.get(job.id)
+            if orchestrator is None:
+                continue
+            retired = await orchestrator.retire_instances(min(surplus(job), needed))
+            if retired:
+                self._retiring[job.id] = self._retiring.get(job.id, 0) + retired
+                needed -= retired
+
+    async def _grow(self) -> None:
+        """Give free browsers to running jobs below their parallel, least served first."""
+        running = sorted(self._running(), key=lambda job: len(self._leases[job.id]) / job.weight)
+        for job in running:
+            free = self._free()
+            if free <= 0:
+                return
+            orchestrator = self._orchestrators.get(job.id)
+            wanted = job.parallel - len(self._leases[job.id])
+            if orchestrator is None or wanted <= 0 or self._retiring.get(job.id):
+                continue
+            instances = await self.pool.lease(min(wanted, free), session=self._session(job), grow=False)
+            if not instances:
+                return
+            if orchestrator.add_instances(instances):
+                self._leases[job.id].extend(instances)
+                job.browsers = len(self._leases[job.id])
+            else:
+                await self.pool.release(instances)
+
+    def _launch(self, job: ResearchJob, instances: list[BrowserInstance]) -> None:
+        job.status = JOB_RUNNING
+        job.started_at = datetime.now(timezone.utc)
+        job.browsers = len(instances)
+        self._leases[job.id] = list(instances)
+        self._runners[job.id] = asyncio.create_task(self._run_job(job))
+        self._save()
+        logger.info(f"Job {job.id} started on {len(instances)} browsers (priority {job.priority})")
+
+    def _finish(self, job: ResearchJob, result: Optional[dict] = None, error: Optional[str] = None) -> None:
+        job.status = JOB_FAILED if error else JOB_COMPLETED
+        job.completed_at = datetime.now(timezone.utc)
+        job.result = result
+        job.error = error
+        self._save()
+
+    async def _run_job(self, job: ResearchJob) -> None:
+        """Run a job on its leased browsers, resuming its session if it has one."""
+        orchestrator = Orchestrator(
+            parallel=job.parallel,
+            output_dir=self.output_dir,
+            # One session name per job keeps results, traces and screenshots apart
+            session_name=f"mcp-job-{job.id}",
+            screenshot=job.screenshot,
+            use_llm=self.use_llm,
+            llm_client=self.llm_client,
+            page_cache=self.page_cache,
+            domain_tiers=self.domain_tiers,
+            semantic_filter=self.semantic_filter,
+            snapshot_manager=self.snapshot_manager,
+            summary_token_budget=self.summary_token_budget,
+            max_concurrency=job.parallel,
+            pool=self.pool,
+            instances=self._leases[job.id],
+            on_instance_retired=lambda instance: self._on_retired(job, instance),
+        )
+        self._orchestrators[job.id] = orchestrator
+        cancelled = False
+
+        try:
+            session_data = None
+            if job.session_id:
+                session_data = await self.snapshot_manager.load_session(job.session_id)
+            if session_data:
+                job.tasks_total = session_data.get("total", 0)
+                job.tasks_done = len(session_data.get("results", []))
+            result = await self._stream(job, orchestrator, session_data or None)
+            self._finish(job, result=result)
+
+        except asyncio.CancelledError:
+            # Shutdown: the job stays running and resumes in the next process
+            cancelled = True
+            raise
+
+        except Exception as e:
+            logger.warning(f"Job {job.id} failed: {e}")
+            self._finish(job, error=str(e))
+
+        finally:
+            self._orchestrators.pop(job.id, None)
+            self._runners.pop(job.id, None)
+            self._retiring.pop(job.id, None)
+            instances = self._leases.pop(job.id, [])
+            job.browsers = 0
+            await self.pool.release(instances)
+            if not cancelled:
+                self.schedule()
+
+    async def _stream(
+        self, job: ResearchJob, orchestrator: Orchestrator, session_data: Optional[dict] = None
+    ) -> Optional[dict]:
+        """Run a new session (or resume a saved one), applying its events to the job."""
+        result = None
+        async with aclosing(orchestrator.stream(job.query, resume=session_data)) as stream:
+            async for event in stream:
+                had_session = bool(job.session_id)
+                job.apply_event(event)
+                if job.session_id and not had_session:
+                    self._save()
+                if event.type == events.COMPLETED:
+                    result = event.data["result"]
+                elif event.type == events.FAILED:
+                    raise RuntimeError(event.data["error"])
+                elif event.type == events.TASK_FINISHED and self._queue() and not self._lock.locked():
+                    # A worker may now be reclaimable for a waiting job
+                    self.schedule()
+        return result
+
+    async def _on_retired(self, job: ResearchJob, instance: BrowserInstance) -> None:
+        """Take back a browser a job has given up."""
+        instances = self._leases.get(job.id, [])
+        if instance in instances:
+            instances.remove(instance)
+        job.browsers = len(instances)
+        self._retiring[job.id] = max(0, self._retiring.get(job.id, 0) - 1)
+        await self.pool.release([instance])
+        self.schedule()
+
+    def cleanup(self) -> None:
+        """Forget old finished jobs."""
+        now = datetime.now(timezone.utc)
+        finished = [job for job in self.jobs.values() if job.finished]
+        removed = [
+            job for job in finished
+            if job.completed_at
+            and (now - job.completed_at).total_seconds() / 3600 > JOB_RETENTION_HOURS
+        ]
+
+        # If still too many, drop the oldest
+        remaining = sorted(
+            (job for job in finished if job not in removed),
+            key=lambda job: job.completed_at or job.created_at,
+        )
+        if len(remaining) > MAX_FINISHED_JOBS:
+            removed.extend(remaining[:-MAX_FINISHED_JOBS])
+
+        for job in removed:
+            self.jobs.pop(job.id, None)
+        if removed:
+            self._save()
+
+    def stats(self) -> dict[str, Any]:
+        """Shared pool usage."""
+        return {
+            "capacity": self.capacity,
+            "browsers_in_use": self.capacity - self._free(),
+            "running": len(self._leases),
+            "queued": len(self._queue()),
+            "max_queued": self.max_queued,
+        }
+
+    async def shutdown(self) -> None:
+        """Stop running jobs (they resume on the next start) and close shared resources."""
+        for task in list(self._background):
+            task.cancel()
+        runners = list(self._runners.values())
+        for task in runners:
+            task.cancel()
+        await asyncio.gather(*runners, *self._background, return_exceptions=True)
+        self._save()
+        await self.pool.close()
+        self.snapshot_manager.close()
@@ -0,0 +1,260 @@
+"""
+Keyword Matcher - Page keyword matching and BM25 paragraph scoring.
+
+Keywords are normalized once per session and compiled into one pattern per
+keyword set, so each paragraph is lowercased once and tested with a single
+search; only paragraphs that contain a keyword are counted keyword by
+keyword. Counts of paragraphs seen earlier in the session (navigation,
+footers and other boilerplate a site repeats on every page) are reused.
+
+Matching is substring based, which handles Japanese text (no whitespace
+between words) without a tokenizer; ASCII keywords additionally require a
+word start so "api" does not match inside "capital". Rather than
+NFKC-normalizing every page, each keyword is also searched in its full-width
+(Latin) or half-width (katakana) spelling.
+
+Paragraphs are ranked with BM25 over corpus statistics (document count,
+average length, per-keyword document frequency) that accumulate across all
+pages of a session, so rare keywords weigh more as the crawl grows. Lengths
+are measured in characters, which works for Japanese and English alike.
+"""
+
+import heapq
+import math
+import re
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass, field
+
+# BM25 parameters
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# Paragraphs shorter than this are navigation/boilerplate
+MIN_PARAGRAPH_CHARS = 50
+
+# Paragraph counts a matcher remembers before it starts over
+MAX_SEEN_PARAGRAPHS = 20000
+
+_ASCII_ALNUM = "abcdefghijklmnopqrstuvwxyz0123456789"
+# Characters that continue a word (ASCII and full-width lowercase alnum)
+_WORD_CHARS = frozenset(_ASCII_ALNUM + "".join(chr(ord(c) + 0xFEE0) for c in _ASCII_ALNUM))
+_WORD_CLASS = "[" + "".join(sorted(_WORD_CHARS)) + "]"
+
+# ASCII -> full-width forms
+_FULL_WIDTH = {c: c + 0xFEE0 for c in range(0x21, 0x7F)}
+
+
+def _half_width_katakana() -> dict[str, str]:
+    """Katakana -> half-width spelling (the inverse of NFKC on U+FF66-U+FF9D)."""
+    table = {}
+    for code in range(0xFF66, 0xFF9E):
+        half = chr(code)
+        table.setdefault(unicodedata.normalize("NFKC", half), half)
+        for mark in ("\uff9e", "\uff9f"):  # (han)dakuten
+            voiced = unicodedata.normalize("NFKC", half + mark)
+            if len(voiced) == 1:
+                table.setdefault(voiced, half + mark)
+    return table
+
+
+_HALF_WIDTH = _half_width_katakana()
+
+
+def normalize(text: str) -> str:
+    """Normalize a keyword for matching (NFKC, lowercase)."""
+    return unicodedata.normalize("NFKC", text).lower()
+
+
+class KeywordMatcher:
+    """
+    Keywords of a task, normalized once and matched against paragraphs.
+
+    A paragraph is counted keyword by keyword only when the pattern of all
+    spellings finds one in it. Nested keywords ("ai" in "ai agent") are
+    counted independently.
+    """
+
+    def __init__(self, keywords: list[str]):
+        # Keep the first spelling of each normalized keyword
+        self.keywords: list[str] = []
+        self.normalized: list[str] = []
+        for keyword in keywords:
+            norm = normalize(keyword.strip())
+            if norm and norm not in self.normalized:
+                self.keywords.append(keyword)
+                self.normalized.append(norm)
+
+        # (spelling, keyword index, needs word start)
+        self._spellings: list[tuple[str, int, bool]] = []
+        alternatives = []
+        for i, norm in enumerate(self.normalized):
+            word_start = norm[0] in _ASCII_ALNUM
+            variants = {norm, norm.translate(_FULL_WIDTH), "".join(_HALF_WIDTH.get(c, c) for c in norm)}
+            for spelling in sorted(variants):
+                self._spellings.append((spelling, i, word_start))
+                escaped = re.escape(spelling)
+                # Literal first, so the regex engine can skip ahead to candidates
+                alternatives.append(f"{escaped}(?<!{_WORD_CLASS}{escaped})" if word_start else escaped)
+        self._pattern = re.compile("|".join(alternatives)) if alternatives else None
+        # Paragraph -> counts of the paragraphs seen so far
+        self._seen: dict[str, dict[int, int]] = {}
+
+    def count(self, paragraphs: list[str]) -> list[dict[int, int]]:
+        """
+        Count keyword occurrences in paragraphs.
+
+        Counts of paragraphs seen before (navigation, footers and other
+        boilerplate shared by the pages of a site) are reused.
+
+        Args:
+            paragraphs: Paragraphs of a page (original case)
+
+        Returns:
+            Occurrences per keyword index for each paragraph (empty for
+            paragraphs without a keyword); the dicts are shared, do not modify
+        """
+        counts = []
+        for paragraph in paragraphs:
+            tfs = self._seen.get(paragraph)
+            if tfs is None:
+                if len(self._seen) >= MAX_SEEN_PARAGRAPHS:
+                    self._seen.clear()
+                tfs = self._seen[paragraph] = self._count(paragraph.lower())
+            counts.append(tfs)
+        return counts
+
+    def _count(self, text: str) -> dict[int, int]:
+        """Count keyword occurrences in one lowercased paragraph."""
+        tfs: dict[int, int] = {}
+        if self._pattern is None or not self._pattern.search(text):
+            return tfs
+        for spelling, i, word_start in self._spellings:
+            if word_start:
+                tf = 0
+                position = text.find(spelling)
+                while position != -1:
+                    if not (position and text[position - 1] in _WORD_CHARS):
+                        tf += 1
+                    position = text.find(spelling, position + len(spelling))
+            else:
+                tf = text.count(spelling)
+            if tf:
+                tfs[i] = tfs.get(i, 0) + tf
+        return tfs
+
+
+@dataclass
+class CorpusStats:
+    """BM25 corpus statistics accumulated over a session."""
+    documents: int = 0
+    total_length: int = 0
+    doc_freq: Counter = field(default_factory=Counter)
+
+    def add(self, lengths: list[int], keywords: list[str]) -> None:
+        """
+        Add the paragraphs of one page.
+
+        Args:
+            lengths: Length of every paragraph
+            keywords: Normalized keywords, once per paragraph containing them
+        """
+        self.documents += len(lengths)
+        self.total_length += sum(lengths)
+        self.doc_freq.update(keywords)
+
+    @property
+    def avg_length(self) -> float:
+        return self.total_length / self.documents if self.documents else 0.0
+
+    def idf(self, keyword: str) -> float:
+        df = self.doc_freq.get(keyword, 0)
+        return math.log(1 + (self.documents - df + 0.5) / (df + 0.5))
+
+
+class ParagraphScorer:
+    """
+    Extracts keyword-bearing paragraphs from page content, ranked by BM25.
+
+    One scorer lives for a research session: keyword matchers are reused for
+    every task with the same keywords and corpus statistics keep growing.
+    Relevance is the BM25 score divided by the score of a paragraph of
+    average length containing every keyword once, capped at 1, so it stays
+    in [0, 1] like the matched-keyword fraction it replaces.
+    """
+
+    def __init__(self, k1: float = BM25_K1, b: float = BM25_B):
+        self.k1 = k1
+        self.b = b
+        self.stats = CorpusStats()
+        self._matchers: dict[tuple[str, ...], KeywordMatcher] = {}
+
+    def matcher(self, keywords: list[str]) -> KeywordMatcher:
+        """Matcher for a keyword set (built once per session)."""
+        key = tuple(keywords)
+        matcher = self._matchers.get(key)
+        if matcher is None:
+            matcher = self._matchers[key] = KeywordMatcher(keywords)
+        return matcher
+
+    def extract(self, content: str, keywords: list[str], limit: int = 10) -> list[dict]:
+        """
+        Extract the most relevant paragraphs of a page.
+
+        Every paragraph of the page is added to the corpus statistics before
+        scoring, including those without keyword matches.
+
+        Args:
+            content: Page text, paragraphs separated by blank lines
+            keywords: Task keywords
+            limit: Maximum findings returned
+
+        Returns:
+            Findings with text, matched keywords and relevance, best first
+        """
+        if not content:
+            return []
+
+        matcher = self.matcher(keywords)
+        paragraphs = []
+        for para in content.split("\n\n"):
+            para = para.strip()
+            # Shorter paragraphs are navigation/boilerplate and never matched
+            if len(para) >= MIN_PARAGRAPH_CHARS:
+                paragraphs.append(para)
+
+        matched: list[tuple[str, dict[int, int]]] = []
+        for para, tfs in zip(paragraphs, matcher.count(paragraphs)):
+            if tfs:
+                matched.append((para, tfs))
+
+        self.stats.add(
+            [len(para) for para in paragraphs],
+            [matcher.normalized[i] for _, tfs in matched for i in tfs],
+        )
+
+        if not matched:
+            return []
+
+        idfs = [self.stats.idf(keyword) for keyword in matcher.normalized]
+        full_match = sum(idfs)
+        weights = [(self.k1 + 1) * idf for idf in idfs]
+        # Length normalization k1 * (1 - b + b * length / avg_length)
+        base = self.k1 * (1 - self.b)
+        scale = self.k1 * self.b / (self.stats.avg_length or 1.0)
+
+        scores = []
+        for para, tfs in matched:
+            norm_length = base + scale * len(para)
+            scores.append(sum([weights[i] * tf / (tf + norm_length) for i, tf in tfs.items()]))
+
+        # Only the returned findings are materialized
+        findings = []
+        for index in heapq.nlargest(limit, range(len(matched)), key=lambda index: scores[index]):
+            para, tfs = matched[index]
+            findings.append({
+                "text": para[:500],
+                "keywords": [matcher.keywords[i] for i in sorted(tfs)],
+                "relevance": min(1.0, scores[index] / full_match) if full_match else 0,
+            })
+        return findings
@@ -2,26 +2,43 @@
 LLM Client - Unified interface for LLM interactions.
 
 Supports multiple providers via LiteLLM.
+
+Responses are memoized in an optional on-disk cache keyed on
+(model, system, prompt, temperature, json_mode), concurrent identical
+requests share a single API call, and token/cost usage is counted.
 """
 
 import asyncio
+import hashlib
+import importlib.util
 import json
 import logging
 import os
 import re
-from dataclasses import dataclass
-from typing import Any, Optional
+import time
+from dataclasses import asdict, dataclass, replace
+from pathlib import Path
+from typing import Any, AsyncIterator, Optional
+
+# LiteLLM takes seconds to import, so it is loaded by the first LLMClient
+LITELLM_AVAILABLE = importlib.util.find_spec("litellm") is not None
+litellm: Any = None
 
-try:
-    import litellm
-    from litellm import acompletion
-    LITELLM_AVAILABLE = True
-except ImportError:
-    LITELLM_AVAILABLE = False
+
+def _import_litellm() -> Any:
+    global litellm
+    if litellm is None:
+        import litellm as module
+        litellm = module
+    return litellm
 
 logger = logging.getLogger(__name__)
 
 
+DEFAULT_CACHE_TTL = 7 * 24 * 60 * 60  # seconds
+DEFAULT_CACHE_MAX_ENTRIES = 2000
+
+
 @dataclass
 class LLMResponse:
     """Response from LLM."""
@@ -29,6 +46,117 @@ class LLMResponse:
     model: str
     usage: dict
     raw: Any = None
+    cached: bool = False
+
+
+@dataclass
+class LLMUsage:
+    """Token and cost counters of an LLMClient."""
+    calls: int = 0
+    cache_hits: int = 0
+    coalesced: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    total_tokens: int = 0
+    cost_usd: float = 0.0
+
+    def add(self, usage: dict, cost: float) -> None:
+        """Count one API call."""
+        self.calls += 1
+        self.prompt_tokens += usage.get("prompt_tokens") or 0
+        self.completion_tokens += usage.get("completion_tokens") or 0
+        self.total_tokens += usage.get("total_tokens") or 0
+        self.cost_usd += cost
+
+    def snapshot(self) -> "LLMUsage":
+        """Copy of the current counters."""
+        return replace(self)
+
+    def since(self, start: Optional["LLMUsage"]) -> "LLMUsage":
+        """Usage accumulated after the given snapshot (e.g. one session)."""
+        if start is None:
+            return self.snapshot()
+        return LLMUsage(**{
+            name: value - getattr(start, name)
+            for name, value in asdict(self).items()
+        })
+
+    def to_dict(self) -> dict:
+        """Convert to a JSON-friendly dictionary."""
+        data = asdict(self)
+        data["cost_usd"] = round(self.cost_usd, 6)
+        return data
+
+
+class ResponseCache:
+    """
+    Persistent LLM response cache, one JSON file per request hash.
+
+    Entries older than ``ttl`` are ignored; once more than ``max_entries`` are
+    stored the least recently used files (by mtime) are removed.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        ttl: int = DEFAULT_CACHE_TTL,
+        max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
+    ):
+        self.cache_dir = cache_dir
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self._count = sum(1 for _ in self.cache_dir.glob("*.json"))
+
+    @staticmethod
+    def make_key(model: str, system: Optional[str], prompt: str, temperature: float, json_mode: bool) -> str:
+        """Hash of everything that determines the response."""
+        payload = json.dumps(
+            [model, system or "", prompt, temperature, json_mode],
+            ensure_ascii=False
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.cache_dir / f"{key}.json"
+
+    def get(self, key: str) -> Optional[dict]:
+        """Get a fresh cached response, or None."""
+        path = self._path(key)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError):
+            return None
+        if time.time() - data.get("created_at", 0) > self.ttl:
+            return None
+        # Touch for LRU eviction
+        os.utime(path)
+        return data
+
+    def put(self, key: str, content: str, model: str, usage: dict) -> None:
+        """Store a response."""
+        path = self._path(key)
+        existed = path.exists()
+        tmp = path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({
+            "content": content,
+            "model": model,
+            "usage": usage,
+            "created_at": time.time(),
+        }, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, path)
+        if not existed:
+            self._count += 1
+        if self._count > self.max_entries:
+            self._evict()
+
+    def _evict(self) -> None:
+        files = sorted(self.cache_dir.glob("*.json"), key=lambda p: p.stat().st_mtime)
+        # Trim to 90% so eviction does not run on every put
+        excess = len(files) - max(1, int(self.max_entries * 0.9))
+        for path in files[:max(0, excess)]:
+            path.unlink(missing_ok=True)
+        self._count = len(files) - max(0, excess)
 
 
 class LLMClient:
@@ -51,6 +179,9 @@ class LLMClient:
         api_key: Optional[str] = None,
         temperature: float = 0.3,
         max_tokens: int = 4096,
+        cache_dir: Optional[Path] = None,
+        cache_ttl: int = DEFAULT_CACHE_TTL,
+        cache_max_entries: int = DEFAULT_CACHE_MAX_ENTRIES,
     ):
         """
         Initialize LLM client.
@@ -60,9 +191,13 @@ class LLMClient:
             api_key: API key (uses environment variable if not provided)
             temperature: Sampling temperature
             max_tokens: Maximum tokens in response
+            cache_dir: Directory for the persistent response cache (None = no cache)
+            cache_ttl: Seconds a cached response stays valid
+            cache_max_entries: Cached responses kept before LRU eviction
         """
         if not LITELLM_AVAILABLE:
             raise ImportError("LiteLLM is required. Install with: pip install litellm")
+        _import_litellm()
         
         # Auto-detect model based on available API keys
         if model is None:
@@ -74,6 +209,11 @@ class LLMClient:
         
         # Store API key as instance variable instead of modifying os.environ
         self.api_key = api_key or self._get_api_key_from_env()
+
+        self.cache = ResponseCache(cache_dir, cache_ttl, cache_max_entries) if cache_dir else None
+        self.usage = LLMUsage()
+        # Requests currently being sent, so identical concurrent prompts share one call
+        self._inflight: dict[str, asyncio.Future] = {}
     
     def _detect_model(self) -> str:
         """Detect best available model based on API keys."""
@@ -105,6 +245,9 @@ class LLMClient:
     ) -> LLMResponse:
         """
         Generate completion from LLM.
+
+        Identical requests are served from the response cache, and concurrent
+        identical requests wait for the one already in flight.
         
         Args:
             prompt: User prompt
@@ -114,6 +257,147 @@ class LLMClient:
         Returns:
             LLMResponse with content and metadata
         """
+        key = ResponseCache.make_key(self.model, system, prompt, self.temperature, json_mode)
+
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached:
+                self.usage.cache_hits += 1
+                return LLMResponse(
+                    content=cached["content"],
+                    model=cached.get("model", self.model),
+                    usage=cached.get("usage", {}),
+                    cached=True,
+                )
+
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.usage.coalesced += 1
+            return await asyncio.shield(inflight)
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        try:
+            response = await self._complete_uncached(prompt, system, json_mode)
+        except BaseException as e:
+            if isinstance(e, Exception):
+                future.set_exception(e)
+                # Mark retrieved so waiter-less failures are not logged as unhandled
+                future.exception()
+            else:
+                future.cancel()
+            raise
+        else:
+            future.set_result(response)
+        finally:
+            self._inflight.pop(key, None)
+
+        if self.cache:
+            try:
+                self.cache.put(key, response.content, response.model, response.usage)
+            except OSError as e:
+                logger.warning(f"Failed to write LLM cache entry: {e}")
+
+        return response
+
+    async def _complete_uncached(
+        self,
+        prompt: str,
+        system: Optional[str],
+        json_mode: bool,
+    ) -> LLMResponse:
+        """Send one completion request to the provider."""
+        kwargs = self._request_kwargs(prompt, system, json_mode)
+        
+        try:
+            response = await litellm.acompletion(**kwargs)
+            
+            content = response.choices[0].message.content
+            usage = {
+                "prompt_tokens": response.usage.prompt_tokens,
+                "completion_tokens": response.usage.completion_tokens,
+                "total_tokens": response.usage.total_tokens,
+            }
+            self.usage.add(usage, self._response_cost(response))
+            
+            return LLMResponse(
+                content=content,
+                model=response.model,
+                usage=usage,
+                raw=response,
+            )
+            
+        except Exception as e:
+            raise RuntimeError(f"LLM completion failed: {e}")
+
+    async def stream(
+        self,
+        prompt: str,
+        system: Optional[str] = None,
+    ) -> AsyncIterator[str]:
+        """
+        Generate a completion incrementally.
+
+        A cached response is yielded as a single chunk. A streamed response is
+        metered and cached like complete() once it has finished.
+
+        Args:
+            prompt: User prompt
+            system: System prompt
+
+        Yields:
+            Text chunks as the provider produces them
+        """
+        key = ResponseCache.make_key(self.model, system, prompt, self.temperature, False)
+
+        if self.cache:
+            cached = self.cache.get(key)
+            if cached:
+                self.usage.cache_hits += 1
+                yield cached["content"]
+                return
+
+        kwargs = self._request_kwargs(prompt, system, json_mode=False)
+        kwargs["stream"] = True
+        chunks = []
+        parts = []
+        try:
+            response = await litellm.acompletion(**kwargs)
+            async for chunk in response:
+                chunks.append(chunk)
+                text = chunk.choices[0].delta.content if chunk.choices else None
+                if text:
+                    parts.append(text)
+                    yield text
+        except Exception as e:
+            raise RuntimeError(f"LLM completion failed: {e}")
+
+        # Rebuild the full response for usage, cost and the cache
+        usage = {}
+        cost = 0.0
+        model = self.model
+        try:
+            full = litellm.stream_chunk_builder(chunks, messages=kwargs["messages"])
+            if full is not None:
+                model = full.model or model
+                usage = {
+                    "prompt_tokens": full.usage.prompt_tokens,
+                    "completion_tokens": full.usage.completion_tokens,
+                    "total_tokens": full.usage.total_tokens,
+                }
+                cost = self._response_cost(full)
+        except Exception as e:
+            logger.debug(f"Could not meter streamed response: {e}")
+        self.usage.add(usage, cost)
+
+        if self.cache and parts:
+            try:
+                self.cache.put(key, "".join(parts), model, usage)
+            except OSError as e:
+                logger.warning(f"Failed to write LLM cache entry: {e}")
+
+    def _request_kwargs(self, prompt: str, system: Optional[str], json_mode: bool) -> dict:
+        """Build acompletion() arguments."""
         messages = []
         
         if system:
@@ -137,26 +421,16 @@ class LLMClient:
             if "gpt" in self.model.lower() or "gemini" in self.model.lower():
                 kwargs["response_format"] = {"type": "json_object"}
         
-        try:
-            response = await acompletion(**kwargs)
-            
-            content = response.choices[0].message.content
-            usage = {
-                "prompt_tokens": response.usage.prompt_tokens,
-                "completion_tokens": response.usage.completion_tokens,
-                "total_tokens": response.usage.total_tokens,
-            }
-            
-            return LLMResponse(
-                content=content,
-                model=response.model,
-                usage=usage,
-                raw=response,
-            )
-            
-        except Exception as e:
-            raise RuntimeError(f"LLM completion failed: {e}")
+        return kwargs
     
+    @staticmethod
+    def _response_cost(response: Any) -> float:
+        """Cost of a response in USD (0 when the model has no known pricing)."""
+        try:
+            return float(litellm.completion_cost(completion_response=response) or 0.0)
+        except Exception:
+            return 0.0
+
     async def parse_json(
         self,
         prompt: str,
@@ -7,11 +7,8 @@ with Clawdbot and other MCP-compatible systems.
 
 import asyncio
 import json
-from dataclasses import dataclass
-from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Optional
-from uuid import uuid4
+from typing import Optional
 
 try:
     from mcp.server import Server
@@ -24,19 +21,18 @@ except ImportError:
     Tool = None
     TextContent = None
 
-from .orchestrator import Orchestrator
-
-
-@dataclass
-class ResearchJob:
-    """Represents an ongoing research job."""
-    id: str
-    query: str
-    status: str  # pending, running, completed, failed
-    created_at: datetime
-    completed_at: Optional[datetime] = None
-    result: Optional[dict] = None
-    error: Optional[str] = None
+from .job_scheduler import (
+    JobScheduler,
+    JOB_PENDING,
+    JOB_RUNNING,
+    JOB_FAILED,
+    JOB_STATUSES,
+    DEFAULT_CAPACITY,
+    DEFAULT_MAX_QUEUED,
+    MAX_PRIORITY,
+)
+from .summarizer import DEFAULT_TOKEN_BUDGET
+from .tracing import MetricsServer
 
 
 class ResearchAgentMCPServer:
@@ -48,6 +44,8 @@ class ResearchAgentMCPServer:
     - research.status: Check status of a research job
     - research.results: Get results of a completed research job
     - research.list: List all research jobs
+
+    Jobs are queued and run by a JobScheduler on one shared browser pool.
     """
     
     def __init__(
@@ -55,6 +53,10 @@ class ResearchAgentMCPServer:
         output_dir: Path = Path("data"),
         use_llm: bool = True,
         parallel: int = 3,
+        warm_pool: bool = False,
+        capacity: int = DEFAULT_CAPACITY,
+        max_queued: int = DEFAULT_MAX_QUEUED,
+        summary_token_budget: int = DEFAULT_TOKEN_BUDGET,
     ):
         """
         Initialize MCP server.
@@ -62,7 +64,11 @@ class ResearchAgentMCPServer:
         Args:
             output_dir: Directory for research output
             use_llm: Whether to use LLM features
-            parallel: Number of parallel browsers
+            parallel: Default number of parallel browsers per job
+            warm_pool: Attach to a running warm pool instead of sizing it to capacity
+            capacity: Browsers shared by all jobs
+            max_queued: Maximum number of jobs waiting to start
+            summary_token_budget: Estimated input tokens per summarization call
         """
         if not MCP_AVAILABLE:
             raise ImportError(
@@ -72,14 +78,17 @@ class ResearchAgentMCPServer:
         self.output_dir = output_dir
         self.use_llm = use_llm
         self.parallel = parallel
+        self.warm_pool = warm_pool
         
-        # Track active jobs
-        self._jobs: dict[str, ResearchJob] = {}
-        self._running_tasks: dict[str, asyncio.Task] = {}
-        
-        # Cleanup settings
-        self._max_completed_jobs = 100
-        self._job_retention_hours = 24
+        # Queues jobs and shares one browser pool between them
+        self.scheduler = JobScheduler(
+            output_dir=output_dir,
+            capacity=capacity,
+            max_queued=max_queued,
+            use_llm=use_llm,
+            warm_pool=warm_pool,
+            summary_token_budget=summary_token_budget,
+        )
         
         # Create MCP server
         self.server = Server("research-agent")
@@ -93,7 +102,8 @@ class ResearchAgentMCPServer:
             return [
                 Tool(
                     name="research_start",
-                    description="Start a new research session. Returns a job ID to track progress.",
+                    description="Start a new research session. Returns a job ID to track progress. "
+                                "Jobs share a pool of browsers and wait in a queue while it is busy.",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -103,9 +113,14 @@ class ResearchAgentMCPServer:
                             },
                             "parallel": {
                                 "type": "integer",
-                                "description": "Number of parallel browsers (default: 3)",
+                                "description": "Maximum parallel browsers for this job (default: 3)",
                                 "default": 3
                             },
+                            "priority": {
+                                "type": "integer",
+                                "description": f"0-{MAX_PRIORITY}; higher starts first and gets more browsers (default: 0)",
+                                "default": 0
+                            },
                             "screenshot": {
                                 "type": "boolean",
                                 "description": "Take screenshots of pages",
@@ -117,7 +132,7 @@ class ResearchAgentMCPServer:
                 ),
                 Tool(
                     name="research_status",
-                    description="Check status of a research job.",
+                    description="Check status and progress of a research job.",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -131,7 +146,7 @@ class ResearchAgentMCPServer:
                 ),
                 Tool(
                     name="research_results",
-                    description="Get results of a completed research job.",
+                    description="Get results of a research job (partial ranking and summary while it is still running).",
                     inputSchema={
                         "type": "object",
                         "properties": {
@@ -157,7 +172,7 @@ class ResearchAgentMCPServer:
                             "status": {
                                 "type": "string",
                                 "description": "Filter by status (pending, running, completed, failed)",
-                                "enum": ["pending", "running", "completed", "failed"]
+                                "enum": list(JOB_STATUSES)
                             }
                         }
                     }
@@ -172,6 +187,7 @@ class ResearchAgentMCPServer:
                         query=arguments["query"],
                         parallel=arguments.get("parallel", self.parallel),
                         screenshot=arguments.get("screenshot", False),
+                        priority=arguments.get("priority", 0),
                     )
                 elif name == "research_status":
                     result = await self._get_status(arguments["job_id"])
@@ -198,109 +214,31 @@ class ResearchAgentMCPServer:
                     text=json.dumps({"error": str(e)}, indent=2)
                 )]
     
-    def _cleanup_completed_jobs(self) -> None:
-        """Remove old completed/failed jobs to prevent memory leaks."""
-        now = datetime.now(timezone.utc)
-        completed_jobs = [
-            (job_id, job) for job_id, job in self._jobs.items()
-            if job.status in ("completed", "failed")
-        ]
-        
-        # Remove jobs older than retention period
-        for job_id, job in completed_jobs:
-            if job.completed_at:
-                age_hours = (now - job.completed_at).total_seconds() / 3600
-                if age_hours > self._job_retention_hours:
-                    self._jobs.pop(job_id, None)
-                    self._running_tasks.pop(job_id, None)
-        
-        # If still too many completed jobs, remove oldest ones
-        remaining_completed = [
-            (job_id, job) for job_id, job in self._jobs.items()
-            if job.status in ("completed", "failed")
-        ]
-        if len(remaining_completed) > self._max_completed_jobs:
-            sorted_jobs = sorted(
-                remaining_completed,
-                key=lambda x: x[1].completed_at or x[1].created_at
-            )
-            for job_id, _ in sorted_jobs[:-self._max_completed_jobs]:
-                self._jobs.pop(job_id, None)
-                self._running_tasks.pop(job_id, None)
-
     async def _start_research(
         self,
         query: str,
         parallel: int = 3,
         screenshot: bool = False,
+        priority: int = 0,
     ) -> dict:
-        """Start a new research job."""
-        # Cleanup old completed jobs before starting new one
-        self._cleanup_completed_jobs()
-        
-        job_id = str(uuid4())[:8]
-        
-        job = ResearchJob(
-            id=job_id,
+        """Queue a new research job."""
+        job = await self.scheduler.submit(
             query=query,
-            status="pending",
-            created_at=datetime.now(timezone.utc),
-        )
-        self._jobs[job_id] = job
-        
-        # Start research in background
-        task = asyncio.create_task(
-            self._run_research(job_id, query, parallel, screenshot)
+            parallel=parallel,
+            screenshot=screenshot,
+            priority=priority,
         )
-        self._running_tasks[job_id] = task
         
         return {
-            "job_id": job_id,
-            "status": "pending",
-            "message": f"Research started for: {query}"
+            "job_id": job.id,
+            "status": job.status,
+            "queue_position": self.scheduler.queue_position(job),
+            "message": f"Research queued for: {query}"
         }
     
-    async def _run_research(
-        self,
-        job_id: str,
-        query: str,
-        parallel: int,
-        screenshot: bool,
-    ):
-        """Run research job in background."""
-        job = self._jobs.get(job_id)
-        if not job:
-            return
-        
-        job.status = "running"
-        
-        try:
-            orchestrator = Orchestrator(
-                parallel=parallel,
-                output_dir=self.output_dir,
-                screenshot=screenshot,
-                use_llm=self.use_llm,
-            )
-            
-            result = await orchestrator.run(query)
-            
-            job.status = "completed"
-            job.completed_at = datetime.now(timezone.utc)
-            job.result = result
-            
-        except Exception as e:
-            job.status = "failed"
-            job.completed_at = datetime.now(timezone.utc)
-            job.error = str(e)
-        
-        finally:
-            # Cleanup task reference
-            if job_id in self._running_tasks:
-                del self._running_tasks[job_id]
-    
     async def _get_status(self, job_id: str) -> dict:
         """Get status of a research job."""
-        job = self._jobs.get(job_id)
+        job = self.scheduler.jobs.get(job_id)
         
         if not job:
             return {"error": f"Job not found: {job_id}"}
@@ -309,9 +247,14 @@ class ResearchAgentMCPServer:
             "job_id": job.id,
             "query": job.query,
             "status": job.status,
+            "priority": job.priority,
             "created_at": job.created_at.isoformat(),
         }
         
+        if job.status == JOB_PENDING:
+            result["queue_position"] = self.scheduler.queue_position(job)
+            result["pool"] = self.scheduler.stats()
+        
         if job.completed_at:
             result["completed_at"] = job.completed_at.isoformat()
         
@@ -323,6 +266,15 @@ class ResearchAgentMCPServer:
                 "completed": job.result.get("completed", 0),
                 "total": job.result.get("total", 0),
             }
+        elif job.status == JOB_RUNNING:
+            result["browsers"] = job.browsers
+            result["progress"] = {
+                "tasks_done": job.tasks_done,
+                "tasks_total": job.tasks_total,
+                "findings": len(job.partial_findings),
+            }
+            if job.partial_findings:
+                result["top_finding"] = job.partial_findings[0]
         
         return result
     
@@ -332,19 +284,37 @@ class ResearchAgentMCPServer:
         include_raw: bool = False,
     ) -> dict:
         """Get results of a completed research job."""
-        job = self._jobs.get(job_id)
+        job = self.scheduler.jobs.get(job_id)
         
         if not job:
             return {"error": f"Job not found: {job_id}"}
         
-        if job.status == "pending":
-            return {"error": "Research not started yet", "status": "pending"}
+        if job.status == JOB_PENDING:
+            return {
+                "error": "Research not started yet",
+                "status": JOB_PENDING,
+                "queue_position": self.scheduler.queue_position(job),
+            }
         
-        if job.status == "running":
-            return {"error": "Research still running", "status": "running"}
+        if job.status == JOB_RUNNING:
+            # Partial ranking and summary streamed so far
+            result = {
+                "job_id": job.id,
+                "query": job.query,
+                "status": "running",
+                "partial": True,
+                "tasks_done": job.tasks_done,
+                "tasks_total": job.tasks_total,
+                "summary": job.partial_summary,
+            }
+            if include_raw:
+                result["findings"] = job.partial_findings
+            else:
+                result["top_findings"] = job.partial_findings[:5]
+            return result
         
-        if job.status == "failed":
-            return {"error": job.error, "status": "failed"}
+        if job.status == JOB_FAILED:
+            return {"error": job.error, "status": JOB_FAILED}
         
         result = {
             "job_id": job.id,
@@ -363,7 +333,7 @@ class ResearchAgentMCPServer:
         """List all research jobs."""
         jobs = []
         
-        for job in self._jobs.values():
+        for job in self.scheduler.jobs.values():
             if status and job.status != status:
                 continue
             
@@ -371,22 +341,30 @@ class ResearchAgentMCPServer:
                 "job_id": job.id,
                 "query": job.query[:50] + "..." if len(job.query) > 50 else job.query,
                 "status": job.status,
+                "priority": job.priority,
                 "created_at": job.created_at.isoformat(),
             })
         
         return {
             "jobs": jobs,
             "total": len(jobs),
+            "pool": self.scheduler.stats(),
         }
     
     async def run(self):
         """Run the MCP server."""
-        async with stdio_server() as (read_stream, write_stream):
-            await self.server.run(
-                read_stream,
-                write_stream,
-                self.server.create_initialization_options(),
-            )
+        # Resumes jobs interrupted by a previous shutdown
+        if any(job.status in (JOB_PENDING, JOB_RUNNING) for job in self.scheduler.jobs.values()):
+            self.scheduler.schedule()
+        try:
+            async with stdio_server() as (read_stream, write_stream):
+                await self.server.run(
+                    read_stream,
+                    write_stream,
+                    self.server.create_initialization_options(),
+                )
+        finally:
+            await self.scheduler.shutdown()
 
 
 async def main():
@@ -409,7 +387,36 @@ async def main():
         "--parallel",
         type=int,
         default=3,
-        help="Number of parallel browsers"
+        help="Default number of parallel browsers per job"
+    )
+    parser.add_argument(
+        "--capacity",
+        type=int,
+        default=DEFAULT_CAPACITY,
+        help="Browsers shared by all jobs"
+    )
+    parser.add_argument(
+        "--max-queued",
+        type=int,
+        default=DEFAULT_MAX_QUEUED,
+        help="Maximum number of jobs waiting to start"
+    )
+    parser.add_argument(
+        "--summary-token-budget",
+        type=int,
+        default=DEFAULT_TOKEN_BUDGET,
+        help="Estimated input tokens per LLM call when summarizing findings in batches"
+    )
+    parser.add_argument(
+        "--metrics-port",
+        type=int,
+        default=None,
+        help="Serve Prometheus metrics at http://127.0.0.1:PORT/metrics"
+    )
+    parser.add_argument(
+        "--warm-pool",
+        action="store_true",
+        help="Use the running warm pool as is (start it with: python -m src pool up)"
     )
     
     args = parser.parse_args()
@@ -418,9 +425,20 @@ async def main():
         output_dir=args.output_dir,
         use_llm=not args.no_llm,
         parallel=args.parallel,
+        warm_pool=args.warm_pool,
+        capacity=args.capacity,
+        max_queued=args.max_queued,
+        summary_token_budget=args.summary_token_budget,
     )
     
-    await server.run()
+    metrics_server = MetricsServer(args.metrics_port) if args.metrics_port else None
+    if metrics_server:
+        await metrics_server.start()
+    try:
+        await server.run()
+    finally:
+        if metrics_server:
+            await metrics_server.stop()
 
 
 if __name__ == "__main__":
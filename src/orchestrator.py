@@ -3,61 +3,79 @@ Orchestrator - Coordinates parallel browser research tasks.
 
 Manages task distribution, result aggregation, and session state.
 Supports LLM-powered query decomposition and result summarization.
+
+A run is pipelined: cold containers boot while the query is decomposed,
+every browser starts on tasks as soon as it is ready, and findings are
+semantically scored and (with LLM) summarized in batches as results
+arrive, so after the last task only the final ranking and the reduce step
+of the summary remain.
 """
 
 import asyncio
+import heapq
 import json
 import logging
+import time
 from dataclasses import dataclass, field
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Optional, TYPE_CHECKING
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, TYPE_CHECKING
 from uuid import uuid4
 
-from rich.progress import Progress
-
 logger = logging.getLogger(__name__)
 
-from .browser_pool import BrowserPool, BrowserInstance
-from .snapshot import SnapshotManager
+from .browser_pool import (
+    BrowserPool, BrowserInstance, BrowserSlot, DEFAULT_READINESS,
+    BLOCK_FULL, BLOCK_NO_MEDIA, BLOCK_TEXT_ONLY
+)
+from . import events
+from .events import ResearchEvent
+from .snapshot import SnapshotManager, TaskJournal
 from .task_parser import TaskParser, LLMTaskParser, ResearchTask, create_parser
-from .semantic_filter import SemanticFilter
+from .keyword_matcher import ParagraphScorer
+from .scheduler import TaskScheduler
+from .page_cache import PageCache, CACHE_OFF
+from .http_fetcher import HttpFetcher, DomainTiers
+from . import tracing
+from .tracing import Tracer
 from .retry import retry_with_backoff, RetryConfig, get_fallback_search_url, backoff_sleep
+from .summarizer import MapReduceSummarizer, DEFAULT_TOKEN_BUDGET, DEFAULT_CONCURRENCY
 
 if TYPE_CHECKING:
+    from rich.progress import Progress
+
     from .llm_client import LLMClient
+    from .semantic_filter import IncrementalRanking, SemanticFilter
 else:
     # Runtime import (deferred to avoid circular imports at module load)
     LLMClient = None
 
 
-# System prompt for result summarization
-SUMMARIZATION_PROMPT = """You are a research analyst. Your job is to synthesize research findings into a clear, actionable summary.
-
-Given a set of research findings from multiple sources, create a comprehensive summary that:
-1. Identifies the key insights and themes
-2. Highlights important facts and statistics
-3. Notes any conflicting information between sources
-4. Provides actionable conclusions
+# Fixed post-navigation wait used before event-driven readiness existed
+PAGE_SETTLE_SECONDS = 2.0
 
-Format your response as Markdown with the following structure:
+# Request-blocking profile per task type: search result pages only need their
+# own text and scripts; articles may render through third-party scripts
+TASK_BLOCK_PROFILES = {
+    "search": BLOCK_TEXT_ONLY,
+    "direct": BLOCK_NO_MEDIA,
+    "crawl": BLOCK_NO_MEDIA,
+}
 
-## Summary
-A brief 2-3 sentence overview of the findings.
+# Characters of page text kept per task (the browser-api truncates before sending)
+PAGE_TEXT_MAX_CHARS = 10000
 
-## Key Insights
-- Bullet points of the most important discoveries
+# Task types tried over plain HTTP before a browser (search pages need one)
+HTTP_TIER_TASK_TYPES = ("direct", "crawl")
+# Concurrent HTTP-tier fetches
+HTTP_TIER_CONCURRENCY = 16
 
-## Details
-Detailed findings organized by topic/theme.
+# Full-page screenshots are cut at this height (Chromium cannot encode taller JPEG/WebP)
+SCREENSHOT_MAX_HEIGHT = 16384
 
-## Sources
-Notable sources and their contributions.
-
-## Conclusions
-Actionable takeaways from the research.
-
-Be concise but thorough. Focus on information that directly answers the original research query."""
+# Partial rankings streamed while tasks run: size and minimum interval (seconds)
+PARTIAL_RANKING_SIZE = 10
+PARTIAL_RANKING_INTERVAL = 1.0
 
 
 @dataclass
@@ -74,6 +92,8 @@ class TaskResult:
     started_at: Optional[datetime] = None
     completed_at: Optional[datetime] = None
     findings: list = field(default_factory=list)
+    links: list = field(default_factory=list)
+    cached: bool = False
 
 
 @dataclass
@@ -116,26 +136,181 @@ class Orchestrator:
         profile_dir: Optional[Path] = None,
         use_llm: bool = False,
         llm_client: Optional["LLMClient"] = None,
+        warm_pool: bool = False,
+        max_concurrency: Optional[int] = None,
+        follow_links: int = 0,
+        tabs_per_instance: int = 1,
+        cache_mode: str = CACHE_OFF,
+        screenshot_format: str = "png",
+        screenshot_quality: Optional[int] = None,
+        block_profile: Optional[str] = None,
+        http_tier: bool = True,
+        pool: Optional[BrowserPool] = None,
+        instances: Optional[list[BrowserInstance]] = None,
+        on_instance_retired: Optional[Callable[[BrowserInstance], Awaitable[None]]] = None,
+        trace: bool = True,
+        summary_token_budget: int = DEFAULT_TOKEN_BUDGET,
+        summary_concurrency: int = DEFAULT_CONCURRENCY,
+        page_cache: Optional[PageCache] = None,
+        domain_tiers: Optional[DomainTiers] = None,
+        semantic_filter: Optional["SemanticFilter"] = None,
+        snapshot_manager: Optional[SnapshotManager] = None,
     ):
         self.parallel = parallel
         self.output_dir = output_dir
         self.screenshot = screenshot
+        # Image encoding of screenshots (png, jpeg, webp) and jpeg/webp quality
+        self.screenshot_format = screenshot_format
+        self.screenshot_quality = screenshot_quality
+        # Request-blocking profile for every page (None = by task type)
+        self.block_profile = block_profile
         self.session_name = session_name or f"session-{datetime.now().strftime('%Y%m%d-%H%M%S')}"
         self.timeout = timeout
         self.profile_dir = profile_dir
         self.use_llm = use_llm
+        # One client shared by query parsing and summarization, so its response
+        # cache, request coalescing and usage counters cover the whole session
+        if use_llm and llm_client is None:
+            llm_client = self._create_llm_client()
         self.llm_client = llm_client
+        # Estimated input tokens per summarization call and calls in flight
+        self.summary_token_budget = summary_token_budget
+        self.summary_concurrency = summary_concurrency
         self.use_semantic_filter = use_llm  # Enable semantic filter with LLM
-
-        self.pool = BrowserPool()
-        self.snapshot_manager = SnapshotManager(output_dir)
-        self.task_parser = create_parser(use_llm=use_llm)
-        self.semantic_filter = SemanticFilter() if self.use_semantic_filter else None
+        # Profiles are mounted at container start, so they need cold containers
+        self.warm_pool = warm_pool and profile_dir is None
+        # Global cap on concurrently running tasks (defaults to one per browser)
+        self.max_concurrency = max_concurrency
+        # Number of result links per search task to crawl as follow-up tasks
+        self.follow_links = follow_links
+        # Concurrent tabs per browser (capped further by each container's free memory)
+        self.tabs_per_instance = max(1, tabs_per_instance)
+
+        # A pool shared by several sessions is closed by its owner
+        self.pool = pool or BrowserPool()
+        self._owns_pool = pool is None
+        # Instances leased by the caller (e.g. the MCP job scheduler), used
+        # instead of acquiring; they stay the caller's to release
+        self._provided_instances = instances
+        # Receives instances given back with retire_instances()
+        self.on_instance_retired = on_instance_retired
+        # Pages fetched by earlier sessions (off, read-write, read-only, refresh);
+        # sessions running side by side on one output_dir share the caller's caches
+        self.page_cache = page_cache or PageCache(output_dir / "cache" / "pages", mode=cache_mode)
+        # Static direct/crawl pages are fetched over HTTP; the browser is the fallback.
+        # Requests go through the browsers' proxies, so both tiers leave from the same addresses
+        self.http_fetcher = (
+            HttpFetcher(
+                domain_tiers or DomainTiers(output_dir / "cache" / "fetch_tiers.json"),
+                proxies=self.pool.proxies,
+            )
+            if http_tier else None
+        )
+        # A snapshot manager (and its catalog connection) shared by several
+        # sessions is closed by its owner
+        self.snapshot_manager = snapshot_manager or SnapshotManager(output_dir)
+        self._owns_snapshot_manager = snapshot_manager is None
+        # Write a JSONL trace per session under <output_dir>/traces
+        self.trace = trace
+        self.tracer: Optional[Tracer] = None
+        self.task_parser = create_parser(use_llm=True, llm_client=llm_client) if use_llm else create_parser()
+        self.semantic_filter = semantic_filter if self.use_semantic_filter else None
+        if self.use_semantic_filter and semantic_filter is None:
+            # numpy (and the model) are only loaded when semantic filtering is on
+            from .semantic_filter import SemanticFilter
+            self.semantic_filter = SemanticFilter(cache_dir=output_dir / "cache" / "embeddings")
 
         self.session: Optional[ResearchSession] = None
         self._running = False
+        self._instances: list[BrowserInstance] = []
+        self._scheduler: Optional[TaskScheduler] = None
+        # Routes tasks to the HTTP tier or the browser scheduler while tasks run
+        self._dispatch: Optional[Callable[[list[ResearchTask]], int]] = None
+        self._seen_urls: set[str] = set()
+        # Keyword matchers and BM25 corpus statistics of the running session
+        self._paragraph_scorer = ParagraphScorer()
+        # Per-task journal of the running session (compacted into the snapshot at the end)
+        self._journal: Optional[TaskJournal] = None
+        # Receiver of progress events (set by stream())
+        self._event_sink: Optional[Callable[[ResearchEvent], None]] = None
+        self._partial_findings: list[dict] = []
+        self._last_ranking = 0.0
+        # Background browser acquisition of the running session
+        self._acquire_job: Optional[asyncio.Task] = None
+        # Semantic ranking updated as results arrive, and its pending batches
+        self._ranking: Optional["IncrementalRanking"] = None
+        self._ranking_jobs: set[asyncio.Task] = set()
+        # Map-reduce summary of the running session, fed as results arrive
+        self._summarizer: Optional[MapReduceSummarizer] = None
+
+    def _emit(self, event_type: str, **data: Any) -> None:
+        """Send a progress event to the stream consumer, if any."""
+        if self._event_sink is None:
+            return
+        self._event_sink(ResearchEvent(
+            type=event_type,
+            data=data,
+            session_id=self.session.id if self.session else "",
+        ))
+
+    async def stream(
+        self,
+        query: str,
+        progress: Optional["Progress"] = None,
+        resume: Optional[dict] = None,
+    ) -> AsyncIterator[ResearchEvent]:
+        """
+        Run (or resume) a research session, yielding progress events as they happen.
+
+        Yields task start/finish, findings as each page is processed, periodic
+        partial rankings, summary chunks, and finally a COMPLETED event holding
+        the same dict run() returns (or FAILED with the error). Closing the
+        generator early (e.g. via contextlib.aclosing) stops the session.
+
+        Args:
+            query: Research query to investigate
+            progress: Rich progress instance for UI updates
+            resume: Saved session data to continue instead of starting a new
+                session (as passed to resume())
+
+        Yields:
+            ResearchEvent objects
+        """
+        queue: asyncio.Queue[ResearchEvent] = asyncio.Queue()
+        self._event_sink = queue.put_nowait
+
+        async def run_session() -> None:
+            try:
+                if resume is not None:
+                    result = await self.resume(resume, progress)
+                else:
+                    result = await self.run(query, progress)
+                self._emit(events.COMPLETED, result=result)
+            except Exception as e:
+                self._emit(events.FAILED, error=str(e))
+
+        runner = asyncio.create_task(run_session())
+        try:
+            while True:
+                if queue.empty() and runner.done():
+                    break
+                getter = asyncio.ensure_future(queue.get())
+                await asyncio.wait({getter, runner}, return_when=asyncio.FIRST_COMPLETED)
+                if not getter.done():
+                    getter.cancel()
+                    continue
+                event = getter.result()
+                yield event
+                if event.type in (events.COMPLETED, events.FAILED):
+                    break
+        finally:
+            if not runner.done():
+                await self.stop()
+                runner.cancel()
+                await asyncio.gather(runner, return_exceptions=True)
+            self._event_sink = None
 
-    async def run(self, query: str, progress: Optional[Progress] = None) -> dict:
+    async def run(self, query: str, progress: Optional["Progress"] = None) -> dict:
         """
         Run a research session.
 
@@ -146,7 +321,23 @@ class Orchestrator:
         Returns:
             Research results dictionary
         """
+        self.tracer = self._create_tracer()
+        with tracing.activate(self.tracer), self.tracer.span("run", query=query):
+            try:
+                return await self._run(query, progress)
+            finally:
+                self.tracer.close()
+
+    def _create_tracer(self) -> Tracer:
+        """Tracer of a session (trace file named like the results file)."""
+        path = self.output_dir / "traces" / f"{self.session_name}.jsonl" if self.trace else None
+        return Tracer(path)
+
+    async def _run(self, query: str, progress: Optional["Progress"]) -> dict:
+        """Run a research session inside its trace."""
         self._running = True
+        self._paragraph_scorer = ParagraphScorer()
+        llm_usage_start = self.llm_client.usage.snapshot() if self.llm_client else None
 
         # Create session
         self.session = ResearchSession(
@@ -161,53 +352,68 @@ class Orchestrator:
         )
 
         try:
+            # Cold containers boot while the query is being decomposed
+            arrivals = None
+            if self._provided_instances is None and not self.warm_pool:
+                arrivals = self._start_browsers(self.parallel, progress)
+
             # Parse query into tasks
             if progress:
                 task_id = progress.add_task("Parsing query...", total=None)
 
-            tasks = await self.task_parser.parse(query)
+            with tracing.span("parse_query"):
+                tasks = await self.task_parser.parse(query)
             self.session.tasks = tasks
             self.session.total = len(tasks)
 
             if progress:
                 progress.update(task_id, completed=True, description=f"Found {len(tasks)} research tasks")
+            self._emit(events.SESSION_STARTED, query=query, total=len(tasks))
 
-            # Start browser pool
-            if progress:
-                pool_task = progress.add_task(f"Starting {self.parallel} browsers...", total=None)
+            # Snapshot the task list once; completed tasks are journaled from here on
+            await self.snapshot_manager.save_session(self.session)
+            self._journal = self.snapshot_manager.open_journal(self.session.id)
 
-            instances = await self.pool.start(
-                count=min(self.parallel, len(tasks)),
-                session=self.session_name,
-                profile_dir=self.profile_dir
-            )
+            # Warm and provided instances are only taken once the task count is known
+            if arrivals is None:
+                arrivals = self._start_browsers(min(self.parallel, len(tasks)), progress)
 
-            if progress:
-                progress.update(pool_task, completed=True, description=f"Started {len(instances)} browsers")
+            # Findings are embedded and scored while the remaining pages load
+            if self.semantic_filter and self.semantic_filter.available:
+                self._ranking = self.semantic_filter.incremental(query)
+            # Batches of results are summarized while the remaining tasks run
+            self._summarizer = self._create_summarizer(query)
 
-            # Execute tasks in parallel
+            # Execute tasks on each browser as soon as it is ready
+            research_task = None
             if progress:
                 research_task = progress.add_task("Researching...", total=len(tasks))
 
-            results = await self._execute_tasks(tasks, instances, progress, research_task)
+            with tracing.span("execute_tasks", tasks=len(tasks)):
+                results = await self._execute_tasks(tasks, [], progress, research_task, arrivals=arrivals)
+            await self._stop_acquiring()
             self.session.results = results
             self.session.completed = len([r for r in results if r.status == "success"])
 
             # Aggregate findings (with semantic filtering if enabled)
-            findings = await self._aggregate_findings(results, query)
+            with tracing.span("aggregate"):
+                findings = await self._aggregate_findings(results, query)
+            self._emit(events.RANKING, findings=findings[:PARTIAL_RANKING_SIZE], final=True)
 
             # Summarize with LLM if enabled
             if progress and self.use_llm:
                 summary_task = progress.add_task("Summarizing results...", total=None)
             
-            summary = await self.summarize_results(findings, query)
+            with tracing.span("summarize"):
+                summary = await self.summarize_results(findings, query)
             
             if progress and self.use_llm:
                 progress.update(summary_task, completed=True, description="Summary generated")
 
             # Save session
             self.session.status = "completed"
-            await self.snapshot_manager.save_session(self.session)
+            self._close_journal()
+            await self.snapshot_manager.save_session(self.session, compact=True)
 
             # Save results to file
             output_path = await self._save_results(findings, summary)
@@ -218,34 +424,60 @@ class Orchestrator:
                 "total": self.session.total,
                 "findings": findings,
                 "summary": summary,
-                "output_path": str(output_path)
+                "output_path": str(output_path),
+                "startup_timings": self.pool.get_startup_timings(),
+                "readiness": self.pool.readiness_stats.to_dict(),
+                "blocking": self.pool.blocking_stats.to_dict(),
+                "cache": self.page_cache.stats(),
+                "http_tier": self.http_fetcher.stats.to_dict() if self.http_fetcher else None,
+                "llm_usage": self.llm_client.usage.since(llm_usage_start).to_dict() if self.llm_client else None,
+                "summarization": self._summarizer.stats.to_dict() if self._summarizer else None,
+                "timings": self.tracer.breakdown(),
             }
 
         except Exception as e:
             if self.session:
+                # Results finished so far stay in the journal for resume()
                 self.session.status = "failed"
+                self._close_journal()
                 await self.snapshot_manager.save_session(self.session)
             raise
 
         finally:
             self._running = False
-            await self.pool.close()
+            self._close_journal()
+            await self._stop_background_work()
+            self.page_cache.flush()
+            await self._close_http_tier()
+            await self._release_instances()
+            await self._close_pool()
+            self._close_snapshot_manager()
 
     async def resume(
         self,
         session_data: dict,
-        progress: Optional[Progress] = None
+        progress: Optional["Progress"] = None
     ) -> dict:
         """
         Resume a paused session.
 
         Args:
-            session_data: Saved session data
+            session_data: Saved session data (snapshot with the journal replayed,
+                as returned by SnapshotManager.load_session)
             progress: Rich progress instance
 
         Returns:
             Research results dictionary
         """
+        self.tracer = self._create_tracer()
+        with tracing.activate(self.tracer), self.tracer.span("run", resumed=True):
+            try:
+                return await self._resume(session_data, progress)
+            finally:
+                self.tracer.close()
+
+    async def _resume(self, session_data: dict, progress: Optional["Progress"]) -> dict:
+        """Resume a paused session inside its trace."""
         # Restore session state
         self.session = ResearchSession(
             id=session_data["id"],
@@ -260,14 +492,20 @@ class Orchestrator:
             total=session_data.get("total", 0)
         )
 
+        self.session.tasks = [ResearchTask(**t) for t in session_data.get("tasks", [])]
+        prev_results = [TaskResult(**r) for r in session_data.get("results", [])]
+        self.session.results = list(prev_results)
+
         # Get remaining tasks
         completed_task_ids = {r["task_id"] for r in session_data.get("results", [])}
         remaining_tasks = [
             ResearchTask(**t) for t in session_data.get("tasks", [])
             if t["id"] not in completed_task_ids
         ]
+        self._emit(events.SESSION_STARTED, query=self.session.query, total=self.session.total)
 
         if not remaining_tasks:
+            self._close_snapshot_manager()
             return {
                 "session_id": self.session.id,
                 "completed": self.session.completed,
@@ -276,81 +514,560 @@ class Orchestrator:
                 "output_path": str(self.output_dir)
             }
 
-        # Start browsers and continue
-        instances = await self.pool.start(
-            count=min(self.parallel, len(remaining_tasks)),
-            session=self.session_name,
-            profile_dir=self.profile_dir
-        )
+        try:
+            # Start browsers and continue
+            self._running = True
+            self._seen_urls = {t.get("url", "") for t in session_data.get("tasks", [])}
+            self._paragraph_scorer = ParagraphScorer()
+            self._journal = self.snapshot_manager.open_journal(self.session.id)
+            arrivals = self._start_browsers(min(self.parallel, len(remaining_tasks)), progress)
+            self._summarizer = self._create_summarizer(session_data["query"])
+            for result in prev_results:
+                self._summarize_in_background(result)
+
+            research_task = None
+            if progress:
+                research_task = progress.add_task(
+                    f"Resuming... ({len(remaining_tasks)} remaining)",
+                    total=len(remaining_tasks)
+                )
+
+            with tracing.span("execute_tasks", tasks=len(remaining_tasks)):
+                results = await self._execute_tasks(remaining_tasks, [], progress, research_task, arrivals=arrivals)
+            await self._stop_acquiring()
 
-        if progress:
-            research_task = progress.add_task(
-                f"Resuming... ({len(remaining_tasks)} remaining)",
-                total=len(remaining_tasks)
+            # Merge with previous results
+            all_results = prev_results + results
+            self.session.results = all_results
+            self.session.completed = len([r for r in all_results if r.status == "success"])
+
+            with tracing.span("aggregate"):
+                findings = await self._aggregate_findings(all_results, session_data["query"])
+            self._emit(events.RANKING, findings=findings[:PARTIAL_RANKING_SIZE], final=True)
+            with tracing.span("summarize"):
+                summary = await self.summarize_results(findings, session_data["query"])
+
+            self.session.status = "completed"
+            self._close_journal()
+            await self.snapshot_manager.save_session(self.session, compact=True)
+            output_path = await self._save_results(findings, summary)
+
+            return {
+                "session_id": self.session.id,
+                "completed": self.session.completed,
+                "total": self.session.total,
+                "findings": findings,
+                "summary": summary,
+                "output_path": str(output_path),
+                "timings": self.tracer.breakdown(),
+            }
+
+        except Exception as e:
+            if self.session:
+                # Results finished so far stay in the journal for the next resume()
+                self.session.status = "failed"
+                self._close_journal()
+                await self.snapshot_manager.save_session(self.session)
+            raise
+
+        finally:
+            self._running = False
+            self._close_journal()
+            await self._stop_background_work()
+            self.page_cache.flush()
+            await self._close_http_tier()
+            await self._release_instances()
+            await self._close_pool()
+            self._close_snapshot_manager()
+
+    async def _acquire_instances(self, count: int) -> list[BrowserInstance]:
+        """
+        Get browser instances for this session.
+
+        Uses the instances given to the constructor, else leases from the warm
+        pool when enabled, otherwise cold-starts containers.
+        """
+        if self._provided_instances is not None:
+            instances = list(self._provided_instances)
+        elif self.warm_pool:
+            instances = await self.pool.lease(count=count, session=self.session_name)
+            if not instances:
+                raise RuntimeError("No warm browser instances available")
+        else:
+            instances = await self.pool.start(
+                count=count,
+                session=self.session_name,
+                profile_dir=self.profile_dir
             )
 
-        results = await self._execute_tasks(remaining_tasks, instances, progress, research_task)
+        self._instances = instances
+        return instances
 
-        # Merge with previous results
-        prev_results = [TaskResult(**r) for r in session_data.get("results", [])]
-        all_results = prev_results + results
-        self.session.results = all_results
-        self.session.completed = len([r for r in all_results if r.status == "success"])
+    def _start_browsers(
+        self,
+        count: int,
+        progress: Optional["Progress"] = None
+    ) -> AsyncIterator[BrowserInstance]:
+        """
+        Acquire browsers in the background and yield each one once it is ready.
 
-        findings = await self._aggregate_findings(all_results, session_data["query"])
-        summary = await self.summarize_results(findings, session_data["query"])
+        Cold containers come from pool.start_each, so the first browser can
+        start working while the others (and query parsing) are still going.
+        Instances given to the constructor or leased from the warm pool
+        arrive together. Acquisition errors are raised by the iterator.
+        """
+        arrived: asyncio.Queue[Optional[BrowserInstance]] = asyncio.Queue()
+        pool_task = progress.add_task(f"Starting {count} browsers...", total=None) if progress else None
 
-        self.session.status = "completed"
-        await self.snapshot_manager.save_session(self.session)
-        output_path = await self._save_results(findings, summary)
+        async def acquire() -> None:
+            try:
+                with tracing.span("acquire_browsers", count=count):
+                    if self._provided_instances is None and not self.warm_pool:
+                        async for instance in self.pool.start_each(
+                            count=count,
+                            session=self.session_name,
+                            profile_dir=self.profile_dir
+                        ):
+                            self._instances.append(instance)
+                            arrived.put_nowait(instance)
+                            if progress:
+                                progress.update(
+                                    pool_task, description=f"Started {len(self._instances)}/{count} browsers"
+                                )
+                    else:
+                        for instance in await self._acquire_instances(count):
+                            arrived.put_nowait(instance)
+                if progress:
+                    progress.update(pool_task, completed=True, description=f"Started {len(self._instances)} browsers")
+            finally:
+                arrived.put_nowait(None)
+
+        job = asyncio.create_task(acquire())
+        self._acquire_job = job
+
+        async def arrivals() -> AsyncIterator[BrowserInstance]:
+            while (instance := await arrived.get()) is not None:
+                yield instance
+            await job
+
+        return arrivals()
+
+    async def _stop_acquiring(self) -> None:
+        """Stop starting browsers (those still booting are not needed any more)."""
+        job, self._acquire_job = self._acquire_job, None
+        if job and not job.done():
+            job.cancel()
+            await asyncio.gather(job, return_exceptions=True)
+
+    async def _stop_background_work(self) -> None:
+        """Cancel browser acquisition and incremental ranking left over from a run."""
+        await self._stop_acquiring()
+        jobs = [job for job in self._ranking_jobs if not job.done()]
+        for job in jobs:
+            job.cancel()
+        if jobs:
+            await asyncio.gather(*jobs, return_exceptions=True)
+        self._ranking_jobs.clear()
+        self._ranking = None
+        if self._summarizer is not None:
+            await self._summarizer.close()
+            self._summarizer = None
+
+    async def _release_instances(self) -> None:
+        """Hand leased instances back to the warm pool (no-op in cold mode)."""
+        if self._provided_instances is None and self.warm_pool and self._instances:
+            await self.pool.release(self._instances)
+        self._instances = []
+
+    async def _close_pool(self) -> None:
+        """Close the browser pool unless it is shared."""
+        if self._owns_pool:
+            await self.pool.close()
 
-        await self.pool.close()
+    def _close_snapshot_manager(self) -> None:
+        """Close the session catalog unless it is shared."""
+        if self._owns_snapshot_manager:
+            self.snapshot_manager.close()
 
-        return {
-            "session_id": self.session.id,
-            "completed": self.session.completed,
-            "total": self.session.total,
-            "findings": findings,
-            "summary": summary,
-            "output_path": str(output_path)
-        }
+    def add_instances(self, instances: list[BrowserInstance]) -> bool:
+        """
+        Add browser instances to the running session as extra workers.
+
+        Args:
+            instances: Instances the caller has acquired (and will release)
+
+        Returns:
+            False if no tasks are running or workers are tab slots
+        """
+        if self._scheduler is None or self.tabs_per_instance > 1:
+            return False
+        for instance in instances:
+            if not self._scheduler.add_worker(instance):
+                return False
+            self._instances.append(instance)
+        return True
+
+    async def retire_instances(self, count: int) -> int:
+        """
+        Give browser instances of the running session back.
+
+        Each worker stops after its current task and its instance is passed
+        to ``on_instance_retired``. At least one instance is kept.
+
+        Args:
+            count: Number of instances to give back
+
+        Returns:
+            Number of instances that will be given back
+        """
+        if self._scheduler is None or self.tabs_per_instance > 1:
+            return 0
+        retired = 0
+        for instance in reversed(self._instances[1:]):
+            if retired >= count:
+                break
+            if await self._scheduler.retire_worker(instance.id):
+                retired += 1
+        return retired
+
+    async def _on_worker_retired(self, instance: BrowserInstance) -> None:
+        if instance in self._instances:
+            self._instances.remove(instance)
+        if self.on_instance_retired:
+            await self.on_instance_retired(instance)
 
     async def _execute_tasks(
         self,
         tasks: list[ResearchTask],
         instances: list[BrowserInstance],
-        progress: Optional[Progress] = None,
-        progress_task_id: Optional[int] = None
+        progress: Optional["Progress"] = None,
+        progress_task_id: Optional[int] = None,
+        arrivals: Optional[AsyncIterator[BrowserInstance]] = None
     ) -> list[TaskResult]:
-        """Execute research tasks on browser instances."""
-        results = []
-        task_queue = asyncio.Queue()
+        """
+        Execute research tasks on browser instances.
 
-        # Fill queue with tasks
-        for task in tasks:
-            await task_queue.put(task)
+        Tasks are pulled from a priority queue until it is empty and no task is
+        in flight, so crawl follow-ups discovered mid-run are also executed.
+        With tabs_per_instance > 1 every tab slot is a separate worker.
+        Instances from ``arrivals`` join as workers while tasks run.
+        """
+        scheduler = TaskScheduler(
+            max_concurrency=self.max_concurrency,
+            # Tab slots share the health of their browser, so a failing
+            # container is drained as a whole
+            health_key=lambda worker: worker.instance.id if isinstance(worker, BrowserSlot) else worker.id,
+        )
+        self._scheduler = scheduler
+        self._seen_urls.update(t.url for t in tasks)
+        self._partial_findings = []
+        http_results: list[TaskResult] = []
+        http_jobs: set[asyncio.Task] = set()
+        http_semaphore = asyncio.Semaphore(HTTP_TIER_CONCURRENCY)
+
+        def dispatch(new_tasks: list[ResearchTask]) -> int:
+            """Queue tasks: static pages go to the HTTP tier, the rest to browsers."""
+            browser_tasks = []
+            for task in new_tasks:
+                if self._uses_http_tier(task):
+                    # Held so browser workers wait for a possible escalation
+                    scheduler.hold()
+                    job = asyncio.create_task(fetch_over_http(task))
+                    http_jobs.add(job)
+                    job.add_done_callback(http_jobs.discard)
+                else:
+                    browser_tasks.append(task)
+            if browser_tasks:
+                scheduler.submit(browser_tasks)
+            return len(new_tasks)
+
+        async def fetch_over_http(task: ResearchTask) -> None:
+            try:
+                result = None
+                async with http_semaphore:
+                    # After a stop the task is queued, so it is reported with the leftovers
+                    if self._running:
+                        self._emit(events.TASK_STARTED, task_id=task.id, url=task.url, task_type=task.task_type)
+                        try:
+                            with tracing.span("task", task_id=task.id, task_type=task.task_type,
+                                              domain=tracing.domain_label(task.url), tier="http"):
+                                result = await self._execute_http_task(task)
+                        except Exception as e:
+                            logger.warning(f"HTTP fetch of {task.url} failed, using a browser: {e}")
+                if result is None:
+                    scheduler.submit([task])
+                else:
+                    http_results.append(result)
+                    await on_result(task, result)
+            finally:
+                await scheduler.release()
+
+        async def execute(task: ResearchTask, instance: BrowserInstance) -> TaskResult:
+            self._emit(events.TASK_STARTED, task_id=task.id, url=task.url, task_type=task.task_type)
+            with tracing.span("task", task_id=task.id, task_type=task.task_type,
+                              domain=tracing.domain_label(task.url), instance=instance.id):
+                return await self._execute_single_task(task, instance)
+
+        async def on_result(task: ResearchTask, result: TaskResult) -> None:
+            if self._journal:
+                self.snapshot_manager.journal_result(self._journal, result)
+            if self._ranking is not None:
+                self._rank_in_background(self._result_findings(result))
+            self._summarize_in_background(result)
+            if self._event_sink is not None:
+                self._emit_task_result(result)
+
+            follow_ups = self._create_follow_up_tasks(task, result)
+            if follow_ups:
+                dispatch(follow_ups)
+                if self.session:
+                    self.session.tasks.extend(follow_ups)
+                    self.session.total += len(follow_ups)
+                if self._journal:
+                    self.snapshot_manager.journal_tasks(self._journal, follow_ups)
+                if progress and progress_task_id is not None:
+                    progress.update(progress_task_id, total=scheduler.submitted)
+
+            if progress and progress_task_id is not None:
+                progress.update(progress_task_id, advance=1)
+
+        # Split each browser into tab slots so I/O-bound pages overlap
+        slots: list[BrowserSlot] = []
+
+        async def open_workers(batch: list[BrowserInstance]) -> list:
+            if self.tabs_per_instance == 1:
+                return batch
+            opened = await self.pool.open_slots(batch, self.tabs_per_instance)
+            slots.extend(opened)
+            return opened
+
+        async def arriving_workers() -> AsyncIterator:
+            async for instance in arrivals:
+                for worker in await open_workers([instance]):
+                    yield worker
+
+        workers = await open_workers(instances) if instances else []
+
+        self._dispatch = dispatch
+        dispatch(tasks)
+        try:
+            results = await scheduler.run(
+                workers,
+                execute=execute,
+                is_success=lambda r: r.status == "success",
+                on_result=on_result,
+                is_running=lambda: self._running,
+                on_retired=self._on_worker_retired,
+                arrivals=arriving_workers() if arrivals is not None else None,
+            )
+            # Fetches still running after a stop end with a result or queue
+            # their task, which is then reported with the leftovers
+            while http_jobs:
+                await asyncio.gather(*http_jobs)
+        finally:
+            self._scheduler = None
+            self._dispatch = None
+            # Fetches still running when the run failed
+            for job in list(http_jobs):
+                job.cancel()
+            if http_jobs:
+                await asyncio.gather(*http_jobs, return_exceptions=True)
+            if slots:
+                await self.pool.close_slots(slots)
+
+        results.extend(http_results)
+
+        # Tasks left behind because every instance was drained
+        for task in scheduler.drain_leftovers():
+            results.append(TaskResult(
+                task_id=task.id,
+                instance_id="",
+                status="error",
+                url=task.url,
+                error="No healthy browser instance available",
+                completed_at=datetime.now()
+            ))
 
-        # Create worker coroutines
-        async def worker(instance: BrowserInstance):
-            while not task_queue.empty() and self._running:
-                try:
-                    task = task_queue.get_nowait()
-                except asyncio.QueueEmpty:
-                    break
+        return results
 
-                result = await self._execute_single_task(task, instance)
-                results.append(result)
+    def submit_tasks(self, tasks: list[ResearchTask]) -> int:
+        """
+        Inject tasks into the running session.
 
-                if progress and progress_task_id:
-                    progress.update(progress_task_id, advance=1)
+        Args:
+            tasks: Tasks to schedule
 
-                task_queue.task_done()
+        Returns:
+            Number of tasks accepted (0 if no session is running)
+        """
+        if self._scheduler is None:
+            return 0
+        new_tasks = [t for t in tasks if t.url not in self._seen_urls]
+        self._seen_urls.update(t.url for t in new_tasks)
+        if self.session:
+            self.session.tasks.extend(new_tasks)
+            self.session.total += len(new_tasks)
+        if self._journal and new_tasks:
+            self.snapshot_manager.journal_tasks(self._journal, new_tasks)
+        return self._dispatch(new_tasks)
+
+    def _emit_task_result(self, result: TaskResult) -> None:
+        """Stream a finished task, its findings and (throttled) the partial ranking."""
+        findings = self._result_findings(result)
+        self._emit(
+            events.TASK_FINISHED,
+            task_id=result.task_id,
+            status=result.status,
+            url=result.url,
+            title=result.title,
+            findings=len(findings),
+            cached=result.cached,
+            error=result.error,
+        )
+        if not findings:
+            return
 
-        # Run workers
-        workers = [worker(instance) for instance in instances]
-        await asyncio.gather(*workers)
+        self._emit(events.FINDINGS_ADDED, task_id=result.task_id, findings=findings)
+        self._partial_findings.extend(findings)
 
-        return results
+        # With semantic ranking the partial ranking is sent once a batch is scored
+        if self._ranking is None and self._ranking_due():
+            top = heapq.nlargest(
+                PARTIAL_RANKING_SIZE, self._partial_findings, key=lambda f: f.get("relevance", 0)
+            )
+            self._emit(events.RANKING, findings=top, final=False)
+
+    def _ranking_due(self) -> bool:
+        """Whether the (throttled) partial ranking may be sent now."""
+        now = time.monotonic()
+        if now - self._last_ranking < PARTIAL_RANKING_INTERVAL:
+            return False
+        self._last_ranking = now
+        return True
+
+    def _rank_in_background(self, findings: list[dict]) -> None:
+        """Embed and score the findings of one result while tasks keep running."""
+        if not findings:
+            return
+        job = asyncio.create_task(self._add_to_ranking(self._ranking, findings))
+        self._ranking_jobs.add(job)
+        job.add_done_callback(self._ranking_jobs.discard)
+
+    async def _add_to_ranking(self, ranking: "IncrementalRanking", findings: list[dict]) -> None:
+        try:
+            await ranking.add(findings)
+        except Exception as e:
+            # Aggregation falls back to scoring everything at the end
+            logger.warning(f"Incremental semantic ranking failed: {e}")
+            if self._ranking is ranking:
+                self._ranking = None
+            return
+        if self._event_sink is not None and self._ranking_due():
+            top = await asyncio.to_thread(ranking.ranked, PARTIAL_RANKING_SIZE)
+            self._emit(
+                events.RANKING,
+                findings=[self.semantic_filter.scored_to_dict(s) for s in top],
+                final=False,
+            )
+
+    def _close_journal(self) -> None:
+        """Sync and close the session's task journal."""
+        if self._journal:
+            self._journal.close()
+            self._journal = None
+
+    def _create_follow_up_tasks(self, task: ResearchTask, result: TaskResult) -> list[ResearchTask]:
+        """Create crawl tasks from links found on a search result page."""
+        if (
+            self.follow_links <= 0
+            or task.task_type != "search"
+            or result.status != "success"
+            or not result.links
+        ):
+            return []
+
+        urls = []
+        for url in result.links:
+            if url in self._seen_urls:
+                continue
+            self._seen_urls.add(url)
+            urls.append(url)
+            if len(urls) >= self.follow_links:
+                break
+
+        return self.task_parser.create_crawl_tasks(task, urls)
+
+    def _serve_from_cache(self, task: ResearchTask, result: TaskResult) -> bool:
+        """Fill the result from a recently fetched page (screenshots need a live page)."""
+        cached = None if self.screenshot else self.page_cache.get(task.url, task.task_type)
+        if not cached:
+            return False
+        result.url = cached.final_url
+        result.title = cached.title
+        result.content = cached.text[:PAGE_TEXT_MAX_CHARS]
+        result.links = list(cached.links)
+        result.cached = True
+        result.findings = self._extract_findings(result.content, task.keywords)
+        result.status = "success"
+        result.completed_at = datetime.now()
+        return True
+
+    def _uses_http_tier(self, task: ResearchTask) -> bool:
+        """Whether a task is tried over plain HTTP before a browser."""
+        return (
+            self.http_fetcher is not None
+            and not self.screenshot
+            and task.task_type in HTTP_TIER_TASK_TYPES
+            and self.http_fetcher.should_try(task.url)
+        )
+
+    async def _execute_http_task(self, task: ResearchTask) -> Optional[TaskResult]:
+        """
+        Execute a task with the HTTP tier.
+
+        Returns:
+            The result, or None if the page needs a browser
+        """
+        result = TaskResult(
+            task_id=task.id,
+            instance_id="http",
+            status="running",
+            started_at=datetime.now()
+        )
+        if self._serve_from_cache(task, result):
+            return result
+
+        with tracing.span("http_fetch"):
+            fetched = await self.http_fetcher.fetch(task.url, max_chars=PAGE_TEXT_MAX_CHARS)
+        tracing.count("bytes_transferred", fetched.bytes, source="http")
+        if not fetched.success:
+            logger.debug(f"Escalating {task.url} to a browser: {fetched.reason}")
+            tracing.count("fallbacks", kind="http_to_browser")
+            return None
+
+        result.url = fetched.final_url or task.url
+        result.title = fetched.title
+        result.content = fetched.text
+        self.page_cache.put(
+            task.url,
+            final_url=result.url,
+            title=result.title,
+            text=fetched.text,
+            html="",
+            task_type=task.task_type,
+            links=[]
+        )
+        with tracing.span("extract_findings"):
+            result.findings = self._extract_findings(result.content, task.keywords)
+        result.status = "success"
+        result.completed_at = datetime.now()
+        return result
+
+    async def _close_http_tier(self) -> None:
+        """Persist per-domain tier decisions and close the HTTP pool."""
+        if self.http_fetcher:
+            self.http_fetcher.tiers.flush()
+            await self.http_fetcher.close()
 
     async def _execute_single_task(
         self,
@@ -365,7 +1082,10 @@ class Orchestrator:
             status="running",
             started_at=datetime.now()
         )
-        
+
+        if self._serve_from_cache(task, result):
+            return result
+
         # URLs to try (original + fallbacks)
         urls_to_try = [task.url]
         
@@ -386,11 +1106,15 @@ class Orchestrator:
         last_error: Optional[str] = None
         
         for url_idx, url in enumerate(urls_to_try):
+            if url_idx > 0:
+                tracing.count("fallbacks", kind="search_engine")
             for attempt in range(max_retries + 1):
+                if attempt > 0:
+                    tracing.count("retries", step="page_load")
                 try:
-                    # Navigate to URL with retry
-                    nav_result = await asyncio.wait_for(
-                        self.pool.navigate(instance, url),
+                    # Navigate (and fetch content/screenshot) with retry
+                    nav_result, content_result, screenshot_result = await asyncio.wait_for(
+                        self._load_page(instance, url, task.id, task.task_type),
                         timeout=self.timeout
                     )
 
@@ -406,32 +1130,45 @@ class Orchestrator:
                     result.url = nav_result.get("url", url)
                     result.title = nav_result.get("title", "")
 
-                    # Wait for page to stabilize
-                    await asyncio.sleep(2)
+                    if not content_result.get("success"):
+                        with tracing.span("get_content_retry"):
+                            content_result = await self._get_content_with_retry(
+                                instance, content_options=self._content_options(task.task_type)
+                            )
+                    if content_result.get("success"):
+                        result.content = content_result.get("text", "")[:PAGE_TEXT_MAX_CHARS]
+                        tracing.count("bytes_transferred", len(result.content.encode()), source="browser")
+
+                    # Collect result links for crawl follow-ups
+                    if self.follow_links > 0 and task.task_type == "search":
+                        with tracing.span("extract_links"):
+                            result.links = await self._extract_result_links(instance)
+
+                    # Screenshot was written to disk by _load_page
+                    if screenshot_result and screenshot_result.get("success"):
+                        result.screenshot_path = screenshot_result["path"]
 
-                    # Get page content with retry
-                    content_result = await self._get_content_with_retry(instance)
                     if content_result.get("success"):
-                        result.content = content_result.get("text", "")[:10000]
-
-                    # Take screenshot if enabled
-                    if self.screenshot:
-                        screenshot_result = await self.pool.screenshot(instance, full_page=True)
-                        if screenshot_result.get("success"):
-                            screenshot_path = await self._save_screenshot(
-                                task.id,
-                                screenshot_result.get("screenshot", "")
-                            )
-                            result.screenshot_path = str(screenshot_path)
+                        self.page_cache.put(
+                            task.url,
+                            final_url=result.url,
+                            title=result.title,
+                            text=content_result.get("text", ""),
+                            html=content_result.get("html", ""),
+                            task_type=task.task_type,
+                            links=result.links
+                        )
 
                     # Extract findings
-                    result.findings = self._extract_findings(result.content, task.keywords)
+                    with tracing.span("extract_findings"):
+                        result.findings = self._extract_findings(result.content, task.keywords)
                     result.status = "success"
                     result.completed_at = datetime.now()
                     return result
 
                 except asyncio.TimeoutError:
                     last_error = f"Timeout after {self.timeout}s"
+                    tracing.count("timeouts", step="page_load")
                     if attempt < max_retries:
                         await backoff_sleep(attempt)
                         continue
@@ -451,16 +1188,174 @@ class Orchestrator:
         result.completed_at = datetime.now()
         return result
     
+    async def _load_page(
+        self,
+        instance: BrowserInstance,
+        url: str,
+        task_id: str = "",
+        task_type: str = "search"
+    ) -> tuple[dict, dict, Optional[dict]]:
+        """
+        Navigate to a URL and fetch its content (and screenshot if enabled).
+
+        Uses a single /browser/batch round-trip where the browser-api supports
+        it, falling back to one request per action otherwise. Screenshots are
+        fetched separately as raw bytes and streamed to disk.
+
+        Returns:
+            (navigation result, content result, screenshot result or None)
+        """
+        profile = self._block_profile(task_type)
+        steps = [
+            {"action": "navigate", "params": {"url": url, "readiness": DEFAULT_READINESS, "profile": profile}},
+            {
+                "action": "content",
+                "params": BrowserPool.content_params(**self._content_options(task_type)),
+                "onError": "continue"
+            },
+        ]
+
+        domain = tracing.domain_label(url)
+        started = time.perf_counter()
+        with tracing.span("navigate", batch=True):
+            batch = await self.pool.execute_batch(instance, steps)
+        if not batch.get("unsupported"):
+            tracing.observe("navigation_seconds", time.perf_counter() - started, domain=domain)
+            step_results = batch.get("steps") or []
+            if not step_results:
+                return {"success": False, "error": batch.get("error", "Batch failed")}, {}, None
+            nav_result = step_results[0]
+            if nav_result.get("success") and nav_result.get("readiness"):
+                self.pool.readiness_stats.record(nav_result["readiness"], PAGE_SETTLE_SECONDS)
+            if nav_result.get("success") and nav_result.get("blocking"):
+                self.pool.blocking_stats.record(nav_result["blocking"])
+            content_result = step_results[1] if len(step_results) > 1 else {}
+            screenshot_result = None
+            if self.screenshot and nav_result.get("success"):
+                with tracing.span("screenshot"):
+                    screenshot_result = await self._capture_screenshot(instance, task_id)
+            return nav_result, content_result, screenshot_result
+
+        started = time.perf_counter()
+        with tracing.span("navigate"):
+            nav_result = await self.pool.navigate(
+                instance, url,
+                readiness=DEFAULT_READINESS,
+                baseline_sleep=PAGE_SETTLE_SECONDS,
+                profile=profile
+            )
+        tracing.observe("navigation_seconds", time.perf_counter() - started, domain=domain)
+        if not nav_result.get("success"):
+            return nav_result, {}, None
+
+        # Older browser-api images ignore readiness; keep the fixed wait for them
+        if "readiness" not in nav_result:
+            with tracing.span("settle_sleep"):
+                await asyncio.sleep(PAGE_SETTLE_SECONDS)
+
+        with tracing.span("get_content"):
+            content_result = await self.pool.get_content(instance, **self._content_options(task_type))
+        screenshot_result = None
+        if self.screenshot:
+            with tracing.span("screenshot"):
+                screenshot_result = await self._capture_screenshot(instance, task_id)
+        return nav_result, content_result, screenshot_result
+
+    def _block_profile(self, task_type: str) -> str:
+        """Request-blocking profile for a page (screenshots need the full page)."""
+        if self.screenshot:
+            return BLOCK_FULL
+        if self.block_profile:
+            return self.block_profile
+        return TASK_BLOCK_PROFILES.get(task_type, BLOCK_NO_MEDIA)
+
+    async def _capture_screenshot(self, instance: BrowserInstance, task_id: str) -> dict:
+        """
+        Save a full-page screenshot of the current page into the session.
+
+        Returns:
+            {"success": True, "path": ...} or {"success": False, "error": ...}
+        """
+        incoming = self.output_dir / "screenshots" / ".incoming" / f"{task_id or uuid4().hex}.img"
+        raw = await self.pool.screenshot_to_file(
+            instance,
+            incoming,
+            full_page=True,
+            image_format=self.screenshot_format,
+            quality=self.screenshot_quality,
+            max_height=SCREENSHOT_MAX_HEIGHT,
+        )
+        if raw.get("success"):
+            tracing.count("bytes_transferred", raw.get("bytes", 0), source="screenshot")
+            path = await self.snapshot_manager.store_screenshot(
+                self.session_name, task_id, incoming, raw["sha256"], image_format=self.screenshot_format
+            )
+            return {"success": True, "path": str(path)}
+        if not raw.get("unsupported"):
+            return raw
+
+        # Older browser-api images only return base64 JSON
+        tracing.count("fallbacks", kind="legacy_screenshot")
+        legacy = await self.pool.screenshot(instance, full_page=True)
+        if not legacy.get("success"):
+            return legacy
+        path = await self._save_screenshot(task_id, legacy.get("screenshot", ""))
+        return {"success": True, "path": str(path)}
+
+    async def _extract_result_links(self, instance: BrowserInstance) -> list[str]:
+        """Extract outbound result links from a search engine page."""
+        script = """(() => {
+            const host = window.location.hostname;
+            const engines = /(duckduckgo|google|bing|startpage|yahoo)\\./;
+            const seen = new Set();
+            const links = [];
+            for (const a of document.querySelectorAll('a[href^="http"]')) {
+                try {
+                    const url = new URL(a.href);
+                    if (url.hostname === host || engines.test(url.hostname)) continue;
+                    url.hash = '';
+                    if (seen.has(url.href) || !a.textContent.trim()) continue;
+                    seen.add(url.href);
+                    links.push(url.href);
+                } catch (e) {}
+                if (links.length >= 30) break;
+            }
+            return links;
+        })()"""
+        try:
+            response = await self.pool.execute(instance, "evaluate", script=script)
+        except Exception as e:
+            logger.debug(f"Link extraction failed: {e}")
+            return []
+        links = response.get("result") if response.get("success") else None
+        return [link for link in links if isinstance(link, str)] if isinstance(links, list) else []
+
+    @staticmethod
+    def _content_options(task_type: str) -> dict:
+        """
+        Content request options for a task type.
+
+        Only text, URL and title are used (the HTML was never read), truncated
+        server-side. Article pages are reduced to their main content; search
+        result pages are kept whole so every result snippet survives.
+        """
+        return {
+            "fields": ["text", "url", "title"],
+            "max_chars": PAGE_TEXT_MAX_CHARS,
+            "main_content": task_type != "search",
+        }
+
     async def _get_content_with_retry(
         self,
         instance: BrowserInstance,
         max_retries: int = 2,
+        content_options: Optional[dict] = None,
     ) -> dict:
-        """Get page content with retry."""
+        """Get page content with retry (content_options as for BrowserPool.get_content)."""
         last_error: Optional[Exception] = None
         for attempt in range(max_retries + 1):
             try:
-                result = await self.pool.get_content(instance)
+                result = await self.pool.get_content(instance, **(content_options or {}))
                 if result.get("success"):
                     return result
             except Exception as e:
@@ -469,40 +1364,15 @@ class Orchestrator:
                 last_error = e
             
             if attempt < max_retries:
+                tracing.count("retries", step="get_content")
                 await backoff_sleep(attempt, base_delay=0.5)
         
         error_msg = f"Failed to get content: {last_error}" if last_error else "Failed to get content"
         return {"success": False, "error": error_msg}
 
     def _extract_findings(self, content: str, keywords: list[str]) -> list[dict]:
-        """Extract relevant findings from page content."""
-        findings = []
-
-        if not content:
-            return findings
-
-        # Split content into paragraphs
-        paragraphs = content.split('\n\n')
-
-        for para in paragraphs:
-            para = para.strip()
-            if len(para) < 50:
-                continue
-
-            # Check if paragraph contains any keywords
-            para_lower = para.lower()
-            matching_keywords = [k for k in keywords if k.lower() in para_lower]
-
-            if matching_keywords:
-                findings.append({
-                    "text": para[:500],
-                    "keywords": matching_keywords,
-                    "relevance": len(matching_keywords) / len(keywords) if keywords else 0
-                })
-
-        # Sort by relevance and limit
-        findings.sort(key=lambda x: x.get("relevance", 0), reverse=True)
-        return findings[:10]
+        """Extract relevant findings from page content, ranked by BM25."""
+        return self._paragraph_scorer.extract(content, keywords)
 
     async def _aggregate_findings(
         self,
@@ -513,36 +1383,52 @@ class Orchestrator:
         all_findings = []
 
         for result in results:
-            if result.status != "success":
-                continue
+            all_findings.extend(self._result_findings(result))
 
-            for finding in result.findings:
-                all_findings.append({
-                    "source": result.url,
-                    "title": result.title,
-                    "summary": finding.get("text", "")[:200],
-                    "keywords": finding.get("keywords", []),
-                    "relevance": finding.get("relevance", 0)
-                })
+        # Findings already scored while the tasks ran only need to be sorted
+        if self._ranking_jobs:
+            with tracing.span("ranking_backlog", batches=len(self._ranking_jobs)):
+                await asyncio.gather(*list(self._ranking_jobs), return_exceptions=True)
+        ranking = self._ranking
+        if ranking is not None and ranking.query == query and ranking.count == len(all_findings):
+            return [self.semantic_filter.scored_to_dict(s) for s in ranking.ranked(top_k=50)]
 
         # Apply semantic filtering if available
         if self.semantic_filter and self.semantic_filter.available and query:
             try:
-                scored = await self.semantic_filter.filter_findings(
-                    query=query,
-                    findings=all_findings,
-                    top_k=50,
-                )
+                with tracing.span("semantic_filter", findings=len(all_findings)):
+                    scored = await self.semantic_filter.filter_findings(
+                        query=query,
+                        findings=all_findings,
+                        top_k=50,
+                    )
                 return [self.semantic_filter.scored_to_dict(s) for s in scored]
             except Exception as e:
                 # Log exception to understand why semantic filtering failed
                 logger.warning(f"Semantic filtering failed, using keyword ranking: {e}")
+                tracing.count("fallbacks", kind="keyword_ranking")
                 # Fall through to basic sorting on error
 
         # Sort by relevance
         all_findings.sort(key=lambda x: x.get("relevance", 0), reverse=True)
         return all_findings[:50]
 
+    @staticmethod
+    def _result_findings(result: TaskResult) -> list[dict]:
+        """Findings of one task result in aggregated form."""
+        if result.status != "success":
+            return []
+        return [
+            {
+                "source": result.url,
+                "title": result.title,
+                "summary": finding.get("text", "")[:200],
+                "keywords": finding.get("keywords", []),
+                "relevance": finding.get("relevance", 0)
+            }
+            for finding in result.findings
+        ]
+
     async def summarize_results(
         self,
         findings: list[dict],
@@ -550,6 +1436,12 @@ class Orchestrator:
     ) -> str:
         """
         Summarize research findings using LLM.
+
+        Map-reduce over token-bounded batches (see summarizer.py): during a
+        run, the results were already condensed while tasks were running.
+        When a stream() consumer is attached the summary is also emitted as
+        SUMMARY_CHUNK events while it is generated; if the LLM fails after
+        some were sent, SUMMARY_RESET precedes the fallback summary.
         
         Args:
             findings: Aggregated findings from research
@@ -559,52 +1451,69 @@ class Orchestrator:
             Markdown summary of findings
         """
         if not self.use_llm or not findings:
-            return self._generate_basic_summary(findings, query)
+            summary = self._generate_basic_summary(findings, query)
+            self._emit(events.SUMMARY_CHUNK, text=summary)
+            return summary
         
+        streamed = False
         try:
             # Get or create LLM client
             if self.llm_client is None:
-                from .llm_client import LLMClient as LLMClientImpl
-                self.llm_client = LLMClientImpl()
+                self.llm_client = self._create_llm_client()
+                if self.llm_client is None:
+                    raise ImportError("LLMClient not available. Install litellm.")
             
-            # Prepare findings text for LLM
-            findings_text = self._format_findings_for_llm(findings)
-            
-            prompt = f"""Original Research Query: {query}
-
-Research Findings:
-{findings_text}
-
-Please synthesize these findings into a comprehensive research summary."""
-            
-            response = await self.llm_client.complete(
-                prompt=prompt,
-                system=SUMMARIZATION_PROMPT,
-            )
-            
-            return response.content
+            # Results of this session were fed to the summarizer as they finished;
+            # other callers get the aggregated findings mapped the same way
+            summarizer = self._summarizer
+            if summarizer is None or summarizer.query != query:
+                summarizer = self._create_summarizer(query)
+                for finding in findings:
+                    summarizer.add(finding.get("source", ""), finding.get("title", ""), [finding.get("summary", "")])
+
+            on_chunk = None
+            if self._event_sink is not None:
+                def on_chunk(text: str) -> None:
+                    nonlocal streamed
+                    streamed = True
+                    self._emit(events.SUMMARY_CHUNK, text=text)
+            return await summarizer.summarize(on_chunk)
             
         except Exception as e:
             # Fallback to basic summary on error
-            return self._generate_basic_summary(findings, query) + f"\n\n*Note: LLM summarization failed: {e}*"
-    
-    def _format_findings_for_llm(self, findings: list[dict]) -> str:
-        """Format findings for LLM consumption."""
-        sections = []
-        
-        for i, finding in enumerate(findings[:20], 1):
-            source = finding.get("source", "Unknown")
-            title = finding.get("title", "No title")
-            summary = finding.get("summary", "")
-            
-            sections.append(f"""### Finding {i}
-**Source:** {source}
-**Title:** {title}
-**Content:** {summary}
-""")
-        
-        return "\n".join(sections)
+            summary = self._generate_basic_summary(findings, query) + f"\n\n*Note: LLM summarization failed: {e}*"
+            if streamed:
+                # Consumers drop the partial LLM text before the fallback
+                self._emit(events.SUMMARY_RESET, error=str(e))
+            self._emit(events.SUMMARY_CHUNK, text=summary)
+            return summary
     
+    def _create_llm_client(self) -> Optional["LLMClient"]:
+        """Create an LLM client with a response cache under output_dir (None without LiteLLM)."""
+        from .llm_client import LLMClient as LLMClientImpl
+        try:
+            return LLMClientImpl(cache_dir=self.output_dir / "cache" / "llm")
+        except ImportError as e:
+            logger.warning(f"LLM client unavailable: {e}")
+            return None
+
+    def _create_summarizer(self, query: str) -> Optional[MapReduceSummarizer]:
+        """Map-reduce summarizer of a query (None without LLM)."""
+        if not self.use_llm or self.llm_client is None:
+            return None
+        return MapReduceSummarizer(
+            self.llm_client,
+            query,
+            token_budget=self.summary_token_budget,
+            concurrency=self.summary_concurrency,
+        )
+
+    def _summarize_in_background(self, result: TaskResult) -> None:
+        """Add a finished task to the running summary (map calls start as batches fill)."""
+        if self._summarizer is None or result.status != "success":
+            return
+        self._summarizer.add(result.url, result.title, [f.get("text", "") for f in result.findings])
+
     def _generate_basic_summary(self, findings: list[dict], query: str) -> str:
         """Generate basic summary without LLM."""
         lines = [
@@ -625,19 +1534,11 @@ Please synthesize these findings into a comprehensive research summary."""
         return "\n".join(lines)
 
     async def _save_screenshot(self, task_id: str, base64_data: str) -> Path:
-        """Save screenshot to file."""
+        """Save a base64-encoded PNG screenshot (legacy browser-api images)."""
         import base64
 
-        screenshots_dir = self.output_dir / "screenshots" / self.session_name
-        screenshots_dir.mkdir(parents=True, exist_ok=True)
-
-        filename = f"{task_id}-{datetime.now().strftime('%H%M%S')}.png"
-        filepath = screenshots_dir / filename
-
-        image_data = base64.b64decode(base64_data)
-        filepath.write_bytes(image_data)
-
-        return filepath
+        image_data = await asyncio.to_thread(base64.b64decode, base64_data)
+        return await self.snapshot_manager.save_screenshot(self.session_name, task_id, image_data)
 
     async def _save_results(
         self,
@@ -666,6 +1567,7 @@ Please synthesize these findings into a comprehensive research summary."""
             },
             "findings": findings,
             "summary": summary or "",
+            "timings": self.tracer.breakdown() if self.tracer else None,
         }
 
         filepath.write_text(json.dumps(output, indent=2, ensure_ascii=False))
@@ -720,8 +1622,14 @@ Please synthesize these findings into a comprehensive research summary."""
         self._running = False
 
         if self.session:
+            # Completed results are already journaled; only the status changes
             self.session.status = "paused"
+            if self._journal:
+                self._journal.sync()
             await self.snapshot_manager.save_session(self.session)
 
-        await self.pool.stop(session=self.session_name)
-        await self.pool.close()
+        if self.warm_pool or self._provided_instances is not None:
+            await self._release_instances()
+        else:
+            await self.pool.stop(session=self.session_name)
+        await self._close_pool()
@@ -0,0 +1,302 @@
+"""
+Page Cache - Persistent on-disk cache of fetched pages.
+
+Research sessions overlap heavily (the same search result pages and articles
+come up again and again), so page text is cached on disk and served instead
+of a full browser navigation while it is fresh.
+
+Layout under ``cache_dir``:
+- ``objects/<aa>/<sha256>.txt``: page text, content-addressed (deduplicated)
+- ``index.json``: requested URL -> entry metadata (final URL, title, text and
+  HTML hashes, fetch time, last access)
+
+Entries expire per task type (search results quickly, articles slowly) and
+the least recently used entries are evicted once the cache exceeds its size
+cap.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import Counter
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+# Cache modes
+CACHE_OFF = "off"
+CACHE_READ_WRITE = "read-write"
+CACHE_READ_ONLY = "read-only"
+CACHE_REFRESH = "refresh"  # never read, always overwrite
+CACHE_MODES = (CACHE_OFF, CACHE_READ_WRITE, CACHE_READ_ONLY, CACHE_REFRESH)
+
+# Time-to-live per task type (seconds)
+DEFAULT_TTLS = {
+    "search": 60 * 60,            # search result pages change quickly
+    "direct": 7 * 24 * 60 * 60,   # articles and documentation
+    "crawl": 7 * 24 * 60 * 60,
+}
+DEFAULT_TTL = 24 * 60 * 60
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+# Eviction trims to this fraction of max_bytes so it does not run on every put
+EVICT_LOW_WATERMARK = 0.9
+
+
+@dataclass
+class CachedPage:
+    """A cached page and its metadata."""
+    url: str
+    final_url: str
+    title: str
+    text_hash: str
+    html_hash: str
+    fetched_at: float
+    last_access: float
+    size: int
+    task_type: str = "search"
+    links: list = field(default_factory=list)
+    text: str = field(default="", compare=False)
+
+
+class PageCache:
+    """
+    URL-keyed page cache with per-task-type TTLs and an LRU size cap.
+
+    The index is kept in memory and written back on flush().
+    """
+
+    def __init__(
+        self,
+        cache_dir: Path,
+        mode: str = CACHE_READ_WRITE,
+        ttls: Optional[dict[str, int]] = None,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        """
+        Initialize page cache.
+
+        Args:
+            cache_dir: Directory holding the index and page objects
+            mode: One of CACHE_MODES
+            ttls: TTL in seconds per task type (merged over DEFAULT_TTLS)
+            max_bytes: Total size of cached text before LRU eviction
+        """
+        if mode not in CACHE_MODES:
+            raise ValueError(f"Unknown cache mode: {mode} (expected one of {', '.join(CACHE_MODES)})")
+
+        self.cache_dir = cache_dir
+        self.mode = mode
+        self.ttls = {**DEFAULT_TTLS, **(ttls or {})}
+        self.max_bytes = max_bytes
+
+        self.hits = 0
+        self.misses = 0
+        self.stores = 0
+        self.evictions = 0
+
+        self._index: dict[str, CachedPage] = {}
+        # Entries per text object and the size of all objects (shared objects count once)
+        self._refs: Counter = Counter()
+        self._bytes = 0
+        self._dirty = False
+        if mode != CACHE_OFF:
+            self._load_index()
+
+    @property
+    def readable(self) -> bool:
+        return self.mode in (CACHE_READ_WRITE, CACHE_READ_ONLY)
+
+    @property
+    def writable(self) -> bool:
+        return self.mode in (CACHE_READ_WRITE, CACHE_REFRESH)
+
+    @property
+    def _index_path(self) -> Path:
+        return self.cache_dir / "index.json"
+
+    def _object_path(self, text_hash: str) -> Path:
+        return self.cache_dir / "objects" / text_hash[:2] / f"{text_hash}.txt"
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return url.strip().rstrip("/")
+
+    @staticmethod
+    def _hash(data: str) -> str:
+        return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+    def _load_index(self) -> None:
+        if not self._index_path.exists():
+            return
+        try:
+            data = json.loads(self._index_path.read_text())
+            entries = {key: CachedPage(**entry) for key, entry in data.get("entries", {}).items()}
+        except (json.JSONDecodeError, TypeError) as e:
+            logger.warning(f"Ignoring corrupt page cache index: {e}")
+            return
+        for key, entry in entries.items():
+            self._add(key, entry)
+
+    def _add(self, key: str, entry: CachedPage) -> Optional[CachedPage]:
+        """
+        Index an entry, replacing the one stored under its key.
+
+        Returns:
+            The replaced entry if nothing references its text object any more
+        """
+        replaced = self._remove(key)
+        self._index[key] = entry
+        if self._refs[entry.text_hash] == 0:
+            self._bytes += entry.size
+        self._refs[entry.text_hash] += 1
+        return replaced
+
+    def _remove(self, key: str) -> Optional[CachedPage]:
+        """
+        Drop an entry from the index.
+
+        Returns:
+            The entry if it was the last one referencing its text object
+        """
+        entry = self._index.pop(key, None)
+        if entry is None:
+            return None
+        self._refs[entry.text_hash] -= 1
+        if self._refs[entry.text_hash] > 0:
+            return None
+        del self._refs[entry.text_hash]
+        self._bytes -= entry.size
+        return entry
+
+    def get(self, url: str, task_type: str = "search") -> Optional[CachedPage]:
+        """
+        Look up a fresh cached page.
+
+        Args:
+            url: Requested URL
+            task_type: Task type, selects the TTL
+
+        Returns:
+            Cached page with its text, or None on a miss / expired entry
+        """
+        if not self.readable:
+            return None
+
+        entry = self._index.get(self._key(url))
+        ttl = self.ttls.get(task_type, DEFAULT_TTL)
+        now = time.time()
+        if entry is None or now - entry.fetched_at > ttl:
+            self.misses += 1
+            return None
+
+        try:
+            text = self._object_path(entry.text_hash).read_text(encoding="utf-8")
+        except OSError:
+            # Object was removed behind our back; read-only caches leave the
+            # index as it is
+            if self.writable:
+                self._remove(self._key(url))
+                self._dirty = True
+            self.misses += 1
+            return None
+
+        if self.writable:
+            entry.last_access = now
+            self._dirty = True
+        self.hits += 1
+        return CachedPage(**{**asdict(entry), "text": text})
+
+    def put(
+        self,
+        url: str,
+        final_url: str,
+        title: str,
+        text: str,
+        html: str = "",
+        task_type: str = "search",
+        links: Optional[list] = None,
+    ) -> None:
+        """
+        Store a fetched page.
+
+        Args:
+            url: Requested URL (the lookup key)
+            final_url: URL after redirects
+            title: Page title
+            text: Page text
+            html: Page HTML (only its hash is kept)
+            task_type: Task type the page was fetched for
+            links: Result links extracted from the page
+        """
+        if not self.writable or not text:
+            return
+
+        text_hash = self._hash(text)
+        path = self._object_path(text_hash)
+        if not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            tmp.write_text(text, encoding="utf-8")
+            os.replace(tmp, path)
+
+        now = time.time()
+        replaced = self._add(self._key(url), CachedPage(
+            url=url,
+            final_url=final_url,
+            title=title,
+            text_hash=text_hash,
+            html_hash=self._hash(html) if html else "",
+            fetched_at=now,
+            last_access=now,
+            size=len(text.encode("utf-8")),
+            task_type=task_type,
+            links=list(links or []),
+        ))
+        if replaced is not None and replaced.text_hash != text_hash:
+            # The page changed since it was cached
+            self._object_path(replaced.text_hash).unlink(missing_ok=True)
+        self._dirty = True
+        self.stores += 1
+        self._evict()
+
+    def _evict(self) -> None:
+        """Drop least recently used entries once the cap is exceeded."""
+        if self._bytes <= self.max_bytes:
+            return
+
+        target = int(self.max_bytes * EVICT_LOW_WATERMARK)
+        for key, entry in sorted(self._index.items(), key=lambda item: item[1].last_access):
+            if self._bytes <= target:
+                break
+            self.evictions += 1
+            if self._remove(key) is not None:
+                self._object_path(entry.text_hash).unlink(missing_ok=True)
+
+    def flush(self) -> None:
+        """Write the index back to disk if it changed (writable modes only)."""
+        if not self._dirty or not self.writable:
+            return
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        entries = {key: asdict(entry) for key, entry in self._index.items()}
+        for entry in entries.values():
+            entry.pop("text", None)
+        tmp = self._index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": 1, "entries": entries}, ensure_ascii=False))
+        os.replace(tmp, self._index_path)
+        self._dirty = False
+
+    def stats(self) -> dict:
+        """Get hit/miss counters and cache size."""
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": len(self._index),
+            "bytes": self._bytes,
+        }
@@ -10,6 +10,8 @@ import urllib.parse
 from dataclasses import dataclass
 from typing import Any, Awaitable, Callable, Optional, TypeVar
 
+from . import tracing
+
 T = TypeVar("T")
 
 
@@ -51,7 +53,8 @@ async def backoff_sleep(
         max_delay: Maximum delay cap
     """
     delay = calculate_backoff_delay(attempt, base_delay, exponential_base, max_delay)
-    await asyncio.sleep(delay)
+    with tracing.span("backoff_sleep", attempt=attempt):
+        await asyncio.sleep(delay)
 
 
 @dataclass
@@ -120,7 +123,9 @@ async def retry_with_backoff(
             if on_retry:
                 on_retry(attempt + 1, e)
             
-            await asyncio.sleep(delay)
+            tracing.count("retries", step=getattr(func, "__name__", "call"))
+            with tracing.span("backoff_sleep", attempt=attempt):
+                await asyncio.sleep(delay)
     
     raise RetryError(
         f"Failed after {config.max_retries + 1} attempts",
@@ -171,8 +176,10 @@ class FallbackChain:
             except Exception as e:
                 last_error = e
                 
-                if on_fallback and i < len(self._fallbacks) - 1:
-                    on_fallback(i, e)
+                if i < len(self._fallbacks) - 1:
+                    tracing.count("fallbacks", kind=getattr(func, "__name__", "call"))
+                    if on_fallback:
+                        on_fallback(i, e)
         
         raise RetryError(
             f"All {len(self._fallbacks)} fallbacks failed",
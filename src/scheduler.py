@@ -0,0 +1,407 @@
+"""
+Task Scheduler - Continuous priority scheduling of research tasks.
+
+Replaces the pre-filled FIFO queue in the Orchestrator with:
+- A priority queue keyed on ResearchTask.priority (FIFO within a priority)
+- Dynamic task injection while the run is in progress (e.g. crawl follow-ups)
+- Per-instance health scoring; unhealthy instances are drained (workers
+  sharing an instance, e.g. the tab slots of one browser, share its score)
+- A global concurrency limit independent of the number of instances
+- Workers added or retired while running (browser slots moved between jobs)
+- Workers joining as their browsers become ready (``arrivals``)
+"""
+
+import asyncio
+import contextlib
+import heapq
+import itertools
+import logging
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional
+
+from .task_parser import ResearchTask
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class InstanceHealth:
+    """Rolling health score of one worker instance."""
+    instance_id: str
+    score: float = 1.0
+    successes: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    draining: bool = False
+
+    def record(self, success: bool, alpha: float) -> None:
+        """Update the exponentially weighted success score."""
+        self.score = (1 - alpha) * self.score + alpha * (1.0 if success else 0.0)
+        if success:
+            self.successes += 1
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+
+
+@dataclass(order=True)
+class _QueueItem:
+    sort_key: tuple
+    task: ResearchTask = field(compare=False)
+    attempts: int = field(default=0, compare=False)
+    excluded: set = field(default_factory=set, compare=False)
+
+
+class TaskScheduler:
+    """
+    Priority scheduler that keeps workers alive until all work is done.
+
+    Workers only exit when the queue is empty *and* nothing is in flight,
+    because an in-flight task may still inject follow-up tasks.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        health_alpha: float = 0.3,
+        drain_threshold: float = 0.35,
+        max_consecutive_failures: int = 3,
+        max_attempts: int = 2,
+        health_key: Callable[[Any], str] = lambda instance: instance.id,
+    ):
+        """
+        Initialize scheduler.
+
+        Args:
+            max_concurrency: Global cap on tasks running at once (None = one per instance)
+            health_alpha: Smoothing factor of the health score (0-1)
+            drain_threshold: Instances whose score falls below this are drained
+            max_consecutive_failures: Drain after this many failures in a row
+            max_attempts: Times a task is tried before it is reported as failed
+            health_key: Instance whose health a worker counts towards (workers
+                with the same key are scored, drained and excluded together)
+        """
+        self.max_concurrency = max_concurrency
+        self.health_alpha = health_alpha
+        self.drain_threshold = drain_threshold
+        self.max_consecutive_failures = max_consecutive_failures
+        self.max_attempts = max_attempts
+        self.health_key = health_key
+
+        self.health: dict[str, InstanceHealth] = {}
+        self._heap: list[_QueueItem] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._submitted = 0
+        self._cond: Optional[asyncio.Condition] = None
+        # Set while run() is active: wakes run() when workers or work change
+        self._changed: Optional[asyncio.Event] = None
+        self._closed = False
+        # Set while run() is active: starts a worker for an added instance
+        self._spawn: Optional[Callable[[Any], None]] = None
+        self._retiring: set[str] = set()
+        # Running workers per worker id and per health key (health outlives
+        # its workers)
+        self._live: Counter = Counter()
+        self._live_keys: Counter = Counter()
+
+    @property
+    def submitted(self) -> int:
+        """Total number of distinct tasks submitted so far."""
+        return self._submitted
+
+    @property
+    def pending(self) -> int:
+        """Number of tasks waiting in the queue."""
+        return len(self._heap)
+
+    def _push(self, item: _QueueItem) -> None:
+        heapq.heappush(self._heap, item)
+
+    def submit(self, tasks: list[ResearchTask]) -> int:
+        """
+        Add tasks to the queue. Safe to call while the scheduler is running.
+
+        Args:
+            tasks: Tasks to schedule
+
+        Returns:
+            Number of tasks added
+        """
+        for task in tasks:
+            self._push(_QueueItem(sort_key=(-task.priority, next(self._seq)), task=task))
+        self._submitted += len(tasks)
+        if self._cond is not None:
+            asyncio.ensure_future(self._notify())
+        if self._changed is not None:
+            self._changed.set()
+        return len(tasks)
+
+    def hold(self) -> None:
+        """
+        Count work running outside the workers as in flight.
+
+        Workers do not exit while it is held, because it may still submit
+        tasks (e.g. an HTTP fetch that has to be escalated to a browser).
+        """
+        self._in_flight += 1
+
+    async def release(self) -> None:
+        """End work started with hold()."""
+        self._in_flight -= 1
+        if self._changed is not None:
+            self._changed.set()
+        if self._cond is not None:
+            await self._notify()
+
+    def add_worker(self, instance: Any) -> bool:
+        """
+        Add a worker instance while run() is active.
+
+        Returns:
+            False if the scheduler is not running
+        """
+        if self._spawn is None or self._closed:
+            return False
+        self._spawn(instance)
+        return True
+
+    async def retire_worker(self, instance_id: str) -> bool:
+        """
+        Stop a worker after its current task.
+
+        The instance is passed to run()'s ``on_retired`` callback once the
+        worker has exited.
+
+        Returns:
+            False if no such worker is running
+        """
+        if self._spawn is None or not self._live[instance_id] or instance_id in self._retiring:
+            return False
+        self._retiring.add(instance_id)
+        await self._notify()
+        return True
+
+    async def _notify(self) -> None:
+        async with self._cond:
+            self._cond.notify_all()
+
+    def _take(self, key: str) -> Optional[_QueueItem]:
+        """Pop the best task a worker of this health key is allowed to run."""
+        skipped = []
+        item = None
+        while self._heap:
+            candidate = heapq.heappop(self._heap)
+            if key in candidate.excluded and self._has_other_worker(candidate.excluded):
+                skipped.append(candidate)
+                continue
+            item = candidate
+            break
+        for s in skipped:
+            self._push(s)
+        return item
+
+    def _has_other_worker(self, excluded: set) -> bool:
+        return any(
+            not h.draining and h.instance_id not in excluded and self._live_keys[h.instance_id]
+            for h in self.health.values()
+        )
+
+    def _should_drain(self, health: InstanceHealth) -> bool:
+        return (
+            health.consecutive_failures >= self.max_consecutive_failures
+            or (health.successes + health.failures >= 3 and health.score < self.drain_threshold)
+        )
+
+    async def run(
+        self,
+        instances: list[Any],
+        execute: Callable[[ResearchTask, Any], Awaitable[Any]],
+        is_success: Callable[[Any], bool],
+        on_result: Optional[Callable[[ResearchTask, Any], Awaitable[None]]] = None,
+        is_running: Callable[[], bool] = lambda: True,
+        on_retired: Optional[Callable[[Any], Awaitable[None]]] = None,
+        arrivals: Optional[AsyncIterator[Any]] = None,
+    ) -> list[Any]:
+        """
+        Run all queued (and later injected) tasks to completion.
+
+        Args:
+            instances: Worker instances (must have an ``id`` attribute)
+            execute: Coroutine running one task on one instance
+            is_success: Whether a result counts as a success for health scoring
+            on_result: Callback per final result (may call submit())
+            is_running: Returns False to stop taking new tasks
+            on_retired: Callback per worker stopped with retire_worker()
+            arrivals: Worker instances that become available while running
+                (e.g. browsers still booting); each gets a worker as soon as
+                it arrives. Queued tasks wait for arrivals while no worker is
+                left, but finished work does not wait for late instances
+
+        Returns:
+            Final results, one per task
+        """
+        self._cond = asyncio.Condition()
+        self._closed = False
+        results: list[Any] = []
+        # Each worker runs one task at a time, so only an explicit cap needs a semaphore
+        semaphore = asyncio.Semaphore(self.max_concurrency) if self.max_concurrency else contextlib.nullcontext()
+
+        async def worker(instance: Any) -> None:
+            key = self.health_key(instance)
+            health = self.health[key]
+
+            while True:
+                async with self._cond:
+                    retired = False
+                    while True:
+                        if instance.id in self._retiring:
+                            self._retiring.discard(instance.id)
+                            retired = True
+                            if self._live_keys[key] == 1:
+                                # Last worker of its instance: a re-added one starts afresh
+                                health.draining = True
+                            break
+                        if self._closed or health.draining or not is_running():
+                            return
+                        if self._heap:
+                            item = self._take(key)
+                            if item is not None:
+                                break
+                        if not self._heap and self._in_flight == 0:
+                            self._closed = True
+                            self._cond.notify_all()
+                            return
+                        await self._cond.wait()
+                    if not retired:
+                        self._in_flight += 1
+
+                if retired:
+                    # Outside the lock: the callback may submit tasks
+                    if on_retired:
+                        await on_retired(instance)
+                    return
+
+                try:
+                    async with semaphore:
+                        result = await execute(item.task, instance)
+                    success = is_success(result)
+                    health.record(success, self.health_alpha)
+
+                    if not success and not health.draining and self._should_drain(health):
+                        health.draining = True
+                        logger.warning(
+                            f"Draining instance {key}: score={health.score:.2f}, "
+                            f"consecutive_failures={health.consecutive_failures}"
+                        )
+
+                    item.attempts += 1
+                    if not success and item.attempts < self.max_attempts and self._has_other_worker(
+                        item.excluded | {key}
+                    ):
+                        # Give the task another chance on a different instance
+                        item.excluded.add(key)
+                        item.sort_key = (item.sort_key[0], next(self._seq))
+                        async with self._cond:
+                            self._push(item)
+                    else:
+                        results.append(result)
+                        if on_result:
+                            await on_result(item.task, result)
+                finally:
+                    async with self._cond:
+                        self._in_flight -= 1
+                        self._cond.notify_all()
+
+        workers: list[asyncio.Task] = []
+        # Set whenever a worker starts or exits, the arrivals end, or work
+        # outside the workers is submitted or released
+        changed = asyncio.Event()
+        self._changed = changed
+
+        def spawn(instance: Any) -> None:
+            key = self.health_key(instance)
+            health = self.health.get(key)
+            if health is None or (health.draining and not self._live_keys[key]):
+                self.health[key] = InstanceHealth(instance_id=key)
+            task = asyncio.create_task(worker(instance))
+            self._live[instance.id] += 1
+            self._live_keys[key] += 1
+
+            def exited(_: asyncio.Task) -> None:
+                self._live[instance.id] -= 1
+                self._live_keys[key] -= 1
+                changed.set()
+
+            task.add_done_callback(exited)
+            workers.append(task)
+            changed.set()
+
+        async def admit() -> None:
+            async for instance in arrivals:
+                if self._closed:
+                    return
+                spawn(instance)
+
+        for instance in instances:
+            spawn(instance)
+        self._spawn = spawn
+        admitter = None
+        if arrivals is not None:
+            admitter = asyncio.create_task(admit())
+            admitter.add_done_callback(lambda _: changed.set())
+        try:
+            # Until every instance has arrived, the run ends once the work is
+            # done (late instances are not waited for) or, without workers, stopped
+            while admitter is not None and not admitter.done() and not self._closed:
+                if all(w.done() for w in workers):
+                    if not is_running():
+                        break
+                    if not self._heap and self._in_flight == 0:
+                        # No worker is left to notice, e.g. when the HTTP tier
+                        # served every task before the first browser arrived
+                        self._closed = True
+                        break
+                changed.clear()
+                await changed.wait()
+            # Workers may be added while waiting
+            while True:
+                await asyncio.gather(*workers)
+                if all(w.done() for w in workers):
+                    break
+            if admitter is not None and admitter.done():
+                # Surface errors of the arrivals iterator (e.g. a failed image build)
+                admitter.result()
+        finally:
+            self._spawn = None
+            self._changed = None
+            self._retiring.clear()
+            for w in workers:
+                w.cancel()
+            if admitter is not None and not admitter.done():
+                admitter.cancel()
+                await asyncio.gather(admitter, return_exceptions=True)
+
+        self._cond = None
+        return results
+
+    def drain_leftovers(self) -> list[ResearchTask]:
+        """Remove and return tasks that were never executed."""
+        leftovers = [item.task for item in sorted(self._heap)]
+        self._heap.clear()
+        return leftovers
+
+    def health_report(self) -> list[dict]:
+        """Get per-instance health scores."""
+        return [
+            {
+                "instance_id": h.instance_id,
+                "score": round(h.score, 3),
+                "successes": h.successes,
+                "failures": h.failures,
+                "draining": h.draining,
+            }
+            for h in self.health.values()
+        ]
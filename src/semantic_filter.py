@@ -3,10 +3,25 @@ Semantic Filter - Embedding-based relevance filtering.
 
 Uses sentence transformers to compute semantic similarity between
 queries and results for intelligent relevance ranking.
+
+Scoring is a single matrix product over L2-normalized embeddings with
+``np.argpartition`` for top-k. Finding embeddings can be persisted in an
+``EmbeddingCache`` (an mmapped float16 matrix plus a text-hash index) so
+text seen in an earlier session is never re-embedded. ``IncrementalRanking``
+scores findings while a session is still running.
 """
 
 import asyncio
+import contextlib
+import hashlib
+import importlib.util
+import json
+import logging
+import os
+import re
+import threading
 from dataclasses import dataclass
+from pathlib import Path
 from typing import Optional
 
 try:
@@ -16,10 +31,14 @@ except ImportError:
     NUMPY_AVAILABLE = False
 
 try:
-    from sentence_transformers import SentenceTransformer
-    SENTENCE_TRANSFORMERS_AVAILABLE = True
-except ImportError:
-    SENTENCE_TRANSFORMERS_AVAILABLE = False
+    import fcntl
+except ImportError:  # Windows: only writers within one process are serialized
+    fcntl = None
+
+# sentence-transformers pulls in torch; it is imported when the model is loaded
+SENTENCE_TRANSFORMERS_AVAILABLE = importlib.util.find_spec("sentence_transformers") is not None
+
+logger = logging.getLogger(__name__)
 
 
 @dataclass
@@ -34,6 +53,173 @@ class ScoredFinding:
     combined_score: float
 
 
+class EmbeddingCache:
+    """
+    Persistent embedding store for one model.
+
+    Layout under ``cache_dir/<model>``:
+    - ``embeddings.f16``: float16 matrix (capacity x dim), memory-mapped
+    - ``index.json``: text hash -> row, plus dim/count/capacity
+    - ``index.lock``: held while a process appends rows
+
+    Embeddings are stored L2-normalized. Appends re-read the index under the
+    file lock, so processes sharing a directory (e.g. a CLI run and the MCP
+    server) never write to the same rows. Within a process a directory is
+    opened through ``shared()``; the returned instance is safe to use from
+    several threads.
+    """
+
+    INITIAL_CAPACITY = 1024
+
+    # One instance per cache directory in this process
+    _instances: dict[tuple[Path, str], "EmbeddingCache"] = {}
+    _instances_lock = threading.Lock()
+
+    @classmethod
+    def shared(cls, cache_dir: Path, model_name: str) -> "EmbeddingCache":
+        """The process-wide cache instance of a directory and model."""
+        key = (Path(cache_dir).resolve(), model_name)
+        with cls._instances_lock:
+            cache = cls._instances.get(key)
+            if cache is None:
+                cache = cls._instances[key] = cls(cache_dir, model_name)
+            return cache
+
+    def __init__(self, cache_dir: Path, model_name: str):
+        safe_name = re.sub(r"[^A-Za-z0-9_.-]+", "_", model_name)
+        self.dir = cache_dir / safe_name
+        self.dir.mkdir(parents=True, exist_ok=True)
+        self._matrix_path = self.dir / "embeddings.f16"
+        self._index_path = self.dir / "index.json"
+        self._lock_path = self.dir / "index.lock"
+
+        self.rows: dict[str, int] = {}
+        self.dim: Optional[int] = None
+        self.capacity = 0
+        self._matrix: Optional["np.memmap"] = None
+        # Identity of the index file last read (rewritten by every append)
+        self._index_version: Optional[tuple] = None
+        # Guards the index and the matrix (growing it replaces the file)
+        self._lock = threading.RLock()
+        self._load()
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        return hashlib.blake2b(text.encode("utf-8"), digest_size=16).hexdigest()
+
+    @property
+    def count(self) -> int:
+        return len(self.rows)
+
+    def _load(self) -> None:
+        """(Re-)read the index and map the matrix if another writer changed them."""
+        try:
+            stat = self._index_path.stat()
+        except FileNotFoundError:
+            return
+        version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if version == self._index_version or not self._matrix_path.exists():
+            return
+        self._index_version = version
+        try:
+            index = json.loads(self._index_path.read_text())
+            self.dim = index["dim"]
+            self.capacity = index["capacity"]
+            self.rows = index["rows"]
+            self._matrix = np.memmap(
+                self._matrix_path, dtype=np.float16, mode="r+", shape=(self.capacity, self.dim)
+            )
+        except (json.JSONDecodeError, KeyError, ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable embedding cache {self.dir}: {e}")
+            self.rows, self.dim, self.capacity, self._matrix = {}, None, 0, None
+
+    def _ensure_capacity(self, needed: int, dim: int) -> None:
+        if self.dim is not None and self.dim != dim:
+            raise ValueError(f"Embedding dim changed from {self.dim} to {dim}")
+        if self._matrix is not None and needed <= self.capacity:
+            return
+
+        capacity = max(self.INITIAL_CAPACITY, self.capacity)
+        while capacity < needed:
+            capacity *= 2
+
+        tmp_path = self._matrix_path.with_suffix(".tmp")
+        grown = np.memmap(tmp_path, dtype=np.float16, mode="w+", shape=(capacity, dim))
+        if self._matrix is not None:
+            grown[:self.count] = self._matrix[:self.count]
+            del self._matrix
+        grown.flush()
+        del grown
+        os.replace(tmp_path, self._matrix_path)
+
+        self.dim = dim
+        self.capacity = capacity
+        self._matrix = np.memmap(self._matrix_path, dtype=np.float16, mode="r+", shape=(capacity, dim))
+
+    def lookup(self, hashes: list[str]) -> "np.ndarray":
+        """Row index per hash (-1 when not cached)."""
+        with self._lock:
+            return np.fromiter((self.rows.get(h, -1) for h in hashes), dtype=np.int64, count=len(hashes))
+
+    def get(self, rows: "np.ndarray") -> "np.ndarray":
+        """Embeddings of the given rows as float32."""
+        with self._lock:
+            return np.asarray(self._matrix[rows], dtype=np.float32)
+
+    @contextlib.contextmanager
+    def _file_lock(self):
+        """Exclusive lock of the directory across processes."""
+        if fcntl is None:
+            yield
+            return
+        with open(self._lock_path, "a") as f:
+            fcntl.flock(f, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(f, fcntl.LOCK_UN)
+
+    def add(self, hashes: list[str], embeddings: "np.ndarray") -> None:
+        """Append normalized embeddings for new hashes and persist them."""
+        with self._lock, self._file_lock():
+            # Rows appended by other processes since the last read
+            self._load()
+            # Another thread or process may have added some of them since the lookup
+            new = [i for i, h in enumerate(hashes) if h not in self.rows]
+            if not new:
+                return
+            start = self.count
+            self._ensure_capacity(start + len(new), embeddings.shape[1])
+            self._matrix[start:start + len(new)] = embeddings[new].astype(np.float16)
+            for offset, i in enumerate(new):
+                self.rows[hashes[i]] = start + offset
+
+            # Rows before the index, so a reader never maps a hash to an unwritten row
+            self._matrix.flush()
+            tmp = self._index_path.with_suffix(".tmp")
+            tmp.write_text(json.dumps({"dim": self.dim, "capacity": self.capacity, "rows": self.rows}))
+            os.replace(tmp, self._index_path)
+            stat = self._index_path.stat()
+            self._index_version = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+
+def _normalize_rows(matrix: "np.ndarray") -> "np.ndarray":
+    """L2-normalize rows (zero rows stay zero)."""
+    norms = np.linalg.norm(matrix, axis=-1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return matrix / norms
+
+
+def top_k_indices(scores: "np.ndarray", k: Optional[int]) -> "np.ndarray":
+    """Indices of the k highest scores, best first (argpartition + sort of k)."""
+    if k is None or k >= len(scores):
+        return np.argsort(-scores, kind="stable")
+    if k <= 0:
+        return np.empty(0, dtype=np.int64)
+    part = np.argpartition(-scores, k - 1)[:k]
+    return part[np.argsort(-scores[part], kind="stable")]
+
+
 class SemanticFilter:
     """
     Embedding-based semantic relevance filter.
@@ -51,6 +237,7 @@ class SemanticFilter:
         relevance_threshold: float = 0.3,
         keyword_weight: float = 0.3,
         semantic_weight: float = 0.7,
+        cache_dir: Optional[Path] = None,
     ):
         """
         Initialize semantic filter.
@@ -60,21 +247,25 @@ class SemanticFilter:
             relevance_threshold: Minimum combined score to keep finding
             keyword_weight: Weight for keyword-based relevance (0-1)
             semantic_weight: Weight for semantic relevance (0-1)
+            cache_dir: Directory for persistent finding embeddings (None = no cache)
         """
         self.model_name = model_name or self.DEFAULT_MODEL
         self.relevance_threshold = relevance_threshold
         self.keyword_weight = keyword_weight
         self.semantic_weight = semantic_weight
         
-        self._model: Optional[SentenceTransformer] = None
+        self.cache_dir = cache_dir
+        
+        self._model: Optional["SentenceTransformer"] = None
         self._available = SENTENCE_TRANSFORMERS_AVAILABLE and NUMPY_AVAILABLE
+        self._cache: Optional[EmbeddingCache] = None
     
     @property
     def available(self) -> bool:
         """Check if semantic filtering is available."""
         return self._available
     
-    def _load_model(self) -> SentenceTransformer:
+    def _load_model(self) -> "SentenceTransformer":
         """Lazily load the sentence transformer model."""
         if not self._available:
             raise ImportError(
@@ -83,24 +274,52 @@ class SemanticFilter:
             )
         
         if self._model is None:
+            from sentence_transformers import SentenceTransformer
             self._model = SentenceTransformer(self.model_name)
         
         return self._model
     
-    def _compute_cosine_similarity(
-        self,
-        embedding1: "np.ndarray",
-        embedding2: "np.ndarray",
-    ) -> float:
-        """Compute cosine similarity between two embeddings."""
-        dot_product = np.dot(embedding1, embedding2)
-        norm1 = np.linalg.norm(embedding1)
-        norm2 = np.linalg.norm(embedding2)
+    def _get_cache(self) -> Optional[EmbeddingCache]:
+        if self.cache_dir is not None and self._cache is None:
+            self._cache = EmbeddingCache.shared(self.cache_dir, self.model_name)
+        return self._cache
+    
+    def _encode(self, texts: list[str]) -> "np.ndarray":
+        """Encode texts into L2-normalized float32 embeddings."""
+        model = self._load_model()
+        embeddings = model.encode(texts, convert_to_numpy=True)
+        return _normalize_rows(np.asarray(embeddings, dtype=np.float32))
+    
+    def embed_texts(self, texts: list[str]) -> "np.ndarray":
+        """
+        Get normalized embeddings for texts, encoding only unseen ones.
         
-        if norm1 == 0 or norm2 == 0:
-            return 0.0
+        Args:
+            texts: Texts to embed
+            
+        Returns:
+            Matrix of shape (len(texts), dim)
+        """
+        cache = self._get_cache()
+        hashes = [EmbeddingCache.text_hash(t) for t in texts]
+        
+        if cache is None:
+            # Still avoid encoding duplicates within one call
+            unique = dict.fromkeys(hashes)
+            first_text = dict(zip(hashes, texts))
+            encoded = self._encode([first_text[h] for h in unique])
+            position = {h: i for i, h in enumerate(unique)}
+            return encoded[[position[h] for h in hashes]]
+        
+        rows = cache.lookup(hashes)
+        missing = {}
+        for i in np.flatnonzero(rows < 0):
+            missing.setdefault(hashes[i], texts[i])
+        if missing:
+            cache.add(list(missing), self._encode(list(missing.values())))
+            rows = cache.lookup(hashes)
         
-        return float(dot_product / (norm1 * norm2))
+        return cache.get(rows)
     
     async def filter_findings(
         self,
@@ -128,77 +347,71 @@ class SemanticFilter:
         
         # Run embedding computation in thread pool
         loop = asyncio.get_event_loop()
-        scored = await loop.run_in_executor(
+        return await loop.run_in_executor(
             None,
             self._compute_scores_sync,
             query,
             findings,
+            top_k,
         )
-        
-        # Filter by threshold
-        filtered = [f for f in scored if f.combined_score >= self.relevance_threshold]
-        
-        # Sort by combined score
-        filtered.sort(key=lambda x: x.combined_score, reverse=True)
-        
-        # Limit to top_k
-        if top_k:
-            filtered = filtered[:top_k]
-        
-        return filtered
     
     def _compute_scores_sync(
         self,
         query: str,
         findings: list[dict],
+        top_k: Optional[int] = None,
     ) -> list[ScoredFinding]:
-        """Compute semantic scores synchronously."""
-        model = self._load_model()
+        """Score, threshold and rank findings synchronously (best first)."""
+        query_embedding = self._encode([query])[0]
+        keyword, semantic = self._score_sync(query_embedding, findings)
+        return self._rank(findings, keyword, semantic, top_k)
+    
+    def _score_sync(
+        self,
+        query_embedding: "np.ndarray",
+        findings: list[dict],
+    ) -> tuple["np.ndarray", "np.ndarray"]:
+        """Keyword and semantic relevance of each finding."""
+        # Combine title and summary for richer embedding
+        texts = [f"{f.get('title', '')} {f.get('summary', '')}" for f in findings]
+        finding_embeddings = self.embed_texts(texts)
         
-        # Compute query embedding
-        query_embedding = model.encode(query, convert_to_numpy=True)
+        # Cosine similarity of normalized vectors, mapped from -1..1 to 0..1
+        semantic = (finding_embeddings @ query_embedding + 1) / 2
+        keyword = np.fromiter(
+            (f.get("relevance", 0) for f in findings), dtype=np.float32, count=len(findings)
+        )
+        return keyword, semantic
+    
+    def _rank(
+        self,
+        findings: list[dict],
+        keyword: "np.ndarray",
+        semantic: "np.ndarray",
+        top_k: Optional[int] = None,
+    ) -> list[ScoredFinding]:
+        """Combine scores, drop findings below the threshold and pick the top_k best."""
+        combined = self.keyword_weight * keyword + self.semantic_weight * semantic
         
-        # Prepare texts for batch encoding
-        texts = []
-        for finding in findings:
-            # Combine title and summary for richer embedding
-            text = f"{finding.get('title', '')} {finding.get('summary', '')}"
-            texts.append(text)
-        
-        # Batch encode findings
-        finding_embeddings = model.encode(texts, convert_to_numpy=True)
-        
-        scored_findings = []
-        for i, finding in enumerate(findings):
-            # Compute semantic similarity
-            semantic_score = self._compute_cosine_similarity(
-                query_embedding,
-                finding_embeddings[i],
-            )
-            
-            # Normalize to 0-1 range (cosine similarity is -1 to 1)
-            semantic_score = (semantic_score + 1) / 2
-            
-            # Get keyword relevance from finding
-            keyword_score = finding.get("relevance", 0)
-            
-            # Compute combined score
-            combined = (
-                self.keyword_weight * keyword_score +
-                self.semantic_weight * semantic_score
-            )
-            
-            scored_findings.append(ScoredFinding(
-                source=finding.get("source", ""),
-                title=finding.get("title", ""),
-                summary=finding.get("summary", ""),
-                keywords=finding.get("keywords", []),
-                keyword_relevance=keyword_score,
-                semantic_relevance=semantic_score,
-                combined_score=combined,
-            ))
+        candidates = np.flatnonzero(combined >= self.relevance_threshold)
+        order = candidates[top_k_indices(combined[candidates], top_k or None)]
         
-        return scored_findings
+        return [
+            ScoredFinding(
+                source=findings[i].get("source", ""),
+                title=findings[i].get("title", ""),
+                summary=findings[i].get("summary", ""),
+                keywords=findings[i].get("keywords", []),
+                keyword_relevance=float(keyword[i]),
+                semantic_relevance=float(semantic[i]),
+                combined_score=float(combined[i]),
+            )
+            for i in order
+        ]
+    
+    def incremental(self, query: str) -> "IncrementalRanking":
+        """Ranking of a query that findings are added to as they are found."""
+        return IncrementalRanking(self, query)
     
     def _keyword_only_ranking(
         self,
@@ -243,3 +456,58 @@ class SemanticFilter:
             "semantic_relevance": scored.semantic_relevance,
             "relevance": scored.combined_score,
         }
+
+
+class IncrementalRanking:
+    """
+    Semantic ranking built up while a research session runs.
+    
+    Findings are embedded and scored as their pages come in (the model is
+    loaded with the first batch), so the final ranking only thresholds and
+    sorts scores that already exist. Scores do not depend on other findings,
+    so the result equals ``filter_findings`` over all findings at once.
+    """
+    
+    def __init__(self, semantic_filter: SemanticFilter, query: str):
+        self.semantic_filter = semantic_filter
+        self.query = query
+        self._findings: list[dict] = []
+        self._keyword: list["np.ndarray"] = []
+        self._semantic: list["np.ndarray"] = []
+        self._query_embedding: Optional["np.ndarray"] = None
+        # Batches are scored in executor threads; keeps the findings and
+        # their score arrays in the same order
+        self._lock = threading.Lock()
+    
+    @property
+    def count(self) -> int:
+        """Number of findings scored so far."""
+        return len(self._findings)
+    
+    def _add_sync(self, findings: list[dict]) -> None:
+        with self._lock:
+            if self._query_embedding is None:
+                self._query_embedding = self.semantic_filter._encode([self.query])[0]
+            keyword, semantic = self.semantic_filter._score_sync(self._query_embedding, findings)
+            self._findings.extend(findings)
+            self._keyword.append(keyword)
+            self._semantic.append(semantic)
+    
+    async def add(self, findings: list[dict]) -> None:
+        """Embed and score a batch of findings (in a worker thread)."""
+        if not findings:
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(None, self._add_sync, findings)
+    
+    def ranked(self, top_k: Optional[int] = None) -> list[ScoredFinding]:
+        """Findings scored so far above the threshold, best first."""
+        with self._lock:
+            if not self._findings:
+                return []
+            return self.semantic_filter._rank(
+                self._findings,
+                np.concatenate(self._keyword),
+                np.concatenate(self._semantic),
+                top_k,
+            )
@@ -2,14 +2,292 @@
 Snapshot Manager - Session state persistence and recovery.
 
 Handles saving and loading session states for resume functionality.
+
+A session is persisted as two files:
+- ``<id>.json``: snapshot of the whole session, written at session start and end
+- ``<id>.journal.jsonl``: append-only journal with one record per completed
+  task (and per batch of discovered follow-up tasks), so a crash mid-run only
+  loses the records not yet synced
+
+Loading a session replays the journal over the snapshot. Saving with
+``compact=True`` folds the journal into the snapshot and removes it.
+
+Session metadata (query, status, counts, timestamps, file sizes) is also kept
+in ``catalog.sqlite3`` so listing, prefix lookup and cleanup never have to
+open the snapshots themselves.
+
+Screenshots are stored once per content hash under ``screenshots/.objects``
+and hard-linked into each session's screenshot directory.
 """
 
+import asyncio
+import hashlib
 import json
+import logging
+import os
+import shutil
+import sqlite3
+import time
 from dataclasses import asdict
 from datetime import datetime
 from pathlib import Path
 from typing import Any, Optional
 
+logger = logging.getLogger(__name__)
+
+# File extension per screenshot image format
+SCREENSHOT_EXTENSIONS = {"png": ".png", "jpeg": ".jpg", "webp": ".webp"}
+
+# Journal fsync batching: sync after this many records or seconds, whichever first
+JOURNAL_SYNC_EVERY = 16
+JOURNAL_SYNC_INTERVAL = 1.0
+
+
+class TaskJournal:
+    """
+    Append-only JSONL journal of a running session.
+
+    Every record is written and flushed immediately (O(1) per task); fsync is
+    batched so a burst of fast tasks does not pay one disk sync each.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        sync_every: int = JOURNAL_SYNC_EVERY,
+        sync_interval: float = JOURNAL_SYNC_INTERVAL,
+    ):
+        """
+        Open (or continue) a journal.
+
+        Args:
+            path: Journal file, appended to if it exists
+            sync_every: Records between fsyncs
+            sync_interval: Maximum seconds between fsyncs
+        """
+        self.path = path
+        self.sync_every = max(1, sync_every)
+        self.sync_interval = sync_interval
+        self.records = 0
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+        self._file = open(path, "a", encoding="utf-8")
+        # Terminate a line torn by a crash so the next record starts cleanly
+        if path.stat().st_size and not path.read_bytes().endswith(b"\n"):
+            self._file.write("\n")
+
+    @property
+    def closed(self) -> bool:
+        return self._file.closed
+
+    def append(self, record: dict) -> None:
+        """Write one record and fsync if the batch is due."""
+        if self._file.closed:
+            return
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        self.records += 1
+        self._unsynced += 1
+        if (
+            self._unsynced >= self.sync_every
+            or time.monotonic() - self._last_sync >= self.sync_interval
+        ):
+            self.sync()
+
+    def sync(self) -> None:
+        """Force journaled records to disk."""
+        if self._file.closed or not self._unsynced:
+            return
+        os.fsync(self._file.fileno())
+        self._unsynced = 0
+        self._last_sync = time.monotonic()
+
+    def close(self) -> None:
+        """Sync and close the journal."""
+        if self._file.closed:
+            return
+        self.sync()
+        self._file.close()
+
+
+class SessionCatalog:
+    """
+    SQLite index of session metadata.
+
+    Rows are written in the same step as the snapshot file they describe;
+    snapshots saved by older versions (or copied in by hand) are picked up by
+    reconcile(), which only stats files whose size or mtime changed.
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS sessions (
+            id TEXT PRIMARY KEY,
+            query TEXT NOT NULL DEFAULT '',
+            status TEXT NOT NULL DEFAULT 'unknown',
+            completed INTEGER NOT NULL DEFAULT 0,
+            total INTEGER NOT NULL DEFAULT 0,
+            created_at TEXT NOT NULL DEFAULT '',
+            saved_at TEXT NOT NULL DEFAULT '',
+            snapshot_bytes INTEGER NOT NULL DEFAULT 0,
+            snapshot_mtime REAL NOT NULL DEFAULT 0,
+            journal_offset INTEGER NOT NULL DEFAULT 0
+        );
+        CREATE INDEX IF NOT EXISTS sessions_status ON sessions (status);
+        CREATE INDEX IF NOT EXISTS sessions_created ON sessions (created_at);
+    """
+
+    def __init__(self, path: Path):
+        """
+        Open (or create) a catalog.
+
+        Args:
+            path: SQLite database file
+        """
+        self.path = path
+        self._conn = sqlite3.connect(str(path), timeout=10)
+        self._conn.row_factory = sqlite3.Row
+        # WAL lets the CLI read while a research run is writing
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(self.SCHEMA)
+
+    def upsert(self, session_id: str, session_dict: dict, snapshot_path: Path, journal_offset: int = 0) -> None:
+        """Record a snapshot's metadata (call after it is written)."""
+        stat = snapshot_path.stat()
+        with self._conn:
+            self._conn.execute(
+                """
+                INSERT INTO sessions (id, query, status, completed, total, created_at, saved_at,
+                                      snapshot_bytes, snapshot_mtime, journal_offset)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(id) DO UPDATE SET
+                    query = excluded.query, status = excluded.status,
+                    completed = excluded.completed, total = excluded.total,
+                    created_at = excluded.created_at, saved_at = excluded.saved_at,
+                    snapshot_bytes = excluded.snapshot_bytes,
+                    snapshot_mtime = excluded.snapshot_mtime,
+                    journal_offset = excluded.journal_offset
+                """,
+                (
+                    session_id,
+                    str(session_dict.get("query", "")),
+                    str(session_dict.get("status", "unknown")),
+                    int(session_dict.get("completed", 0) or 0),
+                    int(session_dict.get("total", 0) or 0),
+                    str(session_dict.get("created_at", "")),
+                    str(session_dict.get("_saved_at", "")),
+                    stat.st_size,
+                    stat.st_mtime,
+                    journal_offset,
+                ),
+            )
+
+    def remove(self, session_ids: list[str]) -> None:
+        """Drop catalog rows."""
+        with self._conn:
+            self._conn.executemany("DELETE FROM sessions WHERE id = ?", [(i,) for i in session_ids])
+
+    def get(self, session_id: str) -> Optional[dict]:
+        """Get one row by exact ID."""
+        row = self._conn.execute("SELECT * FROM sessions WHERE id = ?", (session_id,)).fetchone()
+        return dict(row) if row else None
+
+    def resolve(self, prefix: str) -> Optional[str]:
+        """
+        Resolve a session ID prefix.
+
+        Args:
+            prefix: Full ID or leading part of one
+
+        Returns:
+            Matching ID (the newest on ambiguity) or None
+        """
+        if not prefix:
+            return None
+        row = self._conn.execute(
+            "SELECT id FROM sessions WHERE id = ? OR substr(id, 1, ?) = ? "
+            "ORDER BY id = ? DESC, created_at DESC LIMIT 1",
+            (prefix, len(prefix), prefix, prefix),
+        ).fetchone()
+        return row["id"] if row else None
+
+    def select(
+        self,
+        statuses: Optional[list[str]] = None,
+        exclude_statuses: Optional[list[str]] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        List rows, newest first.
+
+        Args:
+            statuses: Only these statuses
+            exclude_statuses: Skip these statuses
+            limit: Maximum number of rows
+
+        Returns:
+            Row dictionaries
+        """
+        sql = "SELECT * FROM sessions"
+        clauses, params = [], []
+        if statuses:
+            clauses.append(f"status IN ({', '.join('?' * len(statuses))})")
+            params.extend(statuses)
+        if exclude_statuses:
+            clauses.append(f"status NOT IN ({', '.join('?' * len(exclude_statuses))})")
+            params.extend(exclude_statuses)
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY created_at DESC"
+        if limit:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self._conn.execute(sql, params)]
+
+    def older_than(self, cutoff: float) -> list[str]:
+        """IDs of sessions whose snapshot was last written before cutoff (epoch seconds)."""
+        rows = self._conn.execute("SELECT id FROM sessions WHERE snapshot_mtime < ?", (cutoff,))
+        return [row["id"] for row in rows]
+
+    def reconcile(self, sessions_dir: Path) -> int:
+        """
+        Bring the catalog in line with the snapshot files on disk.
+
+        Only snapshots that are new or changed since they were indexed are
+        parsed; rows of deleted files are dropped.
+
+        Returns:
+            Number of rows added, updated or removed
+        """
+        known = {
+            row["id"]: (row["snapshot_bytes"], row["snapshot_mtime"])
+            for row in self._conn.execute("SELECT id, snapshot_bytes, snapshot_mtime FROM sessions")
+        }
+        changed = 0
+        on_disk = set()
+        with os.scandir(sessions_dir) as entries:
+            for entry in entries:
+                if not entry.name.endswith(".json") or not entry.is_file():
+                    continue
+                session_id = entry.name[:-len(".json")]
+                on_disk.add(session_id)
+                stat = entry.stat()
+                if known.get(session_id) == (stat.st_size, stat.st_mtime):
+                    continue
+                try:
+                    session_dict = json.loads(Path(entry.path).read_text())
+                except (OSError, json.JSONDecodeError):
+                    continue
+                self.upsert(session_id, session_dict, Path(entry.path))
+                changed += 1
+
+        stale = [session_id for session_id in known if session_id not in on_disk]
+        if stale:
+            self.remove(stale)
+        return changed + len(stale)
+
+    def close(self) -> None:
+        self._conn.close()
+
 
 class SnapshotManager:
     """
@@ -18,29 +296,102 @@ class SnapshotManager:
     Provides:
     - Session state saving to JSON
     - Session loading and resumption
-    - Session listing and cleanup
+    - Session listing and cleanup (from the SQLite catalog)
     """
 
     def __init__(self, data_dir: Path = Path("data")):
         self.data_dir = data_dir
         self.sessions_dir = data_dir / "sessions"
         self.sessions_dir.mkdir(parents=True, exist_ok=True)
+        self.catalog = SessionCatalog(self.sessions_dir / "catalog.sqlite3")
+        self.catalog.reconcile(self.sessions_dir)
+
+    def close(self) -> None:
+        """Close the session catalog."""
+        self.catalog.close()
 
     def _session_path(self, session_name: str) -> Path:
         """Get path for a session file."""
         return self.sessions_dir / f"{session_name}.json"
 
-    async def save_session(self, session: Any) -> Path:
+    def _journal_path(self, session_name: str) -> Path:
+        """Get path for a session's task journal."""
+        return self.sessions_dir / f"{session_name}.journal.jsonl"
+
+    def open_journal(self, session_name: str) -> TaskJournal:
+        """
+        Open the task journal of a session for appending.
+
+        Args:
+            session_name: Session ID
+
+        Returns:
+            Journal; records are replayed by load_session()
+        """
+        return TaskJournal(self._journal_path(session_name))
+
+    def journal_result(self, journal: TaskJournal, result: Any) -> None:
+        """Append a completed task result to a journal."""
+        journal.append({"type": "result", "result": self._serialize_value(result)})
+
+    def journal_tasks(self, journal: TaskJournal, tasks: list) -> None:
+        """Append newly discovered tasks (e.g. crawl follow-ups) to a journal."""
+        journal.append({"type": "tasks", "tasks": [self._serialize_value(t) for t in tasks]})
+
+    def _replay_journal(self, session_dict: dict, journal_path: Path) -> dict:
+        """Apply journal records on top of a snapshot."""
+        if not journal_path.exists():
+            return session_dict
+
+        results = {r["task_id"]: r for r in session_dict.get("results", [])}
+        tasks = list(session_dict.get("tasks", []))
+        task_ids = {t.get("id") for t in tasks}
+        replayed = 0
+
+        with open(journal_path, "r", encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    # Torn final line from a crash mid-write
+                    logger.warning(f"Skipping corrupt journal record in {journal_path.name}")
+                    continue
+                if record.get("type") == "result":
+                    result = record["result"]
+                    results[result["task_id"]] = result
+                    replayed += 1
+                elif record.get("type") == "tasks":
+                    for task in record.get("tasks", []):
+                        if task.get("id") not in task_ids:
+                            task_ids.add(task.get("id"))
+                            tasks.append(task)
+
+        session_dict["tasks"] = tasks
+        session_dict["results"] = list(results.values())
+        session_dict["total"] = max(session_dict.get("total", 0), len(tasks))
+        session_dict["completed"] = len(
+            [r for r in session_dict["results"] if r.get("status") == "success"]
+        )
+        session_dict["_journal_records"] = replayed
+        return session_dict
+
+    async def save_session(self, session: Any, compact: bool = False) -> Path:
         """
         Save session state to JSON file.
 
         Args:
             session: Session object with state to save
+            compact: The session already holds every journaled result, so
+                remove its journal after the snapshot is written
 
         Returns:
             Path to saved session file
         """
-        filepath = self._session_path(session.id if hasattr(session, 'id') else str(session))
+        session_name = session.id if hasattr(session, 'id') else str(session)
+        filepath = self._session_path(session_name)
 
         # Convert session to dictionary
         if hasattr(session, '__dataclass_fields__'):
@@ -54,10 +405,18 @@ class SnapshotManager:
         session_dict["_saved_at"] = datetime.now().isoformat()
         session_dict["_version"] = "1.0"
 
-        # Save to file
-        filepath.write_text(
+        # Save to file (atomically, a torn snapshot would lose the whole session)
+        tmp = filepath.with_suffix(".tmp")
+        tmp.write_text(
             json.dumps(session_dict, indent=2, ensure_ascii=False, default=str)
         )
+        os.replace(tmp, filepath)
+
+        journal_path = self._journal_path(session_name)
+        if compact:
+            journal_path.unlink(missing_ok=True)
+        journal_offset = journal_path.stat().st_size if journal_path.exists() else 0
+        self.catalog.upsert(session_name, session_dict, filepath, journal_offset)
 
         return filepath
 
@@ -104,58 +463,72 @@ class SnapshotManager:
         """
         Load session state from JSON file.
 
+        Results journaled after the last snapshot are merged in.
+
         Args:
             session_name: Name/ID of session to load
 
         Returns:
             Session dictionary or None if not found
         """
-        # Try exact match first
-        filepath = self._session_path(session_name)
-        if filepath.exists():
-            return json.loads(filepath.read_text())
+        session_id = self.resolve_session(session_name)
+        if session_id is None:
+            return None
 
-        # Try finding by prefix
-        for path in self.sessions_dir.glob(f"{session_name}*.json"):
-            return json.loads(path.read_text())
+        filepath = self._session_path(session_id)
+        if not filepath.exists():
+            self.catalog.remove([session_id])
+            return None
 
-        return None
+        session = json.loads(filepath.read_text())
+        return self._replay_journal(session, self._journal_path(session_id))
 
-    async def list_sessions(self, include_completed: bool = False) -> list[dict]:
+    def resolve_session(self, session_name: str) -> Optional[str]:
         """
-        List all sessions.
+        Resolve a session name or ID prefix to a full session ID.
 
         Args:
-            include_completed: Whether to include completed sessions
+            session_name: Full ID or its leading characters
 
         Returns:
-            List of session summary dictionaries
+            Session ID or None if no session matches
         """
-        sessions = []
+        return self.catalog.resolve(session_name)
 
-        for path in self.sessions_dir.glob("*.json"):
-            try:
-                session = json.loads(path.read_text())
-                status = session.get("status", "unknown")
-
-                if not include_completed and status == "completed":
-                    continue
+    async def list_sessions(
+        self,
+        include_completed: bool = False,
+        status: Optional[str] = None,
+        limit: Optional[int] = None,
+    ) -> list[dict]:
+        """
+        List all sessions.
 
-                sessions.append({
-                    "name": path.stem,
-                    "status": status,
-                    "query": session.get("query", ""),
-                    "created": session.get("created_at", ""),
-                    "completed": session.get("completed", 0),
-                    "total": session.get("total", 0),
-                    "saved_at": session.get("_saved_at", "")
-                })
-            except (json.JSONDecodeError, KeyError):
-                continue
+        Args:
+            include_completed: Whether to include completed sessions
+            status: Only sessions with this status
+            limit: Maximum number of sessions
 
-        # Sort by creation time, newest first
-        sessions.sort(key=lambda x: x.get("created", ""), reverse=True)
-        return sessions
+        Returns:
+            List of session summary dictionaries, newest first
+        """
+        rows = self.catalog.select(
+            statuses=[status] if status else None,
+            exclude_statuses=None if include_completed or status else ["completed"],
+            limit=limit,
+        )
+        return [
+            {
+                "name": row["id"],
+                "status": row["status"],
+                "query": row["query"],
+                "created": row["created_at"],
+                "completed": row["completed"],
+                "total": row["total"],
+                "saved_at": row["saved_at"],
+            }
+            for row in rows
+        ]
 
     async def delete_session(self, session_name: str) -> bool:
         """
@@ -167,17 +540,17 @@ class SnapshotManager:
         Returns:
             True if deleted, False if not found
         """
-        filepath = self._session_path(session_name)
-        if filepath.exists():
-            filepath.unlink()
-            return True
+        session_id = self.resolve_session(session_name)
+        if session_id is None:
+            return False
 
-        # Try finding by prefix
-        for path in self.sessions_dir.glob(f"{session_name}*.json"):
-            path.unlink()
-            return True
+        self._remove_session_files(session_id)
+        self.catalog.remove([session_id])
+        return True
 
-        return False
+    def _remove_session_files(self, session_id: str) -> None:
+        self._session_path(session_id).unlink(missing_ok=True)
+        self._journal_path(session_id).unlink(missing_ok=True)
 
     async def cleanup_old_sessions(self, days: int = 7) -> int:
         """
@@ -189,24 +562,22 @@ class SnapshotManager:
         Returns:
             Number of sessions deleted
         """
-        import time
-
-        deleted = 0
         cutoff = time.time() - (days * 24 * 60 * 60)
 
-        for path in self.sessions_dir.glob("*.json"):
-            if path.stat().st_mtime < cutoff:
-                path.unlink()
-                deleted += 1
+        expired = self.catalog.older_than(cutoff)
+        for session_id in expired:
+            self._remove_session_files(session_id)
+        self.catalog.remove(expired)
 
-        return deleted
+        return len(expired)
 
     async def save_screenshot(
         self,
         session_name: str,
         task_id: str,
         image_data: bytes,
-        suffix: str = ""
+        suffix: str = "",
+        image_format: str = "png"
     ) -> Path:
         """
         Save a screenshot for a session.
@@ -214,20 +585,85 @@ class SnapshotManager:
         Args:
             session_name: Session name
             task_id: Task ID
-            image_data: PNG image data
+            image_data: Encoded image data
             suffix: Optional suffix for filename
+            image_format: png, jpeg or webp (selects the extension)
 
         Returns:
             Path to saved screenshot
         """
+        return await asyncio.to_thread(
+            self._store_screenshot_bytes, session_name, task_id, image_data, suffix, image_format
+        )
+
+    async def store_screenshot(
+        self,
+        session_name: str,
+        task_id: str,
+        file_path: Path,
+        sha256: str,
+        suffix: str = "",
+        image_format: str = "png"
+    ) -> Path:
+        """
+        Move an already written screenshot file into the session.
+
+        Args:
+            session_name: Session name
+            task_id: Task ID
+            file_path: Image file (consumed)
+            sha256: Hex SHA-256 of the file contents
+            suffix: Optional suffix for filename
+            image_format: png, jpeg or webp (selects the extension)
+
+        Returns:
+            Path to saved screenshot
+        """
+        return await asyncio.to_thread(
+            self._store_screenshot_file, session_name, task_id, file_path, sha256, suffix, image_format
+        )
+
+    def _screenshot_object_path(self, sha256: str, image_format: str) -> Path:
+        ext = SCREENSHOT_EXTENSIONS.get(image_format, ".png")
+        return self.data_dir / "screenshots" / ".objects" / sha256[:2] / f"{sha256}{ext}"
+
+    def _store_screenshot_bytes(
+        self, session_name: str, task_id: str, image_data: bytes, suffix: str, image_format: str
+    ) -> Path:
+        sha256 = hashlib.sha256(image_data).hexdigest()
+        object_path = self._screenshot_object_path(sha256, image_format)
+        if not object_path.exists():
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = object_path.with_suffix(".tmp")
+            tmp.write_bytes(image_data)
+            os.replace(tmp, object_path)
+        return self._link_screenshot(object_path, session_name, task_id, suffix)
+
+    def _store_screenshot_file(
+        self, session_name: str, task_id: str, file_path: Path, sha256: str, suffix: str, image_format: str
+    ) -> Path:
+        object_path = self._screenshot_object_path(sha256, image_format)
+        if object_path.exists():
+            # Identical image already stored (e.g. the same error page)
+            file_path.unlink(missing_ok=True)
+        else:
+            object_path.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(file_path, object_path)
+        return self._link_screenshot(object_path, session_name, task_id, suffix)
+
+    def _link_screenshot(self, object_path: Path, session_name: str, task_id: str, suffix: str) -> Path:
+        """Expose a stored image in the session's screenshot directory."""
         screenshots_dir = self.data_dir / "screenshots" / session_name
         screenshots_dir.mkdir(parents=True, exist_ok=True)
 
         timestamp = datetime.now().strftime("%H%M%S")
-        filename = f"{task_id}-{timestamp}{suffix}.png"
-        filepath = screenshots_dir / filename
-
-        filepath.write_bytes(image_data)
+        filepath = screenshots_dir / f"{task_id}-{timestamp}{suffix}{object_path.suffix}"
+        filepath.unlink(missing_ok=True)
+        try:
+            os.link(object_path, filepath)
+        except OSError:
+            # Hard links unsupported (or across devices): fall back to a copy
+            shutil.copyfile(object_path, filepath)
         return filepath
 
     async def get_session_screenshots(self, session_name: str) -> list[Path]:
@@ -244,7 +680,8 @@ class SnapshotManager:
         if not screenshots_dir.exists():
             return []
 
-        return sorted(screenshots_dir.glob("*.png"))
+        extensions = set(SCREENSHOT_EXTENSIONS.values())
+        return sorted(p for p in screenshots_dir.iterdir() if p.suffix in extensions)
 
     async def export_session(
         self,
@@ -263,7 +700,6 @@ class SnapshotManager:
         Returns:
             Path to created archive
         """
-        import shutil
         import tempfile
 
         # Create temp directory
@@ -309,7 +745,6 @@ class SnapshotManager:
         Returns:
             Imported session name
         """
-        import shutil
         import tempfile
 
         with tempfile.TemporaryDirectory() as temp_dir:
@@ -328,6 +763,7 @@ class SnapshotManager:
 
             # Copy session file
             shutil.copy(session_path, self._session_path(session_name))
+            self.catalog.upsert(session_name, session, self._session_path(session_name))
 
             # Copy results
             results_path = temp_path / "results.json"
@@ -0,0 +1,311 @@
+"""
+Summarizer - Map-reduce summarization of research results.
+
+Findings of finished tasks are packed into batches that fit a token budget,
+and each batch is condensed into notes by an LLM call as soon as it is full
+(map), with a bounded number of calls in flight, while the remaining tasks
+are still running. When the session is done the notes are merged into the
+final report (reduce); notes that do not fit one call are first merged in
+groups, level by level. Sessions whose findings fit a single call skip the
+map step and are summarized with one request.
+
+Token counts are estimated from the text (about four ASCII characters or
+one other character per token), which errs on the safe side for Japanese
+text and needs no tokenizer.
+"""
+
+import asyncio
+import logging
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Callable, Optional
+
+from . import tracing
+
+if TYPE_CHECKING:
+    from .llm_client import LLMClient
+
+logger = logging.getLogger(__name__)
+
+# Estimated input tokens per LLM call (packed content plus instructions)
+DEFAULT_TOKEN_BUDGET = 6000
+# LLM calls of one session in flight at once
+DEFAULT_CONCURRENCY = 4
+# Tokens kept free for the instructions around the packed content
+PROMPT_OVERHEAD_TOKENS = 400
+# Smallest budget that leaves room for content
+MIN_TOKEN_BUDGET = PROMPT_OVERHEAD_TOKENS + 200
+
+
+# System prompt for the final report
+SUMMARIZATION_PROMPT = """You are a research analyst. Your job is to synthesize research findings into a clear, actionable summary.
+
+Given a set of research findings from multiple sources, create a comprehensive summary that:
+1. Identifies the key insights and themes
+2. Highlights important facts and statistics
+3. Notes any conflicting information between sources
+4. Provides actionable conclusions
+
+Format your response as Markdown with the following structure:
+
+## Summary
+A brief 2-3 sentence overview of the findings.
+
+## Key Insights
+- Bullet points of the most important discoveries
+
+## Details
+Detailed findings organized by topic/theme.
+
+## Sources
+Notable sources and their contributions.
+
+## Conclusions
+Actionable takeaways from the research.
+
+Be concise but thorough. Focus on information that directly answers the original research query."""
+
+# System prompt for condensing one batch of findings (map)
+MAP_PROMPT = """You are a research assistant condensing raw findings for a later synthesis step.
+
+Given excerpts from several web sources, write concise notes that:
+1. Keep every fact, figure and claim relevant to the research query
+2. Attribute each point to its source URL in brackets
+3. Mention disagreements between sources
+4. Leave out boilerplate, navigation text and anything off-topic
+
+Respond with Markdown bullet points only."""
+
+# System prompt for merging notes that do not fit the final call (reduce)
+REDUCE_PROMPT = """You are a research assistant merging partial research notes.
+
+Combine the notes into a single set: merge duplicate points, keep every distinct fact and figure with its source URLs, and keep mentioned disagreements between sources.
+
+Respond with Markdown bullet points only."""
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count of a text (no tokenizer needed)."""
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return (ascii_chars + 3) // 4 + (len(text) - ascii_chars)
+
+
+def truncate_to_tokens(text: str, tokens: int) -> str:
+    """Longest prefix of a text that fits an estimated token count."""
+    if estimate_tokens(text) <= tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if estimate_tokens(text[:middle]) <= tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low]
+
+
+@dataclass
+class SummaryStats:
+    """Work done by a summarizer."""
+    sources: int = 0
+    map_calls: int = 0
+    reduce_calls: int = 0
+    failed_calls: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class MapReduceSummarizer:
+    """
+    Summarizes the results of a research session in token-bounded batches.
+
+    Call add() for every finished task (map calls start in the background
+    as batches fill up) and summarize() once all tasks are done.
+    """
+
+    def __init__(
+        self,
+        llm_client: "LLMClient",
+        query: str,
+        token_budget: int = DEFAULT_TOKEN_BUDGET,
+        concurrency: int = DEFAULT_CONCURRENCY,
+    ):
+        """
+        Initialize summarizer.
+
+        Args:
+            llm_client: Client for the map, reduce and final calls
+            query: Research query the summary answers
+            token_budget: Estimated input tokens per LLM call
+            concurrency: Maximum LLM calls in flight
+        """
+        self.llm_client = llm_client
+        self.query = query
+        self.token_budget = max(MIN_TOKEN_BUDGET, token_budget)
+        self.stats = SummaryStats()
+        # Room for packed content in one call
+        self._content_budget = self.token_budget - PROMPT_OVERHEAD_TOKENS - estimate_tokens(query)
+        self._content_budget = max(MIN_TOKEN_BUDGET - PROMPT_OVERHEAD_TOKENS, self._content_budget)
+        self._semaphore = asyncio.Semaphore(max(1, concurrency))
+        self._pending: list[str] = []
+        self._pending_tokens = 0
+        # Map calls in batch order
+        self._maps: list[asyncio.Task] = []
+
+    def add(self, source: str, title: str, texts: list[str]) -> None:
+        """
+        Add the findings of one source.
+
+        Starts a map call in the background when the current batch is full.
+
+        Args:
+            source: Source URL
+            title: Page title
+            texts: Finding texts of the page (most relevant first)
+        """
+        body = "\n\n".join(t.strip() for t in texts if t and t.strip())
+        if not body:
+            return
+        section = truncate_to_tokens(f"### {title or source}\n**Source:** {source}\n\n{body}\n", self._content_budget)
+        tokens = estimate_tokens(section)
+        self.stats.sources += 1
+
+        if self._pending and self._pending_tokens + tokens > self._content_budget:
+            self._start_map()
+        self._pending.append(section)
+        self._pending_tokens += tokens
+
+    def _start_map(self) -> None:
+        batch = "\n".join(self._pending)
+        sources = len(self._pending)
+        self._pending = []
+        self._pending_tokens = 0
+        self._maps.append(asyncio.create_task(self._map(batch, sources)))
+
+    async def _call(self, kind: str, prompt: str, system: str) -> Optional[str]:
+        """One bounded map or reduce call; None if it failed."""
+        async with self._semaphore:
+            try:
+                with tracing.span(f"summarize.{kind}"):
+                    response = await self.llm_client.complete(prompt=prompt, system=system)
+            except Exception as e:
+                logger.warning(f"Summary {kind} call failed: {e}")
+                self.stats.failed_calls += 1
+                return None
+        if kind == "map":
+            self.stats.map_calls += 1
+        else:
+            self.stats.reduce_calls += 1
+        return response.content
+
+    async def _map(self, batch: str, sources: int) -> Optional[str]:
+        prompt = f"""Research Query: {self.query}
+
+Excerpts from {sources} sources:
+{batch}
+
+Write notes on everything in these excerpts that is relevant to the query."""
+        return await self._call("map", prompt, MAP_PROMPT)
+
+    def _pack(self, notes: list[str]) -> list[list[str]]:
+        """Group notes into calls that fit the content budget."""
+        groups: list[list[str]] = []
+        tokens = 0
+        for note in notes:
+            size = estimate_tokens(note)
+            if groups and tokens + size <= self._content_budget:
+                groups[-1].append(note)
+                tokens += size
+            else:
+                groups.append([note])
+                tokens = size
+        return groups
+
+    async def _reduce(self, notes: list[str]) -> list[str]:
+        """Merge notes in groups until they fit the final call."""
+        while len(notes) > 1 and sum(estimate_tokens(n) for n in notes) > self._content_budget:
+            groups = self._pack(notes)
+            if len(groups) == len(notes):
+                # Every note fills a call on its own: cut them to an equal share
+                share = self._content_budget // len(notes)
+                return [truncate_to_tokens(n, share) for n in notes]
+
+            async def merge(group: list[str]) -> list[str]:
+                if len(group) == 1:
+                    return group
+                prompt = f"""Research Query: {self.query}
+
+{self._format_notes(group)}
+
+Merge these notes."""
+                merged = await self._call("reduce", prompt, REDUCE_PROMPT)
+                # Keep the unmerged notes rather than losing them
+                return [merged] if merged else group
+
+            with tracing.span("summarize.reduce_level", notes=len(notes), groups=len(groups)):
+                merged_groups = await asyncio.gather(*[merge(g) for g in groups])
+            merged = [note for group in merged_groups for note in group]
+            if len(merged) == len(notes):
+                share = self._content_budget // len(notes)
+                return [truncate_to_tokens(n, share) for n in merged]
+            notes = merged
+        return notes
+
+    @staticmethod
+    def _format_notes(notes: list[str]) -> str:
+        return "\n\n".join(f"### Notes {i}\n{note}" for i, note in enumerate(notes, 1))
+
+    async def summarize(self, on_chunk: Optional[Callable[[str], None]] = None) -> str:
+        """
+        Write the final report.
+
+        Args:
+            on_chunk: Receives the report text while it is generated (streams
+                the final call)
+
+        Returns:
+            Markdown report
+
+        Raises:
+            RuntimeError: If there is nothing to summarize or every map call failed
+        """
+        if not self._maps:
+            if not self._pending:
+                raise RuntimeError("No findings to summarize")
+            # Everything fits one call
+            content = "\n".join(self._pending)
+            heading = "Research Findings"
+        else:
+            if self._pending:
+                self._start_map()
+            with tracing.span("summarize.map_backlog", batches=len(self._maps)):
+                notes = [n for n in await asyncio.gather(*self._maps) if n]
+            if not notes:
+                raise RuntimeError("Every map summarization call failed")
+            content = self._format_notes(await self._reduce(notes))
+            heading = f"Research Notes (condensed from {self.stats.sources} sources)"
+
+        prompt = f"""Original Research Query: {self.query}
+
+{heading}:
+{content}
+
+Please synthesize these findings into a comprehensive research summary."""
+
+        if on_chunk is None:
+            response = await self.llm_client.complete(prompt=prompt, system=SUMMARIZATION_PROMPT)
+            return response.content
+
+        chunks = []
+        async for text in self.llm_client.stream(prompt=prompt, system=SUMMARIZATION_PROMPT):
+            chunks.append(text)
+            on_chunk(text)
+        return "".join(chunks)
+
+    async def close(self) -> None:
+        """Cancel map calls that are still running."""
+        running = [task for task in self._maps if not task.done()]
+        for task in running:
+            task.cancel()
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
@@ -496,6 +496,15 @@ class LLMTaskParser:
         """Build search engine URL (delegates to module-level function)."""
         return build_search_url(query, self.default_engine)
 
+    def create_crawl_tasks(
+        self,
+        parent_task: ResearchTask,
+        urls: list[str],
+        max_depth: int = 1
+    ) -> list[ResearchTask]:
+        """Create follow-up crawl tasks (delegates to the rule-based parser)."""
+        return self._rule_parser.create_crawl_tasks(parent_task, urls, max_depth)
+
 
 def create_parser(use_llm: bool = False, **kwargs) -> TaskParser | LLMTaskParser:
     """
@@ -0,0 +1,435 @@
+"""
+Tracing - Phase spans, counters and histograms of research runs.
+
+A Tracer records nested spans (run phases such as query parsing, browser
+startup and summarization, one span per task and the steps inside it),
+counters (retries, fallbacks, timeouts, bytes transferred) and histograms
+(navigation latency per domain) of one session. The active tracer lives in a
+context variable, so code shared between sessions (the browser pool, the
+retry helpers) records into the session it runs for, and nothing is recorded
+outside a session.
+
+Exports:
+- A JSONL trace file per session: one line per finished span, then one line
+  with counters and histograms
+- A per-run timing breakdown included in the session result
+- Counters and histograms of all sessions of the process in Prometheus text
+  format, optionally served over HTTP (MetricsServer)
+"""
+
+import json
+import logging
+import time
+from bisect import bisect_left
+from collections import defaultdict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator, Optional
+from urllib.parse import urlparse
+from uuid import uuid4
+
+logger = logging.getLogger(__name__)
+
+# Histogram bucket upper bounds (seconds)
+LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+# Distinct label values per metric before the rest are reported as "other"
+# (keeps per-domain metrics bounded in a long-running server)
+MAX_LABEL_VALUES = 200
+
+# Domains listed in the timing breakdown, slowest total first
+BREAKDOWN_DOMAINS = 20
+
+_current_tracer: ContextVar[Optional["Tracer"]] = ContextVar("tracer", default=None)
+_current_span: ContextVar[Optional["Span"]] = ContextVar("span", default=None)
+
+LabelKey = tuple[tuple[str, str], ...]
+
+
+@dataclass
+class Span:
+    """A timed operation; spans nest through their parent id."""
+    name: str
+    span_id: str
+    parent_id: Optional[str]
+    start: float  # time.time()
+    attrs: dict = field(default_factory=dict)
+    duration: float = 0.0
+    error: Optional[str] = None
+
+    def to_dict(self) -> dict:
+        data = {
+            "type": "span",
+            "name": self.name,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": round(self.start, 6),
+            "duration_ms": round(self.duration * 1000, 3),
+        }
+        if self.attrs:
+            data["attrs"] = self.attrs
+        if self.error:
+            data["error"] = self.error
+        return data
+
+
+@dataclass
+class Histogram:
+    """Cumulative-bucket histogram (Prometheus semantics)."""
+    buckets: tuple[float, ...] = LATENCY_BUCKETS
+    counts: list[int] = field(default_factory=list)
+    count: int = 0
+    total: float = 0.0
+    max: float = 0.0
+
+    def __post_init__(self):
+        if not self.counts:
+            self.counts = [0] * (len(self.buckets) + 1)
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Approximate quantile (upper bound of the bucket holding it)."""
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for i, n in enumerate(self.counts):
+            seen += n
+            if seen >= rank:
+                return min(self.buckets[i], self.max) if i < len(self.buckets) else self.max
+        return self.max
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "sum": round(self.total, 6),
+            "max": round(self.max, 6),
+            "buckets": dict(zip([*map(str, self.buckets), "+Inf"], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """Counters and histograms keyed by name and labels."""
+
+    def __init__(self):
+        self.counters: dict[str, dict[LabelKey, float]] = defaultdict(lambda: defaultdict(float))
+        self.histograms: dict[str, dict[LabelKey, Histogram]] = defaultdict(dict)
+        self._label_values: dict[tuple[str, str], set[str]] = defaultdict(set)
+
+    def _key(self, name: str, labels: dict[str, Any]) -> LabelKey:
+        key = []
+        for label, value in sorted(labels.items()):
+            value = str(value)
+            seen = self._label_values[(name, label)]
+            if value not in seen:
+                if len(seen) >= MAX_LABEL_VALUES:
+                    value = "other"
+                else:
+                    seen.add(value)
+            key.append((label, value))
+        return tuple(key)
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        self.counters[name][self._key(name, labels)] += value
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        key = self._key(name, labels)
+        histogram = self.histograms[name].get(key)
+        if histogram is None:
+            histogram = self.histograms[name][key] = Histogram()
+        histogram.observe(value)
+
+    def to_dict(self) -> dict:
+        def labelled(key: LabelKey) -> str:
+            return ",".join(f"{k}={v}" for k, v in key)
+
+        return {
+            "counters": {
+                name: {labelled(key): value for key, value in values.items()}
+                for name, values in self.counters.items()
+            },
+            "histograms": {
+                name: {labelled(key): h.to_dict() for key, h in values.items()}
+                for name, values in self.histograms.items()
+            },
+        }
+
+    def to_prometheus(self, prefix: str = "research_") -> str:
+        """Render in the Prometheus text exposition format."""
+        def labels_text(key: LabelKey, extra: str = "") -> str:
+            parts = [f'{k}="{_escape_label(v)}"' for k, v in key]
+            if extra:
+                parts.append(extra)
+            return "{" + ",".join(parts) + "}" if parts else ""
+
+        lines = []
+        for name, values in sorted(self.counters.items()):
+            metric = f"{prefix}{name}_total"
+            lines.append(f"# TYPE {metric} counter")
+            for key, value in values.items():
+                lines.append(f"{metric}{labels_text(key)} {value:g}")
+        for name, values in sorted(self.histograms.items()):
+            metric = f"{prefix}{name}"
+            lines.append(f"# TYPE {metric} histogram")
+            for key, histogram in values.items():
+                cumulative = 0
+                for bound, n in zip([*map(str, histogram.buckets), "+Inf"], histogram.counts):
+                    cumulative += n
+                    le = 'le="' + bound + '"'
+                    lines.append(f"{metric}_bucket{labels_text(key, le)} {cumulative}")
+                lines.append(f"{metric}_sum{labels_text(key)} {histogram.total:g}")
+                lines.append(f"{metric}_count{labels_text(key)} {histogram.count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+# Totals of every session in this process (served by MetricsServer)
+REGISTRY = MetricsRegistry()
+
+
+class Tracer:
+    """
+    Spans and metrics of one research session.
+
+    Spans are written to the trace file as they finish (buffered; flushed by
+    close()). Counters and histograms go both to the session and to the
+    process-wide REGISTRY.
+    """
+
+    def __init__(self, trace_path: Optional[Path] = None, registry: Optional[MetricsRegistry] = REGISTRY):
+        """
+        Initialize a tracer.
+
+        Args:
+            trace_path: JSONL file to write (None: keep in memory only)
+            registry: Process-wide registry to aggregate metrics into
+        """
+        self.trace_id = uuid4().hex[:16]
+        self.trace_path = trace_path
+        self.metrics = MetricsRegistry()
+        self.registry = registry
+        self.spans: list[Span] = []
+        self._open_root: Optional[Span] = None
+        self._file = None
+
+    @contextmanager
+    def span(self, name: str, **attrs: Any) -> Iterator[Span]:
+        """Time a block as a child of the current span."""
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            span_id=uuid4().hex[:12],
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attrs=attrs,
+        )
+        if parent is None and self._open_root is None:
+            self._open_root = span
+        token = _current_span.set(span)
+        started = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.error = type(e).__name__
+            raise
+        finally:
+            span.duration = time.perf_counter() - started
+            _current_span.reset(token)
+            if span is self._open_root:
+                self._open_root = None
+            self._finish(span)
+
+    def _finish(self, span: Span) -> None:
+        self.spans.append(span)
+        if span.name == "task":
+            self.observe("task_seconds", span.duration, task_type=span.attrs.get("task_type", ""))
+        elif self._open_root is not None and span.parent_id == self._open_root.span_id:
+            self.observe("phase_seconds", span.duration, phase=span.name)
+        if self.trace_path is None:
+            return
+        try:
+            if self._file is None:
+                self.trace_path.parent.mkdir(parents=True, exist_ok=True)
+                self._file = open(self.trace_path, "a", encoding="utf-8")
+                self._write({"type": "trace", "trace_id": self.trace_id, "start": time.time()})
+            self._write(span.to_dict())
+        except OSError as e:
+            logger.warning(f"Trace file disabled: {e}")
+            self.trace_path = None
+
+    def _write(self, record: dict) -> None:
+        self._file.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+
+    def count(self, name: str, value: float = 1, **labels: Any) -> None:
+        self.metrics.count(name, value, **labels)
+        if self.registry is not None:
+            self.registry.count(name, value, **labels)
+
+    def observe(self, name: str, value: float, **labels: Any) -> None:
+        self.metrics.observe(name, value, **labels)
+        if self.registry is not None:
+            self.registry.observe(name, value, **labels)
+
+    def breakdown(self) -> dict:
+        """
+        Per-run timing breakdown.
+
+        Returns:
+            Top-level phase durations, total time per span name inside tasks
+            (summed over concurrent tasks), counters and the slowest domains
+        """
+        by_id = {span.span_id: span for span in self.spans}
+        # Called from inside the run, so its span is usually still open
+        root = self._open_root or next((s for s in self.spans if s.parent_id is None and s.name == "run"), None)
+
+        phases: dict[str, float] = defaultdict(float)
+        steps: dict[str, float] = defaultdict(float)
+        for span in self.spans:
+            if root is not None and span.parent_id == root.span_id:
+                phases[span.name] += span.duration
+            elif span.name != "run" and span.name != "task" and self._inside_task(span, by_id):
+                steps[span.name] += span.duration
+
+        tasks = [s for s in self.spans if s.name == "task"]
+        counters = {
+            name: sum(values.values()) for name, values in self.metrics.counters.items()
+        }
+
+        domains = []
+        for key, histogram in self.metrics.histograms.get("navigation_seconds", {}).items():
+            domains.append({
+                "domain": dict(key).get("domain", ""),
+                "count": histogram.count,
+                "avg_ms": round(histogram.total / histogram.count * 1000) if histogram.count else 0,
+                "p95_ms": round(histogram.quantile(0.95) * 1000),
+                "max_ms": round(histogram.max * 1000),
+                "total_ms": round(histogram.total * 1000),
+            })
+        domains.sort(key=lambda d: d["total_ms"], reverse=True)
+
+        return {
+            "trace_id": self.trace_id,
+            "trace_path": str(self.trace_path) if self.trace_path else None,
+            "total_s": round(
+                (root.duration or time.time() - root.start) if root else sum(phases.values()), 3
+            ),
+            "phases_s": {name: round(seconds, 3) for name, seconds in phases.items()},
+            "tasks": {
+                "count": len(tasks),
+                "total_s": round(sum(s.duration for s in tasks), 3),
+                "max_s": round(max((s.duration for s in tasks), default=0.0), 3),
+            },
+            "task_steps_s": {name: round(seconds, 3) for name, seconds in sorted(steps.items())},
+            "counters": counters,
+            "navigation_by_domain": domains[:BREAKDOWN_DOMAINS],
+        }
+
+    @staticmethod
+    def _inside_task(span: Span, by_id: dict[str, Span]) -> bool:
+        parent_id = span.parent_id
+        while parent_id:
+            parent = by_id.get(parent_id)
+            if parent is None:
+                return False
+            if parent.name == "task":
+                return True
+            parent_id = parent.parent_id
+        return False
+
+    def close(self) -> None:
+        """Write the metrics line and close the trace file."""
+        if self._file is None:
+            return
+        try:
+            self._write({"type": "metrics", **self.metrics.to_dict()})
+            self._file.close()
+        except OSError as e:
+            logger.warning(f"Failed to finish trace file: {e}")
+        self._file = None
+
+
+@contextmanager
+def activate(tracer: Tracer) -> Iterator[Tracer]:
+    """Make a tracer current for the block (and tasks created inside it)."""
+    token = _current_tracer.set(tracer)
+    span_token = _current_span.set(None)
+    try:
+        yield tracer
+    finally:
+        _current_span.reset(span_token)
+        _current_tracer.reset(token)
+
+
+def current_tracer() -> Optional[Tracer]:
+    return _current_tracer.get()
+
+
+@contextmanager
+def span(name: str, **attrs: Any) -> Iterator[Optional[Span]]:
+    """Time a block in the current tracer (no-op without one)."""
+    tracer = _current_tracer.get()
+    if tracer is None:
+        yield None
+        return
+    with tracer.span(name, **attrs) as current:
+        yield current
+
+
+def count(name: str, value: float = 1, **labels: Any) -> None:
+    """Increment a counter of the current tracer (no-op without one)."""
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        tracer.count(name, value, **labels)
+
+
+def observe(name: str, value: float, **labels: Any) -> None:
+    """Record a histogram value in the current tracer (no-op without one)."""
+    tracer = _current_tracer.get()
+    if tracer is not None:
+        tracer.observe(name, value, **labels)
+
+
+def domain_label(url: str) -> str:
+    """Host of a URL for per-domain metrics."""
+    return (urlparse(url).hostname or "").removeprefix("www.")
+
+
+class MetricsServer:
+    """Serves REGISTRY at /metrics in Prometheus text format."""
+
+    def __init__(self, port: int, host: str = "127.0.0.1", registry: MetricsRegistry = REGISTRY):
+        self.port = port
+        self.host = host
+        self.registry = registry
+        self._runner = None
+
+    async def start(self) -> None:
+        from aiohttp import web
+
+        async def metrics(request: web.Request) -> web.Response:
+            return web.Response(
+                body=self.registry.to_prometheus().encode("utf-8"),
+                headers={"Content-Type": "text/plain; version=0.0.4; charset=utf-8"},
+            )
+
+        app = web.Application()
+        app.router.add_get("/metrics", metrics)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        await web.TCPSite(self._runner, self.host, self.port).start()
+        logger.info(f"Serving metrics on http://{self.host}:{self.port}/metrics")
+
+    async def stop(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -0,0 +1,254 @@
+"""
+Traffic archives - record and replay browser-api requests.
+
+A recorder captures every browser-api call made through BrowserPool (action,
+parameters, response and latency) into a gzip-compressed JSON Lines archive.
+A replayer serves those responses back without Docker or network access, so
+the Python side of a session (parsing, findings extraction, dedup, output)
+can be profiled on real traffic, deterministically and as often as needed.
+
+Archive layout (one JSON object per line)::
+
+    {"version": 1, "created_at": "..."}
+    {"t": 0.12, "stream": "abc123", "action": "navigate", "key": "...",
+     "params": {...}, "elapsed": 1.234, "response": {...}}
+
+``stream`` identifies the browser instance the request went to and ``key``
+is a hash of the action, its parameters (tab ids excluded) and, unless the
+request starts with a navigation, the URL the tab was on: an evaluate script or a screenshot
+means something different on every page. Parameters are stored only for the
+first record of each key, since evaluate scripts are sent over and over.
+
+Replay modes:
+- key: each request gets the next recorded response for its key; once they
+  are used up the last one is served again. Tolerates a different task order
+  or parallelism than the recording.
+- order: each instance gets the responses of one recorded stream in the
+  recorded order, so repeated requests (retries, polling) get the responses
+  they got at the time. A request that is not the next one of its stream is
+  answered by key.
+
+Responses are delayed by the recorded latency divided by ``speed``
+(0 = no delay).
+"""
+
+import asyncio
+import gzip
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from datetime import datetime
+from pathlib import Path
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_VERSION = 1
+REPLAY_KEY = "key"
+REPLAY_ORDER = "order"
+REPLAY_MODES = (REPLAY_KEY, REPLAY_ORDER)
+
+# Parameters that differ between runs without changing the response
+VOLATILE_PARAMS = ("tabId",)
+
+
+def request_key(action: str, params: dict, page: str = "") -> str:
+    """Stable key of a request (action, parameters without tab ids, current page)."""
+    stable = {k: v for k, v in params.items() if k not in VOLATILE_PARAMS}
+    steps = params.get("steps") or [{}] if action == "batch" else None
+    navigates = action == "navigate" or (steps is not None and steps[0].get("action") == "navigate")
+    context = "" if navigates else page
+    payload = json.dumps([action, stable, context], sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+def page_after(action: str, params: dict, page: str) -> str:
+    """URL a tab is on after a request (the last navigation of a batch counts)."""
+    if action == "navigate":
+        return params.get("url", page)
+    if action == "batch":
+        for step in params.get("steps", []):
+            if step.get("action") == "navigate":
+                page = (step.get("params") or {}).get("url", page)
+    return page
+
+
+class PageTracker:
+    """Current page of every tab, to key page-dependent requests."""
+
+    def __init__(self):
+        self._pages: dict[tuple[str, Optional[str]], str] = {}
+
+    def key(self, stream: str, action: str, params: dict) -> str:
+        """Key of a request, advancing the tab to the page it navigates to."""
+        tab = (stream, params.get("tabId"))
+        page = self._pages.get(tab, "")
+        self._pages[tab] = page_after(action, params, page)
+        return request_key(action, params, page)
+
+
+@dataclass
+class TrafficStats:
+    """Counters of a recorder or replayer."""
+    recorded: int = 0
+    replayed: int = 0
+    misses: int = 0
+
+    def to_dict(self) -> dict:
+        return asdict(self)
+
+
+class TrafficRecorder:
+    """
+    Appends browser-api requests and responses to a traffic archive.
+
+    The archive is written to a temporary file and moved into place on
+    close(). Safe to call from several threads.
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._tmp_path = self.path.with_name(f".{self.path.name}.tmp")
+        self._file = gzip.open(self._tmp_path, "wt", encoding="utf-8")
+        self._file.write(json.dumps({
+            "version": ARCHIVE_VERSION,
+            "created_at": datetime.now().isoformat(),
+        }) + "\n")
+        self._lock = threading.Lock()
+        self._start = time.monotonic()
+        self._keys: set[str] = set()
+        self._pages = PageTracker()
+        self.stats = TrafficStats()
+
+    def record(self, stream: str, action: str, params: dict, response: dict, elapsed: float) -> None:
+        """
+        Record one request.
+
+        Args:
+            stream: Browser instance the request went to
+            action: browser-api action (navigate, content, batch, ...)
+            params: Request parameters
+            response: Parsed response body
+            elapsed: Request latency in seconds
+        """
+        with self._lock:
+            if self._file is None:
+                return
+            key = self._pages.key(stream, action, params)
+            entry = {
+                "t": round(time.monotonic() - self._start - elapsed, 4),
+                "stream": stream,
+                "action": action,
+                "key": key,
+                "elapsed": round(elapsed, 4),
+                "response": response,
+            }
+            if key not in self._keys:
+                self._keys.add(key)
+                entry["params"] = params
+            self._file.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            self.stats.recorded += 1
+
+    def close(self) -> None:
+        """Finish the archive."""
+        with self._lock:
+            if self._file is None:
+                return
+            self._file.close()
+            self._file = None
+            os.replace(self._tmp_path, self.path)
+        logger.info(f"Recorded {self.stats.recorded} browser-api requests to {self.path}")
+
+
+class TrafficReplayer:
+    """Serves the responses of a traffic archive."""
+
+    def __init__(self, path: Path, speed: float = 1.0, mode: str = REPLAY_KEY):
+        if mode not in REPLAY_MODES:
+            raise ValueError(f"Unknown replay mode: {mode}")
+        self.path = Path(path)
+        self.speed = speed
+        self.mode = mode
+        self.stats = TrafficStats()
+        self._lock = threading.Lock()
+        # Responses are kept serialized and parsed per request, like a real response
+        self._by_key: dict[str, deque[tuple[str, float]]] = {}
+        self._by_stream: dict[str, deque[tuple[str, str, float]]] = {}
+        self._last: dict[str, tuple[str, float]] = {}
+        # Replaying stream -> recorded stream (same name if recorded, else the
+        # first unused one, assigned on first request)
+        self._stream_map: dict[str, str] = {}
+        self._pages = PageTracker()
+
+        with gzip.open(self.path, "rt", encoding="utf-8") as f:
+            header = json.loads(f.readline() or "{}")
+            if header.get("version") != ARCHIVE_VERSION:
+                raise ValueError(f"Unsupported traffic archive version: {header.get('version')}")
+            for line in f:
+                entry = json.loads(line)
+                body, elapsed = json.dumps(entry["response"]), entry.get("elapsed", 0.0)
+                self._by_key.setdefault(entry["key"], deque()).append((body, elapsed))
+                self._by_stream.setdefault(entry["stream"], deque()).append((entry["key"], body, elapsed))
+
+    @property
+    def streams(self) -> list[str]:
+        """Recorded streams, in order of their first request."""
+        return list(self._by_stream)
+
+    def _next(self, stream: str, action: str, params: dict) -> Optional[tuple[str, float]]:
+        with self._lock:
+            key = self._pages.key(stream, action, params)
+            if self.mode == REPLAY_ORDER:
+                recorded = self._stream_map.get(stream)
+                if recorded is None:
+                    used = set(self._stream_map.values())
+                    candidates = [stream] if stream in self._by_stream and stream not in used else self._by_stream
+                    recorded = next((s for s in candidates if s not in used), "")
+                    self._stream_map[stream] = recorded
+                queue = self._by_stream.get(recorded)
+                if queue and queue[0][0] == key:
+                    _, body, elapsed = queue.popleft()
+                    return body, elapsed
+
+            queue = self._by_key.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+                return self._last[key]
+            return self._last.get(key)
+
+    def lookup(self, stream: str, action: str, params: dict) -> tuple[dict, float]:
+        """
+        Recorded response of a request.
+
+        Returns:
+            (response, recorded latency in seconds); a failed response if the
+            request is not in the archive
+        """
+        found = self._next(stream, action, params)
+        if found is None:
+            with self._lock:
+                self.stats.misses += 1
+            logger.debug(f"Not in traffic archive: {action} {params.get('url', '')}")
+            return {"success": False, "error": f"Not in traffic archive: {action}"}, 0.0
+        body, elapsed = found
+        with self._lock:
+            self.stats.replayed += 1
+        return json.loads(body), elapsed
+
+    def delay(self, elapsed: float) -> float:
+        """Seconds to wait before answering a request that took ``elapsed``."""
+        return elapsed / self.speed if self.speed > 0 else 0.0
+
+    async def replay(self, stream: str, action: str, params: dict) -> dict:
+        """Answer a request from the archive after its (scaled) latency."""
+        response, elapsed = self.lookup(stream, action, params)
+        delay = self.delay(elapsed)
+        if delay:
+            await asyncio.sleep(delay)
+        return response
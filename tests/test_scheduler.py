@@ -0,0 +1,74 @@
+"""
+Tests for src/scheduler.py
+"""
+import asyncio
+import time
+from types import SimpleNamespace
+
+from src.scheduler import TaskScheduler
+from src.task_parser import ResearchTask
+
+
+def test_http_only_run_does_not_wait_for_arrivals():
+    """Work served outside the workers ends the run before a late instance boots"""
+    scheduler = TaskScheduler()
+    executed = []
+
+    async def arrivals():
+        # A browser that takes far longer to boot than the work takes
+        await asyncio.sleep(3)
+        yield SimpleNamespace(id="late")
+
+    async def execute(task, instance):
+        executed.append(task.id)
+        return True
+
+    async def fetch_over_http():
+        await asyncio.sleep(0.1)
+        await scheduler.release()
+
+    async def main():
+        # Held like the orchestrator's HTTP tier before the run starts
+        scheduler.hold()
+        fetch = asyncio.create_task(fetch_over_http())
+        started = time.monotonic()
+        results = await scheduler.run(
+            [], execute=execute, is_success=bool, arrivals=arrivals(),
+        )
+        await fetch
+        return results, time.monotonic() - started
+
+    results, elapsed = asyncio.run(main())
+
+    assert results == []
+    assert executed == []
+    assert elapsed < 1.0
+
+
+def test_escalated_task_waits_for_arrival():
+    """A task submitted by held work still runs on the instance that arrives"""
+    scheduler = TaskScheduler()
+
+    async def arrivals():
+        await asyncio.sleep(0.2)
+        yield SimpleNamespace(id="late")
+
+    async def execute(task, instance):
+        return (task.id, instance.id)
+
+    async def fetch_over_http():
+        await asyncio.sleep(0.05)
+        # Escalated to a browser, like a failed HTTP fetch
+        scheduler.submit([ResearchTask(id="t1", query="q", url="https://example.com/")])
+        await scheduler.release()
+
+    async def main():
+        scheduler.hold()
+        fetch = asyncio.create_task(fetch_over_http())
+        results = await scheduler.run(
+            [], execute=execute, is_success=lambda r: True, arrivals=arrivals(),
+        )
+        await fetch
+        return results
+
+    assert asyncio.run(main()) == [("t1", "late")]